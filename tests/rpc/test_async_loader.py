@@ -0,0 +1,91 @@
+import sys
+from pathlib import Path
+from typing import Iterator
+
+import pytest
+
+from wabee.rpc.loader import ToolConfig, ToolLoadError, ToolLoader
+
+TOOLS_SOURCE = '''
+import time
+import asyncio
+from wabee.tools.base_tool import BaseTool
+
+class AsyncCreateTool(BaseTool):
+    async def execute(self, input_data):
+        return None, None
+
+    @classmethod
+    async def create(cls, **kwargs):
+        await asyncio.sleep(0.2)
+        return cls(name="AsyncCreate", **kwargs)
+
+class BlockingCreateTool(BaseTool):
+    async def execute(self, input_data):
+        return None, None
+
+    @classmethod
+    def create(cls, **kwargs):
+        time.sleep(0.2)
+        return cls(name="BlockingCreate", **kwargs)
+
+class BrokenTool(BaseTool):
+    async def execute(self, input_data):
+        return None, None
+
+    @classmethod
+    def create(cls, **kwargs):
+        raise RuntimeError("database unreachable")
+'''
+
+
+@pytest.fixture
+def tools_module(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Iterator[str]:
+    (tmp_path / "startup_tools.py").write_text(TOOLS_SOURCE)
+    monkeypatch.syspath_prepend(str(tmp_path))
+    yield "startup_tools"
+    sys.modules.pop("startup_tools", None)
+
+
+@pytest.mark.asyncio
+async def test_load_tools_concurrently_and_isolates_failures(tools_module: str) -> None:
+    configs = [
+        ToolConfig(module_name=tools_module, tool_name="AsyncCreateTool", args={"region": "us"}),
+        ToolConfig(module_name=tools_module, tool_name="BlockingCreateTool"),
+        ToolConfig(module_name=tools_module, tool_name="BrokenTool"),
+        ToolConfig(module_name="module_that_does_not_exist", tool_name="MissingTool"),
+    ]
+
+    report = await ToolLoader.load_tools(configs)
+
+    assert set(report.tools) == {"AsyncCreate", "BlockingCreate"}
+    assert report.tools["AsyncCreate"].region == "us"
+    # Both 200ms constructors ran concurrently
+    assert report.duration_seconds < 0.35
+
+    failures = {result.config.tool_name: result.error for result in report.failures}
+    assert "database unreachable" in str(failures["BrokenTool"])
+    assert "Failed to import tool module" in str(failures["MissingTool"])
+
+    for result in report.results[:2]:
+        assert result.duration_seconds >= 0.2
+        assert result.profile is not None and result.profile.construct_seconds >= 0.2
+
+    summary = report.format()
+    assert summary.startswith("Loaded 2/4 tools")
+    assert "BrokenTool" in summary and "FAILED" in summary
+
+
+@pytest.mark.asyncio
+async def test_load_tools_respects_max_concurrency(tools_module: str) -> None:
+    configs = [ToolConfig(module_name=tools_module, tool_name="BlockingCreateTool")] * 2
+
+    report = await ToolLoader.load_tools(configs, max_concurrency=1)
+
+    assert len(report.results) == 2 and not report.failures
+    assert report.duration_seconds >= 0.4
+
+
+def test_sync_load_rejects_async_create(tools_module: str) -> None:
+    with pytest.raises(ToolLoadError, match="load_tools"):
+        ToolLoader.load_tool(ToolConfig(module_name=tools_module, tool_name="AsyncCreateTool"))
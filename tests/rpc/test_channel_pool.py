@@ -0,0 +1,93 @@
+import asyncio
+from typing import Any, AsyncIterator, Optional
+
+import grpc
+import pytest
+import pytest_asyncio
+
+from wabee.rpc import client as client_module
+from wabee.rpc.channels import ChannelPool
+from wabee.rpc.client import ToolServiceClient, execute_tool
+from wabee.rpc.protos import tool_service_pb2_grpc
+from wabee.rpc.server import ToolServicer
+from wabee.tools.base_tool import BaseTool
+from wabee.tools.tool_error import ToolError, ToolErrorType
+
+
+class RefusingTool(BaseTool):
+    async def execute(self, input_data: Any) -> tuple[Optional[str], Optional[ToolError]]:
+        return None, ToolError(type=ToolErrorType.PERMANENT, message="refused")
+
+
+@pytest_asyncio.fixture
+async def port() -> AsyncIterator[int]:
+    server = grpc.aio.server()
+    tool_service_pb2_grpc.add_ToolServiceServicer_to_server(
+        ToolServicer({"refuse": RefusingTool(name="refuse")}), server
+    )
+    bound = server.add_insecure_port("127.0.0.1:0")
+    await server.start()
+    yield bound
+    await server.stop(grace=None)
+
+
+@pytest.mark.asyncio
+async def test_clients_to_the_same_target_share_channels(port: int) -> None:
+    pool = ChannelPool(idle_timeout=60)
+    first = ToolServiceClient("127.0.0.1", port, pool=pool)
+    second = ToolServiceClient("127.0.0.1", port, pool=pool)
+    other_options = ToolServiceClient("127.0.0.1", port, pool=pool, options=[("grpc.max_receive_message_length", 1 << 20)])
+
+    assert first.channel is second.channel
+    assert other_options.channel is not first.channel
+    assert sorted(entry["clients"] for entry in pool.stats()) == [1, 2]
+
+    for client in (first, second, other_options):
+        await client.close()
+    assert all(entry["clients"] == 0 for entry in pool.stats())
+    await pool.close()
+
+
+@pytest.mark.asyncio
+async def test_subchannels_spread_calls_over_connections(port: int) -> None:
+    pool = ChannelPool(subchannels=3)
+    async with ToolServiceClient("127.0.0.1", port, pool=pool) as client:
+        stubs = {id(client.stub) for _ in range(6)}
+        assert len(stubs) == 3
+
+        results = await asyncio.gather(*(client.execute("refuse", {}) for _ in range(6)))
+        assert all(error == {"type": "ToolErrorType.PERMANENT", "message": "refused"} for _, error in results)
+
+        lease = client._leased()
+        states = [channel.get_state() for channel in lease.entry.channels]
+        assert states == [grpc.ChannelConnectivity.READY] * 3
+    await pool.close()
+
+
+@pytest.mark.asyncio
+async def test_exit_releases_channel_without_reopening(port: int) -> None:
+    pool = ChannelPool(idle_timeout=0.05)
+    async with ToolServiceClient("127.0.0.1", port, pool=pool) as client:
+        channel = client.channel
+        await client.get_tool_schema("refuse")
+    assert client._leases == {}
+    assert pool.stats()[0]["clients"] == 0
+
+    # Idle channels are closed after the timeout
+    await asyncio.sleep(0.1)
+    assert pool.stats() == []
+    assert channel.get_state() == grpc.ChannelConnectivity.SHUTDOWN
+
+
+@pytest.mark.asyncio
+async def test_execute_tool_reuses_pooled_connection(port: int, monkeypatch: pytest.MonkeyPatch) -> None:
+    pool = ChannelPool()
+    monkeypatch.setattr(client_module, "default_pool", pool)
+
+    for _ in range(3):
+        error = await execute_tool("refuse", {}, host="127.0.0.1", port=port)
+        assert error["message"] == "refused"
+
+    stats = pool.stats()
+    assert len(stats) == 1 and stats[0]["calls"] == 3 and stats[0]["clients"] == 0
+    await pool.close()
@@ -0,0 +1,186 @@
+import time
+import socket
+import asyncio
+from typing import Any, AsyncIterator, Iterable, List, Optional
+
+import grpc
+import pytest
+import pytest_asyncio
+
+from wabee.rpc.balancer import Endpoint, LoadBalancer
+from wabee.rpc.breaker import CLOSED, HALF_OPEN, OPEN, BreakerEvent, CircuitBreakerPolicy, CircuitBreakerRegistry
+from wabee.rpc.channels import ChannelPool
+from wabee.rpc.client import ToolServiceClient
+from wabee.rpc.protos import tool_service_pb2_grpc
+from wabee.rpc.retry import RetryPolicy
+from wabee.rpc.server import ToolServicer
+from wabee.tools.base_tool import BaseTool
+from wabee.tools.tool_error import ToolError, ToolErrorType
+
+
+class AnswerTool(BaseTool):
+    def __init__(self, name: str, error_type: ToolErrorType) -> None:
+        super().__init__(name=name)
+        self.error_type = error_type
+        self.calls = 0
+
+    async def execute(self, input_data: Any) -> tuple[Optional[str], Optional[ToolError]]:
+        self.calls += 1
+        return None, ToolError(type=self.error_type, message=self.name)
+
+
+@pytest_asyncio.fixture
+async def start_server() -> AsyncIterator[Any]:
+    servers: List[grpc.aio.Server] = []
+
+    async def start(tool: BaseTool) -> str:
+        server = grpc.aio.server()
+        tool_service_pb2_grpc.add_ToolServiceServicer_to_server(ToolServicer({"lookup": tool}), server)
+        port = server.add_insecure_port("127.0.0.1:0")
+        await server.start()
+        servers.append(server)
+        return f"127.0.0.1:{port}"
+
+    yield start
+    for server in servers:
+        await server.stop(grace=None)
+
+
+def dead_target() -> str:
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+        sock.bind(("127.0.0.1", 0))
+        return f"127.0.0.1:{sock.getsockname()[1]}"
+
+
+def test_breaker_opens_fails_fast_and_recovers_through_half_open() -> None:
+    registry = CircuitBreakerRegistry(CircuitBreakerPolicy(min_calls=4, open_seconds=0.05))
+    events: List[BreakerEvent] = []
+    registry.add_listener(events.append)
+    breaker = registry.get("a:1", "lookup")
+
+    for success in (True, False, True, False):
+        assert breaker.allow()
+        breaker.record(success, 0.001)
+    assert breaker.state == OPEN
+    assert not breaker.allow() and registry.open_targets("lookup") == ["a:1"]
+
+    time.sleep(0.06)
+    assert breaker.allow() and breaker.state == HALF_OPEN
+    # Only one trial at a time
+    assert not breaker.allow()
+    breaker.record(True, 0.001)
+
+    assert breaker.state == CLOSED
+    assert [(e.previous, e.state) for e in events] == [(CLOSED, OPEN), (OPEN, HALF_OPEN), (HALF_OPEN, CLOSED)]
+    metrics = registry.metrics()[0]
+    assert metrics["opened"] == 1 and metrics["rejected"] == 2 and metrics["state"] == CLOSED
+
+
+def test_slow_calls_open_the_circuit_and_failed_trials_reopen_it() -> None:
+    registry = CircuitBreakerRegistry(CircuitBreakerPolicy(min_calls=3, slow_call_seconds=0.1, open_seconds=0.01))
+    breaker = registry.get("a:1", "lookup")
+
+    for _ in range(3):
+        breaker.record(True, 0.5)
+    assert breaker.state == OPEN
+
+    time.sleep(0.02)
+    assert breaker.allow()
+    breaker.record(False, 0.001)
+    assert breaker.state == OPEN
+
+
+@pytest.mark.asyncio
+async def test_client_fails_fast_once_the_circuit_opens() -> None:
+    target = dead_target()
+    host, port = target.split(":")
+    breakers = CircuitBreakerRegistry(CircuitBreakerPolicy(min_calls=3, open_seconds=60))
+    client = ToolServiceClient(host, int(port), pool=ChannelPool(), breakers=breakers)
+
+    errors = [(await client.execute("lookup", {}))[1] for _ in range(5)]
+
+    assert [error["type"] for error in errors] == ["RPC_ERROR"] * 3 + ["CIRCUIT_OPEN"] * 2
+    assert breakers.get(target, "lookup").rejected == 2
+    await client.close()
+
+
+@pytest.mark.asyncio
+async def test_balancer_routes_around_open_circuits(start_server: Any) -> None:
+    overloaded = AnswerTool("overloaded", ToolErrorType.RETRYABLE)
+    healthy = AnswerTool("healthy", ToolErrorType.PERMANENT)
+    targets = [await start_server(overloaded), await start_server(healthy)]
+    breakers = CircuitBreakerRegistry(CircuitBreakerPolicy(min_calls=2, open_seconds=60))
+    client = ToolServiceClient(balancer=LoadBalancer(targets), pool=ChannelPool(), breakers=breakers)
+
+    answers = [(await client.execute("lookup", {}))[1]["message"] for _ in range(10)]
+
+    # The overloaded replica's circuit opened after its second call; it is skipped from then on
+    assert overloaded.calls == 2 and healthy.calls == 8
+    assert answers.count("healthy") == 8
+    assert breakers.get(targets[0], "lookup").state == OPEN
+    assert breakers.get(targets[1], "lookup").state == CLOSED
+    await client.close()
+
+
+@pytest.mark.asyncio
+async def test_retries_avoid_open_circuits(start_server: Any) -> None:
+    healthy = AnswerTool("healthy", ToolErrorType.PERMANENT)
+    live = await start_server(healthy)
+    breakers = CircuitBreakerRegistry(CircuitBreakerPolicy(min_calls=1, open_seconds=60))
+    client = ToolServiceClient(
+        balancer=LoadBalancer([dead_target(), live]),
+        pool=ChannelPool(),
+        breakers=breakers,
+        retry_policy=RetryPolicy(initial_backoff=0.001)
+    )
+
+    results = await asyncio.gather(*(client.execute("lookup", {}) for _ in range(6)))
+
+    assert all(error["message"] == "healthy" for _, error in results)
+    assert len(breakers.open_targets("lookup")) == 1
+    await client.close()
+
+
+@pytest.mark.asyncio
+async def test_schema_lookups_do_not_count_towards_the_circuit() -> None:
+    target = dead_target()
+    host, port = target.split(":")
+    breakers = CircuitBreakerRegistry(CircuitBreakerPolicy(min_calls=1, open_seconds=60))
+    client = ToolServiceClient(host, int(port), pool=ChannelPool(), breakers=breakers)
+
+    for _ in range(3):
+        assert "error" in await client.get_tool_schema("lookup")
+
+    assert breakers.open_targets("lookup") == []
+    await client.close()
+
+
+class StaleBalancer(LoadBalancer):
+    """Picks the first replica once, ignoring exclusions, like a choice made just before its circuit opened"""
+
+    def __init__(self, targets: List[str]) -> None:
+        super().__init__(targets)
+        self.stale = True
+
+    async def choose(self, exclude: Iterable[str] = ()) -> Endpoint:
+        if self.stale:
+            self.stale = False
+            return self.endpoints[0]
+        return await super().choose(exclude)
+
+
+@pytest.mark.asyncio
+async def test_open_circuit_fails_over_to_the_next_replica(start_server: Any) -> None:
+    tripped = AnswerTool("tripped", ToolErrorType.PERMANENT)
+    healthy = AnswerTool("healthy", ToolErrorType.PERMANENT)
+    targets = [await start_server(tripped), await start_server(healthy)]
+    breakers = CircuitBreakerRegistry(CircuitBreakerPolicy(min_calls=1, open_seconds=60))
+    breakers.get(targets[0], "lookup").record(False, 0.001)
+    # No retry policy: failing over isn't a retry
+    client = ToolServiceClient(balancer=StaleBalancer(targets), pool=ChannelPool(), breakers=breakers)
+
+    _, error = await client.execute("lookup", {})
+
+    assert error is not None and error["message"] == "healthy"
+    assert tripped.calls == 0 and healthy.calls == 1
+    await client.close()
@@ -0,0 +1,216 @@
+import re
+from datetime import date, datetime, timedelta
+from enum import Enum, IntEnum
+from typing import Any, AsyncIterator, List, Optional
+
+import grpc
+import pytest
+import pytest_asyncio
+from pydantic import BaseModel, Field, ValidationError
+
+from wabee.rpc.channels import ChannelPool
+from wabee.rpc.client import ToolServiceClient
+from wabee.rpc.protos import tool_service_pb2_grpc
+from wabee.rpc.server import ToolServicer
+from wabee.rpc.validation import INVALID_INPUT, LocalValidator, SchemaCache
+from wabee.tools.base_tool import BaseTool
+from wabee.tools.tool_error import ToolError, ToolErrorType
+
+
+class Size(str, Enum):
+    SMALL = "small"
+    LARGE = "large"
+
+
+class Address(BaseModel):
+    city: str
+    zip_code: str = Field(min_length=5, max_length=5)
+
+
+class Order(BaseModel):
+    sku: str
+    quantity: int = Field(ge=1)
+    express: bool = False
+    size: Size = Size.SMALL
+    note: Optional[str] = None
+    tags: List[str] = []
+    address: Optional[Address] = None
+
+
+class OrderTool(BaseTool):
+    args_schema = Order
+
+    def __init__(self) -> None:
+        super().__init__(name="order")
+        self.calls = 0
+
+    async def execute(self, input_data: Order) -> tuple[Optional[str], Optional[ToolError]]:
+        self.calls += 1
+        # Answer with an error so the test doesn't depend on result decoding
+        return None, ToolError(type=ToolErrorType.PERMANENT, message="ran")
+
+
+def pydantic_message(data: Any) -> str:
+    """str(ValidationError) without the documentation links"""
+    try:
+        Order.model_validate(data)
+    except ValidationError as e:
+        return re.sub(r"\n +For further information visit \S+", "", str(e))
+    raise AssertionError("input is valid")
+
+
+@pytest_asyncio.fixture
+async def server() -> AsyncIterator[Any]:
+    tool = OrderTool()
+    server = grpc.aio.server()
+    tool_service_pb2_grpc.add_ToolServiceServicer_to_server(ToolServicer({"order": tool}), server)
+    port = server.add_insecure_port("127.0.0.1:0")
+    await server.start()
+    yield tool, port
+    await server.stop(grace=None)
+
+
+@pytest.mark.parametrize("data", [
+    {"quantity": 2},
+    {"sku": 1, "quantity": "two"},
+    {"sku": "a", "quantity": 1.5, "express": "maybe"},
+    {"sku": "a", "quantity": 0, "size": "medium", "tags": "x"},
+    {"sku": "a", "quantity": 1, "address": {"city": "Lisbon", "zip_code": "123"}},
+    {"sku": "a", "quantity": 1, "address": "Lisbon"},
+    [1, 2],
+])
+def test_validator_matches_pydantic_messages(data: Any) -> None:
+    validator = LocalValidator(Order.model_json_schema())
+    assert validator.format(validator.validate(data)) == pydantic_message(data)
+
+
+@pytest.mark.parametrize("data", [
+    {"sku": "a", "quantity": "3"},
+    {"sku": "a", "quantity": 2.0, "express": "yes"},
+    {"sku": "a", "quantity": " 4 ", "express": 0, "size": "large", "note": None},
+    {"sku": "a", "quantity": 1, "tags": ("x", "y"), "address": {"city": "Porto", "zip_code": "40000"}},
+    {"sku": "a", "quantity": 1, "unknown": object()},
+])
+def test_validator_accepts_what_lax_pydantic_accepts(data: Any) -> None:
+    Order.model_validate(data)
+    assert LocalValidator(Order.model_json_schema()).validate(data) == []
+
+
+class Priority(IntEnum):
+    LOW = 1
+    HIGH = 2
+
+
+class Ratio(float, Enum):
+    HALF = 0.5
+    WHOLE = 1.0
+
+
+class Schedule(BaseModel):
+    start: Optional[datetime] = None
+    day: Optional[date] = None
+    every: Optional[timedelta] = None
+    priority: Optional[Priority] = None
+    ratio: Optional[Ratio] = None
+
+
+@pytest.mark.parametrize("data", [
+    {"start": 1700000000},
+    {"start": 1.5},
+    {"start": "2024-01-01T10:00:00"},
+    {"day": 0},
+    {"day": "2024-01-01"},
+    {"every": 30},
+    {"every": "PT30S"},
+    {"priority": 1},
+    {"priority": "1"},
+    {"priority": " 2 "},
+    {"priority": "2.0"},
+    {"priority": 3},
+    {"priority": "3"},
+    {"priority": "high"},
+    {"ratio": "0.5"},
+    {"ratio": 2},
+])
+def test_validator_agrees_with_the_server_model(data: Any) -> None:
+    try:
+        Schedule.model_validate(data)
+        accepted = True
+    except ValidationError:
+        accepted = False
+    assert (LocalValidator(Schedule.model_json_schema()).validate(data) == []) == accepted
+
+
+def test_unknown_types_and_keywords_are_left_to_the_server() -> None:
+    validator = LocalValidator({
+        "properties": {"when": {"type": "<class 'datetime.datetime'>"}, "id": {"format": "uuid"}},
+        "required": ["when"],
+    })
+    assert validator.validate({"when": 3, "id": "not-a-uuid"}) == []
+    assert [issue.type for issue in validator.validate({})] == ["missing"]
+
+
+@pytest.mark.asyncio
+async def test_invalid_input_is_rejected_before_the_call(server: Any) -> None:
+    tool, port = server
+    data = {"sku": "a", "quantity": "many"}
+    async with ToolServiceClient("127.0.0.1", port, pool=ChannelPool(), validate_inputs=True) as client:
+        result, error = await client.execute("order", data)
+        assert result is None and tool.calls == 0
+        assert error == {"type": INVALID_INPUT, "message": pydantic_message(data)}
+
+        # Input pydantic would coerce goes through
+        _, error = await client.execute("order", {"sku": "a", "quantity": "3", "express": "yes"})
+        assert error == {"type": str(ToolErrorType.PERMANENT), "message": "ran"}
+        assert tool.calls == 1
+
+    # The server reports the same error when asked directly
+    async with ToolServiceClient("127.0.0.1", port, pool=ChannelPool()) as client:
+        _, error = await client.execute("order", data)
+    assert error is not None and error["type"] == INVALID_INPUT
+    assert re.sub(r"\n +For further information visit \S+", "", error["message"]) == pydantic_message(data)
+
+
+@pytest.mark.asyncio
+async def test_schema_is_fetched_once_and_refreshed_on_fingerprint_change(server: Any) -> None:
+    _, port = server
+    cache = SchemaCache()
+    # A stale schema that accepts anything
+    target = f"127.0.0.1:{port}"
+    cache.put(target, "order", "{}", "stale")
+    async with ToolServiceClient("127.0.0.1", port, pool=ChannelPool(), validate_inputs=True, schema_cache=cache) as client:
+        _, error = await client.execute("order", {"quantity": 1})
+        # Validated by the server, whose fingerprint evicts the stale schema
+        assert error is not None and error["type"] == INVALID_INPUT
+        assert cache.get(target, "order") is None
+
+        await client.execute("order", {"quantity": 1})
+        entry = cache.get(target, "order")
+        assert entry is not None and entry.validator is not None and entry.fingerprint != "stale"
+
+        await client.execute("order", {"sku": "a", "quantity": 1})
+        assert cache.get(target, "order") is entry
+
+
+@pytest.mark.asyncio
+async def test_schemas_are_cached_per_server(server: Any) -> None:
+    tool, port = server
+    cache = SchemaCache()
+    # Another server's tool of the same name accepts anything
+    other = cache.put("127.0.0.1:1", "order", "{}", "other")
+    async with ToolServiceClient("127.0.0.1", port, pool=ChannelPool(), validate_inputs=True, schema_cache=cache) as client:
+        _, error = await client.execute("order", {"quantity": 1})
+
+    # Checked against this server's schema, without calling the tool
+    assert error is not None and error["type"] == INVALID_INPUT and tool.calls == 0
+    assert cache.get("127.0.0.1:1", "order") is other
+    assert cache.get(f"127.0.0.1:{port}", "order") is not other
+
+
+@pytest.mark.asyncio
+async def test_validation_is_skipped_when_the_schema_is_unavailable(server: Any) -> None:
+    tool, port = server
+    async with ToolServiceClient("127.0.0.1", port, pool=ChannelPool(), validate_inputs=True) as client:
+        _, error = await client.execute("missing", {})
+    assert error is not None and error["type"] == "RPC_ERROR"
+    assert "not found" in error["message"]
@@ -0,0 +1,135 @@
+import json
+import time
+from typing import Any, Dict, List, Optional
+
+import pytest
+from pydantic import BaseModel, model_validator
+
+from wabee.rpc.server import ToolServicer
+from wabee.rpc.protos import tool_service_pb2
+from wabee.tools.base_model import StructuredToolResponse
+from wabee.tools.base_tool import BaseTool
+from wabee.tools.simple_tool import simple_tool
+from wabee.tools.tool_error import ToolError
+
+VALIDATIONS = {"count": 0}
+
+
+class Address(BaseModel):
+    street: str
+    city: str
+    tags: List[str]
+
+
+class Person(BaseModel):
+    name: str
+    age: int
+    addresses: List[Address]
+    attributes: Dict[str, float]
+
+
+class Document(BaseModel):
+    title: str
+    people: List[Person]
+    notes: Optional[str] = None
+
+    @model_validator(mode="before")
+    @classmethod
+    def count(cls, data: Any) -> Any:
+        VALIDATIONS["count"] += 1
+        return data
+
+
+class DocumentTool(BaseTool):
+    args_schema = Document
+
+    async def execute(self, input_data: Document) -> tuple[Optional[StructuredToolResponse], Optional[ToolError]]:
+        return StructuredToolResponse(variable_name="people", content=str(len(input_data.people))), None
+
+
+@simple_tool(schema=Document)
+async def document_tool(input_data: Document) -> StructuredToolResponse:
+    return StructuredToolResponse(variable_name="people", content=str(len(input_data.people)))
+
+
+@simple_tool()
+async def hinted_tool(title: str, people: List[Person]) -> StructuredToolResponse:
+    assert isinstance(people[0], Person)
+    return StructuredToolResponse(variable_name="people", content=str(len(people)))
+
+
+def large_document(people: int = 300) -> Dict[str, Any]:
+    return {
+        "title": "census",
+        "people": [
+            {
+                "name": f"person {i}",
+                "age": i % 90,
+                "addresses": [
+                    {"street": f"{j} Main St", "city": "Springfield", "tags": ["home", "mail", str(j)]}
+                    for j in range(5)
+                ],
+                "attributes": {f"score_{k}": k / 10 for k in range(10)},
+            }
+            for i in range(people)
+        ],
+    }
+
+
+def execute_request(tool_name: str, payload: Dict[str, Any]) -> tool_service_pb2.ExecuteRequest:
+    return tool_service_pb2.ExecuteRequest(tool_name=tool_name, json_data=json.dumps(payload))
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("tool_name", ["base_tool", "simple_tool", "hinted_tool"])
+async def test_execute_validates_input_once(tool_name: str) -> None:
+    servicer = ToolServicer({
+        "base_tool": DocumentTool(),
+        "simple_tool": document_tool,
+        "hinted_tool": hinted_tool,
+    })
+    VALIDATIONS["count"] = 0
+
+    response = await servicer.Execute(execute_request(tool_name, large_document(3)), None)
+
+    assert not response.HasField("error")
+    assert response.structured_result.content == "3"
+    if tool_name != "hinted_tool":
+        assert VALIDATIONS["count"] == 1
+
+
+@pytest.mark.asyncio
+async def test_invalid_input_is_reported_as_invalid_input() -> None:
+    servicer = ToolServicer({"base_tool": DocumentTool()})
+
+    response = await servicer.Execute(execute_request("base_tool", {"title": "missing people"}), None)
+
+    assert response.error.type == "ToolErrorType.INVALID_INPUT"
+    assert "people" in response.error.message
+
+
+@pytest.mark.asyncio
+async def test_single_pass_validation_benchmark() -> None:
+    servicer = ToolServicer({"hinted_tool": hinted_tool})
+    raw = json.dumps(large_document())
+    rounds = 20
+
+    # Previous path: decode, validate into the runtime schema, dump it back to
+    # plain dicts for the function, which then parses them into models again
+    before = float("inf")
+    for _ in range(rounds):
+        start = time.perf_counter()
+        model = hinted_tool.args_schema.model_validate(json.loads(raw))
+        await hinted_tool.__wrapped__(title=model.title, people=[Person(**p) for p in model.model_dump()["people"]])
+        before = min(before, time.perf_counter() - start)
+
+    after = float("inf")
+    for _ in range(rounds):
+        start = time.perf_counter()
+        result, error = await servicer._execute_raw(hinted_tool, raw)
+        after = min(after, time.perf_counter() - start)
+        assert error is None
+
+    print(f"\nExecute on {len(raw) / 1024:.0f}KiB nested input (best of {rounds}): "
+          f"validate + dump {before * 1000:.2f}ms, single pass {after * 1000:.2f}ms ({before / after:.2f}x)")
+    assert after < before
@@ -0,0 +1,137 @@
+import random
+import asyncio
+from contextlib import aclosing
+from typing import Any, AsyncIterator, Dict, Iterator, List, Optional, Tuple
+
+import grpc
+import pytest
+
+from wabee.rpc.channels import ChannelPool
+from wabee.rpc.client import ToolServiceClient
+from wabee.rpc.fanout import CallResult, fan_out
+from wabee.rpc.protos import tool_service_pb2_grpc
+from wabee.rpc.server import ToolServicer
+from wabee.tools.base_tool import BaseTool
+from wabee.tools.tool_error import ToolError, ToolErrorType
+
+
+class Recorder:
+    """Fake execute tracking how many calls run at once, overall and per tool"""
+
+    def __init__(self, delay: float = 0.001) -> None:
+        self.delay = delay
+        self.running: Dict[str, int] = {}
+        self.peak = 0
+        self.peak_per_tool: Dict[str, int] = {}
+        self.started = 0
+        self.cancelled = 0
+
+    async def __call__(self, tool_name: str, input_data: Dict[str, Any]) -> Tuple[Any, Optional[Dict]]:
+        self.started += 1
+        self.running[tool_name] = self.running.get(tool_name, 0) + 1
+        self.peak = max(self.peak, sum(self.running.values()))
+        self.peak_per_tool[tool_name] = max(self.peak_per_tool.get(tool_name, 0), self.running[tool_name])
+        try:
+            await asyncio.sleep(input_data.get("delay", self.delay))
+            if input_data.get("explode"):
+                raise TypeError("not serializable")
+            return input_data["n"], None
+        except asyncio.CancelledError:
+            self.cancelled += 1
+            raise
+        finally:
+            self.running[tool_name] -= 1
+
+
+@pytest.mark.asyncio
+async def test_global_and_per_tool_limits() -> None:
+    execute = Recorder()
+    calls = [("slow" if n % 3 == 0 else "fast", {"n": n}) for n in range(90)]
+    results = [r async for r in fan_out(execute, calls, max_concurrency=6, tool_concurrency={"slow": 2})]
+
+    assert sorted(r.result for r in results) == list(range(90))
+    assert execute.peak == 6
+    assert execute.peak_per_tool["slow"] == 2
+
+
+@pytest.mark.asyncio
+async def test_ordered_results_follow_the_input() -> None:
+    execute = Recorder()
+    calls = [("tool", {"n": n, "delay": random.uniform(0, 0.005)}) for n in range(50)]
+    results = [r async for r in fan_out(execute, calls, max_concurrency=8, ordered=True)]
+    assert [r.index for r in results] == [r.result for r in results] == list(range(50))
+
+
+@pytest.mark.parametrize("ordered", [False, True])
+@pytest.mark.asyncio
+async def test_input_is_consumed_lazily(ordered: bool) -> None:
+    pulled = 0
+
+    def calls() -> Iterator[Tuple[str, Dict[str, Any]]]:
+        nonlocal pulled
+        for n in range(500):
+            pulled += 1
+            # Every tenth call is slow, holding back ordered results
+            yield "tool", {"n": n, "delay": 0.01 if n % 10 == 0 else 0}
+
+    consumed = 0
+    async for _ in fan_out(Recorder(), calls(), max_concurrency=4, window=8, ordered=ordered):
+        consumed += 1
+        # Items in hand plus the one just pulled
+        assert pulled - consumed <= 8
+    assert consumed == 500
+
+
+@pytest.mark.asyncio
+async def test_async_input_errors_and_early_exit() -> None:
+    async def calls() -> AsyncIterator[Tuple[str, Dict[str, Any]]]:
+        yield "tool", {"n": 0, "explode": True}
+        for n in range(1, 100):
+            yield "tool", {"n": n, "delay": 0.05}
+
+    execute = Recorder()
+    results: List[CallResult] = []
+    async with aclosing(fan_out(execute, calls(), max_concurrency=5)) as stream:
+        async for result in stream:
+            results.append(result)
+            break
+
+    assert results[0].error == {"type": "CLIENT_ERROR", "message": "TypeError: not serializable"}
+    # The calls still running were cancelled rather than left behind
+    assert execute.cancelled == execute.started - 1 and sum(execute.running.values()) == 0
+
+
+class EchoTool(BaseTool):
+    def __init__(self) -> None:
+        super().__init__(name="echo")
+        self.running = 0
+        self.peak = 0
+
+    async def execute(self, input_data: Any) -> tuple[Optional[str], Optional[ToolError]]:
+        self.running += 1
+        self.peak = max(self.peak, self.running)
+        await asyncio.sleep(0.005)
+        self.running -= 1
+        # Answer with an error so the test doesn't depend on result decoding
+        return None, ToolError(type=ToolErrorType.PERMANENT, message=str(input_data["n"]))
+
+
+@pytest.mark.asyncio
+async def test_client_fans_out_over_the_server() -> None:
+    tool = EchoTool()
+    server = grpc.aio.server()
+    tool_service_pb2_grpc.add_ToolServiceServicer_to_server(ToolServicer({"echo": tool}), server)
+    port = server.add_insecure_port("127.0.0.1:0")
+    await server.start()
+    try:
+        async with ToolServiceClient("127.0.0.1", port, pool=ChannelPool()) as client:
+            calls = (("echo", {"n": n}) for n in range(40))
+            ordered = [r async for r in client.execute_many(calls, max_concurrency=4)]
+            assert [r.error["message"] for r in ordered if r.error] == [str(n) for n in range(40)]
+
+            calls = (("echo", {"n": n}) for n in range(40))
+            unordered = [r async for r in client.as_completed(calls, max_concurrency=8, tool_concurrency=3)]
+            assert sorted(r.index for r in unordered) == list(range(40))
+        assert tool.peak == 4
+    finally:
+        await server.stop(grace=None)
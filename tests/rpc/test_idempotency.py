@@ -0,0 +1,257 @@
+import asyncio
+import threading
+import time
+from pathlib import Path
+from typing import Any, AsyncIterator, List, Optional, Tuple
+
+import grpc
+import pytest
+import pytest_asyncio
+from pydantic import BaseModel
+
+from wabee.rpc.channels import ChannelPool
+from wabee.rpc.client import ToolServiceClient
+from wabee.rpc.idempotency import IdempotencyCache, MemoryIdempotencyStore, SqliteIdempotencyStore
+from wabee.rpc.protos import tool_service_pb2, tool_service_pb2_grpc
+from wabee.rpc.retry import HedgingPolicy
+from wabee.rpc.server import ToolServicer
+from wabee.tools.base_tool import BaseTool
+from wabee.tools.tool_error import ToolError, ToolErrorType
+
+
+class Charge(BaseModel):
+    amount: int
+    delay: float = 0.0
+
+
+class ChargeTool(BaseTool):
+    """Counts how often it really runs, like a tool with side effects would"""
+    args_schema = Charge
+
+    def __init__(self, name: str = "charge", overloaded: int = 0) -> None:
+        super().__init__(name=name)
+        self.charges: List[int] = []
+        self.overloaded = overloaded
+
+    async def execute(self, input_data: Charge) -> Tuple[Any, Optional[ToolError]]:
+        if self.overloaded:
+            self.overloaded -= 1
+            return None, ToolError(type=ToolErrorType.RETRYABLE, message="busy")
+        await asyncio.sleep(input_data.delay)
+        self.charges.append(input_data.amount)
+        return {"variable_name": "charge", "content": f"charge {len(self.charges)}"}, None
+
+
+@pytest_asyncio.fixture
+async def served() -> AsyncIterator[Any]:
+    servers: List[grpc.aio.Server] = []
+
+    async def start(*tools: ChargeTool) -> Tuple[ToolServicer, str, int]:
+        servicer = ToolServicer({tool.tool_name: tool for tool in tools})
+        server = grpc.aio.server()
+        tool_service_pb2_grpc.add_ToolServiceServicer_to_server(servicer, server)
+        port = server.add_insecure_port("127.0.0.1:0")
+        await server.start()
+        servers.append(server)
+        return servicer, "127.0.0.1", port
+
+    yield start
+    for server in servers:
+        await server.stop(grace=None)
+
+
+@pytest.mark.asyncio
+async def test_concurrent_duplicates_attach_to_the_first_call(served: Any) -> None:
+    tool = ChargeTool()
+    servicer, host, port = await served(tool)
+    client = ToolServiceClient(host, port, pool=ChannelPool())
+
+    outcomes = await asyncio.gather(*(
+        client.execute("charge", {"amount": 5, "delay": 0.1}, idempotency_key="order-1")
+        for _ in range(5)
+    ))
+    assert tool.charges == [5]
+    assert all(error is None and result is not None and result.content == "charge 1" for result, error in outcomes)
+    assert servicer.idempotency.stats()["attached"] == 4
+
+
+@pytest.mark.asyncio
+async def test_later_duplicates_get_the_stored_response(served: Any) -> None:
+    tool = ChargeTool()
+    servicer, host, port = await served(tool)
+    client = ToolServiceClient(host, port, pool=ChannelPool())
+
+    first, _ = await client.execute("charge", {"amount": 5, "delay": 0.2}, idempotency_key="order-1")
+    started = time.monotonic()
+    again, error = await client.execute("charge", {"amount": 5, "delay": 0.2}, idempotency_key="order-1")
+    assert time.monotonic() - started < 0.2
+    assert error is None and first is not None and again is not None
+    assert again.content == first.content == "charge 1"
+    assert tool.charges == [5]
+    assert servicer.idempotency.stats()["replayed"] == 1
+
+    # Other keys, calls without a key and other tools still run
+    await client.execute("charge", {"amount": 7}, idempotency_key="order-2")
+    await client.execute("charge", {"amount": 9})
+    assert tool.charges == [5, 7, 9]
+
+
+@pytest.mark.asyncio
+async def test_keys_are_scoped_to_the_tool(served: Any) -> None:
+    charge, refund = ChargeTool("charge"), ChargeTool("refund")
+    _, host, port = await served(charge, refund)
+    client = ToolServiceClient(host, port, pool=ChannelPool())
+    await client.execute("charge", {"amount": 5}, idempotency_key="order-1")
+    await client.execute("refund", {"amount": 5}, idempotency_key="order-1")
+    assert charge.charges == [5] and refund.charges == [5]
+
+
+@pytest.mark.asyncio
+async def test_session_calls_send_their_keys(served: Any) -> None:
+    tool = ChargeTool()
+    servicer, host, port = await served(tool)
+    client = ToolServiceClient(host, port, pool=ChannelPool())
+    async with client.session() as session:
+        await session.execute("charge", {"amount": 5}, idempotency_key="order-1")
+        result, error = await session.execute("charge", {"amount": 5}, idempotency_key="order-1")
+    assert error is None and result is not None and result.content == "charge 1"
+    assert tool.charges == [5]
+    assert servicer.idempotency.stats()["replayed"] == 1
+
+
+@pytest.mark.asyncio
+async def test_retryable_errors_are_not_stored(served: Any) -> None:
+    tool = ChargeTool(overloaded=1)
+    _, host, port = await served(tool)
+    client = ToolServiceClient(host, port, pool=ChannelPool())
+
+    _, error = await client.execute("charge", {"amount": 5}, idempotency_key="order-1")
+    assert error is not None and error['type'] == str(ToolErrorType.RETRYABLE)
+    result, error = await client.execute("charge", {"amount": 5}, idempotency_key="order-1")
+    assert error is None and result is not None
+    assert tool.charges == [5]
+
+
+@pytest.mark.asyncio
+async def test_call_survives_while_a_duplicate_waits() -> None:
+    tool = ChargeTool()
+    servicer = ToolServicer({"charge": tool})
+    request = tool_service_pb2.ExecuteRequest(
+        tool_name="charge", json_data='{"amount": 5, "delay": 0.1}', idempotency_key="order-1"
+    )
+    first = asyncio.ensure_future(servicer.execute_request(request))
+    await asyncio.sleep(0.02)
+    duplicate = asyncio.ensure_future(servicer.execute_request(request))
+    await asyncio.sleep(0.02)
+    first.cancel()
+
+    response = await duplicate
+    assert response.structured_result.content == "charge 1"
+    assert tool.charges == [5]
+
+
+@pytest.mark.asyncio
+async def test_call_is_cancelled_when_nobody_waits() -> None:
+    tool = ChargeTool()
+    servicer = ToolServicer({"charge": tool})
+    request = tool_service_pb2.ExecuteRequest(
+        tool_name="charge", json_data='{"amount": 5, "delay": 0.1}', idempotency_key="order-1"
+    )
+    call = asyncio.ensure_future(servicer.execute_request(request))
+    await asyncio.sleep(0.02)
+    call.cancel()
+    await asyncio.sleep(0.15)
+    assert tool.charges == []
+
+    # Nothing was stored, so the key runs again
+    response = await servicer.execute_request(request)
+    assert response.structured_result.content == "charge 1"
+
+
+@pytest.mark.asyncio
+async def test_hedged_calls_run_once_with_generated_keys(served: Any) -> None:
+    tool = ChargeTool()
+    _, host, port = await served(tool)
+    client = ToolServiceClient(
+        host, port, pool=ChannelPool(), idempotency_keys=True,
+        hedging=HedgingPolicy(tools=frozenset({"charge"}), delay=0.02)
+    )
+    result, error = await client.execute("charge", {"amount": 5, "delay": 0.1})
+    assert error is None and result is not None
+    assert tool.charges == [5]
+
+    # Each logical call gets its own key
+    await client.execute("charge", {"amount": 7})
+    assert tool.charges == [5, 7]
+
+
+def test_memory_store_expires_and_evicts() -> None:
+    store = MemoryIdempotencyStore(ttl=0.05, maxsize=2)
+    store.set("a", b"1")
+    store.set("b", b"2")
+    store.set("c", b"3")
+    assert store.get("a") is None and store.get("c") == b"3"
+    assert len(store) == 2
+    time.sleep(0.06)
+    assert store.get("b") is None and store.get("c") is None
+
+
+def test_sqlite_store_persists_and_expires(tmp_path: Path) -> None:
+    path = tmp_path / "idempotency.sqlite3"
+    store = SqliteIdempotencyStore(path, ttl=0.1)
+    store.set("a", b"1")
+    store.close()
+
+    reopened = SqliteIdempotencyStore(path, ttl=0.1, maxsize=2)
+    assert reopened.get("a") == b"1"
+    time.sleep(0.11)
+    assert reopened.get("a") is None
+
+    reopened.ttl = 60
+    for key in "bcde":
+        reopened.set(key, key.encode())
+    assert reopened.sweep() == 3
+    assert reopened.get("d") == b"d" and reopened.get("b") is None
+    reopened.close()
+
+
+class ThreadRecordingStore(SqliteIdempotencyStore):
+    def __init__(self, path: Path) -> None:
+        super().__init__(path)
+        self.threads: List[int] = []
+
+    def get(self, key: str) -> Optional[bytes]:
+        self.threads.append(threading.get_ident())
+        return super().get(key)
+
+    def set(self, key: str, value: bytes) -> None:
+        self.threads.append(threading.get_ident())
+        super().set(key, value)
+
+
+@pytest.mark.asyncio
+async def test_sqlite_store_is_used_off_the_event_loop(tmp_path: Path) -> None:
+    store = ThreadRecordingStore(tmp_path / "idempotency.sqlite3")
+    request = tool_service_pb2.ExecuteRequest(tool_name="charge", json_data='{"amount": 5}', idempotency_key="order-1")
+    servicer = ToolServicer({"charge": ChargeTool()}, idempotency=IdempotencyCache(store))
+    await servicer.execute_request(request)
+    await servicer.execute_request(request)
+    assert len(store.threads) == 3
+    assert threading.get_ident() not in store.threads
+    store.close()
+
+
+@pytest.mark.asyncio
+async def test_stored_responses_survive_a_restart(tmp_path: Path) -> None:
+    path = tmp_path / "idempotency.sqlite3"
+    tool = ChargeTool()
+    request = tool_service_pb2.ExecuteRequest(tool_name="charge", json_data='{"amount": 5}', idempotency_key="order-1")
+    cache = IdempotencyCache(SqliteIdempotencyStore(path))
+    await ToolServicer({"charge": tool}, idempotency=cache).execute_request(request)
+    cache.close()
+
+    restarted = ToolServicer({"charge": tool}, idempotency=IdempotencyCache(SqliteIdempotencyStore(path)))
+    response = await restarted.execute_request(request)
+    assert response.structured_result.content == "charge 1"
+    assert tool.charges == [5]
+    restarted.idempotency.close()
@@ -0,0 +1,285 @@
+import os
+import signal
+import socket
+import asyncio
+from pathlib import Path
+from typing import Any, AsyncIterator, List, Optional, Tuple
+
+import grpc
+import pytest
+import pytest_asyncio
+from pydantic import BaseModel
+
+from wabee.rpc.channels import ChannelPool
+from wabee.rpc.client import ToolServiceClient
+from wabee.rpc.jobs import CANCELLED, FAILED, QUEUED, RUNNING, SUCCEEDED, JobManager, JobNotFoundError, JobQueueFullError
+from wabee.rpc.protos import tool_service_pb2, tool_service_pb2_grpc
+from wabee.rpc.server import ToolServicer, serve
+from wabee.tools.base_tool import BaseTool
+from wabee.tools.tool_error import ToolError, ToolErrorType
+
+
+class Work(BaseModel):
+    name: str
+    delay: float = 0.0
+    fail: bool = False
+
+
+class WorkTool(BaseTool):
+    args_schema = Work
+
+    def __init__(self) -> None:
+        super().__init__(name="work")
+        self.started: List[str] = []
+        self.finished: List[str] = []
+        self.cancelled: List[str] = []
+
+    async def execute(self, input_data: Work) -> Tuple[Any, Optional[ToolError]]:
+        self.started.append(input_data.name)
+        try:
+            await asyncio.sleep(input_data.delay)
+        except asyncio.CancelledError:
+            self.cancelled.append(input_data.name)
+            raise
+        self.finished.append(input_data.name)
+        if input_data.fail:
+            return None, ToolError(type=ToolErrorType.PERMANENT, message=f"{input_data.name} failed")
+        return {"variable_name": "work", "content": input_data.name}, None
+
+
+@pytest_asyncio.fixture
+async def served(tmp_path: Path) -> AsyncIterator[Any]:
+    servers: List[Tuple[grpc.aio.Server, ToolServicer]] = []
+
+    async def start(workers: int = 4, max_queued: int = 1000) -> Tuple[WorkTool, ToolServiceClient]:
+        tool = WorkTool()
+        servicer = ToolServicer({"work": tool})
+        servicer.jobs.path = tmp_path / f"jobs-{len(servers)}.sqlite3"
+        servicer.jobs.workers = workers
+        servicer.jobs.max_queued = max_queued
+        server = grpc.aio.server()
+        tool_service_pb2_grpc.add_ToolServiceServicer_to_server(servicer, server)
+        port = server.add_insecure_port("127.0.0.1:0")
+        await server.start()
+        servers.append((server, servicer))
+        return tool, ToolServiceClient("127.0.0.1", port, pool=ChannelPool())
+
+    yield start
+    for server, servicer in servers:
+        await server.stop(grace=None)
+        await servicer.jobs.stop()
+
+
+def execute_request(name: str, delay: float = 0.0) -> tool_service_pb2.ExecuteRequest:
+    return tool_service_pb2.ExecuteRequest(tool_name="work", json_data=f'{{"name": "{name}", "delay": {delay}}}')
+
+
+async def wait_for_state(manager: JobManager, job_id: str, state: str) -> None:
+    while (await manager.get(job_id)).state != state:
+        await asyncio.sleep(0.01)
+
+
+@pytest.mark.asyncio
+async def test_submit_and_wait(served: Any) -> None:
+    tool, client = await served()
+    job, error = await client.submit_job("work", {"name": "a", "delay": 0.05})
+    assert error is None and job is not None
+    assert job.state == QUEUED and job.tool_name == "work" and not job.done
+
+    result, error = await client.wait_job(job.job_id)
+    assert error is None and result is not None and result.content == "a"
+
+    job, error = await client.get_job(job.job_id)
+    assert error is None and job is not None
+    assert job.state == SUCCEEDED and job.result.content == "a"
+    assert job.submitted_at <= job.started_at <= job.finished_at
+
+
+@pytest.mark.asyncio
+async def test_watch_follows_states(served: Any) -> None:
+    tool, client = await served(workers=1)
+    first, _ = await client.submit_job("work", {"name": "first", "delay": 0.1})
+    second, _ = await client.submit_job("work", {"name": "second"})
+    assert first is not None and second is not None
+
+    states = [job.state async for job in client.watch_job(second.job_id)]
+    assert states == [QUEUED, RUNNING, SUCCEEDED]
+    assert tool.finished == ["first", "second"]
+
+
+@pytest.mark.asyncio
+async def test_failed_jobs_report_their_error(served: Any) -> None:
+    tool, client = await served()
+    job, _ = await client.submit_job("work", {"name": "bad", "fail": True})
+    assert job is not None
+    result, error = await client.wait_job(job.job_id)
+    assert result is None and error is not None
+    assert error['type'] == str(ToolErrorType.PERMANENT)
+
+    job, _ = await client.get_job(job.job_id)
+    assert job is not None and job.state == FAILED
+
+
+@pytest.mark.asyncio
+async def test_cancel_running_and_queued_jobs(served: Any) -> None:
+    tool, client = await served(workers=1)
+    running, _ = await client.submit_job("work", {"name": "running", "delay": 10})
+    queued, _ = await client.submit_job("work", {"name": "queued"})
+    assert running is not None and queued is not None
+
+    job, error = await client.cancel_job(queued.job_id)
+    assert error is None and job is not None and job.state == CANCELLED
+    assert job.error is not None and job.error['type'] == 'CANCELLED'
+
+    while "running" not in tool.started:
+        await asyncio.sleep(0.01)
+    job, error = await client.cancel_job(running.job_id)
+    assert error is None and job is not None and job.state == CANCELLED
+    assert tool.cancelled == ["running"]
+
+    _, error = await client.wait_job(queued.job_id)
+    assert error is not None and error['type'] == 'CANCELLED'
+    assert "queued" not in tool.started
+
+
+@pytest.mark.asyncio
+async def test_queue_is_bounded(served: Any) -> None:
+    tool, client = await served(workers=1, max_queued=1)
+    running, _ = await client.submit_job("work", {"name": "running", "delay": 10})
+    assert running is not None
+    while "running" not in tool.started:
+        await asyncio.sleep(0.01)
+    queued, error = await client.submit_job("work", {"name": "queued"})
+    assert error is None and queued is not None
+
+    job, error = await client.submit_job("work", {"name": "rejected"})
+    assert job is None and error is not None
+    assert error['type'] == 'RPC_ERROR' and 'RESOURCE_EXHAUSTED' in error['message']
+    await client.cancel_job(running.job_id)
+
+
+@pytest.mark.asyncio
+async def test_unknown_jobs_and_tools(served: Any) -> None:
+    _, client = await served()
+    job, error = await client.get_job("missing")
+    assert job is None and error is not None and 'NOT_FOUND' in error['message']
+
+    result, error = await client.wait_job("missing")
+    assert result is None and error is not None and 'NOT_FOUND' in error['message']
+
+    job, error = await client.submit_job("nope", {})
+    assert job is None and error is not None and 'NOT_FOUND' in error['message']
+
+
+@pytest.mark.asyncio
+async def test_malformed_input_fails_the_job(served: Any) -> None:
+    _, client = await served()
+    # Input the server can't decode is queued, and fails when the job runs
+    bad = tool_service_pb2.ExecuteRequest(tool_name="work", proto_data=b"not json")
+    job = await client.stub.SubmitJob(bad)
+    result, error = await client.wait_job(job.job_id)
+    assert result is None and error is not None
+    assert error['type'] == 'RPC_ERROR' and 'INVALID_ARGUMENT' in error['message']
+
+
+@pytest.mark.asyncio
+async def test_jobs_survive_a_restart(tmp_path: Path) -> None:
+    path = tmp_path / "jobs.sqlite3"
+    tool = WorkTool()
+    manager = JobManager(ToolServicer({"work": tool}), path=path, workers=1)
+    done = await manager.submit(execute_request("done"))
+    await wait_for_state(manager, done.job_id, SUCCEEDED)
+    interrupted = await manager.submit(execute_request("interrupted", delay=0.3))
+    waiting = await manager.submit(execute_request("waiting"))
+    await wait_for_state(manager, interrupted.job_id, RUNNING)
+    await manager.stop()
+    assert tool.cancelled == ["interrupted"]
+
+    restarted_tool = WorkTool()
+    restarted = JobManager(ToolServicer({"work": restarted_tool}), path=path, workers=1)
+    assert (await restarted.get(done.job_id)).response.structured_result.content == "done"
+    await wait_for_state(restarted, waiting.job_id, SUCCEEDED)
+    # The interrupted job runs again, before the jobs queued after it
+    assert restarted_tool.started == ["interrupted", "waiting"]
+    assert (await restarted.get(interrupted.job_id)).state == SUCCEEDED
+    await restarted.stop()
+
+
+@pytest.mark.asyncio
+async def test_finished_jobs_expire(tmp_path: Path) -> None:
+    path = tmp_path / "jobs.sqlite3"
+    manager = JobManager(ToolServicer({"work": WorkTool()}), path=path)
+    job = await manager.submit(execute_request("a"))
+    await wait_for_state(manager, job.job_id, SUCCEEDED)
+    await manager.stop()
+
+    restarted = JobManager(ToolServicer({"work": WorkTool()}), path=path, retention=0)
+    with pytest.raises(JobNotFoundError):
+        await restarted.get(job.job_id)
+    await restarted.stop()
+
+
+@pytest.mark.asyncio
+async def test_finished_jobs_expire_while_running() -> None:
+    manager = JobManager(ToolServicer({"work": WorkTool()}), path=None, retention=0.1)
+    job = await manager.submit(execute_request("a"))
+    await wait_for_state(manager, job.job_id, SUCCEEDED)
+    queued = await manager.submit(execute_request("b", delay=10))
+
+    await asyncio.sleep(0.3)
+    with pytest.raises(JobNotFoundError):
+        await manager.get(job.job_id)
+    # Unfinished jobs are kept however old
+    assert (await manager.get(queued.job_id)).state == RUNNING
+    await manager.stop()
+
+
+@pytest.mark.asyncio
+async def test_submit_rejects_when_full() -> None:
+    manager = JobManager(ToolServicer({"work": WorkTool()}), path=None, workers=1, max_queued=0)
+    with pytest.raises(JobQueueFullError):
+        await manager.submit(execute_request("a"))
+    await manager.stop()
+
+
+@pytest.mark.asyncio
+async def test_watching_unknown_jobs_leaves_nothing_behind() -> None:
+    manager = JobManager(ToolServicer({"work": WorkTool()}), path=None)
+    with pytest.raises(JobNotFoundError):
+        async for _ in manager.watch("missing"):
+            pass
+    job = await manager.submit(execute_request("a"))
+    assert [update.state async for update in manager.watch(job.job_id)][-1] == SUCCEEDED
+    assert manager._changed == {}
+    await manager.stop()
+
+
+@pytest.mark.asyncio
+async def test_server_starts_the_job_queue_on_first_use(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.chdir(tmp_path)
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+        sock.bind(("127.0.0.1", 0))
+        port = sock.getsockname()[1]
+
+    server = asyncio.create_task(serve({"work": WorkTool()}, port=port))
+    client = ToolServiceClient("127.0.0.1", port, pool=ChannelPool())
+    for _ in range(100):
+        result, _ = await client.execute("work", {"name": "plain"})
+        if result is not None:
+            break
+        await asyncio.sleep(0.05)
+    # Plain calls don't open the job store
+    assert not (tmp_path / ".wabee").exists()
+
+    job, _ = await client.submit_job("work", {"name": "queued"})
+    assert job is not None
+    result, error = await client.wait_job(job.job_id)
+    assert error is None and result is not None and result.content == "queued"
+    assert (tmp_path / ".wabee" / "jobs.sqlite3").exists()
+    await client.close()
+
+    os.kill(os.getpid(), signal.SIGTERM)
+    await asyncio.wait_for(server, timeout=5)
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGTERM, signal.SIGINT):
+        loop.remove_signal_handler(sig)
@@ -0,0 +1,123 @@
+import os
+import signal
+import socket
+import asyncio
+from typing import Any, List, Optional
+
+import grpc
+import pytest
+
+from wabee.rpc.server import serve, start_tools, stop_tools
+from wabee.rpc.protos import tool_service_pb2
+from wabee.rpc.protos import tool_service_pb2_grpc
+from wabee.tools.base_model import StructuredToolResponse
+from wabee.tools.base_tool import BaseTool
+from wabee.tools.resources import ResourceRegistry
+from wabee.tools.simple_tool import simple_tool
+from wabee.tools.tool_error import ToolError
+
+
+class Session:
+    def __init__(self) -> None:
+        self.requests = 0
+        self.closed = False
+
+    async def aclose(self) -> None:
+        self.closed = True
+
+
+class SessionTool(BaseTool):
+    resources = ("session",)
+
+    def __init__(self, name: str, events: List[str], fail_startup: bool = False) -> None:
+        super().__init__(name=name)
+        self.events = events
+        self.fail_startup = fail_startup
+        self.session: Optional[Session] = None
+
+    async def on_startup(self) -> None:
+        if self.fail_startup:
+            raise RuntimeError("model not found")
+        self.events.append(f"start {self.name}")
+
+    async def on_shutdown(self) -> None:
+        self.events.append(f"stop {self.name}")
+
+    async def execute(self, input_data: Any) -> tuple[Optional[StructuredToolResponse], Optional[ToolError]]:
+        assert self.session is not None
+        self.session.requests += 1
+        return StructuredToolResponse(variable_name="requests", content=str(self.session.requests)), None
+
+
+@simple_tool()
+async def echo(text: str) -> str:
+    return text
+
+
+def session_registry() -> ResourceRegistry:
+    registry = ResourceRegistry()
+    registry.register("session", Session)
+    return registry
+
+
+@pytest.mark.asyncio
+async def test_tools_share_resources_and_stop_in_reverse_order() -> None:
+    events: List[str] = []
+    registry = session_registry()
+    first, second = SessionTool("first", events), SessionTool("second", events)
+    tools = {"first": first, "second": second, "alias": first, "echo": echo}
+
+    await start_tools(tools, registry)
+    session = first.session
+    assert session is not None and second.session is session
+
+    await stop_tools(tools, registry)
+    assert events == ["start first", "start second", "stop second", "stop first"]
+    assert session.closed
+
+
+@pytest.mark.asyncio
+async def test_failed_startup_rolls_back_started_tools() -> None:
+    events: List[str] = []
+    registry = session_registry()
+    first = SessionTool("first", events)
+    tools = {"first": first, "broken": SessionTool("broken", events, fail_startup=True)}
+
+    with pytest.raises(RuntimeError, match="model not found"):
+        await start_tools(tools, registry)
+
+    assert events == ["start first", "stop first"]
+    assert first.session is not None and first.session.closed
+
+
+def _free_port() -> int:
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+@pytest.mark.asyncio
+async def test_serve_runs_hooks_around_server_lifetime() -> None:
+    events: List[str] = []
+    registry = session_registry()
+    tool = SessionTool("counter", events)
+    port = _free_port()
+
+    server = asyncio.create_task(serve({"counter": tool}, port=port, resources=registry))
+    async with grpc.aio.insecure_channel(f"127.0.0.1:{port}") as channel:
+        await asyncio.wait_for(channel.channel_ready(), timeout=5)
+        stub = tool_service_pb2_grpc.ToolServiceStub(channel)
+        for expected in ("1", "2"):
+            response = await stub.Execute(tool_service_pb2.ExecuteRequest(tool_name="counter", json_data="{}"))
+            assert response.structured_result.content == expected
+
+    assert events == ["start counter"]
+    session = tool.session
+    os.kill(os.getpid(), signal.SIGTERM)
+    await asyncio.wait_for(server, timeout=5)
+
+    assert events == ["start counter", "stop counter"]
+    assert session is not None and session.closed
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGTERM, signal.SIGINT):
+        loop.remove_signal_handler(sig)
@@ -0,0 +1,169 @@
+import asyncio
+from collections import Counter
+from typing import Any, AsyncIterator, Callable, Awaitable, List, Optional
+
+import grpc
+import pytest
+import pytest_asyncio
+
+from wabee.rpc.balancer import LEAST_OUTSTANDING, LoadBalancer
+from wabee.rpc.channels import ChannelPool
+from wabee.rpc.client import ToolServiceClient
+from wabee.rpc.pipeline import Step
+from wabee.rpc.protos import tool_service_pb2_grpc
+from wabee.rpc.server import ToolServicer
+from wabee.tools.base_tool import BaseTool
+from wabee.tools.tool_error import ToolError, ToolErrorType
+
+# Reconnect quickly so a restarted replica is picked up within the test
+FAST_RECONNECT = [("grpc.initial_reconnect_backoff_ms", 20), ("grpc.max_reconnect_backoff_ms", 50)]
+
+
+class WhoAmITool(BaseTool):
+    """Answers with the replica's name, carried in the error message"""
+
+    async def execute(self, input_data: Any) -> tuple[Optional[str], Optional[ToolError]]:
+        return None, ToolError(type=ToolErrorType.PERMANENT, message=self.name)
+
+
+async def start_replica(name: str, port: int = 0) -> tuple[grpc.aio.Server, int]:
+    server = grpc.aio.server()
+    tool_service_pb2_grpc.add_ToolServiceServicer_to_server(
+        ToolServicer({"whoami": WhoAmITool(name=name)}), server
+    )
+    bound = server.add_insecure_port(f"127.0.0.1:{port}")
+    await server.start()
+    return server, bound
+
+
+@pytest_asyncio.fixture
+async def replicas() -> AsyncIterator[Callable[[int], Awaitable[List[int]]]]:
+    servers: List[grpc.aio.Server] = []
+
+    async def start(count: int) -> List[int]:
+        ports = []
+        for i in range(count):
+            server, port = await start_replica(f"replica-{i}")
+            servers.append(server)
+            ports.append(port)
+        return ports
+
+    yield start
+    for server in servers:
+        await server.stop(grace=None)
+
+
+async def whoami(client: ToolServiceClient, calls: int) -> Counter:
+    answers: Counter = Counter()
+    for _ in range(calls):
+        _, error = await client.execute("whoami", {})
+        assert error is not None
+        answers[error["message"] if error["type"] != "RPC_ERROR" else "RPC_ERROR"] += 1
+    return answers
+
+
+@pytest.mark.asyncio
+async def test_round_robin_spreads_calls_over_replicas(replicas: Any) -> None:
+    ports = await replicas(3)
+    pool = ChannelPool()
+    client = ToolServiceClient(endpoints=[f"127.0.0.1:{port}" for port in ports], pool=pool)
+
+    answers = await whoami(client, 9)
+
+    assert answers == {"replica-0": 3, "replica-1": 3, "replica-2": 3}
+    await client.close()
+    await pool.close()
+
+
+@pytest.mark.asyncio
+async def test_failed_replica_is_ejected_and_comes_back(replicas: Any) -> None:
+    ports = await replicas(1)
+    down, down_port = await start_replica("flaky")
+    balancer = LoadBalancer(
+        [f"127.0.0.1:{ports[0]}", f"127.0.0.1:{down_port}"],
+        failure_threshold=2,
+        base_ejection_seconds=0.3
+    )
+    pool = ChannelPool()
+    client = ToolServiceClient(balancer=balancer, pool=pool, options=FAST_RECONNECT)
+    assert set(await whoami(client, 2)) == {"replica-0", "flaky"}
+
+    await down.stop(grace=None)
+    answers = await whoami(client, 8)
+    # Two failures eject the replica, after which every call goes to the healthy one
+    assert answers["RPC_ERROR"] == 2 and answers["replica-0"] == 6
+    assert balancer.endpoints[1].is_ejected()
+
+    restarted, _ = await start_replica("flaky", down_port)
+    try:
+        await asyncio.sleep(0.4)
+        answers = await whoami(client, 4)
+        assert answers["flaky"] >= 1
+        assert balancer.endpoints[1].ejections == 0
+    finally:
+        await client.close()
+        await pool.close()
+        await restarted.stop(grace=None)
+
+
+def test_least_outstanding_prefers_idle_replicas() -> None:
+    balancer = LoadBalancer(["a:1", "b:1", "c:1"], policy=LEAST_OUTSTANDING)
+    busy = balancer.pick()
+    balancer.begin(busy)
+    balancer.begin(busy)
+    second = balancer.pick()
+    balancer.begin(second)
+
+    assert balancer.pick().target not in {busy.target, second.target}
+
+    balancer.succeeded(busy)
+    balancer.succeeded(busy)
+    assert balancer.pick().target in {busy.target} | ({"a:1", "b:1", "c:1"} - {busy.target, second.target})
+
+
+@pytest.mark.asyncio
+async def test_dns_name_resolves_to_endpoints(replicas: Any) -> None:
+    ports = await replicas(1)
+    balancer = LoadBalancer.from_dns("localhost", ports[0])
+
+    endpoint = await balancer.choose()
+
+    assert endpoint.target.endswith(f":{ports[0]}")
+    assert f"127.0.0.1:{ports[0]}" in {e.target for e in balancer.endpoints}
+
+
+@pytest.mark.asyncio
+async def test_pipelines_are_balanced_and_counted(replicas: Any) -> None:
+    ports = await replicas(2)
+    balancer = LoadBalancer([f"127.0.0.1:{port}" for port in ports])
+    pool = ChannelPool()
+    client = ToolServiceClient(balancer=balancer, pool=pool)
+
+    answers: Counter = Counter()
+    for _ in range(4):
+        results, error = await client.execute_pipeline([Step("who", "whoami")])
+        assert error is None and results is not None
+        step_error = results["who"].error
+        assert step_error is not None
+        answers[step_error["message"]] += 1
+
+    assert answers == {"replica-0": 2, "replica-1": 2}
+    assert [endpoint.requests for endpoint in balancer.endpoints] == [2, 2]
+    assert all(endpoint.outstanding == 0 for endpoint in balancer.endpoints)
+    await client.close()
+    await pool.close()
+
+
+@pytest.mark.asyncio
+async def test_calls_without_endpoints_return_an_error() -> None:
+    balancer = LoadBalancer(["127.0.0.1:1"])
+    balancer.endpoints = []
+    client = ToolServiceClient(balancer=balancer, pool=ChannelPool())
+
+    _, error = await client.execute("whoami", {})
+    assert error is not None and error["type"] == "NO_ENDPOINTS"
+    _, error = await client.execute_pipeline([Step("who", "whoami")])
+    assert error is not None and error["type"] == "NO_ENDPOINTS"
+    _, error = await client.submit_job("whoami", {})
+    assert error is not None and error["type"] == "NO_ENDPOINTS"
+    await client.close()
@@ -0,0 +1,94 @@
+import sys
+import logging
+from pathlib import Path
+from typing import Iterator
+
+import pytest
+
+from wabee.rpc.loader import ToolConfig, ToolLoader
+from wabee.rpc.profiling import ImportProfiler
+
+TOOL_SOURCE = '''
+import time
+import slow_dependency
+from wabee.tools.base_tool import BaseTool
+
+class ProfiledTool(BaseTool):
+    async def execute(self, input_data):
+        return None, None
+
+    @classmethod
+    def create(cls, **kwargs):
+        time.sleep(0.03)
+        return cls(name="Profiled", **kwargs)
+'''
+
+DEPENDENCY_SOURCE = '''
+import time
+import slow_nested_dependency
+time.sleep(0.05)
+'''
+
+NESTED_DEPENDENCY_SOURCE = '''
+import time
+time.sleep(0.02)
+'''
+
+
+@pytest.fixture
+def tool_path(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Iterator[Path]:
+    (tmp_path / "profiled_tool.py").write_text(TOOL_SOURCE)
+    (tmp_path / "slow_dependency.py").write_text(DEPENDENCY_SOURCE)
+    (tmp_path / "slow_nested_dependency.py").write_text(NESTED_DEPENDENCY_SOURCE)
+    monkeypatch.syspath_prepend(str(tmp_path))
+    yield tmp_path
+    for module in ("profiled_tool", "slow_dependency", "slow_nested_dependency"):
+        sys.modules.pop(module, None)
+
+
+def test_load_tool_records_timing_breakdown(tool_path: Path) -> None:
+    tool = ToolLoader.load_tool(ToolConfig(module_name="profiled_tool", tool_name="ProfiledTool"))
+    profile = ToolLoader.profiles["ProfiledTool"]
+
+    assert tool.name == "Profiled"
+    assert profile.import_seconds >= 0.07
+    assert profile.construct_seconds >= 0.03
+    assert profile.lookup_seconds < profile.import_seconds
+
+    timings = {timing.module: timing for timing in profile.imports}
+    assert set(timings) >= {"profiled_tool", "slow_dependency", "slow_nested_dependency"}
+    # Self time excludes nested imports, cumulative time includes them
+    assert 0.05 <= timings["slow_dependency"].self_seconds < 0.07
+    assert timings["slow_dependency"].cumulative_seconds >= 0.07
+    assert timings["profiled_tool"].cumulative_seconds >= 0.07
+    assert profile.slowest_imports(1)[0].module == "slow_dependency"
+
+    metrics = profile.as_dict()
+    assert metrics["tool_name"] == "ProfiledTool"
+    assert metrics["slowest_imports"][0]["module"] == "slow_dependency"
+
+
+def test_import_report_is_logged_when_enabled(
+    tool_path: Path,
+    monkeypatch: pytest.MonkeyPatch,
+    caplog: pytest.LogCaptureFixture
+) -> None:
+    monkeypatch.setenv("WABEE_IMPORT_REPORT", "2")
+    with caplog.at_level(logging.INFO, logger="wabee.rpc.loader"):
+        ToolLoader.load_tool(ToolConfig(module_name="profiled_tool", tool_name="ProfiledTool"))
+
+    structured = [record for record in caplog.records if hasattr(record, "startup_profile")]
+    assert structured and structured[0].startup_profile["tool_name"] == "ProfiledTool"
+
+    report = next(record.message for record in caplog.records if record.message.startswith("Startup profile"))
+    lines = report.splitlines()
+    assert len(lines) == 4
+    assert lines[2].endswith("slow_dependency")
+
+
+def test_profiler_is_removed_from_meta_path(tool_path: Path) -> None:
+    with ImportProfiler() as profiler:
+        import slow_nested_dependency  # noqa: F401
+    assert [timing.module for timing in profiler.imports] == ["slow_nested_dependency"]
+    assert not any(type(finder).__name__ == "_ProfilingFinder" for finder in sys.meta_path)
+    assert type(sys.modules["slow_nested_dependency"].__loader__).__name__ != "_TimingLoader"
@@ -0,0 +1,140 @@
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
+
+import grpc
+import pytest
+import pytest_asyncio
+from pydantic import BaseModel
+
+from wabee.rpc.channels import ChannelPool
+from wabee.rpc.client import ToolServiceClient, create_client
+from wabee.rpc.local import LocalToolClient
+from wabee.rpc.protos import tool_service_pb2_grpc
+from wabee.rpc.server import ToolServicer
+from wabee.tools.base_model import StructuredToolResponse
+from wabee.tools.base_tool import BaseTool
+from wabee.tools.simple_tool import simple_tool
+from wabee.tools.tool_error import ToolError, ToolErrorType
+
+
+class Query(BaseModel):
+    text: str
+    limit: int = 10
+
+
+class SearchTool(BaseTool):
+    args_schema = Query
+
+    def __init__(self) -> None:
+        super().__init__(name="search")
+        self.last: Optional[StructuredToolResponse] = None
+
+    async def execute(self, input_data: Query) -> Tuple[Any, Optional[ToolError]]:
+        if input_data.text == "boom":
+            return None, ToolError(type=ToolErrorType.PERMANENT, message="exploded")
+        self.last = StructuredToolResponse(
+            variable_name="hits",
+            content=f"{input_data.text}:{input_data.limit}",
+            metadata={"source": "index"},
+        )
+        return self.last, None
+
+
+@simple_tool()
+async def add(x: int, y: int) -> int:
+    return x + y
+
+
+@pytest_asyncio.fixture
+async def clients() -> AsyncIterator[Tuple[LocalToolClient, ToolServiceClient, SearchTool]]:
+    search = SearchTool()
+    tools: Dict[str, Any] = {"search": search, "add": add}
+    server = grpc.aio.server()
+    tool_service_pb2_grpc.add_ToolServiceServicer_to_server(ToolServicer(tools), server)
+    port = server.add_insecure_port("127.0.0.1:0")
+    await server.start()
+    remote = ToolServiceClient("127.0.0.1", port, pool=ChannelPool())
+    yield LocalToolClient(tools), remote, search
+    await remote.close()
+    await server.stop(grace=None)
+
+
+@pytest.mark.parametrize("tool_name, input_data", [
+    ("search", {"text": "cats", "limit": "3"}),
+    ("search", {"limit": "many"}),
+    ("search", {"text": "boom"}),
+    ("add", {"x": 1, "y": 2}),
+    ("add", {"x": "one", "y": 2}),
+])
+@pytest.mark.asyncio
+async def test_local_and_remote_results_match(clients: Any, tool_name: str, input_data: Dict[str, Any]) -> None:
+    local, remote, _ = clients
+    assert await local.execute(tool_name, input_data) == await remote.execute(tool_name, input_data)
+
+
+@pytest.mark.asyncio
+async def test_local_schema_and_unknown_tools_match(clients: Any) -> None:
+    local, remote, _ = clients
+    assert await local.get_tool_schema("search") == await remote.get_tool_schema("search")
+
+    local_result, local_error = await local.execute("missing", {})
+    remote_result, remote_error = await remote.execute("missing", {})
+    assert local_result is remote_result is None
+    assert local_error["type"] == remote_error["type"] == "RPC_ERROR"
+    assert local_error["message"] in remote_error["message"]
+    assert "error" in await local.get_tool_schema("missing")
+
+
+@pytest.mark.asyncio
+async def test_local_results_are_not_copied(clients: Any) -> None:
+    local, _, search = clients
+    result, _ = await local.execute("search", {"text": "dogs"})
+    assert result is search.last
+
+
+@pytest.mark.asyncio
+async def test_transport_is_chosen_by_configuration(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setenv("WABEE_TOOL_TRANSPORT", "local")
+    client = create_client({"add": add})
+    assert isinstance(client, LocalToolClient)
+    async with client:
+        result, error = await client.execute("add", {"x": 2, "y": 3})
+    assert error is None and result is not None and result.content == "5"
+
+    assert isinstance(create_client({"add": add}, transport="grpc", port=1234), ToolServiceClient)
+    monkeypatch.delenv("WABEE_TOOL_TRANSPORT")
+    assert isinstance(create_client(), ToolServiceClient)
+    with pytest.raises(ValueError):
+        create_client(transport="local")
+    with pytest.raises(TypeError, match="port"):
+        create_client({"add": add}, transport="local", port=1234)
+    with pytest.raises(ValueError):
+        create_client(transport="carrier-pigeon")
+
+
+class ModelTool(BaseTool):
+    def __init__(self) -> None:
+        super().__init__(name="model")
+        self.events: List[str] = []
+
+    async def on_startup(self) -> None:
+        self.events.append("start")
+
+    async def on_shutdown(self) -> None:
+        self.events.append("stop")
+
+    async def execute(self, input_data: Any) -> Tuple[Any, Optional[ToolError]]:
+        return StructuredToolResponse(variable_name="events", content=",".join(self.events)), None
+
+
+@pytest.mark.asyncio
+async def test_local_client_runs_tool_lifecycle() -> None:
+    tool = ModelTool()
+    async with LocalToolClient({"model": tool}) as client:
+        result, _ = await client.execute("model", {})
+        assert result is not None and result.content == "start"
+    assert tool.events == ["start", "stop"]
+
+    # A servicer passed in is started and stopped by its owner
+    async with LocalToolClient(servicer=ToolServicer({"model": tool})):
+        pass
+    assert tool.events == ["start", "stop"]
@@ -0,0 +1,94 @@
+import sys
+import json
+from typing import Iterator
+from pathlib import Path
+
+import pytest
+
+from wabee.cli.tools.build_tool_service import BuildToolService
+from wabee.cli.tools.create_tool_service import CreateToolService
+from wabee.rpc.loader import ToolLoader
+from wabee.rpc.manifest import MANIFEST_FILENAME, fingerprint, load_manifest
+from wabee.rpc.server import ToolServicer
+from wabee.rpc.protos import tool_service_pb2
+
+
+@pytest.fixture
+def tool_dir(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Iterator[Path]:
+    """A freshly generated complete tool with a build-time manifest"""
+    monkeypatch.chdir(tmp_path)
+    CreateToolService().create_tool(
+        name="manifested",
+        tool_type="complete",
+        description="A manifest test tool",
+        version="0.1.0",
+        generate_js=False
+    )
+    directory = tmp_path / "manifested"
+    with open(directory / "toolspec.yaml", "a") as f:
+        f.write("  tool_args:\n    - name: greeting\n      value: hi\n")
+    yield directory
+    sys.modules.pop("manifested_tool", None)
+
+
+def test_manifest_contents(tool_dir: Path) -> None:
+    manifest = BuildToolService()._generate_manifest(tool_dir, "manifested_tool", None)
+
+    assert manifest is not None
+    assert manifest.module_name == "manifested_tool"
+    assert manifest.tool_name == "ManifestedTool"
+    assert manifest.args == {"greeting": "hi"}
+    assert "message" in manifest.json_schema["properties"]
+    assert manifest.proto_descriptor["name"] == "ManifestedToolInput"
+    assert manifest.proto_descriptor["fields"][0]["type"] == "string"
+    assert manifest.schema_fingerprint == fingerprint(manifest.json_schema)
+
+    on_disk = json.loads((tool_dir / MANIFEST_FILENAME).read_text())
+    assert on_disk["schema_fingerprint"] == manifest.schema_fingerprint
+
+
+@pytest.mark.asyncio
+async def test_loader_uses_fresh_manifest_without_parsing_spec(
+    tool_dir: Path,
+    monkeypatch: pytest.MonkeyPatch
+) -> None:
+    BuildToolService()._generate_manifest(tool_dir, "manifested_tool", None)
+    monkeypatch.syspath_prepend(str(tool_dir))
+
+    def fail(*args, **kwargs):
+        raise AssertionError("toolspec.yaml should not be parsed when the manifest is fresh")
+
+    monkeypatch.setattr(ToolLoader, "_read_yaml", staticmethod(fail))
+    tool = ToolLoader.load_from_spec(tool_dir / "toolspec.yaml")
+
+    assert tool.greeting == "hi"
+    assert tool.precompiled_schema == load_manifest(tool_dir / MANIFEST_FILENAME).json_schema
+
+    servicer = ToolServicer({tool.tool_name: tool})
+    response = await servicer.GetToolSchema(
+        tool_service_pb2.GetToolSchemaRequest(tool_name=tool.tool_name),
+        None
+    )
+    assert [field.name for field in response.fields] == ["message"]
+    assert servicer._schema_generator is None
+
+
+def test_stale_manifest_falls_back_to_spec(tool_dir: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    BuildToolService()._generate_manifest(tool_dir, "manifested_tool", None)
+    monkeypatch.syspath_prepend(str(tool_dir))
+
+    with open(tool_dir / "manifested_tool.py", "a") as f:
+        f.write("\n# edited after build\n")
+
+    assert load_manifest(tool_dir / MANIFEST_FILENAME) is None
+    tool = ToolLoader.load_from_spec(tool_dir / "toolspec.yaml")
+    assert tool.tool_name == "Manifested"
+    assert not hasattr(tool, "precompiled_schema")
+
+
+def test_manifest_skipped_when_tool_cannot_be_imported(tool_dir: Path) -> None:
+    with open(tool_dir / "manifested_tool.py", "a") as f:
+        f.write("\nimport a_dependency_missing_on_the_build_host\n")
+
+    assert BuildToolService()._generate_manifest(tool_dir, "manifested_tool", None) is None
+    assert not (tool_dir / MANIFEST_FILENAME).exists()
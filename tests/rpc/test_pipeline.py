@@ -0,0 +1,175 @@
+import asyncio
+import json
+from typing import Any, AsyncIterator, List, Optional, Tuple
+
+import grpc
+import pytest
+import pytest_asyncio
+from pydantic import BaseModel
+
+from wabee.rpc.channels import ChannelPool
+from wabee.rpc.client import ToolServiceClient
+from wabee.rpc.pipeline import Step
+from wabee.rpc.protos import tool_service_pb2_grpc
+from wabee.rpc.server import ToolServicer
+from wabee.tools.base_tool import BaseTool
+from wabee.tools.tool_error import ToolError, ToolErrorType
+
+
+class Search(BaseModel):
+    query: str
+    delay: float = 0.0
+
+
+class SearchTool(BaseTool):
+    args_schema = Search
+
+    def __init__(self) -> None:
+        super().__init__(name="search")
+        self.queries: List[str] = []
+
+    async def execute(self, input_data: Search) -> Tuple[Any, Optional[ToolError]]:
+        self.queries.append(input_data.query)
+        await asyncio.sleep(input_data.delay)
+        if input_data.query == "fail":
+            return None, ToolError(type=ToolErrorType.PERMANENT, message="search failed")
+        items = [{"id": f"{input_data.query}-1"}, {"id": f"{input_data.query}-2"}]
+        return {
+            "variable_name": "hits",
+            "content": json.dumps({"items": items}),
+            "metadata": {"count": len(items)},
+        }, None
+
+
+class Fetch(BaseModel):
+    id: str
+    repeat: int = 1
+
+
+class FetchTool(BaseTool):
+    args_schema = Fetch
+
+    def __init__(self) -> None:
+        super().__init__(name="fetch")
+
+    async def execute(self, input_data: Fetch) -> Tuple[Any, Optional[ToolError]]:
+        return {"variable_name": "page", "content": " ".join([f"page {input_data.id}"] * input_data.repeat)}, None
+
+
+class Join(BaseModel):
+    first: str
+    second: str = ""
+
+
+class JoinTool(BaseTool):
+    args_schema = Join
+
+    def __init__(self) -> None:
+        super().__init__(name="join")
+
+    async def execute(self, input_data: Join) -> Tuple[Any, Optional[ToolError]]:
+        return {"variable_name": "joined", "content": f"{input_data.first} | {input_data.second}"}, None
+
+
+@pytest_asyncio.fixture
+async def served() -> AsyncIterator[Tuple[SearchTool, ToolServiceClient]]:
+    search = SearchTool()
+    server = grpc.aio.server()
+    servicer = ToolServicer({"search": search, "fetch": FetchTool(), "join": JoinTool()})
+    tool_service_pb2_grpc.add_ToolServiceServicer_to_server(servicer, server)
+    port = server.add_insecure_port("127.0.0.1:0")
+    await server.start()
+    yield search, ToolServiceClient("127.0.0.1", port, pool=ChannelPool())
+    await server.stop(grace=None)
+
+
+@pytest.mark.asyncio
+async def test_chain_passes_fields_between_steps(served: Any) -> None:
+    search, client = served
+    results, error = await client.execute_pipeline([
+        Step("search", "search", {"query": "cats"}),
+        Step("fetch", "fetch", inputs={"id": "search.content.items.1.id", "repeat": "search.metadata.count"}),
+        Step("join", "join", {"second": "end"}, inputs={"first": "fetch"}),
+    ])
+    assert error is None and results is not None
+    assert list(results) == ["search", "fetch", "join"]
+    # Only the last step's result leaves the server; metadata kept its int type on the way
+    assert results["join"].result is not None
+    assert results["join"].result.content == "page cats-2 page cats-2 | end"
+    assert results["search"].result is None and results["fetch"].result is None
+    assert all(step.error is None and not step.skipped for step in results.values())
+    assert results["fetch"].started_ms >= results["search"].started_ms + results["search"].duration_ms
+    assert search.queries == ["cats"]
+
+
+@pytest.mark.asyncio
+async def test_independent_steps_run_concurrently(served: Any) -> None:
+    _, client = served
+    results, error = await client.execute_pipeline([
+        Step("a", "search", {"query": "a", "delay": 0.2}),
+        Step("b", "search", {"query": "b", "delay": 0.2}),
+        Step("join", "join", inputs={"first": "a.content.items.0.id", "second": "b.content.items.0.id"}),
+    ])
+    assert error is None and results is not None
+    assert results["join"].result is not None and results["join"].result.content == "a-1 | b-1"
+    assert results["a"].duration_ms >= 200 and results["b"].duration_ms >= 200
+    # Both searches started together, not one after the other
+    assert abs(results["a"].started_ms - results["b"].started_ms) < 100
+    assert results["join"].started_ms < 350
+
+
+@pytest.mark.asyncio
+async def test_failures_skip_dependent_steps(served: Any) -> None:
+    search, client = served
+    results, error = await client.execute_pipeline([
+        Step("bad", "search", {"query": "fail"}),
+        Step("fetch", "fetch", inputs={"id": "bad.content.items.0.id"}),
+        Step("join", "join", inputs={"first": "fetch"}),
+        Step("good", "search", {"query": "ok"}),
+    ])
+    assert error is None and results is not None
+    assert results["bad"].error is not None and results["bad"].error['type'] == str(ToolErrorType.PERMANENT)
+    assert results["fetch"].skipped and results["join"].skipped
+    assert results["good"].result is not None and not results["good"].skipped
+    assert search.queries == ["fail", "ok"]
+
+
+@pytest.mark.asyncio
+async def test_unreadable_fields_fail_the_step(served: Any) -> None:
+    _, client = served
+    results, error = await client.execute_pipeline([
+        Step("search", "search", {"query": "cats"}),
+        Step("fetch", "fetch", inputs={"id": "search.metadata.missing"}),
+    ])
+    assert error is None and results is not None
+    assert results["fetch"].error is not None
+    assert results["fetch"].error['type'] == str(ToolErrorType.INVALID_INPUT)
+    assert "search.metadata.missing" in results["fetch"].error['message']
+
+
+@pytest.mark.asyncio
+async def test_outputs_and_after(served: Any) -> None:
+    search, client = served
+    results, error = await client.execute_pipeline([
+        Step("first", "search", {"query": "first", "delay": 0.05}),
+        Step("second", "search", {"query": "second"}, after=["first"]),
+    ], outputs=["first", "second"])
+    assert error is None and results is not None
+    assert results["first"].result is not None and results["second"].result is not None
+    assert search.queries == ["first", "second"]
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("steps, message", [
+    ([Step("a", "search", inputs={"query": "b"}), Step("b", "search", inputs={"query": "a"})], "cycle"),
+    ([Step("a", "search", inputs={"query": "nope"})], "unknown step"),
+    ([Step("a", "missing")], "not found"),
+    ([Step("a", "search"), Step("a", "search")], "unique"),
+    ([], "no steps"),
+])
+async def test_invalid_pipelines_are_rejected(served: Any, steps: List[Step], message: str) -> None:
+    search, client = served
+    results, error = await client.execute_pipeline(steps)
+    assert results is None and error is not None
+    assert 'INVALID_ARGUMENT' in error['message'] and message in error['message']
+    assert search.queries == []
@@ -0,0 +1,80 @@
+from typing import Any, Optional
+
+import grpc
+import pytest
+
+from wabee.rpc.channels import ChannelPool
+from wabee.rpc.client import ToolServiceClient
+from wabee.rpc.protos import tool_service_pb2, tool_service_pb2_grpc
+from wabee.rpc.results import decode_structured_result, encode_structured_result
+from wabee.rpc.server import ToolServicer
+from wabee.tools.base_model import ImageToolResponse, StructuredToolResponse
+from wabee.tools.base_tool import BaseTool
+from wabee.tools.tool_error import ToolError
+
+FULL = StructuredToolResponse(
+    variable_name="report",
+    content="x" * 1000,
+    local_file_path="/tmp/report.txt",
+    metadata={"source": "db", "pages": 3},
+    memory_push=True,
+    images=[ImageToolResponse(mime_type="image/png", data="aGVsbG8=")],
+    error="partial",
+    is_final_answer=True,
+)
+
+
+class ResultTool(BaseTool):
+    def __init__(self, result: Any) -> None:
+        super().__init__(name="result")
+        self.result = result
+
+    async def execute(self, input_data: Any) -> tuple[Any, Optional[ToolError]]:
+        return self.result, None
+
+
+@pytest.mark.parametrize("trusted", [False, True])
+def test_round_trip_through_the_proto(trusted: bool) -> None:
+    message = tool_service_pb2.StructuredToolResponse()
+    encode_structured_result(FULL, message)
+    decoded = decode_structured_result(message, trusted=trusted)
+
+    # Metadata values travel as strings
+    assert decoded.model_dump() == {**FULL.model_dump(), "metadata": {"source": "db", "pages": "3"}}
+
+
+@pytest.mark.parametrize("trusted", [False, True])
+def test_unset_optional_fields_decode_as_defaults(trusted: bool) -> None:
+    message = tool_service_pb2.StructuredToolResponse()
+    encode_structured_result({"variable_name": "v", "content": "c"}, message)
+    decoded = decode_structured_result(message, trusted=trusted)
+    assert decoded == StructuredToolResponse(variable_name="v", content="c")
+
+
+@pytest.mark.parametrize("result, content", [
+    ("plain text", "plain text"),
+    ([1, 2], "[1, 2]"),
+    (None, ""),
+])
+def test_plain_values_become_content(result: Any, content: str) -> None:
+    message = tool_service_pb2.StructuredToolResponse()
+    encode_structured_result(result, message)
+    assert decode_structured_result(message).content == content
+
+
+@pytest.mark.parametrize("trusted", [False, True])
+@pytest.mark.asyncio
+async def test_client_decodes_structured_results(trusted: bool) -> None:
+    server = grpc.aio.server()
+    tool_service_pb2_grpc.add_ToolServiceServicer_to_server(ToolServicer({"result": ResultTool(FULL)}), server)
+    port = server.add_insecure_port("127.0.0.1:0")
+    await server.start()
+    try:
+        async with ToolServiceClient("127.0.0.1", port, pool=ChannelPool(), trusted=trusted) as client:
+            result, error = await client.execute("result", {})
+    finally:
+        await server.stop(grace=None)
+
+    assert error is None and isinstance(result, StructuredToolResponse)
+    assert result.content == FULL.content and result.is_final_answer
+    assert result.images == FULL.images
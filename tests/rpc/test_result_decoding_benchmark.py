@@ -0,0 +1,52 @@
+import json
+import time
+from typing import Any, Callable
+
+import pytest
+
+from wabee.rpc.protos import tool_service_pb2
+from wabee.rpc.results import decode_structured_result, encode_structured_result
+from wabee.tools.base_model import ImageToolResponse, StructuredToolResponse
+
+ROUNDS = 20
+
+
+def json_decode(response: tool_service_pb2.ExecuteResponse) -> StructuredToolResponse:
+    """The previous client path: a JSON result parsed and splatted into the model"""
+    return StructuredToolResponse(**json.loads(response.json_result))
+
+
+def seconds_per_decode(decode: Callable[[tool_service_pb2.ExecuteResponse], StructuredToolResponse],
+                       response: tool_service_pb2.ExecuteResponse) -> float:
+    start = time.perf_counter()
+    for _ in range(ROUNDS):
+        decode(response)
+    return (time.perf_counter() - start) / ROUNDS
+
+
+# Large content skips a JSON parse and copy; with many small images building the
+# image models dominates
+@pytest.mark.parametrize("content_size, image_count", [(5_000_000, 0), (1_000, 2_000)])
+def test_structured_decoding_cost(content_size: int, image_count: int, record_property: Any) -> None:
+    result = StructuredToolResponse(
+        variable_name="report",
+        content="lorem ipsum " * (content_size // 12),
+        metadata={"rows": "100"},
+        images=[ImageToolResponse(mime_type="image/png", data="aGVsbG8=" * 64) for _ in range(image_count)],
+    )
+    wire = tool_service_pb2.ExecuteResponse(json_result=result.model_dump_json()).SerializeToString()
+    json_response = tool_service_pb2.ExecuteResponse.FromString(wire)
+    structured = tool_service_pb2.ExecuteResponse()
+    encode_structured_result(result, structured.structured_result)
+    structured_response = tool_service_pb2.ExecuteResponse.FromString(structured.SerializeToString())
+
+    before = seconds_per_decode(json_decode, json_response)
+    validated = seconds_per_decode(lambda r: decode_structured_result(r.structured_result), structured_response)
+    trusted = seconds_per_decode(lambda r: decode_structured_result(r.structured_result, trusted=True), structured_response)
+
+    assert decode_structured_result(structured_response.structured_result, trusted=True).content == result.content
+    # Timings swing with machine load, so they are reported with the test (e.g. in
+    # --junitxml output) rather than asserted on
+    record_property("json_decode_us", round(before * 1e6))
+    record_property("structured_decode_us", round(validated * 1e6))
+    record_property("trusted_decode_us", round(trusted * 1e6))
@@ -0,0 +1,199 @@
+import asyncio
+from typing import Any, AsyncIterator, List, Optional, Tuple
+
+import grpc
+import pytest
+import pytest_asyncio
+from pydantic import BaseModel
+
+from wabee.rpc.channels import ChannelPool
+from wabee.rpc.client import ToolServiceClient
+from wabee.rpc.protos import tool_service_pb2, tool_service_pb2_grpc
+from wabee.rpc.result_store import ResultStore
+from wabee.rpc.server import ToolServicer
+from wabee.tools.base_tool import BaseTool
+from wabee.tools.tool_error import ToolError
+
+
+class Document(BaseModel):
+    lines: int
+    text: str = "line"
+
+
+class DocumentTool(BaseTool):
+    args_schema = Document
+
+    def __init__(self) -> None:
+        super().__init__(name="document")
+
+    async def execute(self, input_data: Document) -> Tuple[Any, Optional[ToolError]]:
+        content = "".join(f"{input_data.text} {i}\n" for i in range(input_data.lines))
+        return {"variable_name": "doc", "content": content, "metadata": {"lines": input_data.lines}}, None
+
+
+def document(lines: int, text: str = "line") -> str:
+    return "".join(f"{text} {i}\n" for i in range(lines))
+
+
+@pytest_asyncio.fixture
+async def served() -> AsyncIterator[Any]:
+    servers: List[grpc.aio.Server] = []
+
+    async def start(store: Optional[ResultStore] = None, **client_kwargs: Any) -> ToolServiceClient:
+        servicer = ToolServicer({"document": DocumentTool()}, result_store=store)
+        server = grpc.aio.server()
+        tool_service_pb2_grpc.add_ToolServiceServicer_to_server(servicer, server)
+        port = server.add_insecure_port("127.0.0.1:0")
+        await server.start()
+        servers.append(server)
+        return ToolServiceClient("127.0.0.1", port, pool=ChannelPool(), **client_kwargs)
+
+    yield start
+    for server in servers:
+        await server.stop(grace=None)
+
+
+@pytest.mark.asyncio
+async def test_large_content_is_paged(served: Any) -> None:
+    client = await served(ResultStore(threshold=1000, page_size=100), paginate_results=True)
+    full = document(200)
+    result, error = await client.execute("document", {"lines": 200})
+    assert error is None and result is not None
+    handle = result.result_handle
+    assert handle is not None
+    assert result.content == full[:100] and result.metadata == {"lines": "200"}
+    assert (handle.total_bytes, handle.total_lines, handle.page_bytes) == (len(full), 200, 100)
+
+    content, error = await client.read_content(result)
+    assert error is None and content == full
+
+    chunk, error = await client.read_result(handle.handle_id, offset=100, limit=50)
+    assert error is None and chunk is not None
+    assert chunk.data == full[100:150].encode() and chunk.next_offset == 150 and not chunk.eof
+
+
+@pytest.mark.asyncio
+async def test_line_ranges(served: Any) -> None:
+    client = await served(ResultStore(threshold=1000, page_size=100, read_max_bytes=40), paginate_results=True)
+    result, _ = await client.execute("document", {"lines": 200})
+    assert result is not None and result.result_handle is not None
+    handle_id = result.result_handle.handle_id
+
+    chunk, error = await client.read_result(handle_id, offset=2, limit=3, lines=True)
+    assert error is None and chunk is not None
+    assert chunk.data == b"line 2\nline 3\nline 4\n" and chunk.next_offset == 5
+
+    # Without a limit, as many whole lines as fit in one read
+    chunk, _ = await client.read_result(handle_id, offset=10, lines=True)
+    assert chunk is not None and chunk.data == b"line 10\nline 11\nline 12\nline 13\nline 14\n"
+    assert chunk.next_offset == 15
+
+    chunk, _ = await client.read_result(handle_id, offset=198, limit=10, lines=True)
+    assert chunk is not None and chunk.data == b"line 198\nline 199\n" and chunk.eof
+
+
+@pytest.mark.asyncio
+async def test_lines_longer_than_one_read_are_read_by_bytes(served: Any) -> None:
+    client = await served(ResultStore(threshold=100, page_size=50, read_max_bytes=100), paginate_results=True)
+    result, _ = await client.execute("document", {"lines": 2, "text": "x" * 1000})
+    assert result is not None and result.result_handle is not None
+    handle_id = result.result_handle.handle_id
+
+    chunk, error = await client.read_result(handle_id, lines=True)
+    assert chunk is None and error is not None
+    assert 'OUT_OF_RANGE' in error['message'] and 'from offset 0' in error['message']
+
+    # The second line is offered from its first byte
+    _, error = await client.read_result(handle_id, offset=1, lines=True)
+    assert error is not None and 'from offset 1003' in error['message']
+    chunk, _ = await client.read_result(handle_id, offset=1003)
+    assert chunk is not None and chunk.data == b"x" * 100
+
+
+@pytest.mark.asyncio
+async def test_small_content_and_old_clients_get_everything(served: Any) -> None:
+    store = ResultStore(threshold=1000, page_size=100)
+    client = await served(store, paginate_results=True)
+    result, _ = await client.execute("document", {"lines": 10})
+    assert result is not None and result.result_handle is None and result.content == document(10)
+
+    client.paginate_results = False
+    result, _ = await client.execute("document", {"lines": 200})
+    assert result is not None and result.result_handle is None and result.content == document(200)
+    assert len(store) == 0
+
+
+@pytest.mark.asyncio
+async def test_pages_end_on_whole_characters(served: Any) -> None:
+    client = await served(ResultStore(threshold=100, page_size=15), paginate_results=True)
+    full = document(50, text="é")
+    result, _ = await client.execute("document", {"lines": 50, "text": "é"})
+    assert result is not None and result.result_handle is not None
+    assert full.startswith(result.content) and result.result_handle.page_bytes == len(result.content.encode())
+    content, _ = await client.read_content(result)
+    assert content == full
+
+
+@pytest.mark.asyncio
+async def test_results_expire_unless_read(served: Any) -> None:
+    client = await served(ResultStore(threshold=1000, page_size=100, ttl=0.3), paginate_results=True)
+    result, _ = await client.execute("document", {"lines": 200})
+    assert result is not None and result.result_handle is not None
+    handle_id = result.result_handle.handle_id
+
+    # Each read extends the expiry
+    for _ in range(3):
+        await asyncio.sleep(0.15)
+        chunk, error = await client.read_result(handle_id, limit=10)
+        assert error is None and chunk is not None
+
+    await asyncio.sleep(0.35)
+    chunk, error = await client.read_result(handle_id)
+    assert chunk is None and error is not None and 'NOT_FOUND' in error['message']
+
+
+@pytest.mark.asyncio
+async def test_memory_cap_evicts_least_recently_read(served: Any) -> None:
+    store = ResultStore(threshold=1000, page_size=100, max_bytes=4000)
+    client = await served(store, paginate_results=True)
+    handles = []
+    for _ in range(2):
+        result, _ = await client.execute("document", {"lines": 200})
+        assert result is not None and result.result_handle is not None
+        handles.append(result.result_handle.handle_id)
+    await client.read_result(handles[0], limit=1)
+    result, _ = await client.execute("document", {"lines": 200})
+    assert result is not None and result.result_handle is not None
+    assert len(store) == 2 and store.size <= 4000
+
+    _, error = await client.read_result(handles[1])
+    assert error is not None and 'NOT_FOUND' in error['message']
+    _, error = await client.read_result(handles[0], limit=1)
+    assert error is None
+
+    # Too large to store at all: sent whole
+    result, _ = await client.execute("document", {"lines": 1000})
+    assert result is not None and result.result_handle is None and result.content == document(1000)
+
+
+@pytest.mark.asyncio
+async def test_content_over_the_message_cap(served: Any) -> None:
+    client = await served(paginate_results=True)
+    lines = 600_000  # about 7MB, over gRPC's default 4MB limit
+    result, error = await client.execute("document", {"lines": lines})
+    assert error is None and result is not None and result.result_handle is not None
+    content, error = await client.read_content(result)
+    assert error is None and content is not None and len(content) == len(document(lines))
+
+    client.paginate_results = False
+    result, error = await client.execute("document", {"lines": lines})
+    assert result is None and error is not None and 'RESOURCE_EXHAUSTED' in error['message']
+
+
+def test_shared_responses_are_not_modified() -> None:
+    store = ResultStore(threshold=10, page_size=5)
+    response = tool_service_pb2.ExecuteResponse()
+    response.structured_result.content = "x" * 100
+    paged = store.page(response)
+    assert paged is not response and paged.structured_result.content == "xxxxx"
+    assert response.structured_result.content == "x" * 100 and not response.HasField('result_handle')
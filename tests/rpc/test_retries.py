@@ -0,0 +1,169 @@
+import time
+import socket
+import asyncio
+from typing import Any, AsyncIterator, List, Optional
+
+import grpc
+import pytest
+import pytest_asyncio
+
+from wabee.rpc.balancer import LoadBalancer
+from wabee.rpc.channels import ChannelPool
+from wabee.rpc.client import ToolServiceClient
+from wabee.rpc.protos import tool_service_pb2_grpc
+from wabee.rpc.retry import HedgingPolicy, RetryBudget, RetryPolicy
+from wabee.rpc.server import ToolServicer
+from wabee.tools.base_tool import BaseTool
+from wabee.tools.tool_error import ToolError, ToolErrorType
+
+FAST_RETRIES = dict(initial_backoff=0.001, max_backoff=0.005)
+
+
+class FlakyTool(BaseTool):
+    """Fails with RETRYABLE errors a few times, then answers with a final (PERMANENT) error"""
+
+    def __init__(self, failures: int) -> None:
+        super().__init__(name="flaky")
+        self.failures = failures
+        self.calls = 0
+
+    async def execute(self, input_data: Any) -> tuple[Optional[str], Optional[ToolError]]:
+        self.calls += 1
+        if self.calls <= self.failures:
+            return None, ToolError(type=ToolErrorType.RETRYABLE, message="busy")
+        return None, ToolError(type=ToolErrorType.PERMANENT, message=f"answered after {self.calls} calls")
+
+
+class SlowTool(BaseTool):
+    def __init__(self, name: str, delay: float) -> None:
+        super().__init__(name=name)
+        self.delay = delay
+
+    async def execute(self, input_data: Any) -> tuple[Optional[str], Optional[ToolError]]:
+        await asyncio.sleep(self.delay)
+        return None, ToolError(type=ToolErrorType.PERMANENT, message=self.name)
+
+
+class Servers:
+    def __init__(self) -> None:
+        self.servers: List[grpc.aio.Server] = []
+
+    async def start(self, **tools: BaseTool) -> str:
+        server = grpc.aio.server()
+        tool_service_pb2_grpc.add_ToolServiceServicer_to_server(ToolServicer(tools), server)
+        port = server.add_insecure_port("127.0.0.1:0")
+        await server.start()
+        self.servers.append(server)
+        return f"127.0.0.1:{port}"
+
+
+@pytest_asyncio.fixture
+async def servers() -> AsyncIterator[Servers]:
+    running = Servers()
+    yield running
+    for server in running.servers:
+        await server.stop(grace=None)
+
+
+def dead_target() -> str:
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+        sock.bind(("127.0.0.1", 0))
+        return f"127.0.0.1:{sock.getsockname()[1]}"
+
+
+@pytest.mark.asyncio
+async def test_retryable_tool_errors_are_retried(servers: Servers) -> None:
+    tool = FlakyTool(failures=2)
+    target = await servers.start(flaky=tool)
+    host, port = target.split(":")
+    client = ToolServiceClient(host, int(port), pool=ChannelPool(), retry_policy=RetryPolicy(**FAST_RETRIES))
+
+    _, error = await client.execute("flaky", {})
+
+    assert error == {"type": "ToolErrorType.PERMANENT", "message": "answered after 3 calls"}
+    await client.close()
+
+
+@pytest.mark.asyncio
+async def test_retries_stop_at_max_attempts_and_without_policy(servers: Servers) -> None:
+    tool = FlakyTool(failures=10)
+    target = await servers.start(flaky=tool)
+    host, port = target.split(":")
+
+    no_retries = ToolServiceClient(host, int(port), pool=ChannelPool())
+    _, error = await no_retries.execute("flaky", {})
+    assert error is not None and error["type"] == "ToolErrorType.RETRYABLE"
+
+    limited = ToolServiceClient(host, int(port), pool=ChannelPool(), retry_policy=RetryPolicy(max_attempts=2, **FAST_RETRIES))
+    _, error = await limited.execute("flaky", {})
+    assert error is not None and error["type"] == "ToolErrorType.RETRYABLE"
+    # One call without a policy, two with max_attempts=2
+    assert tool.calls == 3
+
+
+@pytest.mark.asyncio
+async def test_unavailable_replica_is_retried_on_another(servers: Servers) -> None:
+    live = await servers.start(slow=SlowTool("live", 0))
+    client = ToolServiceClient(
+        balancer=LoadBalancer([dead_target(), live]),
+        pool=ChannelPool(),
+        retry_policy=RetryPolicy(**FAST_RETRIES)
+    )
+
+    answers = [(await client.execute("slow", {}))[1] for _ in range(4)]
+
+    assert all(error is not None and error["message"] == "live" for error in answers)
+    await client.close()
+
+
+@pytest.mark.asyncio
+async def test_retry_budget_limits_retries(servers: Servers) -> None:
+    tool = FlakyTool(failures=100)
+    target = await servers.start(flaky=tool)
+    host, port = target.split(":")
+    budget = RetryBudget(ratio=0.0, max_tokens=2)
+    client = ToolServiceClient(host, int(port), pool=ChannelPool(), retry_policy=RetryPolicy(max_attempts=5, budget=budget, **FAST_RETRIES))
+
+    for _ in range(3):
+        await client.execute("flaky", {})
+
+    # 3 calls plus the 2 retries the budget allowed
+    assert tool.calls == 5
+
+
+def test_backoff_grows_exponentially_with_jitter() -> None:
+    policy = RetryPolicy(initial_backoff=0.1, max_backoff=0.5, multiplier=2, jitter=0.2)
+
+    for attempt, base in [(1, 0.1), (2, 0.2), (3, 0.4), (4, 0.5), (8, 0.5)]:
+        delays = [policy.backoff(attempt) for _ in range(50)]
+        assert all(base * 0.8 <= delay <= base * 1.2 for delay in delays)
+        assert len(set(delays)) > 1
+
+
+@pytest.mark.asyncio
+async def test_hedging_sends_backup_to_another_replica(servers: Servers) -> None:
+    slow = await servers.start(search=SlowTool("slow", 1.0))
+    fast = await servers.start(search=SlowTool("fast", 0.0))
+    hedging = HedgingPolicy(tools=frozenset({"search"}), delay=0.05)
+    client = ToolServiceClient(balancer=LoadBalancer([slow, fast]), pool=ChannelPool(), hedging=hedging)
+
+    start = time.perf_counter()
+    _, error = await client.execute("search", {})
+    elapsed = time.perf_counter() - start
+
+    assert error is not None and error["message"] == "fast"
+    assert elapsed < 0.5
+    # The abandoned copy no longer counts as outstanding
+    assert all(endpoint.outstanding == 0 for endpoint in client.balancer.endpoints)
+    assert not hedging.applies_to("other_tool")
+    await client.close()
+
+
+def test_hedging_delay_follows_observed_p95() -> None:
+    hedging = HedgingPolicy(tools=frozenset({"search"}), min_samples=10, initial_delay=0.2)
+    assert hedging.delay_for("search") == 0.2
+
+    for ms in range(1, 101):
+        hedging.latencies.record("search", ms / 1000)
+
+    assert hedging.delay_for("search") == pytest.approx(0.096, abs=0.002)
@@ -0,0 +1,161 @@
+import asyncio
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
+
+import grpc
+import pytest
+import pytest_asyncio
+from pydantic import BaseModel
+
+from wabee.rpc.channels import ChannelPool
+from wabee.rpc.client import ToolServiceClient
+from wabee.rpc.protos import tool_service_pb2, tool_service_pb2_grpc
+from wabee.rpc.server import ToolServicer
+from wabee.tools.base_tool import BaseTool
+from wabee.tools.tool_error import ToolError, ToolErrorType
+
+
+class Work(BaseModel):
+    name: str
+    delay: float = 0.0
+    fail: bool = False
+
+
+class WorkTool(BaseTool):
+    args_schema = Work
+
+    def __init__(self) -> None:
+        super().__init__(name="work")
+        self.finished: List[str] = []
+        self.cancelled: List[str] = []
+        self.running = 0
+        self.peak = 0
+
+    async def execute(self, input_data: Work) -> Tuple[Any, Optional[ToolError]]:
+        self.running += 1
+        self.peak = max(self.peak, self.running)
+        try:
+            await asyncio.sleep(input_data.delay)
+        except asyncio.CancelledError:
+            self.cancelled.append(input_data.name)
+            raise
+        finally:
+            self.running -= 1
+        self.finished.append(input_data.name)
+        if input_data.fail:
+            return None, ToolError(type=ToolErrorType.PERMANENT, message=f"{input_data.name} failed")
+        return {"variable_name": "work", "content": input_data.name}, None
+
+
+@pytest_asyncio.fixture
+async def served() -> AsyncIterator[Any]:
+    servers: List[grpc.aio.Server] = []
+
+    async def start(**kwargs: Any) -> Tuple[WorkTool, ToolServiceClient, grpc.aio.Server]:
+        tool = WorkTool()
+        server = grpc.aio.server()
+        tool_service_pb2_grpc.add_ToolServiceServicer_to_server(ToolServicer({"work": tool}, **kwargs), server)
+        port = server.add_insecure_port("127.0.0.1:0")
+        await server.start()
+        servers.append(server)
+        return tool, ToolServiceClient("127.0.0.1", port, pool=ChannelPool()), server
+
+    yield start
+    for server in servers:
+        await server.stop(grace=None)
+
+
+@pytest.mark.asyncio
+async def test_responses_arrive_out_of_order(served: Any) -> None:
+    tool, client, _ = await served()
+    async with client.session() as session:
+        completed: List[str] = []
+
+        async def run(name: str, delay: float) -> None:
+            result, error = await session.execute("work", {"name": name, "delay": delay})
+            assert error is None and result is not None and result.content == name
+            completed.append(name)
+
+        await asyncio.gather(run("slow", 0.2), run("medium", 0.1), run("fast", 0))
+    assert completed == ["fast", "medium", "slow"]
+
+
+@pytest.mark.parametrize("tool_name, input_data", [
+    ("work", {"name": "a"}),
+    ("work", {"name": "b", "fail": True}),
+    ("work", {"delay": "soon"}),
+    ("missing", {}),
+])
+@pytest.mark.asyncio
+async def test_session_results_match_unary_calls(served: Any, tool_name: str, input_data: Dict[str, Any]) -> None:
+    _, client, _ = await served()
+    unary = await client.execute(tool_name, input_data)
+    async with client.session() as session:
+        streamed = await session.execute(tool_name, input_data)
+
+    if tool_name == "missing":
+        assert unary[1]["type"] == streamed[1]["type"] == "RPC_ERROR"
+        assert "StatusCode.NOT_FOUND" in streamed[1]["message"] and "not found" in streamed[1]["message"]
+    else:
+        assert streamed == unary
+
+
+@pytest.mark.asyncio
+async def test_server_limits_calls_in_flight_per_session(served: Any) -> None:
+    tool, client, _ = await served(session_max_in_flight=2)
+    async with client.session(max_in_flight=10) as session:
+        results = await asyncio.gather(*(
+            session.execute("work", {"name": str(n), "delay": 0.02}) for n in range(8)
+        ))
+    assert all(error is None for _, error in results)
+    assert tool.peak == 2 and len(tool.finished) == 8
+
+
+@pytest.mark.asyncio
+async def test_cancelling_a_call_cancels_it_on_the_server(served: Any) -> None:
+    tool, client, _ = await served()
+    async with client.session() as session:
+        call = asyncio.ensure_future(session.execute("work", {"name": "long", "delay": 5}))
+        await asyncio.sleep(0.1)
+        call.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await call
+        # The session keeps working
+        result, _ = await session.execute("work", {"name": "after"})
+        assert result is not None and result.content == "after"
+    assert tool.cancelled == ["long"] and tool.finished == ["after"]
+
+
+@pytest.mark.asyncio
+async def test_calls_cancelled_before_they_start_are_answered() -> None:
+    tool = WorkTool()
+    servicer = ToolServicer({"work": tool}, session_max_in_flight=1)
+
+    async def requests() -> AsyncIterator[tool_service_pb2.SessionRequest]:
+        # Sent back to back, the cancel reaches the server before the call's task has run
+        yield tool_service_pb2.SessionRequest(
+            tag=1, execute=tool_service_pb2.ExecuteRequest(tool_name="work", json_data='{"name": "early"}')
+        )
+        yield tool_service_pb2.SessionRequest(tag=1, cancel=True)
+        yield tool_service_pb2.SessionRequest(
+            tag=2, execute=tool_service_pb2.ExecuteRequest(tool_name="work", json_data='{"name": "next"}')
+        )
+
+    async def collect() -> List[tool_service_pb2.SessionResponse]:
+        return [answer async for answer in servicer.Session(requests(), None)]
+
+    answers = await asyncio.wait_for(collect(), timeout=5)
+    assert [(answer.tag, answer.cancelled) for answer in answers] == [(1, True), (2, False)]
+    assert tool.finished == ["next"]
+
+
+@pytest.mark.asyncio
+async def test_calls_fail_cleanly_when_the_server_goes_away(served: Any) -> None:
+    _, client, server = await served()
+    async with client.session() as session:
+        call = asyncio.ensure_future(session.execute("work", {"name": "doomed", "delay": 5}))
+        await asyncio.sleep(0.1)
+        await server.stop(grace=None)
+        result, error = await call
+        assert result is None and error["type"] == "RPC_ERROR"
+        result, error = await session.execute("work", {"name": "late"})
+        assert result is None and error["type"] == "RPC_ERROR"
@@ -0,0 +1,163 @@
+import os
+import sys
+import json
+import time
+import socket
+import asyncio
+import subprocess
+from pathlib import Path
+
+import grpc
+import pytest
+
+from wabee.cli.tools.create_tool_service import CreateToolService
+from wabee.rpc.protos import tool_service_pb2
+from wabee.rpc.protos import tool_service_pb2_grpc
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+
+# Regression budget for process start -> first successful Execute.
+# Can be tightened or relaxed per environment via WABEE_STARTUP_BUDGET_SECONDS.
+STARTUP_BUDGET_SECONDS = float(os.environ.get("WABEE_STARTUP_BUDGET_SECONDS", "5.0"))
+
+# Modules that are not needed to serve a tool and must stay off the server path
+NON_SERVING_MODULES = [
+    "inquirer",
+    "requests",
+    "pkg_resources",
+    "yaml",
+    "wabee.cli",
+    "wabee.rpc.schema",
+]
+
+
+def _free_port() -> int:
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _env() -> dict:
+    env = os.environ.copy()
+    env["PYTHONPATH"] = os.pathsep.join(filter(None, [str(REPO_ROOT), env.get("PYTHONPATH")]))
+    return env
+
+
+def test_server_path_does_not_import_non_serving_modules() -> None:
+    code = (
+        "import sys, json\n"
+        "import wabee.rpc.server, wabee.rpc.loader\n"
+        f"print(json.dumps([m for m in {NON_SERVING_MODULES!r} if m in sys.modules]))\n"
+    )
+    output = subprocess.run(
+        [sys.executable, "-c", code],
+        env=_env(),
+        capture_output=True,
+        text=True,
+        check=True
+    ).stdout
+
+    assert json.loads(output) == []
+
+
+def test_first_execute_does_not_import_non_serving_modules() -> None:
+    code = (
+        "import sys, json, asyncio\n"
+        "from pydantic import BaseModel\n"
+        "from wabee.rpc.server import ToolServicer\n"
+        "from wabee.rpc.protos import tool_service_pb2\n"
+        "from wabee.tools.simple_tool import simple_tool\n"
+        "class Echo(BaseModel):\n"
+        "    text: str\n"
+        "@simple_tool(schema=Echo)\n"
+        "async def echo(input_data: Echo) -> str:\n"
+        "    return input_data.text\n"
+        "request = tool_service_pb2.ExecuteRequest(tool_name='echo', json_data='{\"text\": \"hi\"}')\n"
+        "response = asyncio.run(ToolServicer({'echo': echo}).execute_request(request))\n"
+        "assert response.structured_result.content == 'hi', response\n"
+        f"print(json.dumps([m for m in {NON_SERVING_MODULES!r} if m in sys.modules]))\n"
+    )
+    output = subprocess.run(
+        [sys.executable, "-c", code],
+        env=_env(),
+        capture_output=True,
+        text=True,
+        check=True
+    ).stdout
+
+    assert json.loads(output) == []
+
+
+def test_cli_entrypoint_does_not_import_command_dependencies() -> None:
+    code = (
+        "import sys, json\n"
+        "import wabee.cli.main\n"
+        "print(json.dumps([m for m in ['inquirer', 'requests'] if m in sys.modules]))\n"
+    )
+    output = subprocess.run(
+        [sys.executable, "-c", code],
+        env=_env(),
+        capture_output=True,
+        text=True,
+        check=True
+    ).stdout
+
+    assert json.loads(output) == []
+
+
+@pytest.mark.asyncio
+async def test_cold_start_to_first_execute(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    """Measure process start -> first successful Execute for the server template."""
+    monkeypatch.chdir(tmp_path)
+    CreateToolService().create_tool(
+        name="bench",
+        tool_type="complete",
+        description="Startup benchmark tool",
+        version="0.1.0",
+        generate_js=False
+    )
+    tool_dir = tmp_path / "bench"
+    port = _free_port()
+    env = _env()
+    env["WABEE_GRPC_PORT"] = str(port)
+
+    started = time.perf_counter()
+    process = subprocess.Popen(
+        [sys.executable, "server.py"],
+        cwd=tool_dir,
+        env=env,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.PIPE
+    )
+    try:
+        request = tool_service_pb2.ExecuteRequest(
+            tool_name="Bench",
+            json_data=json.dumps({"message": "ping"})
+        )
+        # Keep reconnect backoff short so the benchmark measures the server, not the client
+        options = [
+            ("grpc.initial_reconnect_backoff_ms", 10),
+            ("grpc.min_reconnect_backoff_ms", 10),
+            ("grpc.max_reconnect_backoff_ms", 50),
+        ]
+        async with grpc.aio.insecure_channel(f"127.0.0.1:{port}", options=options) as channel:
+            stub = tool_service_pb2_grpc.ToolServiceStub(channel)
+            while True:
+                try:
+                    response = await stub.Execute(request)
+                    break
+                except grpc.RpcError as e:
+                    if process.poll() is not None:
+                        pytest.fail(f"Server exited early: {process.stderr.read().decode()}")  # type: ignore[union-attr]
+                    if time.perf_counter() - started > STARTUP_BUDGET_SECONDS * 2:
+                        pytest.fail(f"Server did not answer in time: {e}")
+                    await asyncio.sleep(0.01)
+        elapsed = time.perf_counter() - started
+    finally:
+        process.terminate()
+        process.wait(timeout=10)
+
+    print(f"\ncold start to first Execute: {elapsed * 1000:.1f}ms (budget {STARTUP_BUDGET_SECONDS:.1f}s)")
+    assert not response.HasField("error")
+    assert response.structured_result.content == "Processed: ping"
+    assert elapsed < STARTUP_BUDGET_SECONDS
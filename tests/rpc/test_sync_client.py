@@ -0,0 +1,101 @@
+import os
+import asyncio
+import concurrent.futures
+from typing import Any, Iterator, Optional, Tuple
+
+import grpc
+import pytest
+
+from wabee.rpc.channels import ChannelPool
+from wabee.rpc.protos import tool_service_pb2_grpc
+from wabee.rpc.server import ToolServicer
+from wabee.rpc.sync_client import BackgroundLoop, SyncToolServiceClient
+from wabee.tools.base_tool import BaseTool
+from wabee.tools.tool_error import ToolError
+
+
+class EchoTool(BaseTool):
+    def __init__(self) -> None:
+        super().__init__(name="echo")
+
+    async def execute(self, input_data: Any) -> tuple[Any, Optional[ToolError]]:
+        await asyncio.sleep(input_data.get("delay", 0))
+        return {"variable_name": "echo", "content": str(input_data["n"])}, None
+
+
+@pytest.fixture
+def served() -> Iterator[Tuple[BackgroundLoop, int]]:
+    background = BackgroundLoop("test-loop")
+
+    async def start() -> Tuple[grpc.aio.Server, int]:
+        server = grpc.aio.server()
+        tool_service_pb2_grpc.add_ToolServiceServicer_to_server(ToolServicer({"echo": EchoTool()}), server)
+        port = server.add_insecure_port("127.0.0.1:0")
+        await server.start()
+        return server, port
+
+    server, port = background.run(start())
+    yield background, port
+    background.run(server.stop(grace=None))
+    background.stop()
+
+
+def test_blocking_calls_from_many_threads_share_one_channel(served: Tuple[BackgroundLoop, int]) -> None:
+    background, port = served
+    pool = ChannelPool()
+
+    def call(n: int) -> str:
+        with SyncToolServiceClient("127.0.0.1", port, pool=pool, background=background) as client:
+            result, error = client.execute("echo", {"n": n, "delay": 0.01})
+            assert error is None and result is not None
+            return result.content
+
+    with concurrent.futures.ThreadPoolExecutor(max_workers=8) as threads:
+        assert list(threads.map(call, range(32))) == [str(n) for n in range(32)]
+
+    client = SyncToolServiceClient("127.0.0.1", port, pool=pool, background=background)
+    client.execute("echo", {"n": 0})
+    stats = pool.stats()
+    assert len(stats) == 1 and stats[0]["calls"] == 33
+    assert client.get_tool_schema("echo")["tool_name"] == "echo"
+    client.close()
+
+
+def test_futures_and_fan_out(served: Tuple[BackgroundLoop, int]) -> None:
+    background, port = served
+    with SyncToolServiceClient("127.0.0.1", port, pool=ChannelPool(), background=background) as client:
+        futures = [client.execute_future("echo", {"n": n}) for n in range(5)]
+        assert [f.result(timeout=5)[0].content for f in concurrent.futures.as_completed(futures)]
+        assert client.get_tool_schema_future("echo").result(timeout=5)["tool_name"] == "echo"
+
+        results = list(client.execute_many((("echo", {"n": n}) for n in range(20)), max_concurrency=4))
+        assert [r.result.content for r in results] == [str(n) for n in range(20)]
+
+        stream = client.as_completed([("echo", {"n": n, "delay": 0.2}) for n in range(10)], max_concurrency=10)
+        next(stream)
+        # Closing early cancels what is still running
+        stream.close()
+
+        with pytest.raises(concurrent.futures.TimeoutError):
+            client.execute("echo", {"n": 1, "delay": 1}, timeout=0.05)
+
+
+def test_background_loop_restarts_after_fork_and_refuses_to_block_itself() -> None:
+    background = BackgroundLoop("test-fork")
+    first = background.loop
+    assert background.loop is first
+
+    # What a forked child sees: state inherited from a parent with another pid
+    background._pid = os.getpid() + 1
+    second = background.loop
+    assert second is not first and second.is_running()
+
+    async def nested() -> None:
+        background.run(asyncio.sleep(0))
+
+    with pytest.raises(RuntimeError):
+        background.run(nested())
+    thread = background._thread
+    background.stop()
+    assert thread is not None and not thread.is_alive() and second.is_closed()
+    first.call_soon_threadsafe(first.stop)
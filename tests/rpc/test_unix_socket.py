@@ -0,0 +1,116 @@
+import os
+import time
+import socket
+import signal
+import asyncio
+from pathlib import Path
+from typing import Any, Optional
+
+import grpc
+import pytest
+
+from wabee.rpc.channels import ChannelPool
+from wabee.rpc.client import ToolServiceClient
+from wabee.rpc.protos import tool_service_pb2_grpc
+from wabee.rpc.server import ToolServicer, serve
+from wabee.tools.base_tool import BaseTool
+from wabee.tools.tool_error import ToolError
+
+CALLS = 300
+
+
+class EchoTool(BaseTool):
+    def __init__(self) -> None:
+        super().__init__(name="echo")
+
+    async def execute(self, input_data: Any) -> tuple[Any, Optional[ToolError]]:
+        return {"variable_name": "echo", "content": input_data.get("text", "")}, None
+
+
+def _free_port() -> int:
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+async def _stop(server: "asyncio.Task[None]") -> None:
+    os.kill(os.getpid(), signal.SIGTERM)
+    await asyncio.wait_for(server, timeout=5)
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGTERM, signal.SIGINT):
+        loop.remove_signal_handler(sig)
+
+
+async def _echo(client: ToolServiceClient, text: str) -> str:
+    for _ in range(50):
+        result, error = await client.execute("echo", {"text": text})
+        if result is not None:
+            return result.content
+        # The server task may not be listening yet
+        await asyncio.sleep(0.05)
+    raise AssertionError(f"server never answered: {error}")
+
+
+@pytest.mark.asyncio
+async def test_serve_on_unix_socket_alongside_tcp(tmp_path: Path) -> None:
+    path = tmp_path / "tool.sock"
+    # A socket file left behind by a crashed server is replaced
+    stale = socket.socket(socket.AF_UNIX)
+    stale.bind(str(path))
+    stale.close()
+    port = _free_port()
+
+    server = asyncio.create_task(serve({"echo": EchoTool()}, port=port, unix_socket=str(path)))
+    pool = ChannelPool()
+    async with ToolServiceClient(f"unix:{path}", pool=pool) as client:
+        assert client.target == f"unix:{path}"
+        assert await _echo(client, "over uds") == "over uds"
+    async with ToolServiceClient("127.0.0.1", port, pool=pool) as client:
+        assert await _echo(client, "over tcp") == "over tcp"
+    await pool.close()
+    await _stop(server)
+
+    assert not path.exists()
+
+
+@pytest.mark.asyncio
+async def test_serve_refuses_to_replace_other_files(tmp_path: Path) -> None:
+    path = tmp_path / "not-a-socket"
+    path.write_text("keep me")
+    with pytest.raises(FileExistsError):
+        await serve({"echo": EchoTool()}, port=None, unix_socket=str(path))
+    with pytest.raises(ValueError):
+        await serve({"echo": EchoTool()}, port=None)
+    assert path.read_text() == "keep me"
+
+
+async def _mean_latency(client: ToolServiceClient) -> float:
+    await _echo(client, "warm up")
+    start = time.perf_counter()
+    for _ in range(CALLS):
+        await client.execute("echo", {"text": "ping"})
+    return (time.perf_counter() - start) / CALLS
+
+
+@pytest.mark.asyncio
+async def test_unix_socket_latency_against_loopback_tcp(tmp_path: Path, record_property: Any) -> None:
+    server = grpc.aio.server()
+    tool_service_pb2_grpc.add_ToolServiceServicer_to_server(ToolServicer({"echo": EchoTool()}), server)
+    port = server.add_insecure_port("127.0.0.1:0")
+    server.add_insecure_port(f"unix:{tmp_path / 'bench.sock'}")
+    await server.start()
+    try:
+        pool = ChannelPool()
+        async with ToolServiceClient("127.0.0.1", port, pool=pool) as tcp:
+            tcp_latency = await _mean_latency(tcp)
+        async with ToolServiceClient(f"unix:{tmp_path / 'bench.sock'}", pool=pool) as uds:
+            uds_latency = await _mean_latency(uds)
+        await pool.close()
+    finally:
+        await server.stop(grace=None)
+
+    # Both run through the same Python client and server code, so the transport is
+    # a minor share of the total and too noisy to assert on; the numbers are
+    # reported with the test (e.g. in --junitxml output) for comparison
+    record_property("tcp_latency_us", round(tcp_latency * 1e6))
+    record_property("unix_socket_latency_us", round(uds_latency * 1e6))
@@ -0,0 +1,153 @@
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+import pytest
+from pydantic import BaseModel
+
+from wabee.rpc.protos import tool_service_pb2
+from wabee.rpc.server import ToolServicer
+from wabee.tools.base_tool import BaseTool
+from wabee.tools.memoize import memoize
+from wabee.tools.simple_tool import simple_tool
+from wabee.tools.tool_error import ToolError, ToolErrorType
+
+CALLS: Dict[str, int] = {}
+
+
+def counted(name: str) -> None:
+    CALLS[name] = CALLS.get(name, 0) + 1
+
+
+class QueryInput(BaseModel):
+    query: str
+    limit: int = 10
+
+
+def make_search(path: Optional[Path] = None, version: Optional[str] = None) -> Any:
+    @memoize(path=path, version=version)
+    @simple_tool(schema=QueryInput)
+    async def search(input_data: QueryInput) -> str:
+        counted("search")
+        return f"{input_data.query}:{input_data.limit}"
+    return search
+
+
+@pytest.fixture(autouse=True)
+def reset_calls() -> None:
+    CALLS.clear()
+
+
+@pytest.mark.asyncio
+async def test_memoize_keys_on_validated_input() -> None:
+    @memoize(maxsize=2)
+    @simple_tool()
+    async def add(x: int, y: int) -> int:
+        counted("add")
+        return x + y
+
+    assert await add(x=2, y=3) == (5, None)
+    assert await add(x="2", y="3") == (5, None)
+    assert CALLS["add"] == 1
+
+    await add(x=1, y=1)
+    await add(x=1, y=2)
+    # The LRU holds two entries, so (2, 3) was evicted
+    await add(x=2, y=3)
+    assert CALLS["add"] == 4
+    assert add.cache.stats()["hits"] == 1
+    assert add.name == "add" and set(add.args_schema.model_fields) == {"x", "y"}
+    assert not hasattr(add, "tool")
+
+
+@pytest.mark.asyncio
+async def test_server_calls_go_through_the_cache() -> None:
+    servicer = ToolServicer({"search": make_search()})
+    request = tool_service_pb2.ExecuteRequest(tool_name="search", json_data='{"query": "cats"}')
+
+    for _ in range(2):
+        response = await servicer.execute_request(request)
+        assert response.structured_result.content == "cats:10"
+    assert CALLS["search"] == 1
+    assert servicer._tool_schema("search")[0]["required"] == ["query"]
+
+
+@pytest.mark.asyncio
+async def test_errors_are_not_cached() -> None:
+    search = make_search()
+
+    result, error = await search(query=None)
+    assert error is not None and error.type == ToolErrorType.INVALID_INPUT
+
+    @memoize()
+    @simple_tool()
+    async def flaky(n: int) -> int:
+        counted("flaky")
+        raise RuntimeError("upstream timeout")
+
+    await flaky(n=1)
+    await flaky(n=1)
+    assert CALLS["flaky"] == 2
+
+
+@pytest.mark.asyncio
+async def test_disk_store_survives_restarts_and_versions_invalidate(tmp_path: Path) -> None:
+    path = tmp_path / "memo.sqlite"
+
+    assert await make_search(path)(query="wabee") == ("wabee:10", None)
+    # A fresh decoration is what a new process would build
+    assert await make_search(path)(query="wabee", limit=10) == ("wabee:10", None)
+    assert CALLS["search"] == 1
+
+    # A new version ignores and prunes the old results
+    bumped = make_search(path, version="2")
+    assert await bumped(query="wabee") == ("wabee:10", None)
+    assert CALLS["search"] == 2
+    assert bumped.cache.disk.prune(bumped.cache.namespace, "2") == 0
+
+
+def make_upper(path: Path) -> Any:
+    @memoize(path=path, version="1")
+    @simple_tool()
+    async def convert(text: str) -> str:
+        return text.upper()
+    return convert
+
+
+def make_lower(path: Path) -> Any:
+    @memoize(path=path, version="1")
+    @simple_tool()
+    async def convert(text: str) -> str:
+        return text.lower()
+    return convert
+
+
+@pytest.mark.asyncio
+async def test_same_named_tools_do_not_share_results(tmp_path: Path) -> None:
+    path = tmp_path / "memo.sqlite"
+    upper, lower = make_upper(path), make_lower(path)
+
+    assert await upper(text="Wabee") == ("WABEE", None)
+    assert await lower(text="Wabee") == ("wabee", None)
+    assert upper.cache.namespace != lower.cache.namespace
+
+
+@memoize()
+class LookupTool(BaseTool):
+    args_schema = QueryInput
+
+    async def execute(self, input_data: QueryInput) -> tuple[Optional[str], Optional[ToolError]]:
+        counted(self.name)
+        return input_data.query.upper(), None
+
+
+@pytest.mark.asyncio
+async def test_memoize_base_tool_class() -> None:
+    first, second = LookupTool(name="first"), LookupTool(name="second")
+
+    assert await first({"query": "a"}) == ("A", None)
+    assert await first(QueryInput(query="a")) == ("A", None)
+    assert await second({"query": "a"}) == ("A", None)
+
+    assert CALLS == {"first": 1, "second": 1}
+    result, error = await first({"limit": 1})
+    assert error is not None and error.type == ToolErrorType.INVALID_INPUT
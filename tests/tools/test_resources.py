@@ -0,0 +1,65 @@
+import asyncio
+
+import pytest
+
+from wabee.tools.resources import ResourceError, ResourceRegistry
+
+
+class Pool:
+    created = 0
+
+    def __init__(self) -> None:
+        Pool.created += 1
+        self.closed = False
+
+    async def aclose(self) -> None:
+        self.closed = True
+
+
+@pytest.mark.asyncio
+async def test_resource_is_created_once_and_shared() -> None:
+    registry = ResourceRegistry()
+    Pool.created = 0
+
+    @registry.register("pool")
+    async def make_pool() -> Pool:
+        await asyncio.sleep(0.01)
+        return Pool()
+
+    pools = await asyncio.gather(*(registry.get("pool") for _ in range(5)))
+
+    assert Pool.created == 1
+    assert all(pool is pools[0] for pool in pools)
+
+
+@pytest.mark.asyncio
+async def test_close_releases_resources_newest_first() -> None:
+    registry = ResourceRegistry()
+    closed = []
+    registry.register("pool", Pool)
+    registry.register("cache", dict, close=lambda value: closed.append("cache"))
+
+    pool = await registry.get("pool")
+    await registry.get("cache")
+    await registry.close()
+
+    assert pool.closed and closed == ["cache"]
+    # A closed registry creates fresh resources on the next use
+    assert await registry.get("pool") is not pool
+
+
+@pytest.mark.asyncio
+async def test_unknown_or_failing_resources_raise_resource_error() -> None:
+    registry = ResourceRegistry()
+
+    def broken() -> None:
+        raise ConnectionError("refused")
+
+    registry.register("db", broken)
+
+    with pytest.raises(ResourceError, match="not registered"):
+        await registry.get("missing")
+    with pytest.raises(ResourceError, match="refused"):
+        await registry.get("db")
+    with pytest.raises(ResourceError, match="already registered"):
+        registry.register("db", broken)
@@ -0,0 +1,62 @@
+import time
+from typing import Any, Awaitable, Callable
+
+import pytest
+from pydantic import BaseModel, ConfigDict, create_model
+
+from wabee.tools.base_tool import BaseTool
+from wabee.tools.simple_tool import simple_tool
+
+CALLS = 2000
+
+
+async def add(x: int, y: int) -> int:
+    return x + y
+
+
+def per_call_wrapper(func: Callable[..., Awaitable[Any]]) -> Callable[..., Awaitable[Any]]:
+    """The previous simple_tool behaviour: a new tool class, instance and runtime schema per call"""
+    async def wrapped_tool(**kwargs: Any) -> Any:
+        class FunctionalTool(BaseTool):
+            args_schema = BaseModel
+
+            async def execute(self, input_data: Any) -> Any:
+                fields = {name: (typ, ...) for name, typ in func.__annotations__.items() if name != 'return'}
+                runtime_schema = create_model(
+                    f"{func.__name__}RuntimeSchema",
+                    __config__=ConfigDict(arbitrary_types_allowed=True),
+                    **fields
+                )
+                model_instance = runtime_schema(**{k: v for k, v in kwargs.items() if k in fields})
+                return await func(**model_instance.model_dump()), None
+
+        return await FunctionalTool().execute(kwargs)
+    return wrapped_tool
+
+
+async def calls_per_second(tool: Callable[..., Awaitable[Any]]) -> float:
+    start = time.perf_counter()
+    for i in range(CALLS):
+        result, error = await tool(x=i, y=1)
+        assert result == i + 1 and error is None
+    return CALLS / (time.perf_counter() - start)
+
+
+@pytest.mark.asyncio
+async def test_compiled_simple_tool_throughput(record_property: Any) -> None:
+    before = await calls_per_second(per_call_wrapper(add))
+    after = await calls_per_second(simple_tool()(add))
+
+    # Wall-clock ratios swing with machine load, so the numbers are reported with
+    # the test (e.g. in --junitxml output) rather than asserted on
+    record_property("per_call_compilation_calls_per_second", round(before))
+    record_property("compiled_once_calls_per_second", round(after))
+
+
+def test_tool_is_compiled_once_at_decoration() -> None:
+    compiled = simple_tool()(add)
+
+    assert isinstance(compiled.tool, BaseTool)
+    assert compiled.args_schema is compiled.tool.args_schema
+    assert set(compiled.args_schema.model_fields) == {"x", "y"}
+    assert compiled.name == "add"
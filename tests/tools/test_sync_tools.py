@@ -0,0 +1,121 @@
+import asyncio
+import contextvars
+import threading
+import time
+from typing import Optional
+
+import pytest
+from pydantic import BaseModel
+
+from wabee.tools.base_tool import BaseTool
+from wabee.tools.simple_tool import simple_tool
+from wabee.tools.tool_error import ToolError, ToolErrorType
+
+REQUEST_ID: contextvars.ContextVar[str] = contextvars.ContextVar("request_id", default="")
+
+
+class SleepInput(BaseModel):
+    seconds: float
+
+
+@simple_tool(schema=SleepInput, max_sync_workers=2)
+def blocking_sleep(input_data: SleepInput) -> str:
+    time.sleep(input_data.seconds)
+    return threading.current_thread().name
+
+
+@simple_tool()
+def add(x: int, y: int) -> int:
+    return x + y
+
+
+@simple_tool()
+def request_id() -> str:
+    return REQUEST_ID.get()
+
+
+@simple_tool()
+def fails(reason: str) -> None:
+    raise ValueError(reason)
+
+
+class BlockingTool(BaseTool):
+    args_schema = SleepInput
+    max_sync_workers = 1
+
+    def execute(self, input_data: SleepInput) -> tuple[Optional[str], Optional[ToolError]]:  # type: ignore[override]
+        time.sleep(input_data.seconds)
+        return threading.current_thread().name, None
+
+
+@pytest.mark.asyncio
+async def test_sync_function_runs_off_the_event_loop() -> None:
+    ticks = 0
+
+    async def ticker() -> None:
+        nonlocal ticks
+        while True:
+            await asyncio.sleep(0.01)
+            ticks += 1
+
+    task = asyncio.create_task(ticker())
+    start = time.perf_counter()
+    results = await asyncio.gather(blocking_sleep(seconds=0.2), blocking_sleep(seconds=0.2))
+    elapsed = time.perf_counter() - start
+    task.cancel()
+
+    assert all(error is None for _, error in results)
+    assert all(name.startswith("wabee-blocking_sleepFunctionalTool") for name, _ in results)
+    assert elapsed < 0.35
+    # The loop kept running while both calls blocked their threads
+    assert ticks >= 10
+
+
+@pytest.mark.asyncio
+async def test_sync_function_keeps_validation_and_errors() -> None:
+    assert await add(x="2", y=3) == (5, None)
+
+    result, error = await add(x="two", y=3)
+    assert result is None and error is not None and error.type == ToolErrorType.INVALID_INPUT
+
+    result, error = await fails(reason="boom")
+    assert result is None and error is not None and error.message == "boom"
+
+
+@pytest.mark.asyncio
+async def test_sync_function_sees_caller_context() -> None:
+    REQUEST_ID.set("req-42")
+
+    assert await request_id() == ("req-42", None)
+
+
+@pytest.mark.asyncio
+async def test_sync_base_tool_uses_bounded_pool() -> None:
+    tool = BlockingTool(name="blocking")
+
+    start = time.perf_counter()
+    results = await asyncio.gather(tool(SleepInput(seconds=0.1)), tool(SleepInput(seconds=0.1)))
+
+    # A single worker runs the calls one after the other
+    assert time.perf_counter() - start >= 0.2
+    assert all(name.startswith("wabee-BlockingTool") for name, _ in results)
+
+
+@pytest.mark.asyncio
+async def test_cancelling_queued_sync_call_skips_it() -> None:
+    tool = BlockingTool(name="blocking")
+    started = []
+
+    def record(seconds: float) -> None:
+        started.append(seconds)
+        time.sleep(seconds)
+
+    first = asyncio.create_task(tool.sync_runner.run(record, 0.1))
+    queued = asyncio.create_task(tool.sync_runner.run(record, 0.2))
+    await asyncio.sleep(0.02)
+    queued.cancel()
+
+    await first
+    with pytest.raises(asyncio.CancelledError):
+        await queued
+    assert started == [0.1]
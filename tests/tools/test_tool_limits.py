@@ -0,0 +1,161 @@
+import asyncio
+import threading
+import time
+from typing import Any, Dict, Optional
+
+import pytest
+
+from wabee.tools.base_tool import BaseTool
+from wabee.tools.limits import REJECT, ConcurrencyLimit, ToolLimiter, ToolLimitExceeded
+from wabee.tools.simple_tool import simple_tool
+from wabee.tools.tool_error import ToolError, ToolErrorType
+
+
+class Gauge:
+    def __init__(self) -> None:
+        self.active = 0
+        self.peak = 0
+        self.lock = threading.Lock()
+
+    def __enter__(self) -> None:
+        with self.lock:
+            self.active += 1
+            self.peak = max(self.peak, self.active)
+
+    def __exit__(self, *exc: Any) -> None:
+        with self.lock:
+            self.active -= 1
+
+
+def gauged_tool(gauge: Gauge, seconds: float = 0.05, **limits: Any) -> Any:
+    @simple_tool(**limits)
+    async def work(n: int) -> int:
+        with gauge:
+            await asyncio.sleep(seconds)
+        return n
+    return work
+
+
+class InferenceTool(BaseTool):
+    max_concurrency = 1
+    on_limit = "reject"
+
+    async def execute(self, input_data: Dict[str, Any]) -> tuple[Optional[str], Optional[ToolError]]:
+        await asyncio.sleep(0.05)
+        return "done", None
+
+
+@pytest.mark.asyncio
+async def test_max_concurrency_queues_excess_calls() -> None:
+    gauge = Gauge()
+    work = gauged_tool(gauge, max_concurrency=2)
+
+    results = await asyncio.gather(*(work(n=n) for n in range(6)))
+
+    assert [result for result, _ in results] == list(range(6))
+    assert gauge.peak == 2
+    snapshot = work.tool.limiter.snapshot()
+    assert snapshot.accepted == 6 and snapshot.rejected == 0
+    assert snapshot.in_flight == 0 and snapshot.queued == 0
+    assert snapshot.max_wait_seconds >= 0.1
+
+
+@pytest.mark.asyncio
+async def test_reject_mode_returns_retryable_error() -> None:
+    tool = InferenceTool(name="inference")
+
+    results = await asyncio.gather(tool({}), tool({}))
+
+    errors = [error for _, error in results if error is not None]
+    assert len(errors) == 1 and errors[0].type == ToolErrorType.RETRYABLE
+    assert "concurrency limit" in errors[0].message
+    assert tool.limiter is not None and tool.limiter.snapshot().rejected == 1
+
+
+@pytest.mark.asyncio
+async def test_queue_timeout_rejects_calls_that_wait_too_long() -> None:
+    gauge = Gauge()
+    work = gauged_tool(gauge, seconds=0.1, max_concurrency=1)
+    work.tool.queue_timeout = 0.02
+
+    first, second = await asyncio.gather(work(n=1), work(n=2))
+
+    assert first == (1, None)
+    assert second[1] is not None and second[1].type == ToolErrorType.RETRYABLE
+
+
+@pytest.mark.asyncio
+async def test_rate_limit_spaces_out_calls() -> None:
+    @simple_tool(rate_limit=20)
+    def ping() -> float:
+        return time.monotonic()
+
+    ping.tool.rate_limit_burst = 1
+    results = await asyncio.gather(*(ping() for _ in range(5)))
+
+    started = sorted(result for result, _ in results)
+    assert started[-1] - started[0] >= 0.18
+
+
+@pytest.mark.asyncio
+async def test_cancelled_waiter_does_not_leak_a_slot() -> None:
+    limit = ConcurrencyLimit(1)
+    assert await limit.acquire()
+
+    waiter = asyncio.create_task(limit.acquire())
+    await asyncio.sleep(0)
+    waiter.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await waiter
+
+    limit.release()
+    assert limit.in_flight == 0 and limit.waiting == 0
+    assert await limit.acquire(timeout=0.1)
+
+
+@pytest.mark.asyncio
+async def test_calls_rejected_for_concurrency_keep_their_rate_token() -> None:
+    limiter = ToolLimiter("inference", max_concurrency=1, rate_limit=1, burst=5, on_limit=REJECT)
+    await limiter.acquire()
+    assert limiter.bucket is not None
+    budget = limiter.bucket.available
+
+    for _ in range(3):
+        with pytest.raises(ToolLimitExceeded, match="concurrency limit"):
+            await limiter.acquire()
+
+    assert limiter.bucket.available == pytest.approx(budget, abs=0.1)
+
+
+@pytest.mark.asyncio
+async def test_cancelled_rate_wait_gives_its_token_back() -> None:
+    limiter = ToolLimiter("ping", rate_limit=1, burst=1)
+    await limiter.acquire()
+
+    waiter = asyncio.create_task(limiter.acquire())
+    await asyncio.sleep(0.01)
+    waiter.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await waiter
+
+    # Only the first call's token is spent: the next one is about a second away, not two
+    assert limiter.bucket is not None
+    wait = limiter.bucket.reserve()
+    assert wait is not None and wait < 1.1
+
+
+def test_limits_hold_across_event_loops() -> None:
+    gauge = Gauge()
+    work = gauged_tool(gauge, seconds=0.02, max_concurrency=1)
+
+    async def calls() -> None:
+        await asyncio.gather(*(work(n=n) for n in range(3)))
+
+    threads = [threading.Thread(target=asyncio.run, args=(calls(),)) for _ in range(3)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(timeout=5)
+
+    assert gauge.peak == 1
+    assert work.tool.limiter.snapshot().accepted == 9
@@ -1,9 +1,5 @@
 import sys
 from argparse import ArgumentParser
-import inquirer
-
-from wabee.cli.tools.create_tool_service import CreateToolService
-from wabee.cli.tools.build_tool_service import BuildToolService
 
 
 def main() -> None:
@@ -32,6 +28,10 @@ def main() -> None:
 
     if args.svc_command == "tools":
         if args.act_command == "create":
+            # Imported here so that other commands don't pay for the prompt toolkit
+            import inquirer
+            from wabee.cli.tools.create_tool_service import CreateToolService
+
             # Interactive prompts for tool creation
             questions = [
                 inquirer.Text('name', message="What is the name of your tool?"),
@@ -62,6 +62,8 @@ def main() -> None:
                 )
                 print(f"Tool '{answers['name']}' created successfully!")
         elif args.act_command == "build":
+            from wabee.cli.tools.build_tool_service import BuildToolService
+
             build_service = BuildToolService(s2i_commit=args.s2i_commit)
             try:
                 build_service.build_tool(
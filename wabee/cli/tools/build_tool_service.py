@@ -2,16 +2,23 @@ import os
 import platform
 import subprocess
 import sys
-import requests
 import stat
 import shutil
 import tarfile
 import tempfile
-import pkg_resources
 import re
 import json
+from importlib import resources
 from pathlib import Path
-from typing import Optional
+from typing import Any, Dict, Optional
+
+from wabee.rpc.manifest import (
+    MANIFEST_FILENAME,
+    TOOLSPEC_FILENAME,
+    ToolManifest,
+    build_manifest,
+    write_manifest,
+)
 
 class BuildToolService:
     S2I_VERSION = "v1.4.0"
@@ -55,6 +62,8 @@ class BuildToolService:
             f"{self.S2I_VERSION}/{archive_name}"
         )
         
+        import requests
+
         print("Downloading s2i...")
         response = requests.get(download_url, stream=True)
         response.raise_for_status()
@@ -95,13 +104,10 @@ class BuildToolService:
         protos_dir = tool_dir / "protos"
         protos_dir.mkdir(exist_ok=True)
         
-        # Get the proto file from the installed package
-        proto_resource = pkg_resources.resource_filename(
-            'wabee', 'rpc/protos/tool_service.proto'
-        )
-        
-        # Copy proto file to tool directory
-        shutil.copy2(proto_resource, protos_dir / "tool_service.proto")
+        # Copy the proto file from the installed package to the tool directory
+        proto_resource = resources.files('wabee') / 'rpc' / 'protos' / 'tool_service.proto'
+        with resources.as_file(proto_resource) as proto_path:
+            shutil.copy2(proto_path, protos_dir / "tool_service.proto")
         
         # Generate the gRPC code
         try:
@@ -260,6 +266,64 @@ class BuildToolService:
             # Clean up build directory
             shutil.rmtree(build_dir, ignore_errors=True)
 
+    def _detect_python_tool_name(self, tool_file: Path) -> str:
+        """Find the tool class/function name by scanning the tool source."""
+        with open(tool_file, 'r') as f:
+            content = f.read()
+            
+        # Look for class definition first (complete tool)
+        class_match = re.search(r'class\s+(\w+)\s*\(\s*BaseTool\s*\)\s*:', content)
+        if class_match:
+            return class_match.group(1)
+
+        # Look for decorated function (simple tool)
+        func_match = re.search(r'@simple_tool[^\n]*\s*(?:async\s+)?def\s+(\w+)', content)
+        if func_match:
+            return func_match.group(1)
+
+        raise ValueError(f"Could not find tool class or function in {tool_file}")
+
+    def _read_tool_args(self, tool_dir: Path) -> Optional[Dict[str, Any]]:
+        """Read tool arguments from the toolspec.yaml, if present."""
+        import yaml
+
+        spec_path = tool_dir / TOOLSPEC_FILENAME
+        if not spec_path.exists():
+            return None
+        with open(spec_path) as f:
+            spec = yaml.safe_load(f)
+        if isinstance(spec, dict) and isinstance(spec.get('tool'), dict):
+            args = spec['tool'].get('tool_args')
+            if args:
+                return {arg['name']: arg['value'] for arg in args if 'name' in arg and 'value' in arg}
+        return None
+
+    def _generate_manifest(
+        self,
+        tool_dir: Path,
+        tool_module: str,
+        tool_name: Optional[str]
+    ) -> Optional[ToolManifest]:
+        """Write the precompiled tool manifest into the tool directory.
+
+        Returns None if the tool can't be imported on the build host, in which case
+        the container falls back to loading the tool from toolspec.yaml.
+        """
+        try:
+            manifest = build_manifest(
+                tool_dir,
+                tool_module,
+                tool_name=tool_name,
+                args=self._read_tool_args(tool_dir)
+            )
+        except Exception as e:
+            print(f"Warning: skipping tool manifest generation: {e}", file=sys.stderr)
+            return None
+
+        write_manifest(manifest, tool_dir / MANIFEST_FILENAME)
+        print(f"Generated tool manifest (schema {manifest.schema_fingerprint[:12]})")
+        return manifest
+
     def _build_python_tool(
         self,
         tool_dir: Path,
@@ -284,23 +348,14 @@ class BuildToolService:
             # Get the filename without .py extension
             tool_module = python_files[0].stem
 
-        # If tool_name not provided, try to find the tool class/function name
-        if tool_name is None:
-            tool_file = tool_dir / f"{tool_module}.py"
-            with open(tool_file, 'r') as f:
-                content = f.read()
-                
-            # Look for class definition first (complete tool)
-            class_match = re.search(r'class\s+(\w+)\s*\(\s*BaseTool\s*\)\s*:', content)
-            if class_match:
-                tool_name = class_match.group(1)
-            else:
-                # Look for decorated function (simple tool)
-                func_match = re.search(r'@simple_tool[^\n]*\s*async\s+def\s+(\w+)', content)
-                if func_match:
-                    tool_name = func_match.group(1)
-                else:
-                    raise ValueError(f"Could not find tool class or function in {tool_file}")
+        # Precompile the tool manifest so the container can skip introspection at startup.
+        # This also resolves the tool name by importing the module; when that's not possible
+        # on the build host, fall back to scanning the source.
+        manifest = self._generate_manifest(tool_dir, tool_module, tool_name)
+        if manifest is not None:
+            tool_name = manifest.tool_name
+        elif tool_name is None:
+            tool_name = self._detect_python_tool_name(tool_dir / f"{tool_module}.py")
         
         if not image_name:
             image_name = f"{tool_module}:latest"
@@ -380,7 +435,6 @@ class BuildToolService:
                 image_name,
                 builder_name
             )
-            return  # Exit after building JavaScript tool
         else:
             self._build_python_tool(
                 tool_dir,
@@ -389,73 +443,3 @@ class BuildToolService:
                 image_name,
                 builder_name
             )
-
-        # Find the tool module file if not explicitly provided
-        if tool_module is None:
-            python_files = list(tool_dir.glob("*_tool.py"))
-            if not python_files:
-                raise ValueError(f"No *_tool.py file found in {tool_path}")
-            if len(python_files) > 1:
-                raise ValueError(f"Multiple tool files found in {tool_path}. Please specify tool_module.")
-            
-            # Get the filename without .py extension
-            tool_module = python_files[0].stem
-
-        # If tool_name not provided, try to find the tool class/function name
-        if tool_name is None:
-            tool_file = tool_dir / f"{tool_module}.py"
-            with open(tool_file, 'r') as f:
-                content = f.read()
-                
-            # Look for class definition first (complete tool)
-            class_match = re.search(r'class\s+(\w+)\s*\(\s*BaseTool\s*\)\s*:', content)
-            if class_match:
-                tool_name = class_match.group(1)
-            else:
-                # Look for decorated function (simple tool)
-                func_match = re.search(r'@simple_tool[^\n]*\s*async\s+def\s+(\w+)', content)
-                if func_match:
-                    tool_name = func_match.group(1)
-                else:
-                    raise ValueError(f"Could not find tool class or function in {tool_file}")
-        
-        # Generate protos in tool directory
-        self._generate_protos(tool_dir)
-            
-        if not image_name:
-            image_name = f"{tool_module}:latest"  # Use module name for image
-            
-        if not builder_name:
-            builder_name = self.PYTHON_BUILDER
-            
-        # Create environment file with tool configuration
-        env_file = tempfile.NamedTemporaryFile(mode='w', delete=False)
-        try:
-            env_file.write(f"WABEE_TOOL_MODULE={tool_module}\n")
-            env_file.write(f"WABEE_TOOL_NAME={tool_name}\n")
-            env_file.write("APP_FILE=server.py\n")
-            env_file.close()
-            
-            print("Building with environment:")
-            print(f"  WABEE_TOOL_MODULE={tool_module}")
-            print(f"  WABEE_TOOL_NAME={tool_name}")
-            
-            # Run s2i build directly
-            subprocess.run(
-                [
-                    str(self.s2i_path),
-                    "build",
-                    "--environment-file", env_file.name,
-                    str(tool_dir),
-                    builder_name,
-                    image_name,
-                ],
-                check=True
-            )
-            
-            print(f"Successfully built image: {image_name}")
-        except subprocess.CalledProcessError as e:
-            print(f"Error building image: {e}", file=sys.stderr)
-            raise
-        finally:
-            os.unlink(env_file.name)
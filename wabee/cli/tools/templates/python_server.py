@@ -2,8 +2,9 @@ import asyncio
 import os
 import logging
 from pathlib import Path
+from typing import Optional
 from wabee.rpc.server import serve
-from wabee.rpc.loader import ToolLoader
+from wabee.rpc.loader import ToolLoader, ToolLoadError
 
 logging.basicConfig(
     level=logging.INFO,
@@ -12,12 +13,21 @@ logging.basicConfig(
 
 logger = logging.getLogger(__name__)
 
+async def run(port: Optional[int], unix_socket: Optional[str] = None) -> None:
+    config = ToolLoader.config_from_spec(Path("toolspec.yaml"))
+    report = await ToolLoader.load_tools([config])
+    logger.info(report.format())
+    if not report.tools:
+        raise ToolLoadError(str(report.failures[0].error))
+    await serve(report.tools, port=port, unix_socket=unix_socket)
+
 def main():
     try:
-        port = int(os.environ.get('WABEE_GRPC_PORT', '50051'))
-        tool = ToolLoader.load_from_spec(Path("toolspec.yaml"))
-        logger.info(f"Starting gRPC server on port {port}")
-        asyncio.run(serve({tool.tool_name: tool}, port=port))
+        # An empty WABEE_GRPC_PORT serves on the Unix socket only
+        port_setting = os.environ.get('WABEE_GRPC_PORT', '50051')
+        port = int(port_setting) if port_setting else None
+        unix_socket = os.environ.get('WABEE_GRPC_UNIX_SOCKET') or None
+        asyncio.run(run(port, unix_socket))
     except Exception as e:
         logger.error(f"Failed to start server: {e}")
         raise
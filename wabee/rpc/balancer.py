@@ -0,0 +1,173 @@
+import time
+import random
+import socket
+import asyncio
+import logging
+from dataclasses import dataclass
+from typing import Iterable, List, Optional, Sequence
+
+import grpc
+
+logger = logging.getLogger(__name__)
+
+ROUND_ROBIN = "round_robin"
+LEAST_OUTSTANDING = "least_outstanding"
+
+# Status codes that say something about the endpoint rather than the request
+ENDPOINT_FAILURE_CODES = frozenset({
+    grpc.StatusCode.UNAVAILABLE,
+    grpc.StatusCode.DEADLINE_EXCEEDED,
+    grpc.StatusCode.INTERNAL,
+    grpc.StatusCode.UNKNOWN,
+    grpc.StatusCode.RESOURCE_EXHAUSTED,
+})
+
+class NoEndpointsError(Exception):
+    """Raised when a load balancer has no endpoints to choose from"""
+    pass
+
+def format_target(host: str, port: int) -> str:
+    """host:port target string, bracketing IPv6 addresses"""
+    if ":" in host and not host.startswith("["):
+        host = f"[{host}]"
+    return f"{host}:{port}"
+
+@dataclass
+class Endpoint:
+    """One tool replica and what the balancer knows about it"""
+    target: str
+    outstanding: int = 0
+    consecutive_failures: int = 0
+    ejections: int = 0
+    ejected_until: float = 0.0
+    requests: int = 0
+    failures: int = 0
+
+    def is_ejected(self, now: Optional[float] = None) -> bool:
+        return self.ejected_until > (now if now is not None else time.monotonic())
+
+class LoadBalancer:
+    """
+    Client-side balancing across tool replicas.
+
+    Endpoints come from a static list or from resolving a DNS name (re-resolved
+    every resolve_interval seconds). Calls go round-robin or to the endpoint with
+    the fewest outstanding requests. An endpoint failing failure_threshold times
+    in a row is ejected for base_ejection_seconds, doubling with each further
+    ejection up to max_ejection_seconds. Once the ejection expires it gets traffic
+    again: its first success resets the backoff, a failure ejects it straight
+    away. If every endpoint is ejected, the one coming back soonest is used
+    rather than failing outright.
+    """
+
+    def __init__(
+        self,
+        endpoints: Sequence[str] = (),
+        policy: str = ROUND_ROBIN,
+        failure_threshold: int = 3,
+        base_ejection_seconds: float = 1.0,
+        max_ejection_seconds: float = 30.0,
+        dns_name: Optional[str] = None,
+        dns_port: Optional[int] = None,
+        resolve_interval: float = 30.0
+    ) -> None:
+        if policy not in (ROUND_ROBIN, LEAST_OUTSTANDING):
+            raise ValueError(f"Unknown load balancing policy '{policy}'")
+        if not endpoints and dns_name is None:
+            raise NoEndpointsError("A load balancer needs endpoints or a DNS name")
+        self.policy = policy
+        self.failure_threshold = failure_threshold
+        self.base_ejection_seconds = base_ejection_seconds
+        self.max_ejection_seconds = max_ejection_seconds
+        self.dns_name = dns_name
+        self.dns_port = dns_port
+        self.resolve_interval = resolve_interval
+        self.endpoints: List[Endpoint] = [Endpoint(target) for target in endpoints]
+        # Names the set of replicas, whatever its endpoints resolve to later
+        self.name = f"dns:{dns_name}:{dns_port}" if dns_name is not None else ",".join(endpoints)
+        self._next = 0
+        self._resolved_at: Optional[float] = None
+
+    @classmethod
+    def from_dns(cls, name: str, port: int, **kwargs) -> "LoadBalancer":
+        """Balance over every address a DNS name resolves to"""
+        return cls(dns_name=name, dns_port=port, **kwargs)
+
+    def _set_targets(self, targets: Iterable[str]) -> None:
+        # Keep the state of endpoints that are still present
+        known = {endpoint.target: endpoint for endpoint in self.endpoints}
+        self.endpoints = [known.get(target) or Endpoint(target) for target in dict.fromkeys(targets)]
+
+    async def resolve(self) -> None:
+        """Re-resolve the DNS name, if any; a failed lookup keeps the previous endpoints"""
+        if self.dns_name is None:
+            return
+        loop = asyncio.get_running_loop()
+        try:
+            infos = await loop.getaddrinfo(self.dns_name, self.dns_port, type=socket.SOCK_STREAM)
+        except OSError as e:
+            logger.warning(f"Failed to resolve {self.dns_name}: {e}")
+            if not self.endpoints:
+                raise NoEndpointsError(f"Could not resolve {self.dns_name}: {e}") from e
+        else:
+            self._set_targets(format_target(str(info[4][0]), int(info[4][1])) for info in infos)
+        self._resolved_at = time.monotonic()
+
+    async def choose(self, exclude: Iterable[str] = ()) -> Endpoint:
+        """Pick the endpoint for the next call, skipping targets in exclude when possible"""
+        if self.dns_name is not None and (
+            self._resolved_at is None or time.monotonic() - self._resolved_at >= self.resolve_interval
+        ):
+            await self.resolve()
+        return self.pick(exclude)
+
+    def pick(self, exclude: Iterable[str] = ()) -> Endpoint:
+        if not self.endpoints:
+            raise NoEndpointsError("No endpoints available")
+        now = time.monotonic()
+        excluded = set(exclude)
+        candidates = [e for e in self.endpoints if not e.is_ejected(now) and e.target not in excluded]
+        if not candidates:
+            candidates = [e for e in self.endpoints if not e.is_ejected(now)]
+        if not candidates:
+            # Everything is ejected: try the endpoint that would come back first
+            return min(self.endpoints, key=lambda e: e.ejected_until)
+
+        if self.policy == LEAST_OUTSTANDING:
+            fewest = min(e.outstanding for e in candidates)
+            return random.choice([e for e in candidates if e.outstanding == fewest])
+
+        endpoint = candidates[self._next % len(candidates)]
+        self._next += 1
+        return endpoint
+
+    def begin(self, endpoint: Endpoint) -> None:
+        endpoint.outstanding += 1
+        endpoint.requests += 1
+
+    def succeeded(self, endpoint: Endpoint) -> None:
+        endpoint.outstanding -= 1
+        endpoint.consecutive_failures = 0
+        endpoint.ejections = 0
+
+    def abandoned(self, endpoint: Endpoint) -> None:
+        """Record a call that was cancelled before it finished"""
+        endpoint.outstanding -= 1
+
+    def failed(self, endpoint: Endpoint, error: Optional[grpc.RpcError] = None) -> None:
+        """Record a failed call; only failures caused by the endpoint count towards ejection"""
+        endpoint.outstanding -= 1
+        if error is not None and error.code() not in ENDPOINT_FAILURE_CODES:
+            return
+        endpoint.failures += 1
+        endpoint.consecutive_failures += 1
+        # An endpoint back from an ejection hasn't proven itself yet, so one failure sends it back
+        if endpoint.ejections or endpoint.consecutive_failures >= self.failure_threshold:
+            self.eject(endpoint)
+
+    def eject(self, endpoint: Endpoint) -> None:
+        duration = min(self.max_ejection_seconds, self.base_ejection_seconds * (2 ** endpoint.ejections))
+        endpoint.ejections += 1
+        endpoint.consecutive_failures = 0
+        endpoint.ejected_until = time.monotonic() + duration
+        logger.warning(f"Ejected tool endpoint {endpoint.target} for {duration:.1f}s")
@@ -0,0 +1,210 @@
+import time
+import logging
+import threading
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any, Callable, Deque, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+class CircuitOpenError(Exception):
+    """Raised instead of calling a tool endpoint whose circuit is open"""
+    pass
+
+@dataclass
+class BreakerEvent:
+    """A circuit changing state"""
+    target: str
+    tool_name: str
+    previous: str
+    state: str
+    reason: str
+    timestamp: float = field(default_factory=time.time)
+
+BreakerListener = Callable[[BreakerEvent], Any]
+
+@dataclass
+class CircuitBreakerPolicy:
+    """
+    When a circuit opens and how it recovers.
+
+    A circuit opens when, over the last window_seconds and at least min_calls calls,
+    the failure rate or the rate of calls slower than slow_call_seconds reaches its
+    threshold. It stays open for open_seconds, failing fast, then lets up to
+    half_open_calls trial calls through: a successful trial closes it, a failed
+    one opens it again.
+    """
+    window_seconds: float = 30.0
+    min_calls: int = 10
+    failure_rate_threshold: float = 0.5
+    slow_call_seconds: Optional[float] = None
+    slow_call_rate_threshold: float = 0.8
+    open_seconds: float = 10.0
+    half_open_calls: int = 1
+
+class CircuitBreaker:
+    """Circuit for one tool on one endpoint"""
+
+    def __init__(
+        self,
+        target: str,
+        tool_name: str,
+        policy: CircuitBreakerPolicy,
+        notify: Callable[[BreakerEvent], None]
+    ) -> None:
+        self.target = target
+        self.tool_name = tool_name
+        self.policy = policy
+        self.state = CLOSED
+        self._notify = notify
+        self._calls: Deque[Tuple[float, bool, bool]] = deque()
+        self._opened_at = 0.0
+        self._trials = 0
+        self._lock = threading.Lock()
+        self.rejected = 0
+        self.transitions: Dict[str, int] = {CLOSED: 0, OPEN: 0, HALF_OPEN: 0}
+
+    def _transition(self, state: str, reason: str) -> Optional[BreakerEvent]:
+        previous, self.state = self.state, state
+        self.transitions[state] += 1
+        if state == OPEN:
+            self._opened_at = time.monotonic()
+        if state != HALF_OPEN:
+            self._trials = 0
+        if state == CLOSED:
+            self._calls.clear()
+        return BreakerEvent(self.target, self.tool_name, previous, state, reason)
+
+    def _prune(self, now: float) -> None:
+        horizon = now - self.policy.window_seconds
+        while self._calls and self._calls[0][0] < horizon:
+            self._calls.popleft()
+
+    def is_open(self) -> bool:
+        """True while the circuit is failing fast (without starting a trial)"""
+        with self._lock:
+            if self.state == OPEN:
+                return time.monotonic() - self._opened_at < self.policy.open_seconds
+            return self.state == HALF_OPEN and self._trials >= self.policy.half_open_calls
+
+    def allow(self) -> bool:
+        """Ask to make a call; False means fail fast"""
+        event = None
+        with self._lock:
+            if self.state == OPEN:
+                if time.monotonic() - self._opened_at < self.policy.open_seconds:
+                    self.rejected += 1
+                    return False
+                event = self._transition(HALF_OPEN, "open period elapsed")
+            if self.state == HALF_OPEN:
+                if self._trials >= self.policy.half_open_calls:
+                    self.rejected += 1
+                    allowed = False
+                else:
+                    self._trials += 1
+                    allowed = True
+            else:
+                allowed = True
+        if event is not None:
+            self._notify(event)
+        return allowed
+
+    def record(self, success: bool, duration: float) -> None:
+        """Record the outcome of an allowed call"""
+        policy = self.policy
+        slow = policy.slow_call_seconds is not None and duration >= policy.slow_call_seconds
+        event = None
+        with self._lock:
+            if self.state == HALF_OPEN:
+                self._trials = max(0, self._trials - 1)
+                if success and not slow:
+                    event = self._transition(CLOSED, "trial call succeeded")
+                else:
+                    event = self._transition(OPEN, "trial call failed" if not success else "trial call was slow")
+            elif self.state == CLOSED:
+                now = time.monotonic()
+                self._calls.append((now, not success, slow))
+                self._prune(now)
+                total = len(self._calls)
+                if total >= policy.min_calls:
+                    failure_rate = sum(1 for _, failed, _ in self._calls if failed) / total
+                    slow_rate = sum(1 for _, _, was_slow in self._calls if was_slow) / total
+                    if failure_rate >= policy.failure_rate_threshold:
+                        event = self._transition(OPEN, f"failure rate {failure_rate:.0%} over {total} calls")
+                    elif policy.slow_call_seconds is not None and slow_rate >= policy.slow_call_rate_threshold:
+                        event = self._transition(OPEN, f"slow call rate {slow_rate:.0%} over {total} calls")
+        if event is not None:
+            self._notify(event)
+
+    def release(self) -> None:
+        """Give back a trial whose call was abandoned without an outcome"""
+        with self._lock:
+            if self.state == HALF_OPEN:
+                self._trials = max(0, self._trials - 1)
+
+    def metrics(self) -> Dict[str, Any]:
+        with self._lock:
+            self._prune(time.monotonic())
+            total = len(self._calls)
+            failures = sum(1 for _, failed, _ in self._calls if failed)
+            return {
+                "target": self.target,
+                "tool_name": self.tool_name,
+                "state": self.state,
+                "window_calls": total,
+                "window_failures": failures,
+                "failure_rate": failures / total if total else 0.0,
+                "rejected": self.rejected,
+                "opened": self.transitions[OPEN],
+            }
+
+class CircuitBreakerRegistry:
+    """
+    Circuit breakers keyed by (endpoint, tool), with state changes published
+    to listeners and the log.
+    """
+
+    def __init__(self, policy: Optional[CircuitBreakerPolicy] = None) -> None:
+        self.policy = policy or CircuitBreakerPolicy()
+        self._breakers: Dict[Tuple[str, str], CircuitBreaker] = {}
+        self._listeners: List[BreakerListener] = []
+        self._lock = threading.Lock()
+
+    def add_listener(self, listener: BreakerListener) -> None:
+        self._listeners.append(listener)
+
+    def _notify(self, event: BreakerEvent) -> None:
+        log = logger.warning if event.state == OPEN else logger.info
+        log(
+            f"Circuit for '{event.tool_name}' on {event.target}: {event.previous} -> {event.state} ({event.reason})",
+            extra={"circuit_event": event.__dict__}
+        )
+        for listener in self._listeners:
+            try:
+                listener(event)
+            except Exception as e:
+                logger.error(f"Circuit breaker listener failed: {e}")
+
+    def get(self, target: str, tool_name: str) -> CircuitBreaker:
+        key = (target, tool_name)
+        breaker = self._breakers.get(key)
+        if breaker is None:
+            with self._lock:
+                breaker = self._breakers.get(key)
+                if breaker is None:
+                    breaker = self._breakers[key] = CircuitBreaker(target, tool_name, self.policy, self._notify)
+        return breaker
+
+    def open_targets(self, tool_name: str) -> List[str]:
+        """Endpoints currently failing fast for a tool"""
+        return [
+            breaker.target for (_, name), breaker in list(self._breakers.items())
+            if name == tool_name and breaker.is_open()
+        ]
+
+    def metrics(self) -> List[Dict[str, Any]]:
+        return [breaker.metrics() for breaker in list(self._breakers.values())]
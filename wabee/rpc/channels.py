@@ -0,0 +1,199 @@
+import os
+import asyncio
+import logging
+import threading
+import weakref
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Sequence, Set, Tuple
+
+import grpc
+
+from wabee.rpc.protos import tool_service_pb2_grpc
+
+logger = logging.getLogger(__name__)
+
+ChannelOptions = Tuple[Tuple[str, Any], ...]
+
+# Number of HTTP/2 connections opened per target unless a client asks otherwise
+DEFAULT_SUBCHANNELS = int(os.environ.get("WABEE_GRPC_SUBCHANNELS", "1"))
+# Seconds an unused pooled channel stays open before it is closed
+DEFAULT_IDLE_TIMEOUT = float(os.environ.get("WABEE_GRPC_IDLE_TIMEOUT", "60"))
+
+_PoolKey = Tuple[int, str, ChannelOptions, int]
+
+@dataclass
+class _PoolEntry:
+    key: _PoolKey
+    loop: "weakref.ref[asyncio.AbstractEventLoop]"
+    channels: List[grpc.aio.Channel]
+    stubs: List[tool_service_pb2_grpc.ToolServiceStub]
+    refs: int = 0
+    calls: int = 0
+    idle_handle: Optional[asyncio.TimerHandle] = None
+    closed: bool = False
+
+@dataclass
+class ChannelLease:
+    """A client's hold on a pooled set of channels to one target"""
+    pool: "ChannelPool"
+    entry: _PoolEntry
+    released: bool = field(default=False)
+
+    @property
+    def loop(self) -> Optional[asyncio.AbstractEventLoop]:
+        return self.entry.loop()
+
+    @property
+    def channel(self) -> grpc.aio.Channel:
+        return self.entry.channels[0]
+
+    def next_stub(self) -> tool_service_pb2_grpc.ToolServiceStub:
+        """Stub for the next subchannel, spreading calls round-robin over the connections"""
+        entry = self.entry
+        stub = entry.stubs[entry.calls % len(entry.stubs)]
+        entry.calls += 1
+        return stub
+
+    def release(self) -> None:
+        if not self.released:
+            self.released = True
+            self.pool.release(self.entry)
+
+class ChannelPool:
+    """
+    Process-wide pool of grpc.aio channels, keyed by event loop, target, options
+    and subchannel count.
+
+    Clients lease channels instead of opening their own, so every call to a
+    target reuses the same HTTP/2 connections. With subchannels > 1 a target gets
+    several independent connections and calls are spread over them. Channels are
+    reference counted and closed once no client has used them for idle_timeout seconds.
+    grpc.aio channels belong to the loop they were created on, so each loop gets its own.
+    """
+
+    def __init__(
+        self,
+        subchannels: int = DEFAULT_SUBCHANNELS,
+        idle_timeout: float = DEFAULT_IDLE_TIMEOUT
+    ) -> None:
+        self.subchannels = max(1, subchannels)
+        self.idle_timeout = idle_timeout
+        self._entries: Dict[_PoolKey, _PoolEntry] = {}
+        self._closing: Set["asyncio.Task[None]"] = set()
+        self._lock = threading.Lock()
+
+    def acquire(
+        self,
+        target: str,
+        options: Sequence[Tuple[str, Any]] = (),
+        subchannels: Optional[int] = None
+    ) -> ChannelLease:
+        """Lease the channels for target on the running event loop, opening them if needed"""
+        loop = asyncio.get_running_loop()
+        count = max(1, subchannels or self.subchannels)
+        key: _PoolKey = (id(loop), target, tuple(options), count)
+        with self._lock:
+            self._purge_closed_loops()
+            entry = self._entries.get(key)
+            if entry is None or entry.loop() is not loop:
+                entry = self._open(key, loop, target, tuple(options), count)
+                self._entries[key] = entry
+            entry.refs += 1
+            if entry.idle_handle is not None:
+                entry.idle_handle.cancel()
+                entry.idle_handle = None
+        return ChannelLease(self, entry)
+
+    def _open(
+        self,
+        key: _PoolKey,
+        loop: asyncio.AbstractEventLoop,
+        target: str,
+        options: ChannelOptions,
+        count: int
+    ) -> _PoolEntry:
+        channel_options = list(options)
+        if count > 1:
+            # Without a local subchannel pool gRPC would share one connection between
+            # channels with identical arguments; this gives each channel its own
+            channel_options.append(("grpc.use_local_subchannel_pool", 1))
+        channels = [grpc.aio.insecure_channel(target, options=channel_options) for _ in range(count)]
+        logger.debug(f"Opened {count} pooled channel(s) to {target}")
+        return _PoolEntry(
+            key=key,
+            loop=weakref.ref(loop),
+            channels=channels,
+            stubs=[tool_service_pb2_grpc.ToolServiceStub(channel) for channel in channels]
+        )
+
+    def release(self, entry: _PoolEntry) -> None:
+        with self._lock:
+            entry.refs -= 1
+            if entry.refs > 0 or entry.closed:
+                return
+            loop = entry.loop()
+            if loop is None or loop.is_closed():
+                self._discard(entry)
+                return
+            if self.idle_timeout <= 0:
+                self._discard(entry)
+                loop.call_soon_threadsafe(self._close_channels, entry)
+            else:
+                entry.idle_handle = loop.call_later(self.idle_timeout, self._expire, entry)
+
+    def _expire(self, entry: _PoolEntry) -> None:
+        with self._lock:
+            if entry.refs > 0 or entry.closed:
+                return
+            self._discard(entry)
+        self._close_channels(entry)
+
+    def _discard(self, entry: _PoolEntry) -> None:
+        entry.closed = True
+        if self._entries.get(entry.key) is entry:
+            del self._entries[entry.key]
+
+    def _close_channels(self, entry: _PoolEntry) -> None:
+        loop = entry.loop()
+        if loop is None or loop.is_closed():
+            return
+        for channel in entry.channels:
+            task = loop.create_task(channel.close())
+            # Keep a reference until the close finishes
+            self._closing.add(task)
+            task.add_done_callback(self._closing.discard)
+
+    def _purge_closed_loops(self) -> None:
+        for entry in list(self._entries.values()):
+            loop = entry.loop()
+            if loop is None or loop.is_closed():
+                self._discard(entry)
+
+    def stats(self) -> List[Dict[str, Any]]:
+        """Targets currently pooled with their client and call counts"""
+        with self._lock:
+            return [
+                {
+                    "target": entry.key[1],
+                    "subchannels": len(entry.channels),
+                    "clients": entry.refs,
+                    "calls": entry.calls,
+                }
+                for entry in self._entries.values()
+            ]
+
+    async def close(self) -> None:
+        """Close every channel pooled for the running event loop"""
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            entries = [entry for entry in self._entries.values() if entry.loop() is loop]
+            for entry in entries:
+                if entry.idle_handle is not None:
+                    entry.idle_handle.cancel()
+                self._discard(entry)
+        for entry in entries:
+            for channel in entry.channels:
+                await channel.close()
+
+# Pool shared by every ToolServiceClient that isn't given its own
+default_pool = ChannelPool()
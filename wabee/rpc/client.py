@@ -1,32 +1,312 @@
+import os
 import json
+import time
+import uuid
+import asyncio
 import grpc
-from typing import Any, Optional, Dict, Union
+from typing import TYPE_CHECKING, Any, AsyncIterator, Optional, Dict, List, Mapping, Sequence, Tuple, Union
 
-from wabee.tools.base_model import StructuredToolResponse
+from wabee.tools.base_model import ResultHandle, StructuredToolResponse
+from wabee.rpc.balancer import ENDPOINT_FAILURE_CODES, LoadBalancer, NoEndpointsError
+from wabee.rpc.breaker import CircuitBreakerRegistry, CircuitOpenError
+from wabee.rpc.channels import ChannelLease, ChannelPool, default_pool
+from wabee.rpc.fanout import DEFAULT_MAX_CONCURRENCY, CallResult, Calls, fan_out
+from wabee.rpc.pipeline import Step, StepResult, pipeline_request
+from wabee.rpc.results import STATUS_CODES, ResultRange, decode_structured_result
+from wabee.rpc.session import DEFAULT_MAX_IN_FLIGHT, ToolSession
+from wabee.rpc.retry import RETRYABLE_TOOL_ERROR, HedgingPolicy, RetryPolicy
+from wabee.rpc.validation import INVALID_INPUT, SchemaCache
 from wabee.rpc.protos import tool_service_pb2
 from wabee.rpc.protos import tool_service_pb2_grpc
 
+if TYPE_CHECKING:
+    from wabee.rpc.jobs import JobInfo
+    from wabee.rpc.local import LocalToolClient
+
+TRANSPORT_GRPC = "grpc"
+TRANSPORT_LOCAL = "local"
+
+def schema_dict(schema: tool_service_pb2.ToolSchema) -> Dict[str, Any]:
+    """What get_tool_schema() returns for a ToolSchema message"""
+    return {
+        "tool_name": schema.tool_name,
+        "fields": [
+            {
+                "name": field.name,
+                "type": field.type,
+                "required": field.required,
+                "description": field.description
+            }
+            for field in schema.fields
+        ]
+    }
+
 class ToolServiceClient:
     def __init__(
         self,
         host: str = "localhost",
         port: int = 50051,
-        use_json: bool = True
+        use_json: bool = True,
+        pool: Optional[ChannelPool] = None,
+        options: Sequence[Tuple[str, Any]] = (),
+        subchannels: Optional[int] = None,
+        endpoints: Optional[Sequence[str]] = None,
+        balancer: Optional[LoadBalancer] = None,
+        retry_policy: Optional[RetryPolicy] = None,
+        hedging: Optional[HedgingPolicy] = None,
+        breakers: Optional[CircuitBreakerRegistry] = None,
+        validate_inputs: bool = False,
+        schema_cache: Optional[SchemaCache] = None,
+        trusted: bool = False,
+        idempotency_keys: bool = False,
+        paginate_results: bool = False
     ):
+        """
+        Client for a tool server. Channels come from a shared ChannelPool, so
+        clients to the same target reuse the same connections.
+
+        Args:
+            host: Server host, or a `unix:/path/to/socket` target to connect over a
+                Unix domain socket
+            port: Server port (ignored for unix: targets)
+            use_json: Send input as json_data rather than proto_data
+            pool: Channel pool to lease from (defaults to the process-wide pool)
+            options: gRPC channel options; clients with different options get different channels
+            subchannels: Number of connections to spread calls over (defaults to the pool's setting)
+            endpoints: Optional "host:port" targets of several replicas to balance over
+                instead of host/port
+            balancer: Optional LoadBalancer to use instead of one built from endpoints
+            retry_policy: Optional RetryPolicy for execute(); without one nothing is retried
+            hedging: Optional HedgingPolicy sending backup requests for idempotent tools
+            breakers: Optional CircuitBreakerRegistry; calls to an endpoint whose circuit
+                for the tool is open fail fast, and the balancer routes around it
+            validate_inputs: Check input against the tool's schema before sending it;
+                the schema is fetched once per tool and refreshed when the server's changes
+            schema_cache: Optional SchemaCache to share schemas between clients
+            trusted: Build results without validating them, for servers whose
+                responses are known to be well formed
+            idempotency_keys: Give every call a fresh idempotency key, so the
+                retries and hedges of a call run the tool on a server only once
+            paginate_results: Receive only the first page of large content, with
+                result.result_handle set to read the rest with read_result() or
+                read_content()
+        """
         self.host = host
         self.port = port
         self.use_json = use_json
-        self.channel = grpc.aio.insecure_channel(f"{self.host}:{self.port}")
-        self.stub = tool_service_pb2_grpc.ToolServiceStub(self.channel)
+        self.pool = pool if pool is not None else default_pool
+        self.options = tuple(options)
+        self.subchannels = subchannels
+        if balancer is None and endpoints:
+            balancer = LoadBalancer(endpoints)
+        self.balancer = balancer
+        self.retry_policy = retry_policy
+        self.hedging = hedging
+        self.breakers = breakers
+        self.validate_inputs = validate_inputs
+        self.schema_cache = schema_cache if schema_cache is not None else SchemaCache()
+        self.trusted = trusted
+        self.idempotency_keys = idempotency_keys
+        self.paginate_results = paginate_results
+        self._leases: Dict[str, ChannelLease] = {}
+        # Replica each recently read result handle lives on, when there are several
+        self._result_targets: Dict[str, str] = {}
+        # Replica each recently submitted job lives on, when there are several
+        self._job_targets: Dict[str, str] = {}
+
+    @property
+    def target(self) -> str:
+        if self.host.startswith('unix:'):
+            return self.host
+        return f"{self.host}:{self.port}"
+
+    @property
+    def service(self) -> str:
+        """The server or set of replicas this client calls, e.g. to key cached schemas"""
+        return self.balancer.name if self.balancer is not None else self.target
+
+    def _leased(self, target: Optional[str] = None) -> ChannelLease:
+        target = target or self.target
+        lease = self._leases.get(target)
+        # Leases are tied to the event loop they were taken on
+        if lease is not None and lease.loop is not asyncio.get_running_loop():
+            lease.release()
+            lease = None
+        if lease is None:
+            lease = self._leases[target] = self.pool.acquire(target, self.options, self.subchannels)
+        return lease
+
+    async def _invoke(self, method: str, request: Any, tried: Optional[List[str]] = None) -> Any:
+        """
+        Send one RPC, to the balancer's choice of replica when there are several.
+        Targets in `tried` are avoided if possible, and the chosen target is added to it.
+        Execute calls raise CircuitOpenError instead of calling an endpoint whose
+        circuit is open, and only their outcomes count towards the circuit.
+        Raises NoEndpointsError when the balancer has no replica to choose.
+        """
+        # Pipelines span several tools, so they aren't routed by tool
+        tool_name = getattr(request, 'tool_name', '')
+        breakers = self.breakers
+        balancer = self.balancer
+        endpoint = None
+        target = self.target
+        if balancer is not None:
+            exclude = list(tried or ())
+            if breakers is not None and tool_name:
+                exclude.extend(breakers.open_targets(tool_name))
+            endpoint = await balancer.choose(exclude)
+            target = endpoint.target
+        if tried is not None:
+            tried.append(target)
+
+        breaker = breakers.get(target, tool_name) if breakers is not None and method == 'Execute' else None
+        if breaker is not None and not breaker.allow():
+            raise CircuitOpenError(f"Circuit for tool '{tool_name}' on {target} is open")
+
+        if balancer is not None and endpoint is not None:
+            balancer.begin(endpoint)
+        started = time.monotonic()
+        try:
+            response = await getattr(self._leased(target).next_stub(), method)(request)
+        except grpc.RpcError as e:
+            if balancer is not None and endpoint is not None:
+                balancer.failed(endpoint, e)
+            if breaker is not None:
+                breaker.record(e.code() not in ENDPOINT_FAILURE_CODES, time.monotonic() - started)
+            raise
+        except BaseException:
+            if balancer is not None and endpoint is not None:
+                balancer.abandoned(endpoint)
+            if breaker is not None:
+                breaker.release()
+            raise
+        if balancer is not None and endpoint is not None:
+            balancer.succeeded(endpoint)
+        if breaker is not None:
+            # A tool answering RETRYABLE is shedding load, which counts against its circuit
+            overloaded = response.HasField('error') and response.error.type == RETRYABLE_TOOL_ERROR
+            breaker.record(not overloaded, time.monotonic() - started)
+        return response
+
+    def _may_retry(self, attempt: int) -> bool:
+        policy = self.retry_policy
+        if policy is None or attempt >= policy.max_attempts:
+            return False
+        return policy.budget is None or policy.budget.try_spend()
+
+    def _may_fail_over(self, tool_name: str, tried: List[str], failovers: int) -> bool:
+        """Whether another replica may take a call whose chosen circuit was open"""
+        balancer = self.balancer
+        if balancer is None or failovers >= len(balancer.endpoints):
+            return False
+        skip = set(tried)
+        if self.breakers is not None:
+            skip.update(self.breakers.open_targets(tool_name))
+        return any(endpoint.target not in skip for endpoint in balancer.endpoints)
+
+    async def _execute_request(
+        self,
+        request: tool_service_pb2.ExecuteRequest,
+        hedge: Optional[bool] = None
+    ) -> tool_service_pb2.ExecuteResponse:
+        """Run an Execute RPC under the client's retry and hedging policies"""
+        policy = self.retry_policy
+        if policy is not None and policy.budget is not None:
+            policy.budget.deposit()
+        tried: List[str] = []
+        attempt = 0
+        failovers = 0
+        while True:
+            attempt += 1
+            try:
+                response = await self._attempt(request, hedge, tried)
+            except CircuitOpenError:
+                # The circuit opened after the replica was chosen: move on to the
+                # next one straight away, which doesn't count as a retry
+                if not self._may_fail_over(request.tool_name, tried, failovers):
+                    raise
+                failovers += 1
+                attempt -= 1
+                continue
+            except grpc.RpcError as e:
+                if policy is None or not policy.is_retryable_rpc_error(e) or not self._may_retry(attempt):
+                    raise
+            else:
+                retryable = (
+                    policy is not None
+                    and response.HasField('error')
+                    and policy.is_retryable_tool_error(response.error.type)
+                )
+                if not retryable or not self._may_retry(attempt):
+                    return response
+            assert policy is not None
+            await asyncio.sleep(policy.backoff(attempt))
+
+    async def _attempt(
+        self,
+        request: tool_service_pb2.ExecuteRequest,
+        hedge: Optional[bool],
+        tried: List[str]
+    ) -> tool_service_pb2.ExecuteResponse:
+        hedging = self.hedging
+        if hedging is not None and (hedge if hedge is not None else hedging.applies_to(request.tool_name)):
+            return await self._hedged(request, hedging, tried)
+        started = time.monotonic()
+        response = await self._invoke('Execute', request, tried)
+        if hedging is not None:
+            hedging.record(request.tool_name, started)
+        return response
+
+    async def _hedged(
+        self,
+        request: tool_service_pb2.ExecuteRequest,
+        hedging: HedgingPolicy,
+        tried: List[str]
+    ) -> tool_service_pb2.ExecuteResponse:
+        """Send backup copies of a slow call to other replicas and keep the first answer"""
+        delay = hedging.delay_for(request.tool_name)
+        started = time.monotonic()
+        pending = {asyncio.ensure_future(self._invoke('Execute', request, tried))}
+        hedges = 0
+        error: Optional[BaseException] = None
+        try:
+            while pending:
+                timeout = delay if hedges < hedging.max_hedges else None
+                done, pending = await asyncio.wait(pending, timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.cancelled():
+                        continue
+                    if task.exception() is None:
+                        hedging.record(request.tool_name, started)
+                        return task.result()
+                    error = task.exception()
+                if not done and hedges < hedging.max_hedges:
+                    hedges += 1
+                    pending.add(asyncio.ensure_future(self._invoke('Execute', request, tried)))
+            assert error is not None
+            raise error
+        finally:
+            for task in pending:
+                task.cancel()
+            if pending:
+                await asyncio.gather(*pending, return_exceptions=True)
+
+    @property
+    def channel(self) -> grpc.aio.Channel:
+        return self._leased().channel
+
+    @property
+    def stub(self) -> tool_service_pb2_grpc.ToolServiceStub:
+        """Stub on the next pooled subchannel"""
+        return self._leased().next_stub()
         
     async def __aenter__(self):
+        if self.balancer is None:
+            self._leased()
         return self
         
     async def __aexit__(self, exc_type, exc_val, exc_tb):
         await self.close()
-        self.channel = grpc.aio.insecure_channel(f"{self.host}:{self.port}")
-        self.stub = tool_service_pb2_grpc.ToolServiceStub(self.channel)
-        self.use_json = self.use_json
 
     async def get_tool_schema(
         self,
@@ -38,61 +318,448 @@ class ToolServiceClient:
         )
         
         try:
-            response = await self.stub.GetToolSchema(request)
-            return {
-                "tool_name": response.tool_name,
-                "fields": [
-                    {
-                        "name": field.name,
-                        "type": field.type,
-                        "required": field.required,
-                        "description": field.description
-                    }
-                    for field in response.fields
-                ]
-            }
-        except grpc.RpcError as e:
+            response = await self._invoke('GetToolSchema', request)
+            return schema_dict(response)
+        except (grpc.RpcError, NoEndpointsError) as e:
             return {"error": str(e)}
 
+    async def _validation_error(self, tool_name: str, input_data: Dict[str, Any]) -> Optional[Dict]:
+        """Validate input locally; an error dict like the server's INVALID_INPUT, or None"""
+        entry = self.schema_cache.get(self.service, tool_name)
+        if entry is None:
+            request = tool_service_pb2.GetToolSchemaRequest(tool_name=tool_name)
+            try:
+                response = await self._invoke('GetToolSchema', request)
+            except grpc.RpcError:
+                # The server validates anyway, so go ahead without a schema
+                return None
+            entry = self.schema_cache.put(self.service, tool_name, response.json_schema, response.fingerprint)
+        if entry.validator is None:
+            return None
+        issues = entry.validator.validate(input_data)
+        if not issues:
+            return None
+        return {
+            'type': INVALID_INPUT,
+            'message': entry.validator.format(issues)
+        }
+
+    def execute_request(
+        self,
+        tool_name: str,
+        input_data: Dict[str, Any],
+        idempotency_key: Optional[str] = None
+    ) -> tool_service_pb2.ExecuteRequest:
+        """The ExecuteRequest for a call, encoded the way this client is configured to"""
+        request = tool_service_pb2.ExecuteRequest(
+            tool_name=tool_name
+        )
+        if idempotency_key is None and self.idempotency_keys:
+            idempotency_key = uuid.uuid4().hex
+        if idempotency_key is not None:
+            request.idempotency_key = idempotency_key
+        if self.paginate_results:
+            request.paginate = True
+        if self.validate_inputs:
+            entry = self.schema_cache.get(self.service, tool_name)
+            if entry is not None and entry.fingerprint:
+                request.schema_fingerprint = entry.fingerprint
+        
+        if self.use_json:
+            request.json_data = json.dumps(input_data)
+        else:
+            request.proto_data = json.dumps(input_data).encode()
+        return request
+
+    def decode_response(
+        self,
+        tool_name: str,
+        response: tool_service_pb2.ExecuteResponse
+    ) -> tuple[Optional[StructuredToolResponse], Optional[Dict]]:
+        """The (result, error) pair execute() returns for an ExecuteResponse"""
+        if self.validate_inputs:
+            self.schema_cache.observe(self.service, tool_name, response.schema_fingerprint)
+        
+        if response.HasField('error'):
+            return None, {
+                'type': response.error.type,
+                'message': response.error.message
+            }
+        
+        result_case = response.WhichOneof('result')
+        if result_case == 'structured_result':
+            result = decode_structured_result(response.structured_result, self.trusted)
+            if response.HasField('result_handle'):
+                handle = response.result_handle
+                result.result_handle = ResultHandle(
+                    handle_id=handle.handle_id,
+                    total_bytes=handle.total_bytes,
+                    total_lines=handle.total_lines,
+                    page_bytes=handle.page_bytes,
+                    expires_at=handle.expires_at
+                )
+            return result, None
+        if result_case == 'json_result':
+            return StructuredToolResponse.model_validate_json(response.json_result), None
+        if result_case == 'proto_result':
+            return StructuredToolResponse.model_validate_json(response.proto_result), None
+        return None, {
+            'type': 'RPC_ERROR',
+            'message': 'Response has neither a result nor an error'
+        }
+
     async def execute(
         self,
         tool_name: str,
-        input_data: Dict[str, Any]
+        input_data: Dict[str, Any],
+        hedge: Optional[bool] = None,
+        idempotency_key: Optional[str] = None
     ) -> tuple[Optional[StructuredToolResponse], Optional[Dict]]:
-        """Execute a tool with the given input data"""
+        """
+        Execute a tool with the given input data.
+
+        Args:
+            tool_name: Name of the tool to run
+            input_data: Tool input
+            hedge: Force hedging on or off for this call; by default the
+                hedging policy decides based on the tool name
+            idempotency_key: Key identifying this logical call. The server runs
+                calls with the same key once and answers duplicates with the
+                first call's response
+        """
         try:
-            request = tool_service_pb2.ExecuteRequest(
-                tool_name=tool_name
-            )
-            
-            if self.use_json:
-                request.json_data = json.dumps(input_data)
-            else:
-                request.proto_data = json.dumps(input_data).encode()
-            
-            response = await self.stub.Execute(request)
-            
-            if response.HasField('error'):
-                return None, {
-                    'type': response.error.type,
-                    'message': response.error.message
-                }
-            
-            if response.HasField('json_result'):
-                result_dict = json.loads(response.json_result)
-            else:
-                result_dict = json.loads(response.proto_result.decode())
-            
-            return StructuredToolResponse(**result_dict), None
+            if self.validate_inputs:
+                invalid = await self._validation_error(tool_name, input_data)
+                if invalid is not None:
+                    return None, invalid
+
+            request = self.execute_request(tool_name, input_data, idempotency_key)
+            response = await self._execute_request(request, hedge)
+            return self.decode_response(tool_name, response)
             
         except grpc.RpcError as e:
             return None, {
                 'type': 'RPC_ERROR',
                 'message': str(e)
             }
+        except CircuitOpenError as e:
+            return None, {
+                'type': 'CIRCUIT_OPEN',
+                'message': str(e)
+            }
+        except NoEndpointsError as e:
+            return None, {
+                'type': 'NO_ENDPOINTS',
+                'message': str(e)
+            }
+
+    def session(self, max_in_flight: int = DEFAULT_MAX_IN_FLIGHT) -> ToolSession:
+        """
+        A ToolSession multiplexing calls over one stream, to use with `async with`.
+
+        Args:
+            max_in_flight: Most calls outstanding on the session at once
+        """
+        return ToolSession(self, max_in_flight)
+
+    def as_completed(
+        self,
+        calls: Calls,
+        max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+        tool_concurrency: Union[int, Mapping[str, int], None] = None,
+        window: Optional[int] = None
+    ) -> AsyncIterator[CallResult]:
+        """
+        Execute many (tool_name, input_data) calls concurrently, yielding each
+        CallResult as soon as it finishes.
+
+        Args:
+            calls: Iterable or async iterable of (tool_name, input_data) pairs,
+                consumed lazily
+            max_concurrency: Most calls in flight at once
+            tool_concurrency: Most calls in flight per tool, either one limit for
+                all tools or a mapping of tool name to limit
+            window: Most calls held at once, running or waiting (defaults to twice
+                max_concurrency)
+
+        Close the iterator (e.g. with contextlib.aclosing) to stop early; calls
+        still running are cancelled.
+        """
+        return fan_out(self.execute, calls, max_concurrency, tool_concurrency, window)
+
+    def execute_many(
+        self,
+        calls: Calls,
+        max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+        tool_concurrency: Union[int, Mapping[str, int], None] = None,
+        window: Optional[int] = None
+    ) -> AsyncIterator[CallResult]:
+        """
+        Like as_completed(), but yields results in the order of `calls`. A slow
+        call holds back the results after it, and no more than `window` calls
+        are pulled ahead of it.
+        """
+        return fan_out(self.execute, calls, max_concurrency, tool_concurrency, window, ordered=True)
+
+    async def execute_pipeline(
+        self,
+        steps: Sequence[Step],
+        outputs: Optional[Sequence[str]] = None
+    ) -> Tuple[Optional[Dict[str, StepResult]], Optional[Dict]]:
+        """
+        Run a DAG of tool calls on the server in one round trip. Steps run as soon
+        as the steps they take input from (or run `after`) have finished, and
+        intermediate results stay on the server.
+
+        Args:
+            steps: The pipeline's steps
+            outputs: Names of the steps whose results to return; by default the
+                steps no other step depends on
+
+        Returns a StepResult with timings for every step, by name. Failed steps
+        carry their error, and the steps depending on them are skipped.
+        """
+        tool_names = {step.name: step.tool_name for step in steps}
+        try:
+            response = await self._invoke('ExecutePipeline', pipeline_request(steps, outputs))
+        except grpc.RpcError as e:
+            return None, {
+                'type': 'RPC_ERROR',
+                'message': str(e)
+            }
+        except NoEndpointsError as e:
+            return None, {
+                'type': 'NO_ENDPOINTS',
+                'message': str(e)
+            }
+
+        results: Dict[str, StepResult] = {}
+        for answer in response.steps:
+            step = results[answer.name] = StepResult(
+                name=answer.name,
+                skipped=answer.skipped,
+                started_ms=answer.started_ms,
+                duration_ms=answer.duration_ms
+            )
+            if answer.HasField('response'):
+                step.result, step.error = self.decode_response(tool_names[answer.name], answer.response)
+        return results, None
+
+    async def _read_result(self, request: tool_service_pb2.ReadResultRequest) -> tool_service_pb2.ResultChunk:
+        handle_id = request.handle_id
+        known = self._result_targets.get(handle_id)
+        if known is not None or self.balancer is None:
+            targets = [known or self.target]
+        else:
+            # Results live on the replica that ran the call; find it
+            targets = [endpoint.target for endpoint in self.balancer.endpoints]
+        missing: Optional[grpc.RpcError] = None
+        for target in targets:
+            try:
+                chunk = await self._leased(target).next_stub().ReadResult(request)
+            except grpc.RpcError as e:
+                if e.code() != grpc.StatusCode.NOT_FOUND:
+                    raise
+                missing = e
+                continue
+            if self.balancer is not None and known is None:
+                if len(self._result_targets) >= 1024:
+                    del self._result_targets[next(iter(self._result_targets))]
+                self._result_targets[handle_id] = target
+            return chunk
+        assert missing is not None
+        raise missing
+
+    async def read_result(
+        self,
+        handle_id: str,
+        offset: int = 0,
+        limit: int = 0,
+        lines: bool = False
+    ) -> Tuple[Optional[ResultRange], Optional[Dict]]:
+        """
+        Read a range of a large result kept on the server, from the handle of a
+        paginated response (see paginate_results).
+
+        Args:
+            handle_id: result.result_handle.handle_id
+            offset: Byte to start at, or line with `lines`
+            limit: Most bytes (or lines) to read; 0 reads as much as the server
+                sends at once. Continue from the range's next_offset.
+            lines: Read whole lines instead of bytes; a line longer than the server
+                sends at once fails with OUT_OF_RANGE and has to be read by bytes
+        """
+        request = tool_service_pb2.ReadResultRequest(handle_id=handle_id, offset=offset, limit=limit, lines=lines)
+        try:
+            chunk = await self._read_result(request)
+        except grpc.RpcError as e:
+            return None, {
+                'type': 'RPC_ERROR',
+                'message': str(e)
+            }
+        return ResultRange(data=chunk.data, offset=chunk.offset, next_offset=chunk.next_offset, eof=chunk.eof), None
+
+    async def read_content(self, result: StructuredToolResponse) -> Tuple[Optional[str], Optional[Dict]]:
+        """The full content of a result, reading the rest from the server if it was paginated"""
+        handle = result.result_handle
+        if handle is None:
+            return result.content, None
+        parts = [result.content.encode()]
+        offset = handle.page_bytes
+        while offset < handle.total_bytes:
+            chunk, error = await self.read_result(handle.handle_id, offset)
+            if error is not None:
+                return None, error
+            assert chunk is not None
+            parts.append(chunk.data)
+            if chunk.eof:
+                break
+            offset = chunk.next_offset
+        return b''.join(parts).decode(), None
+
+    def _job_info(self, job: tool_service_pb2.Job, target: str) -> "JobInfo":
+        # Imported here so clients that don't use jobs don't load the job store
+        from wabee.rpc.jobs import CANCELLED, JobInfo
+
+        result, error = None, None
+        if job.state == CANCELLED:
+            error = {'type': 'CANCELLED', 'message': f"Job {job.job_id} was cancelled"}
+        elif job.code:
+            code = STATUS_CODES.get(job.code, grpc.StatusCode.UNKNOWN)
+            error = {'type': 'RPC_ERROR', 'message': f"{code}: {job.details}"}
+        elif job.HasField('response'):
+            result, error = self.decode_response(job.tool_name, job.response)
+        return JobInfo(
+            job_id=job.job_id,
+            tool_name=job.tool_name,
+            state=job.state,
+            target=target,
+            submitted_at=job.submitted_at,
+            started_at=job.started_at or None,
+            finished_at=job.finished_at or None,
+            result=result,
+            error=error
+        )
+
+    async def submit_job(
+        self,
+        tool_name: str,
+        input_data: Dict[str, Any],
+        idempotency_key: Optional[str] = None
+    ) -> Tuple[Optional["JobInfo"], Optional[Dict]]:
+        """
+        Queue a tool call to run in the background on the server, for calls
+        that outlive a client or a connection. Follow the job with get_job(),
+        watch_job() or wait_job(), and stop it with cancel_job(). Jobs
+        submitted with the same idempotency_key run the tool once.
+        """
+        try:
+            if self.validate_inputs:
+                invalid = await self._validation_error(tool_name, input_data)
+                if invalid is not None:
+                    return None, invalid
+            tried: List[str] = []
+            request = self.execute_request(tool_name, input_data, idempotency_key)
+            job = await self._invoke('SubmitJob', request, tried)
+        except grpc.RpcError as e:
+            return None, {
+                'type': 'RPC_ERROR',
+                'message': str(e)
+            }
+        except NoEndpointsError as e:
+            return None, {
+                'type': 'NO_ENDPOINTS',
+                'message': str(e)
+            }
+        if self.balancer is not None:
+            if len(self._job_targets) >= 1024:
+                del self._job_targets[next(iter(self._job_targets))]
+            self._job_targets[job.job_id] = tried[-1]
+        return self._job_info(job, tried[-1]), None
+
+    async def _job_rpc(self, method: str, job_id: str) -> Tuple[Optional["JobInfo"], Optional[Dict]]:
+        # Jobs live on the replica they were submitted to, so skip the balancer
+        target = self._job_targets.get(job_id, self.target)
+        request = tool_service_pb2.JobRequest(job_id=job_id)
+        try:
+            job = await getattr(self._leased(target).next_stub(), method)(request)
+        except grpc.RpcError as e:
+            return None, {
+                'type': 'RPC_ERROR',
+                'message': str(e)
+            }
+        return self._job_info(job, target), None
+
+    async def get_job(self, job_id: str) -> Tuple[Optional["JobInfo"], Optional[Dict]]:
+        """The current state of a job, with its result or error once it has finished"""
+        return await self._job_rpc('GetJob', job_id)
+
+    async def cancel_job(self, job_id: str) -> Tuple[Optional["JobInfo"], Optional[Dict]]:
+        """Cancel a queued or running job; a finished job is returned as is"""
+        return await self._job_rpc('CancelJob', job_id)
+
+    async def watch_job(self, job_id: str) -> AsyncIterator["JobInfo"]:
+        """
+        Yield the job now and whenever its state changes, until it has finished.
+        Raises grpc.RpcError if the job isn't known or the stream fails.
+        """
+        target = self._job_targets.get(job_id, self.target)
+        call = self._leased(target).next_stub().WatchJob(tool_service_pb2.JobRequest(job_id=job_id))
+        try:
+            async for job in call:
+                yield self._job_info(job, target)
+        finally:
+            call.cancel()
+
+    async def wait_job(self, job_id: str) -> Tuple[Optional[StructuredToolResponse], Optional[Dict]]:
+        """Wait for a job to finish and return its (result, error) like execute()"""
+        try:
+            async for job in self.watch_job(job_id):
+                if job.done:
+                    return job.result, job.error
+        except grpc.RpcError as e:
+            return None, {
+                'type': 'RPC_ERROR',
+                'message': str(e)
+            }
+        return None, {
+            'type': 'RPC_ERROR',
+            'message': f"Stream ended before job {job_id} finished"
+        }
 
     async def close(self):
-        await self.channel.close()
+        """Give the channels back to the pool; the client leases them again if used later"""
+        while self._leases:
+            _, lease = self._leases.popitem()
+            lease.release()
+
+def create_client(
+    tools: Optional[Dict[str, Any]] = None,
+    transport: Optional[str] = None,
+    **kwargs: Any
+) -> Union[ToolServiceClient, "LocalToolClient"]:
+    """
+    Client for calling tools over gRPC or in-process, chosen by configuration.
+
+    Args:
+        tools: Tools available in this process, by name; required for the local transport
+        transport: "grpc" or "local"; defaults to the WABEE_TOOL_TRANSPORT
+            environment variable, then to "grpc"
+        **kwargs: ToolServiceClient arguments for the gRPC transport; the local
+            transport takes none
+    """
+    transport = (transport or os.environ.get('WABEE_TOOL_TRANSPORT') or TRANSPORT_GRPC).lower()
+    if transport == TRANSPORT_LOCAL:
+        # Imported here so remote-only callers don't load the server
+        from wabee.rpc.local import LocalToolClient
+        if tools is None:
+            raise ValueError("The local transport needs the tools to call")
+        if kwargs:
+            raise TypeError(f"The local transport takes no client arguments, got {', '.join(sorted(kwargs))}")
+        return LocalToolClient(tools)
+    if transport != TRANSPORT_GRPC:
+        raise ValueError(f"Unknown tool transport '{transport}'")
+    return ToolServiceClient(**kwargs)
 
 async def execute_tool(
     tool_name: str,
@@ -100,7 +767,7 @@ async def execute_tool(
     host: str = "localhost",
     port: int = 50051
 ) -> Union[Any, Dict[str, str]]:
-    """Convenience function for one-off tool execution"""
+    """Convenience function for one-off tool execution, reusing pooled connections"""
     async with ToolServiceClient(host, port) as client:
         result, error = await client.execute(tool_name, input_data)
         if error:
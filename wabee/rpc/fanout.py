@@ -0,0 +1,161 @@
+import asyncio
+from collections import deque
+from dataclasses import dataclass
+from typing import (
+    Any, AsyncGenerator, AsyncIterable, AsyncIterator, Awaitable, Callable, Deque, Dict, Iterable,
+    Mapping, Optional, Set, Tuple, Union
+)
+
+DEFAULT_MAX_CONCURRENCY = 16
+
+ToolCall = Tuple[str, Dict[str, Any]]
+Calls = Union[Iterable[ToolCall], AsyncIterable[ToolCall]]
+Execute = Callable[[str, Dict[str, Any]], Awaitable[Tuple[Any, Optional[Dict]]]]
+
+@dataclass
+class CallResult:
+    """Outcome of one call in a fan-out; index is the call's position in the input"""
+    index: int
+    tool_name: str
+    input_data: Dict[str, Any]
+    result: Any
+    error: Optional[Dict]
+
+async def _aiter(calls: Calls) -> AsyncGenerator[ToolCall, None]:
+    if isinstance(calls, AsyncIterable):
+        async for call in calls:
+            yield call
+    else:
+        for call in calls:
+            yield call
+
+async def _run(execute: Execute, index: int, tool_name: str, input_data: Dict[str, Any]) -> CallResult:
+    try:
+        result, error = await execute(tool_name, input_data)
+    except Exception as e:
+        # One bad call shouldn't end a stream of many
+        result, error = None, {'type': 'CLIENT_ERROR', 'message': f"{type(e).__name__}: {e}"}
+    return CallResult(index, tool_name, input_data, result, error)
+
+async def fan_out(
+    execute: Execute,
+    calls: Calls,
+    max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+    tool_concurrency: Union[int, Mapping[str, int], None] = None,
+    window: Optional[int] = None,
+    ordered: bool = False
+) -> AsyncIterator[CallResult]:
+    """
+    Run calls concurrently and yield their results as they finish, or in input
+    order if `ordered` is set.
+
+    At most max_concurrency calls run at once, and at most tool_concurrency per
+    tool (one limit for every tool, or a mapping of tool name to limit). Calls
+    are pulled from `calls` lazily: no more than `window` (by default twice
+    max_concurrency) are held at any time, counting running calls, calls
+    waiting for their tool's limit and, when ordered, finished calls waiting for
+    earlier ones. Memory stays flat however long the input is.
+
+    Closing the iterator early (e.g. with contextlib.aclosing) cancels the calls
+    still running.
+    """
+    if max_concurrency < 1:
+        raise ValueError("max_concurrency must be at least 1")
+    window = max(window or 2 * max_concurrency, max_concurrency)
+
+    def tool_limit(tool_name: str) -> Optional[int]:
+        if isinstance(tool_concurrency, Mapping):
+            return tool_concurrency.get(tool_name)
+        return tool_concurrency
+
+    # Plain iterables are read directly; async ones through a task, so calls
+    # keep finishing while the source is slow
+    items = iter(calls) if not isinstance(calls, AsyncIterable) else None
+    source = _aiter(calls) if items is None else None
+    pulling: Optional[asyncio.Future] = None
+    exhausted = False
+    pulled = 0
+    yielded = 0
+    running: Set[asyncio.Future] = set()
+    per_tool: Dict[str, int] = {}
+    waiting: Dict[str, Deque[Tuple[int, str, Dict[str, Any]]]] = {}
+    finished: Dict[int, CallResult] = {}
+
+    def can_start(tool_name: str) -> bool:
+        limit = tool_limit(tool_name)
+        return len(running) < max_concurrency and (limit is None or per_tool.get(tool_name, 0) < limit)
+
+    def start(index: int, tool_name: str, input_data: Dict[str, Any]) -> None:
+        per_tool[tool_name] = per_tool.get(tool_name, 0) + 1
+        running.add(asyncio.ensure_future(_run(execute, index, tool_name, input_data)))
+
+    def admit(call: ToolCall) -> None:
+        nonlocal pulled
+        tool_name, input_data = call
+        index = pulled
+        pulled += 1
+        if can_start(tool_name) and tool_name not in waiting:
+            start(index, tool_name, input_data)
+        else:
+            waiting.setdefault(tool_name, deque()).append((index, tool_name, input_data))
+
+    def start_waiting() -> None:
+        for tool_name, queue in list(waiting.items()):
+            while queue and can_start(tool_name):
+                start(*queue.popleft())
+            if not queue:
+                del waiting[tool_name]
+
+    try:
+        while True:
+            while not exhausted and pulling is None and len(running) < max_concurrency and pulled - yielded < window:
+                if items is not None:
+                    try:
+                        admit(next(items))
+                    except StopIteration:
+                        exhausted = True
+                else:
+                    assert source is not None
+                    pulling = asyncio.ensure_future(source.__anext__())
+            if pulling is None and not running:
+                break
+
+            pending = set(running)
+            if pulling is not None:
+                pending.add(pulling)
+            done, _ = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+
+            if pulling is not None and pulling in done:
+                done.discard(pulling)
+                try:
+                    admit(pulling.result())
+                except StopAsyncIteration:
+                    exhausted = True
+                pulling = None
+
+            for task in done:
+                running.discard(task)
+                outcome: CallResult = task.result()
+                per_tool[outcome.tool_name] -= 1
+                finished[outcome.index] = outcome
+            start_waiting()
+
+            if ordered:
+                while yielded in finished:
+                    yield finished.pop(yielded)
+                    yielded += 1
+            else:
+                while finished:
+                    _, outcome = finished.popitem()
+                    yielded += 1
+                    yield outcome
+    finally:
+        leftovers = set(running)
+        if pulling is not None:
+            leftovers.add(pulling)
+        for task in leftovers:
+            task.cancel()
+        if leftovers:
+            await asyncio.gather(*leftovers, return_exceptions=True)
+        if source is not None:
+            await source.aclose()
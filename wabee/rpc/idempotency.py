@@ -0,0 +1,219 @@
+import os
+import time
+import asyncio
+import logging
+import sqlite3
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Awaitable, Callable, Dict, Optional, Tuple, Union
+
+from wabee.rpc.retry import RETRYABLE_TOOL_ERROR
+from wabee.rpc.protos import tool_service_pb2
+
+logger = logging.getLogger(__name__)
+
+# sqlite file completed keys are kept in; without one they are kept in memory
+DEFAULT_IDEMPOTENCY_STORE = os.environ.get("WABEE_IDEMPOTENCY_STORE") or None
+# Seconds a completed key's response is kept
+DEFAULT_IDEMPOTENCY_TTL = float(os.environ.get("WABEE_IDEMPOTENCY_TTL", "600"))
+DEFAULT_IDEMPOTENCY_MAX_KEYS = int(os.environ.get("WABEE_IDEMPOTENCY_MAX_KEYS", "10000"))
+
+class MemoryIdempotencyStore:
+    """Serialized responses by key, in memory; expired and oldest keys are evicted first"""
+
+    def __init__(self, ttl: float = DEFAULT_IDEMPOTENCY_TTL, maxsize: int = DEFAULT_IDEMPOTENCY_MAX_KEYS) -> None:
+        self.ttl = ttl
+        self.maxsize = maxsize
+        # Insertion order is expiry order, since every key lives for the same ttl
+        self._entries: "OrderedDict[str, Tuple[float, bytes]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _expire(self, now: float) -> None:
+        while self._entries:
+            expires_at, _ = next(iter(self._entries.values()))
+            if expires_at > now:
+                break
+            self._entries.popitem(last=False)
+
+    def get(self, key: str) -> Optional[bytes]:
+        with self._lock:
+            self._expire(time.monotonic())
+            entry = self._entries.get(key)
+        return entry[1] if entry is not None else None
+
+    def set(self, key: str, value: bytes) -> None:
+        now = time.monotonic()
+        with self._lock:
+            self._expire(now)
+            self._entries.pop(key, None)
+            self._entries[key] = (now + self.ttl, value)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def close(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+class SqliteIdempotencyStore:
+    """
+    Serialized responses by key in a sqlite file, so completed keys are still
+    answered after a restart and by every server process sharing the file.
+    """
+
+    # Writes between sweeps of expired and excess keys
+    SWEEP_INTERVAL = 64
+
+    def __init__(
+        self,
+        path: Union[str, Path],
+        ttl: float = DEFAULT_IDEMPOTENCY_TTL,
+        maxsize: int = DEFAULT_IDEMPOTENCY_MAX_KEYS
+    ) -> None:
+        self.path = Path(path)
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._writes = 0
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS idempotency ("
+            "key TEXT PRIMARY KEY, response BLOB NOT NULL, expires_at REAL NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idempotency_by_expiry ON idempotency (expires_at)")
+        self.sweep()
+
+    def get(self, key: str) -> Optional[bytes]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT response FROM idempotency WHERE key = ? AND expires_at > ?", (key, time.time())
+            ).fetchone()
+        return row[0] if row is not None else None
+
+    def set(self, key: str, value: bytes) -> None:
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO idempotency (key, response, expires_at) VALUES (?, ?, ?)",
+                (key, value, time.time() + self.ttl)
+            )
+            self._writes += 1
+            sweep = self._writes % self.SWEEP_INTERVAL == 0
+        if sweep:
+            self.sweep()
+
+    def sweep(self) -> int:
+        """Delete expired keys, then the oldest ones beyond maxsize"""
+        with self._lock:
+            expired = self._conn.execute(
+                "DELETE FROM idempotency WHERE expires_at <= ?", (time.time(),)
+            ).rowcount
+            excess = self._conn.execute(
+                "DELETE FROM idempotency WHERE key IN "
+                "(SELECT key FROM idempotency ORDER BY expires_at DESC LIMIT -1 OFFSET ?)",
+                (self.maxsize,)
+            ).rowcount
+        return expired + excess
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+IdempotencyStore = Union[MemoryIdempotencyStore, SqliteIdempotencyStore]
+
+@dataclass
+class _Call:
+    task: "asyncio.Task[tool_service_pb2.ExecuteResponse]"
+    waiters: int = 0
+
+class IdempotencyCache:
+    """
+    Runs the calls sharing an idempotency key once.
+
+    A duplicate arriving while the first call runs waits for that call's
+    response; one arriving after it completed gets the stored response. The
+    call keeps running as long as any duplicate waits for it. Calls failing
+    with a gRPC status or a RETRYABLE tool error aren't stored, so retrying
+    them runs the tool again.
+    """
+
+    def __init__(self, store: Optional[IdempotencyStore] = None) -> None:
+        if store is None:
+            if DEFAULT_IDEMPOTENCY_STORE is not None:
+                store = SqliteIdempotencyStore(DEFAULT_IDEMPOTENCY_STORE)
+            else:
+                store = MemoryIdempotencyStore()
+        self.store = store
+        # Reads and writes to a file go through a thread to keep the event loop free
+        self._blocking = isinstance(store, SqliteIdempotencyStore)
+        self._running: Dict[str, _Call] = {}
+        self.replayed = 0
+        self.attached = 0
+
+    async def _get(self, key: str) -> Optional[bytes]:
+        if self._blocking:
+            return await asyncio.to_thread(self.store.get, key)
+        return self.store.get(key)
+
+    async def _set(self, key: str, value: bytes) -> None:
+        if self._blocking:
+            await asyncio.to_thread(self.store.set, key, value)
+        else:
+            self.store.set(key, value)
+
+    async def _complete(
+        self,
+        key: str,
+        compute: Callable[[], Awaitable[tool_service_pb2.ExecuteResponse]]
+    ) -> tool_service_pb2.ExecuteResponse:
+        try:
+            response = await compute()
+            if not (response.HasField('error') and response.error.type == RETRYABLE_TOOL_ERROR):
+                await self._set(key, response.SerializeToString())
+            return response
+        finally:
+            call = self._running.get(key)
+            if call is not None and call.task is asyncio.current_task():
+                del self._running[key]
+
+    async def run(
+        self,
+        key: str,
+        compute: Callable[[], Awaitable[tool_service_pb2.ExecuteResponse]]
+    ) -> tool_service_pb2.ExecuteResponse:
+        """The response for key: stored, from the call already running, or computed now"""
+        stored = await self._get(key)
+        if stored is not None:
+            self.replayed += 1
+            return tool_service_pb2.ExecuteResponse.FromString(stored)
+
+        call = self._running.get(key)
+        if call is None:
+            call = self._running[key] = _Call(asyncio.ensure_future(self._complete(key, compute)))
+        else:
+            self.attached += 1
+        call.waiters += 1
+        try:
+            return await asyncio.shield(call.task)
+        finally:
+            call.waiters -= 1
+            if call.waiters == 0 and not call.task.done():
+                # Nobody is waiting for the call any more; a later duplicate starts afresh
+                call.task.cancel()
+                if self._running.get(key) is call:
+                    del self._running[key]
+
+    def stats(self) -> dict:
+        return {
+            "replayed": self.replayed,
+            "attached": self.attached,
+            "running": len(self._running),
+        }
+
+    def close(self) -> None:
+        self.store.close()
@@ -0,0 +1,358 @@
+import os
+import time
+import uuid
+import asyncio
+import logging
+import threading
+from dataclasses import dataclass
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, AsyncIterator, Dict, List, Optional, Set, Union
+
+from wabee.rpc.protos import tool_service_pb2
+
+if TYPE_CHECKING:
+    from wabee.rpc.server import ToolServicer
+
+logger = logging.getLogger(__name__)
+
+QUEUED = "queued"
+RUNNING = "running"
+SUCCEEDED = "succeeded"
+FAILED = "failed"
+CANCELLED = "cancelled"
+TERMINAL_STATES = frozenset({SUCCEEDED, FAILED, CANCELLED})
+
+# sqlite file jobs are kept in, relative to the working directory; set it empty
+# for jobs to only live as long as the server
+DEFAULT_JOB_STORE = os.environ.get("WABEE_JOB_STORE", os.path.join(".wabee", "jobs.sqlite3")) or None
+DEFAULT_JOB_WORKERS = int(os.environ.get("WABEE_JOB_WORKERS", "4"))
+DEFAULT_MAX_QUEUED_JOBS = int(os.environ.get("WABEE_JOB_QUEUE_SIZE", "1000"))
+# Seconds finished jobs are kept for clients to collect
+DEFAULT_JOB_RETENTION = float(os.environ.get("WABEE_JOB_RETENTION", "86400"))
+# Longest wait between removals of expired jobs
+PRUNE_INTERVAL = 60.0
+
+class JobNotFoundError(Exception):
+    """Raised for a job id the server doesn't know"""
+    pass
+
+class JobQueueFullError(Exception):
+    """Raised when a job is submitted while the queue is at capacity"""
+    pass
+
+@dataclass
+class JobInfo:
+    """A job as seen by the client; result and error are set once it has finished"""
+    job_id: str
+    tool_name: str
+    state: str
+    target: str
+    submitted_at: float
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+    result: Any = None
+    error: Optional[Dict] = None
+
+    @property
+    def done(self) -> bool:
+        return self.state in TERMINAL_STATES
+
+class JobStore:
+    """Jobs with their requests and responses in sqlite, in a file or in memory"""
+
+    def __init__(self, path: Optional[Union[str, Path]] = None) -> None:
+        # Imported here so servers that never run a job don't load sqlite
+        import sqlite3
+
+        self.path = Path(path) if path is not None else None
+        self._lock = threading.Lock()
+        if self.path is None:
+            self._conn = sqlite3.connect(":memory:", check_same_thread=False, isolation_level=None)
+        else:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._conn = sqlite3.connect(str(self.path), check_same_thread=False, isolation_level=None)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS jobs ("
+            "job_id TEXT PRIMARY KEY, tool_name TEXT NOT NULL, state TEXT NOT NULL, "
+            "request BLOB NOT NULL, response BLOB, code INTEGER NOT NULL DEFAULT 0, "
+            "details TEXT NOT NULL DEFAULT '', submitted_at REAL NOT NULL, "
+            "started_at REAL NOT NULL DEFAULT 0, finished_at REAL NOT NULL DEFAULT 0)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS jobs_by_state ON jobs (state, submitted_at)")
+
+    def add(self, job: tool_service_pb2.Job, request: tool_service_pb2.ExecuteRequest) -> None:
+        with self._lock:
+            self._conn.execute(
+                "INSERT INTO jobs (job_id, tool_name, state, request, submitted_at) VALUES (?, ?, ?, ?, ?)",
+                (job.job_id, job.tool_name, job.state, request.SerializeToString(), job.submitted_at)
+            )
+
+    def get(self, job_id: str) -> Optional[tool_service_pb2.Job]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT job_id, tool_name, state, response, code, details, submitted_at, started_at, finished_at "
+                "FROM jobs WHERE job_id = ?", (job_id,)
+            ).fetchone()
+        if row is None:
+            return None
+        job = tool_service_pb2.Job(
+            job_id=row[0], tool_name=row[1], state=row[2], code=row[4], details=row[5],
+            submitted_at=row[6], started_at=row[7], finished_at=row[8]
+        )
+        if row[3] is not None:
+            job.response.ParseFromString(row[3])
+        return job
+
+    def request(self, job_id: str) -> Optional[tool_service_pb2.ExecuteRequest]:
+        with self._lock:
+            row = self._conn.execute("SELECT request FROM jobs WHERE job_id = ?", (job_id,)).fetchone()
+        return tool_service_pb2.ExecuteRequest.FromString(row[0]) if row is not None else None
+
+    def update(self, job: tool_service_pb2.Job) -> None:
+        response = job.response.SerializeToString() if job.HasField('response') else None
+        with self._lock:
+            self._conn.execute(
+                "UPDATE jobs SET state = ?, response = ?, code = ?, details = ?, started_at = ?, finished_at = ? "
+                "WHERE job_id = ?",
+                (job.state, response, job.code, job.details, job.started_at, job.finished_at, job.job_id)
+            )
+
+    def ids(self, state: str) -> List[str]:
+        """Ids of the jobs in a state, oldest first"""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT job_id FROM jobs WHERE state = ? ORDER BY submitted_at", (state,)
+            ).fetchall()
+        return [row[0] for row in rows]
+
+    def count(self, state: str) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM jobs WHERE state = ?", (state,)).fetchone()[0]
+
+    def requeue_running(self) -> int:
+        """Put jobs that were running when the server stopped back in the queue"""
+        with self._lock:
+            cursor = self._conn.execute(
+                "UPDATE jobs SET state = ?, started_at = 0 WHERE state = ?", (QUEUED, RUNNING)
+            )
+        return cursor.rowcount
+
+    def prune(self, finished_before: float) -> int:
+        """Delete jobs that finished before the given time"""
+        with self._lock:
+            cursor = self._conn.execute(
+                f"DELETE FROM jobs WHERE state IN ({', '.join('?' * len(TERMINAL_STATES))}) AND finished_at < ?",
+                (*sorted(TERMINAL_STATES), finished_before)
+            )
+        return cursor.rowcount
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+class JobManager:
+    """
+    Runs submitted calls as jobs on a pool of worker tasks.
+
+    Jobs wait in a queue of at most max_queued jobs and are kept in a JobStore,
+    so with a store file queued jobs survive a restart. Jobs that were running
+    when the server stopped run again, so tools used as jobs should be safe to
+    repeat. Finished jobs are kept for `retention` seconds.
+    """
+
+    def __init__(
+        self,
+        servicer: "ToolServicer",
+        path: Optional[Union[str, Path]] = DEFAULT_JOB_STORE,
+        workers: int = DEFAULT_JOB_WORKERS,
+        max_queued: int = DEFAULT_MAX_QUEUED_JOBS,
+        retention: float = DEFAULT_JOB_RETENTION
+    ) -> None:
+        self.servicer = servicer
+        self.path = path
+        self.workers = max(1, workers)
+        self.max_queued = max_queued
+        self.retention = retention
+        self.store: Optional[JobStore] = None
+        self._queue: Optional["asyncio.Queue[str]"] = None
+        self._workers: List["asyncio.Task[None]"] = []
+        self._running: Dict[str, "asyncio.Task[Any]"] = {}
+        self._cancelled: Set[str] = set()
+        self._changed: Dict[str, asyncio.Event] = {}
+        self._pruner: Optional["asyncio.Task[None]"] = None
+
+    @property
+    def started(self) -> bool:
+        return bool(self._workers)
+
+    @property
+    def has_store(self) -> bool:
+        """Whether a store file exists, e.g. with jobs left from a previous run"""
+        return self.path is not None and os.path.exists(self.path)
+
+    async def start(self) -> None:
+        """Open the store, queue the jobs left from a previous run and start the workers"""
+        if self.started:
+            return
+        if self.store is None:
+            self.store = JobStore(self.path)
+        store = self.store
+        pruned = store.prune(time.time() - self.retention)
+        requeued = store.requeue_running()
+        self._queue = asyncio.Queue()
+        pending = store.ids(QUEUED)
+        for job_id in pending:
+            self._queue.put_nowait(job_id)
+        self._workers = [asyncio.ensure_future(self._work()) for _ in range(self.workers)]
+        self._pruner = asyncio.ensure_future(self._prune())
+        logger.info(
+            f"Job queue started with {self.workers} workers: {len(pending)} jobs queued "
+            f"({requeued} interrupted), {pruned} expired jobs removed"
+        )
+
+    async def stop(self) -> None:
+        """Stop the workers; jobs they were running go back to the queue"""
+        workers, self._workers = self._workers, []
+        if self._pruner is not None:
+            workers.append(self._pruner)
+            self._pruner = None
+        for worker in workers:
+            worker.cancel()
+        if workers:
+            await asyncio.gather(*workers, return_exceptions=True)
+        if self.store is not None:
+            self.store.close()
+            self.store = None
+
+    def _notify(self, job_id: str) -> None:
+        event = self._changed.pop(job_id, None)
+        if event is not None:
+            event.set()
+
+    def _save(self, job: tool_service_pb2.Job) -> None:
+        assert self.store is not None
+        self.store.update(job)
+        self._notify(job.job_id)
+
+    async def _prune(self) -> None:
+        # Often enough that finished jobs don't outlive their retention by much
+        interval = min(max(self.retention, 0.01), PRUNE_INTERVAL)
+        while True:
+            await asyncio.sleep(interval)
+            assert self.store is not None
+            pruned = self.store.prune(time.time() - self.retention)
+            if pruned:
+                logger.debug(f"Removed {pruned} expired jobs")
+
+    async def _work(self) -> None:
+        assert self._queue is not None
+        while True:
+            job_id = await self._queue.get()
+            await self._run(job_id)
+
+    async def _run(self, job_id: str) -> None:
+        # Imported here so clients can use JobInfo without loading the server
+        from wabee.rpc.server import CallStatusError
+
+        assert self.store is not None
+        job = self.store.get(job_id)
+        request = self.store.request(job_id)
+        if job is None or request is None or job.state != QUEUED:
+            return
+        job.state = RUNNING
+        job.started_at = time.time()
+        self._save(job)
+
+        task = asyncio.ensure_future(self.servicer.execute_request(request))
+        self._running[job_id] = task
+        try:
+            response = await task
+        except CallStatusError as e:
+            job.state = FAILED
+            job.code = e.code.value[0]
+            job.details = e.details
+        except asyncio.CancelledError:
+            if job_id not in self._cancelled:
+                # The server is stopping: leave the job to run again after a restart
+                task.cancel()
+                job.state = QUEUED
+                job.started_at = 0
+                self._save(job)
+                raise
+            job.state = CANCELLED
+        except Exception as e:
+            logger.error(f"Job {job_id} failed: {e}")
+            job.state = FAILED
+            job.code = 2  # grpc.StatusCode.UNKNOWN
+            job.details = f"Unexpected error: {e}"
+        else:
+            job.response.CopyFrom(response)
+            job.state = FAILED if response.HasField('error') else SUCCEEDED
+        finally:
+            self._running.pop(job_id, None)
+            self._cancelled.discard(job_id)
+        job.finished_at = time.time()
+        self._save(job)
+
+    async def submit(self, request: tool_service_pb2.ExecuteRequest) -> tool_service_pb2.Job:
+        """Queue a call; raises JobQueueFullError when the queue is at capacity"""
+        await self.start()
+        assert self.store is not None and self._queue is not None
+        if self.store.count(QUEUED) >= self.max_queued:
+            raise JobQueueFullError(f"Job queue is full ({self.max_queued} jobs queued)")
+        job = tool_service_pb2.Job(
+            job_id=uuid.uuid4().hex,
+            tool_name=request.tool_name,
+            state=QUEUED,
+            submitted_at=time.time()
+        )
+        self.store.add(job, request)
+        self._queue.put_nowait(job.job_id)
+        return job
+
+    async def get(self, job_id: str) -> tool_service_pb2.Job:
+        await self.start()
+        assert self.store is not None
+        job = self.store.get(job_id)
+        if job is None:
+            raise JobNotFoundError(f"Job '{job_id}' not found")
+        return job
+
+    async def cancel(self, job_id: str) -> tool_service_pb2.Job:
+        """Cancel a queued or running job; finished jobs are returned unchanged"""
+        job = await self.get(job_id)
+        if job.state == QUEUED:
+            job.state = CANCELLED
+            job.finished_at = time.time()
+            self._save(job)
+        elif job.state == RUNNING:
+            task = self._running.get(job_id)
+            if task is not None:
+                self._cancelled.add(job_id)
+                task.cancel()
+                await asyncio.wait({task})
+                # Let the worker record the cancellation
+                while (await self.get(job_id)).state == RUNNING:
+                    await asyncio.sleep(0)
+            job = await self.get(job_id)
+        return job
+
+    async def watch(self, job_id: str) -> AsyncIterator[tool_service_pb2.Job]:
+        """Yield the job now and on every change of state, until it has finished"""
+        last = None
+        while True:
+            changed = self._changed.setdefault(job_id, asyncio.Event())
+            try:
+                job = await self.get(job_id)
+            except JobNotFoundError:
+                self._changed.pop(job_id, None)
+                raise
+            if job.state != last:
+                last = job.state
+                yield job
+            if job.state in TERMINAL_STATES:
+                # Nothing changes any more, so nobody waits on the event
+                self._changed.pop(job_id, None)
+                return
+            await changed.wait()
@@ -1,12 +1,17 @@
 import os
-import yaml
+import time
+import asyncio
+import inspect
 import logging
 import importlib
-from typing import Dict, Any, Optional
+from dataclasses import dataclass, field
+from typing import Dict, Any, Iterable, List, Optional, Union
 from pathlib import Path
 from pydantic import BaseModel
 
 from wabee.tools.base_tool import BaseTool
+from wabee.rpc.manifest import MANIFEST_FILENAME, ToolManifest, load_manifest
+from wabee.rpc.profiling import ImportProfiler, LoadProfile
 
 logger = logging.getLogger(__name__)
 
@@ -23,13 +28,76 @@ class ToolConfig(BaseModel):
     module_name: str
     tool_name: str
     args: Optional[Dict[str, Any]] = None
+    precompiled_schema: Optional[Dict[str, Any]] = None
+
+@dataclass
+class ToolLoadResult:
+    """Outcome of loading a single tool"""
+    config: ToolConfig
+    tool: Optional[Union[BaseTool, Any]] = None
+    error: Optional[ToolLoadError] = None
+    duration_seconds: float = 0.0
+    profile: Optional[LoadProfile] = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+    @property
+    def name(self) -> str:
+        """Name the tool is served under"""
+        return getattr(self.tool, 'tool_name', None) or self.config.tool_name
+
+@dataclass
+class LoadReport:
+    """Result of loading several tools concurrently"""
+    results: List[ToolLoadResult] = field(default_factory=list)
+    duration_seconds: float = 0.0
+
+    @property
+    def tools(self) -> Dict[str, Union[BaseTool, Any]]:
+        """Successfully loaded tools, keyed by the name they should be served under"""
+        return {result.name: result.tool for result in self.results if result.ok}
+
+    @property
+    def failures(self) -> List[ToolLoadResult]:
+        return [result for result in self.results if not result.ok]
+
+    def format(self) -> str:
+        """Human readable summary of what loaded and how long each tool took"""
+        lines = [
+            f"Loaded {len(self.results) - len(self.failures)}/{len(self.results)} tools "
+            f"in {self.duration_seconds * 1000:.1f}ms"
+        ]
+        for result in self.results:
+            status = "ok" if result.ok else f"FAILED: {result.error}"
+            lines.append(f"  {result.config.tool_name}: {result.duration_seconds * 1000:.1f}ms {status}")
+        return "\n".join(lines)
 
 class ToolLoader:
     """Handles loading of tool instances from various sources"""
 
+    # Startup metrics: the most recent load profile for each loaded tool
+    profiles: Dict[str, LoadProfile] = {}
+
     @staticmethod
     def load_from_env() -> BaseTool:
         """Load tool based on environment variables"""
+        return ToolLoader.load_tool(ToolLoader.config_from_env())
+
+    @staticmethod
+    def load_from_spec(spec_path: Path) -> BaseTool:
+        """Load tool from toolspec.yaml, preferring a fresh build-time manifest next to it"""
+        return ToolLoader.load_tool(ToolLoader.config_from_spec(spec_path))
+
+    @staticmethod
+    def load_from_manifest(manifest_path: Path) -> BaseTool:
+        """Load tool from a manifest generated by `wb tools build`"""
+        return ToolLoader.load_tool(ToolLoader.config_from_manifest(manifest_path))
+
+    @staticmethod
+    def config_from_env() -> ToolConfig:
+        """Build the tool configuration from environment variables"""
         module_name = os.environ.get('WABEE_TOOL_MODULE')
         tool_name = os.environ.get('WABEE_TOOL_NAME')
         
@@ -38,23 +106,29 @@ class ToolLoader:
                 "WABEE_TOOL_MODULE and WABEE_TOOL_NAME environment variables are required"
             )
 
-        config = ToolConfig(
+        manifest_path = Path(os.environ.get('WABEE_TOOL_MANIFEST_PATH', MANIFEST_FILENAME))
+        manifest = load_manifest(manifest_path)
+        if manifest and (manifest.module_name, manifest.tool_name) == (module_name, tool_name):
+            return ToolLoader._config_from_manifest(manifest)
+
+        return ToolConfig(
             module_name=module_name,
             tool_name=tool_name,
             args=ToolLoader._load_args_from_spec()
         )
-        
-        return ToolLoader.load_tool(config)
 
     @staticmethod
-    def load_from_spec(spec_path: Path) -> BaseTool:
-        """Load tool from toolspec.yaml"""
+    def config_from_spec(spec_path: Path) -> ToolConfig:
+        """Build the tool configuration from toolspec.yaml, preferring a fresh manifest next to it"""
+        manifest = load_manifest(spec_path.with_name(MANIFEST_FILENAME))
+        if manifest:
+            return ToolLoader._config_from_manifest(manifest)
+
         if not spec_path.exists():
             raise ConfigurationError(f"Tool spec not found: {spec_path}")
 
         try:
-            with open(spec_path) as f:
-                spec = yaml.safe_load(f)
+            spec = ToolLoader._read_yaml(spec_path)
         except Exception as e:
             raise ConfigurationError(f"Failed to load tool spec: {e}")
 
@@ -62,40 +136,171 @@ class ToolLoader:
             raise ConfigurationError("Invalid tool spec format")
 
         tool_spec = spec['tool']
-        config = ToolConfig(
+        return ToolConfig(
             module_name=tool_spec.get('module', tool_spec.get('entrypoint', '').replace('.py', '')),
             tool_name=f"{tool_spec.get('name')}Tool",
             args=ToolLoader._parse_tool_args(tool_spec.get('tool_args', []))
         )
 
-        return ToolLoader.load_tool(config)
+    @staticmethod
+    def config_from_manifest(manifest_path: Path) -> ToolConfig:
+        """Build the tool configuration from a manifest generated by `wb tools build`"""
+        manifest = load_manifest(manifest_path)
+        if manifest is None:
+            raise ConfigurationError(f"Tool manifest missing or stale: {manifest_path}")
+        return ToolLoader._config_from_manifest(manifest)
+
+    @staticmethod
+    def _config_from_manifest(manifest: ToolManifest) -> ToolConfig:
+        logger.info(f"Loading tool from manifest (schema {manifest.schema_fingerprint[:12]})")
+        return ToolConfig(
+            module_name=manifest.module_name,
+            tool_name=manifest.tool_name,
+            args=manifest.args,
+            precompiled_schema=manifest.json_schema
+        )
 
     @staticmethod
     def load_tool(config: ToolConfig) -> BaseTool:
-        """Core tool loading logic"""
+        """Core tool loading logic.
+
+        Records a LoadProfile with the time spent importing the tool module (broken
+        down per imported module), looking up the tool and constructing it. Set
+        WABEE_IMPORT_REPORT to the number of entries to log a report of the slowest imports.
+        """
+        profile = LoadProfile(module_name=config.module_name, tool_name=config.tool_name)
         try:
-            logger.info(f"Loading tool module: {config.module_name}")
-            module = importlib.import_module(config.module_name)
-            
-            logger.info(f"Loading tool class/function: {config.tool_name}")
-            tool_class = getattr(module, config.tool_name)
-            
-            if hasattr(tool_class, 'create'):
-                logger.info("Creating tool instance using create() method")
-                return tool_class.create(**(config.args or {}))
-            elif isinstance(tool_class, type):
-                logger.info("Creating tool instance directly")
-                return tool_class(**(config.args or {}))
-            else:
-                logger.info("Using function-based tool")
-                return tool_class
-
-        except ImportError as e:
-            raise ToolLoadError(f"Failed to import tool module: {e}")
-        except AttributeError as e:
-            raise ToolLoadError(f"Failed to load tool class/function: {e}")
+            tool_class = ToolLoader._resolve(config, profile)
+            if inspect.iscoroutinefunction(getattr(tool_class, 'create', None)):
+                raise ToolLoadError(
+                    f"{config.tool_name}.create() is async; load it with ToolLoader.load_tools"
+                )
+            with profile.phase("construct"):
+                tool = ToolLoader._construct(tool_class, config)
         except Exception as e:
-            raise ToolLoadError(f"Failed to create tool instance: {e}")
+            raise ToolLoader._load_error(e)
+
+        ToolLoader._finish(tool, config, profile)
+        return tool
+
+    @staticmethod
+    async def load_tools(
+        configs: Iterable[ToolConfig],
+        max_concurrency: Optional[int] = None
+    ) -> LoadReport:
+        """Load several tools concurrently.
+
+        Module imports and synchronous constructors run in worker threads, while an
+        `async create()` classmethod is awaited on the event loop. Failures are isolated:
+        a tool that fails to load is reported in the LoadReport instead of raising, so the
+        remaining tools can still be served.
+
+        Example:
+            report = await ToolLoader.load_tools([config_a, config_b])
+            logger.info(report.format())
+            await serve(report.tools)
+        """
+        semaphore = asyncio.Semaphore(max_concurrency) if max_concurrency else None
+
+        async def load(config: ToolConfig) -> ToolLoadResult:
+            if semaphore is None:
+                return await ToolLoader._load_tool_async(config)
+            async with semaphore:
+                return await ToolLoader._load_tool_async(config)
+
+        started = time.perf_counter()
+        results = await asyncio.gather(*(load(config) for config in configs))
+        report = LoadReport(list(results), time.perf_counter() - started)
+        for failure in report.failures:
+            logger.error(f"Failed to load tool {failure.config.tool_name}: {failure.error}")
+        return report
+
+    @staticmethod
+    async def _load_tool_async(config: ToolConfig) -> ToolLoadResult:
+        profile = LoadProfile(module_name=config.module_name, tool_name=config.tool_name)
+        result = ToolLoadResult(config=config, profile=profile)
+        started = time.perf_counter()
+        try:
+            tool_class = await asyncio.to_thread(ToolLoader._resolve, config, profile)
+            with profile.phase("construct"):
+                create = getattr(tool_class, 'create', None)
+                if inspect.iscoroutinefunction(create):
+                    logger.info("Creating tool instance using async create() method")
+                    tool = await create(**(config.args or {}))
+                else:
+                    tool = await asyncio.to_thread(ToolLoader._construct, tool_class, config)
+            ToolLoader._finish(tool, config, profile)
+            result.tool = tool
+        except Exception as e:
+            result.error = ToolLoader._load_error(e)
+        result.duration_seconds = time.perf_counter() - started
+        return result
+
+    @staticmethod
+    def _resolve(config: ToolConfig, profile: LoadProfile) -> Any:
+        """Import the tool module and look up the tool class/function"""
+        logger.info(f"Loading tool module: {config.module_name}")
+        with ImportProfiler() as import_profiler, profile.phase("import"):
+            module = importlib.import_module(config.module_name)
+        profile.imports = import_profiler.imports
+        
+        logger.info(f"Loading tool class/function: {config.tool_name}")
+        with profile.phase("lookup"):
+            return getattr(module, config.tool_name)
+
+    @staticmethod
+    def _construct(tool_class: Any, config: ToolConfig) -> Any:
+        """Create the tool instance"""
+        if hasattr(tool_class, 'create'):
+            logger.info("Creating tool instance using create() method")
+            return tool_class.create(**(config.args or {}))
+        elif isinstance(tool_class, type):
+            logger.info("Creating tool instance directly")
+            return tool_class(**(config.args or {}))
+        else:
+            logger.info("Using function-based tool")
+            return tool_class
+
+    @staticmethod
+    def _finish(tool: Any, config: ToolConfig, profile: LoadProfile) -> None:
+        """Attach the precompiled schema, if any, and publish the load profile"""
+        if config.precompiled_schema is not None:
+            try:
+                setattr(tool, 'precompiled_schema', config.precompiled_schema)
+            except (AttributeError, TypeError):
+                logger.warning("Tool does not accept a precompiled schema, falling back to reflection")
+        ToolLoader._report_profile(profile)
+
+    @staticmethod
+    def _load_error(e: Exception) -> ToolLoadError:
+        if isinstance(e, ToolLoadError):
+            return e
+        elif isinstance(e, ImportError):
+            return ToolLoadError(f"Failed to import tool module: {e}")
+        elif isinstance(e, AttributeError):
+            return ToolLoadError(f"Failed to load tool class/function: {e}")
+        else:
+            return ToolLoadError(f"Failed to create tool instance: {e}")
+
+    @staticmethod
+    def _report_profile(profile: LoadProfile) -> None:
+        """Publish a load profile as startup metrics and structured logs"""
+        ToolLoader.profiles[profile.tool_name] = profile
+        logger.info(
+            f"Loaded tool {profile.tool_name} in {profile.total_seconds * 1000:.1f}ms "
+            f"(import {profile.import_seconds * 1000:.1f}ms, "
+            f"lookup {profile.lookup_seconds * 1000:.1f}ms, "
+            f"construct {profile.construct_seconds * 1000:.1f}ms)",
+            extra={"startup_profile": profile.as_dict()}
+        )
+
+        report_size = os.environ.get('WABEE_IMPORT_REPORT')
+        if report_size:
+            try:
+                limit = int(report_size)
+            except ValueError:
+                limit = 20
+            logger.info(profile.format_report(limit))
 
     @staticmethod
     def _load_args_from_spec() -> Optional[Dict[str, Any]]:
@@ -105,14 +310,21 @@ class ToolLoader:
             return None
 
         try:
-            with open(spec_path) as f:
-                spec = yaml.safe_load(f)
+            spec = ToolLoader._read_yaml(Path(spec_path))
             if isinstance(spec, dict) and 'tool' in spec and 'tool_args' in spec['tool']:
                 return ToolLoader._parse_tool_args(spec['tool']['tool_args'])
         except Exception as e:
             logger.warning(f"Failed to load tool args from spec: {e}")
         return None
 
+    @staticmethod
+    def _read_yaml(path: Path) -> Any:
+        """Parse a YAML file, importing the parser only when it is needed"""
+        import yaml
+
+        with open(path) as f:
+            return yaml.safe_load(f)
+
     @staticmethod
     def _parse_tool_args(args_list: list) -> Dict[str, Any]:
         """Parse tool arguments from spec format to dictionary"""
@@ -0,0 +1,127 @@
+from typing import Any, AsyncIterator, Dict, Mapping, Optional, Tuple, Union
+
+from pydantic import ValidationError
+
+from wabee.tools.base_model import StructuredToolResponse
+from wabee.tools.base_tool import BaseTool
+from wabee.tools.resources import ResourceRegistry
+from wabee.rpc.client import schema_dict
+from wabee.rpc.fanout import DEFAULT_MAX_CONCURRENCY, CallResult, Calls, fan_out
+from wabee.rpc.results import as_structured_response
+from wabee.rpc.server import ToolServicer, start_tools, stop_tools
+
+class LocalToolClient:
+    """
+    ToolServiceClient look-alike for tools living in the same process.
+
+    Calls go straight to a ToolServicer, without serialization or the network,
+    but through the same input validation and tool execution as over gRPC, so
+    results and errors have the same shape. Tool results are handed over as is,
+    so metadata values keep their types instead of arriving as strings.
+
+    A client built from tools runs their startup hooks when entered as an async
+    context manager and their shutdown hooks on close, as a server would.
+    """
+
+    def __init__(
+        self,
+        tools: Optional[Dict[str, Union[BaseTool, Any]]] = None,
+        servicer: Optional[ToolServicer] = None,
+        resources: Optional[ResourceRegistry] = None
+    ) -> None:
+        """
+        Args:
+            tools: Tools to call, by name
+            servicer: ToolServicer to call instead, e.g. the one a server in the
+                same process is using; its tools are left to that server to start
+            resources: Registry to bind the tools' resources from, defaults to the
+                process-wide one
+        """
+        # Tools of a servicer passed in belong to whoever built it
+        self._owns_tools = servicer is None
+        if servicer is None:
+            if tools is None:
+                raise ValueError("LocalToolClient needs tools or a servicer")
+            servicer = ToolServicer(tools)
+        self.servicer = servicer
+        self.resources = resources
+        self._started = False
+
+    async def __aenter__(self) -> "LocalToolClient":
+        if self._owns_tools and not self._started:
+            await start_tools(self.servicer.tools, self.resources)
+            self._started = True
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb) -> None:
+        await self.close()
+
+    def _not_found(self, tool_name: str) -> Dict[str, str]:
+        # Over gRPC this is a NOT_FOUND status, which the client reports as RPC_ERROR
+        return {
+            'type': 'RPC_ERROR',
+            'message': f"Tool '{tool_name}' not found"
+        }
+
+    async def get_tool_schema(self, tool_name: str) -> Dict[str, Any]:
+        """Get the schema for a specific tool"""
+        if tool_name not in self.servicer.tools:
+            return {"error": self._not_found(tool_name)['message']}
+        return schema_dict(self.servicer.schema_message(tool_name))
+
+    async def execute(
+        self,
+        tool_name: str,
+        input_data: Dict[str, Any],
+        hedge: Optional[bool] = None,
+        idempotency_key: Optional[str] = None
+    ) -> Tuple[Optional[StructuredToolResponse], Optional[Dict]]:
+        """
+        Execute a tool with the given input data. `hedge` and `idempotency_key`
+        are accepted for compatibility with ToolServiceClient and ignored: every
+        call runs the tool, since there are no retries or hedges to deduplicate.
+        """
+        tool = self.servicer.tools.get(tool_name)
+        if tool is None:
+            return None, self._not_found(tool_name)
+
+        result, error = await self.servicer.execute_decoded(tool, input_data)
+        if error:
+            return None, {
+                'type': str(error.type),
+                'message': error.message
+            }
+        try:
+            return as_structured_response(result), None
+        except ValidationError as e:
+            # A result the server can't encode fails the RPC
+            return None, {
+                'type': 'RPC_ERROR',
+                'message': f"Invalid tool result: {e}"
+            }
+
+    def as_completed(
+        self,
+        calls: Calls,
+        max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+        tool_concurrency: Union[int, Mapping[str, int], None] = None,
+        window: Optional[int] = None
+    ) -> AsyncIterator[CallResult]:
+        """Execute many calls concurrently, yielding results as they finish"""
+        return fan_out(self.execute, calls, max_concurrency, tool_concurrency, window)
+
+    def execute_many(
+        self,
+        calls: Calls,
+        max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+        tool_concurrency: Union[int, Mapping[str, int], None] = None,
+        window: Optional[int] = None
+    ) -> AsyncIterator[CallResult]:
+        """Execute many calls concurrently, yielding results in input order"""
+        return fan_out(self.execute, calls, max_concurrency, tool_concurrency, window, ordered=True)
+
+    async def close(self) -> None:
+        """Shut down the tools this client started"""
+        if self._started:
+            self._started = False
+            await stop_tools(self.servicer.tools, self.resources)
@@ -0,0 +1,136 @@
+import sys
+import json
+import hashlib
+import inspect
+import logging
+import importlib
+from dataclasses import asdict
+from pathlib import Path
+from types import ModuleType
+from typing import Dict, Any, Optional
+from pydantic import BaseModel, ValidationError
+
+from wabee.tools.base_tool import BaseTool
+
+logger = logging.getLogger(__name__)
+
+MANIFEST_FILENAME = "wabee_manifest.json"
+MANIFEST_VERSION = 1
+TOOLSPEC_FILENAME = "toolspec.yaml"
+
+class ManifestError(Exception):
+    """Raised when a tool manifest cannot be generated"""
+    pass
+
+class ToolManifest(BaseModel):
+    """Precompiled description of a tool, produced by `wb tools build`"""
+    manifest_version: int = MANIFEST_VERSION
+    module_name: str
+    tool_name: str
+    args: Optional[Dict[str, Any]] = None
+    json_schema: Dict[str, Any]
+    proto_descriptor: Dict[str, Any]
+    schema_fingerprint: str
+    source_fingerprint: str
+
+def fingerprint(data: Any) -> str:
+    """Stable hash of any JSON serializable value"""
+    encoded = json.dumps(data, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(encoded.encode()).hexdigest()
+
+def source_fingerprint(tool_dir: Path, module_name: str) -> str:
+    """Hash of the files a manifest is derived from: the tool module and its toolspec"""
+    digest = hashlib.sha256()
+    module_path = Path(*module_name.split("."))
+    candidates = [
+        tool_dir / module_path.with_suffix(".py"),
+        tool_dir / module_path / "__init__.py",
+        tool_dir / TOOLSPEC_FILENAME,
+    ]
+    for path in candidates:
+        if path.exists():
+            digest.update(path.name.encode())
+            digest.update(path.read_bytes())
+    return digest.hexdigest()
+
+def discover_tool_symbol(module: ModuleType) -> Optional[str]:
+    """Find the tool defined in a module, preferring BaseTool subclasses over simple tools"""
+    functions = []
+    for symbol, obj in vars(module).items():
+        if getattr(obj, "__module__", None) != module.__name__:
+            continue
+        if isinstance(obj, type) and issubclass(obj, BaseTool) and not inspect.isabstract(obj):
+            return symbol
+        if callable(obj) and hasattr(obj, "__wrapped__"):
+            functions.append(symbol)
+    return functions[0] if functions else None
+
+def build_manifest(
+    tool_dir: Path,
+    module_name: str,
+    tool_name: Optional[str] = None,
+    args: Optional[Dict[str, Any]] = None
+) -> ToolManifest:
+    """Import a tool and precompute everything the server would otherwise introspect at startup"""
+    from wabee.rpc.schema import ProtoSchemaGenerator
+
+    # Always introspect the sources on disk, not a previously imported copy
+    sys.modules.pop(module_name, None)
+    sys.path.insert(0, str(tool_dir))
+    try:
+        module = importlib.import_module(module_name)
+    except Exception as e:
+        raise ManifestError(f"Failed to import tool module {module_name}: {e}")
+    finally:
+        sys.path.remove(str(tool_dir))
+
+    tool_name = tool_name or discover_tool_symbol(module)
+    if tool_name is None or not hasattr(module, tool_name):
+        raise ManifestError(f"Could not find tool class or function in {module_name}")
+    tool = getattr(module, tool_name)
+
+    json_schema = ProtoSchemaGenerator.get_tool_schema(tool)
+    args_schema = getattr(tool, "args_schema", None)
+    if isinstance(args_schema, type) and issubclass(args_schema, BaseModel):
+        proto_message = ProtoSchemaGenerator.generate_from_pydantic(args_schema, f"{tool_name}Input")
+    else:
+        proto_message = ProtoSchemaGenerator.generate_from_function(tool, f"{tool_name}Input")
+
+    return ToolManifest(
+        module_name=module_name,
+        tool_name=tool_name,
+        args=args,
+        json_schema=json_schema,
+        proto_descriptor=asdict(proto_message),
+        schema_fingerprint=fingerprint(json_schema),
+        source_fingerprint=source_fingerprint(tool_dir, module_name)
+    )
+
+def write_manifest(manifest: ToolManifest, path: Path) -> None:
+    """Write a manifest as JSON"""
+    with open(path, "w") as f:
+        f.write(manifest.model_dump_json(indent=2))
+
+def load_manifest(path: Path) -> Optional[ToolManifest]:
+    """Load a manifest, returning None when it is missing, invalid or stale"""
+    if not path.exists():
+        return None
+
+    try:
+        with open(path, "rb") as f:
+            manifest = ToolManifest.model_validate_json(f.read())
+    except (OSError, ValidationError) as e:
+        logger.warning(f"Ignoring invalid tool manifest {path}: {e}")
+        return None
+
+    if manifest.manifest_version != MANIFEST_VERSION:
+        logger.info(f"Ignoring tool manifest {path}: unsupported version {manifest.manifest_version}")
+        return None
+    if manifest.source_fingerprint != source_fingerprint(path.parent, manifest.module_name):
+        logger.info(f"Ignoring stale tool manifest {path}: tool sources changed since build")
+        return None
+    if manifest.schema_fingerprint != fingerprint(manifest.json_schema):
+        logger.info(f"Ignoring tool manifest {path}: schema fingerprint mismatch")
+        return None
+
+    return manifest
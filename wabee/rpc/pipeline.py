@@ -0,0 +1,229 @@
+import os
+import json
+import time
+import asyncio
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any, Dict, List, Mapping, Optional, Sequence, Set
+
+from pydantic import BaseModel, ValidationError
+
+from wabee.tools.base_model import StructuredToolResponse
+from wabee.tools.tool_error import ToolError, ToolErrorType
+from wabee.rpc.results import as_structured_response
+from wabee.rpc.protos import tool_service_pb2
+
+if TYPE_CHECKING:
+    from wabee.rpc.server import ToolServicer
+
+# Most steps a pipeline may have
+DEFAULT_MAX_PIPELINE_STEPS = int(os.environ.get("WABEE_PIPELINE_MAX_STEPS", "64"))
+
+class InvalidPipelineError(Exception):
+    """Raised for a pipeline that can't run: unknown steps or tools, bad input or a cycle"""
+    pass
+
+@dataclass
+class Step:
+    """
+    One tool call of a pipeline.
+
+    `inputs` maps input fields (dotted paths) to "step.path" sources, the path
+    being read from that step's StructuredToolResponse: "search.content",
+    "search.metadata.url", or "search.content.items.0.id" for JSON content.
+    A bare "search" stands for "search.content".
+    """
+    name: str
+    tool_name: str
+    input_data: Dict[str, Any] = field(default_factory=dict)
+    inputs: Mapping[str, str] = field(default_factory=dict)
+    after: Sequence[str] = ()
+
+    def message(self) -> tool_service_pb2.PipelineStep:
+        step = tool_service_pb2.PipelineStep(
+            name=self.name,
+            tool_name=self.tool_name,
+            json_data=json.dumps(self.input_data),
+            after=list(self.after)
+        )
+        for target, source in self.inputs.items():
+            source_step, _, path = source.partition('.')
+            step.inputs.add(step=source_step, source=path, target=target)
+        return step
+
+@dataclass
+class StepResult:
+    """How a pipeline step went; result is only set for output steps"""
+    name: str
+    result: Optional[StructuredToolResponse] = None
+    error: Optional[Dict] = None
+    skipped: bool = False
+    started_ms: float = 0.0
+    duration_ms: float = 0.0
+
+def pipeline_request(steps: Sequence[Step], outputs: Optional[Sequence[str]] = None) -> tool_service_pb2.PipelineRequest:
+    return tool_service_pb2.PipelineRequest(
+        steps=[step.message() for step in steps],
+        outputs=list(outputs or ())
+    )
+
+def _dependencies(step: tool_service_pb2.PipelineStep) -> List[str]:
+    return list(dict.fromkeys([mapping.step for mapping in step.inputs] + list(step.after)))
+
+def _plan(
+    servicer: "ToolServicer",
+    request: tool_service_pb2.PipelineRequest,
+    max_steps: int
+) -> Dict[str, Dict[str, Any]]:
+    """Check a pipeline can run; the static input of each step, by step name"""
+    if not request.steps:
+        raise InvalidPipelineError("Pipeline has no steps")
+    if len(request.steps) > max_steps:
+        raise InvalidPipelineError(f"Pipeline has {len(request.steps)} steps, more than {max_steps}")
+
+    static: Dict[str, Dict[str, Any]] = {}
+    for step in request.steps:
+        if not step.name or step.name in static:
+            raise InvalidPipelineError(f"Step names must be unique and not empty: '{step.name}'")
+        if step.tool_name not in servicer.tools:
+            raise InvalidPipelineError(f"Step '{step.name}': tool '{step.tool_name}' not found")
+        try:
+            data = json.loads(step.json_data) if step.json_data else {}
+        except ValueError:
+            raise InvalidPipelineError(f"Step '{step.name}': invalid JSON input")
+        if not isinstance(data, dict):
+            raise InvalidPipelineError(f"Step '{step.name}': input must be a JSON object")
+        if any(not mapping.target for mapping in step.inputs):
+            raise InvalidPipelineError(f"Step '{step.name}': mapped inputs need a target field")
+        static[step.name] = data
+
+    # Kahn's algorithm: steps left over sit on a cycle
+    waiting = {step.name: set(_dependencies(step)) for step in request.steps}
+    for name, dependencies in waiting.items():
+        unknown = dependencies - static.keys()
+        if unknown:
+            raise InvalidPipelineError(f"Step '{name}' depends on unknown step '{sorted(unknown)[0]}'")
+    ready = [name for name, dependencies in waiting.items() if not dependencies]
+    while ready:
+        done = ready.pop()
+        for name, dependencies in waiting.items():
+            if done in dependencies:
+                dependencies.discard(done)
+                if not dependencies:
+                    ready.append(name)
+    cycle = sorted(name for name, dependencies in waiting.items() if dependencies)
+    if cycle:
+        raise InvalidPipelineError(f"Pipeline has a cycle through steps {', '.join(cycle)}")
+
+    unknown_outputs = [name for name in request.outputs if name not in static]
+    if unknown_outputs:
+        raise InvalidPipelineError(f"Unknown output step '{unknown_outputs[0]}'")
+    return static
+
+def _read(value: Any, part: str) -> Any:
+    if isinstance(value, BaseModel):
+        if part not in type(value).model_fields:
+            raise KeyError(part)
+        return getattr(value, part)
+    if isinstance(value, str):
+        # Tools often return JSON as their content
+        value = json.loads(value)
+    if isinstance(value, dict):
+        return value[part]
+    if isinstance(value, list):
+        return value[int(part)]
+    raise KeyError(part)
+
+def resolve(result: StructuredToolResponse, path: str) -> Any:
+    """The value at a dotted path of a result; an empty path is its content"""
+    value: Any = result
+    for part in (path or "content").split('.'):
+        value = _read(value, part)
+    return value
+
+def _assign(data: Dict[str, Any], path: str, value: Any) -> None:
+    *parents, last = path.split('.')
+    for part in parents:
+        data = data.setdefault(part, {})
+        if not isinstance(data, dict):
+            raise ValueError(f"'{part}' isn't an object")
+    data[last] = value
+
+async def run_pipeline(
+    servicer: "ToolServicer",
+    request: tool_service_pb2.PipelineRequest,
+    max_steps: int = DEFAULT_MAX_PIPELINE_STEPS
+) -> tool_service_pb2.PipelineResponse:
+    """
+    Run a pipeline's steps on the servicer's tools, each as soon as the steps it
+    depends on have finished, so independent steps run concurrently.
+
+    Results are passed between steps as StructuredToolResponse objects, without
+    being encoded, so metadata values keep their types. A step that fails skips
+    the steps depending on it. Only the responses of output steps and of failed
+    steps are returned; raises InvalidPipelineError for pipelines that can't run.
+    """
+    static = _plan(servicer, request, max_steps)
+    steps = {step.name: step for step in request.steps}
+    outputs = set(request.outputs)
+    if not outputs:
+        needed = {name for step in request.steps for name in _dependencies(step)}
+        outputs = set(steps) - needed
+
+    begin = time.perf_counter()
+    answers = {name: tool_service_pb2.StepResult(name=name) for name in steps}
+    results: Dict[str, StructuredToolResponse] = {}
+    failed: Set[str] = set()
+    tasks: Dict[str, "asyncio.Task[None]"] = {}
+
+    async def run(step: tool_service_pb2.PipelineStep) -> None:
+        dependencies = _dependencies(step)
+        if dependencies:
+            await asyncio.wait([tasks[name] for name in dependencies])
+        answer = answers[step.name]
+        if failed.intersection(dependencies):
+            answer.skipped = True
+            failed.add(step.name)
+            return
+
+        input_data = static[step.name]
+        error: Optional[ToolError] = None
+        for mapping in step.inputs:
+            try:
+                _assign(input_data, mapping.target, resolve(results[mapping.step], mapping.source))
+            except (KeyError, IndexError, TypeError, ValueError) as e:
+                error = ToolError(
+                    type=ToolErrorType.INVALID_INPUT,
+                    message=f"Can't map '{mapping.step}.{mapping.source}' to '{mapping.target}': {e!r}"
+                )
+                break
+
+        started = time.perf_counter()
+        answer.started_ms = (started - begin) * 1000
+        result = None
+        if error is None:
+            result, error = await servicer.execute_decoded(servicer.tools[step.tool_name], input_data)
+        answer.duration_ms = (time.perf_counter() - started) * 1000
+        if error is None:
+            try:
+                results[step.name] = as_structured_response(result)
+            except ValidationError as e:
+                error = ToolError(type=ToolErrorType.INTERNAL_ERROR, message=f"Invalid tool result: {e}")
+
+        if error is not None:
+            failed.add(step.name)
+            answer.response.CopyFrom(servicer.response_message(step.tool_name, None, error))
+        elif step.name in outputs:
+            answer.response.CopyFrom(servicer.response_message(step.tool_name, results[step.name], None))
+
+    for step in request.steps:
+        tasks[step.name] = asyncio.ensure_future(run(step))
+    try:
+        await asyncio.gather(*tasks.values())
+    finally:
+        for task in tasks.values():
+            task.cancel()
+
+    return tool_service_pb2.PipelineResponse(
+        steps=[answers[step.name] for step in request.steps],
+        duration_ms=(time.perf_counter() - begin) * 1000
+    )
@@ -0,0 +1,194 @@
+import sys
+import time
+import threading
+import importlib.abc
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from importlib.machinery import ModuleSpec
+from types import ModuleType
+from typing import Any, Dict, Iterator, List, Optional, Sequence
+
+@dataclass
+class ImportTiming:
+    """Cost of importing a single module, in the spirit of `python -X importtime`"""
+    module: str
+    self_seconds: float
+    cumulative_seconds: float
+
+@dataclass
+class LoadProfile:
+    """Timing breakdown of loading a single tool"""
+    module_name: str
+    tool_name: str
+    import_seconds: float = 0.0
+    lookup_seconds: float = 0.0
+    construct_seconds: float = 0.0
+    imports: List[ImportTiming] = field(default_factory=list)
+
+    @property
+    def total_seconds(self) -> float:
+        return self.import_seconds + self.lookup_seconds + self.construct_seconds
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        """Time a block and add it to the `<name>_seconds` attribute"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            attribute = f"{name}_seconds"
+            setattr(self, attribute, getattr(self, attribute) + time.perf_counter() - start)
+
+    def slowest_imports(self, limit: int = 20) -> List[ImportTiming]:
+        """Imports sorted by the time spent in the module itself"""
+        return sorted(self.imports, key=lambda timing: timing.self_seconds, reverse=True)[:limit]
+
+    def as_dict(self, limit: int = 10) -> Dict[str, Any]:
+        """Structured form used for logs and startup metrics"""
+        return {
+            "module_name": self.module_name,
+            "tool_name": self.tool_name,
+            "import_seconds": round(self.import_seconds, 6),
+            "lookup_seconds": round(self.lookup_seconds, 6),
+            "construct_seconds": round(self.construct_seconds, 6),
+            "total_seconds": round(self.total_seconds, 6),
+            "imported_modules": len(self.imports),
+            "slowest_imports": [
+                {"module": timing.module, "self_seconds": round(timing.self_seconds, 6)}
+                for timing in self.slowest_imports(limit)
+            ],
+        }
+
+    def format_report(self, limit: int = 20) -> str:
+        """Human readable report of the slowest imports"""
+        lines = [
+            f"Startup profile for {self.module_name}.{self.tool_name}: "
+            f"import {self.import_seconds * 1000:.1f}ms, "
+            f"lookup {self.lookup_seconds * 1000:.1f}ms, "
+            f"construct {self.construct_seconds * 1000:.1f}ms",
+            f"{'self [us]':>12} | {'cumulative':>12} | imported module",
+        ]
+        for timing in self.slowest_imports(limit):
+            lines.append(
+                f"{timing.self_seconds * 1e6:>12.0f} | {timing.cumulative_seconds * 1e6:>12.0f} | {timing.module}"
+            )
+        return "\n".join(lines)
+
+class _TimingLoader(importlib.abc.Loader):
+    """Wraps a module loader to time module creation and execution"""
+
+    def __init__(self, loader: Any) -> None:
+        self._loader = loader
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._loader, name)
+
+    def create_module(self, spec: ModuleSpec) -> Optional[ModuleType]:
+        # Extension modules do their initialization here
+        with ImportProfiler._timed(spec.name):
+            return self._loader.create_module(spec)
+
+    def exec_module(self, module: ModuleType) -> None:
+        try:
+            with ImportProfiler._timed(module.__name__):
+                self._loader.exec_module(module)
+        finally:
+            # Don't leave the wrapper behind on the imported module
+            module.__loader__ = self._loader
+            if module.__spec__ is not None:
+                module.__spec__.loader = self._loader
+
+class _ProfilingFinder(importlib.abc.MetaPathFinder):
+    """Delegates to the regular finders and wraps the loaders they return"""
+
+    def find_spec(
+        self,
+        fullname: str,
+        path: Optional[Sequence[str]],
+        target: Optional[ModuleType] = None
+    ) -> Optional[ModuleSpec]:
+        if ImportProfiler._current() is None:
+            return None
+        for finder in sys.meta_path:
+            if finder is self or not hasattr(finder, "find_spec"):
+                continue
+            spec = finder.find_spec(fullname, path, target)
+            if spec is not None:
+                if spec.loader is not None and hasattr(spec.loader, "exec_module"):
+                    spec.loader = _TimingLoader(spec.loader)
+                return spec
+        return None
+
+class ImportProfiler:
+    """Records per-module import cost for imports made by the current thread.
+
+    Usage:
+        with ImportProfiler() as profiler:
+            importlib.import_module("my_tool")
+        profiler.imports  # list of ImportTiming
+    """
+    _lock = threading.Lock()
+    _installs = 0
+    _finder = _ProfilingFinder()
+    _local = threading.local()
+
+    def __init__(self) -> None:
+        self.imports: List[ImportTiming] = []
+        self._by_module: Dict[str, ImportTiming] = {}
+
+    def __enter__(self) -> "ImportProfiler":
+        with ImportProfiler._lock:
+            if ImportProfiler._installs == 0:
+                sys.meta_path.insert(0, ImportProfiler._finder)
+            ImportProfiler._installs += 1
+        ImportProfiler._stack().append(self)
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        ImportProfiler._stack().remove(self)
+        with ImportProfiler._lock:
+            ImportProfiler._installs -= 1
+            if ImportProfiler._installs == 0:
+                sys.meta_path.remove(ImportProfiler._finder)
+
+    @staticmethod
+    def _stack() -> List["ImportProfiler"]:
+        if not hasattr(ImportProfiler._local, "profilers"):
+            ImportProfiler._local.profilers = []
+            ImportProfiler._local.children = []
+        return ImportProfiler._local.profilers
+
+    @staticmethod
+    def _current() -> Optional["ImportProfiler"]:
+        stack = ImportProfiler._stack()
+        return stack[-1] if stack else None
+
+    @staticmethod
+    @contextmanager
+    def _timed(module: str) -> Iterator[None]:
+        profiler = ImportProfiler._current()
+        if profiler is None:
+            yield
+            return
+
+        # Time spent in nested imports is tracked to report self time like -X importtime
+        children: List[float] = ImportProfiler._local.children
+        children.append(0.0)
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            cumulative = time.perf_counter() - start
+            nested = children.pop()
+            if children:
+                children[-1] += cumulative
+            profiler._record(module, cumulative - nested, cumulative)
+
+    def _record(self, module: str, self_seconds: float, cumulative_seconds: float) -> None:
+        # create_module and exec_module are timed separately; merge them per module
+        timing = self._by_module.get(module)
+        if timing is None:
+            timing = self._by_module[module] = ImportTiming(module, 0.0, 0.0)
+            self.imports.append(timing)
+        timing.self_seconds += self_seconds
+        timing.cumulative_seconds += cumulative_seconds
@@ -24,7 +24,7 @@ _sym_db = _symbol_database.Default()
 
 
 
-DESCRIPTOR = _descriptor_pool.Default().AddSerializedFile(b'\n#wabee/rpc/protos/tool_service.proto\x12\x0bwabee.tools\"\x1b\n\nInt64Value\x12\r\n\x05value\x18\x01 \x01(\x03\"\x1c\n\x0bStringValue\x12\r\n\x05value\x18\x01 \x01(\t\"\x1b\n\nFloatValue\x12\r\n\x05value\x18\x01 \x01(\x01\"W\n\x0e\x45xecuteRequest\x12\x11\n\ttool_name\x18\x01 \x01(\t\x12\x13\n\tjson_data\x18\x02 \x01(\tH\x00\x12\x14\n\nproto_data\x18\x03 \x01(\x0cH\x00\x42\x07\n\x05input\"4\n\x11ImageToolResponse\x12\x11\n\tmime_type\x18\x01 \x01(\t\x12\x0c\n\x04\x64\x61ta\x18\x02 \x01(\t\"\xe0\x02\n\x16StructuredToolResponse\x12\x15\n\rvariable_name\x18\x01 \x01(\t\x12\x0f\n\x07\x63ontent\x18\x02 \x01(\t\x12\x1c\n\x0flocal_file_path\x18\x03 \x01(\tH\x00\x88\x01\x01\x12\x43\n\x08metadata\x18\x04 \x03(\x0b\x32\x31.wabee.tools.StructuredToolResponse.MetadataEntry\x12\x18\n\x0bmemory_push\x18\x05 \x01(\x08H\x01\x88\x01\x01\x12.\n\x06images\x18\x06 \x03(\x0b\x32\x1e.wabee.tools.ImageToolResponse\x12\x12\n\x05\x65rror\x18\x07 \x01(\tH\x02\x88\x01\x01\x1a/\n\rMetadataEntry\x12\x0b\n\x03key\x18\x01 \x01(\t\x12\r\n\x05value\x18\x02 \x01(\t:\x02\x38\x01\x42\x12\n\x10_local_file_pathB\x0e\n\x0c_memory_pushB\x08\n\x06_error\"\xb3\x01\n\x0f\x45xecuteResponse\x12\x15\n\x0bjson_result\x18\x01 \x01(\tH\x00\x12\x16\n\x0cproto_result\x18\x02 \x01(\x0cH\x00\x12@\n\x11structured_result\x18\x03 \x01(\x0b\x32#.wabee.tools.StructuredToolResponseH\x00\x12%\n\x05\x65rror\x18\x04 \x01(\x0b\x32\x16.wabee.tools.ToolErrorB\x08\n\x06result\"*\n\tToolError\x12\x0c\n\x04type\x18\x01 \x01(\t\x12\x0f\n\x07message\x18\x02 \x01(\t\")\n\x14GetToolSchemaRequest\x12\x11\n\ttool_name\x18\x01 \x01(\t\"^\n\nToolSchema\x12\x11\n\ttool_name\x18\x01 \x01(\t\x12\x13\n\x0b\x64\x65scription\x18\x02 \x01(\t\x12(\n\x06\x66ields\x18\x03 \x03(\x0b\x32\x18.wabee.tools.FieldSchema\"P\n\x0b\x46ieldSchema\x12\x0c\n\x04name\x18\x01 \x01(\t\x12\x0c\n\x04type\x18\x02 \x01(\t\x12\x10\n\x08required\x18\x03 \x01(\x08\x12\x13\n\x0b\x64\x65scription\x18\x04 \x01(\t2\xa0\x01\n\x0bToolService\x12\x44\n\x07\x45xecute\x12\x1b.wabee.tools.ExecuteRequest\x1a\x1c.wabee.tools.ExecuteResponse\x12K\n\rGetToolSchema\x12!.wabee.tools.GetToolSchemaRequest\x1a\x17.wabee.tools.ToolSchemab\x06proto3')
+DESCRIPTOR = _descriptor_pool.Default().AddSerializedFile(b'\n#wabee/rpc/protos/tool_service.proto\x12\x0bwabee.tools\"\x1b\n\nInt64Value\x12\r\n\x05value\x18\x01 \x01(\x03\"\x1c\n\x0bStringValue\x12\r\n\x05value\x18\x01 \x01(\t\"\x1b\n\nFloatValue\x12\r\n\x05value\x18\x01 \x01(\x01\"\x9e\x01\n\x0e\x45xecuteRequest\x12\x11\n\ttool_name\x18\x01 \x01(\t\x12\x13\n\tjson_data\x18\x02 \x01(\tH\x00\x12\x14\n\nproto_data\x18\x03 \x01(\x0cH\x00\x12\x17\n\x0fidempotency_key\x18\x04 \x01(\t\x12\x10\n\x08paginate\x18\x05 \x01(\x08\x12\x1a\n\x12schema_fingerprint\x18\x06 \x01(\tB\x07\n\x05input\"4\n\x11ImageToolResponse\x12\x11\n\tmime_type\x18\x01 \x01(\t\x12\x0c\n\x04\x64\x61ta\x18\x02 \x01(\t\"\x92\x03\n\x16StructuredToolResponse\x12\x15\n\rvariable_name\x18\x01 \x01(\t\x12\x0f\n\x07\x63ontent\x18\x02 \x01(\t\x12\x1c\n\x0flocal_file_path\x18\x03 \x01(\tH\x00\x88\x01\x01\x12\x43\n\x08metadata\x18\x04 \x03(\x0b\x32\x31.wabee.tools.StructuredToolResponse.MetadataEntry\x12\x18\n\x0bmemory_push\x18\x05 \x01(\x08H\x01\x88\x01\x01\x12.\n\x06images\x18\x06 \x03(\x0b\x32\x1e.wabee.tools.ImageToolResponse\x12\x12\n\x05\x65rror\x18\x07 \x01(\tH\x02\x88\x01\x01\x12\x1c\n\x0fis_final_answer\x18\x08 \x01(\x08H\x03\x88\x01\x01\x1a/\n\rMetadataEntry\x12\x0b\n\x03key\x18\x01 \x01(\t\x12\r\n\x05value\x18\x02 \x01(\t:\x02\x38\x01\x42\x12\n\x10_local_file_pathB\x0e\n\x0c_memory_pushB\x08\n\x06_errorB\x12\n\x10_is_final_answer\"\x81\x02\n\x0f\x45xecuteResponse\x12\x15\n\x0bjson_result\x18\x01 \x01(\tH\x00\x12\x16\n\x0cproto_result\x18\x02 \x01(\x0cH\x00\x12@\n\x11structured_result\x18\x03 \x01(\x0b\x32#.wabee.tools.StructuredToolResponseH\x00\x12%\n\x05\x65rror\x18\x04 \x01(\x0b\x32\x16.wabee.tools.ToolError\x12\x1a\n\x12schema_fingerprint\x18\x05 \x01(\t\x12\x30\n\rresult_handle\x18\x06 \x01(\x0b\x32\x19.wabee.tools.ResultHandleB\x08\n\x06result\"*\n\tToolError\x12\x0c\n\x04type\x18\x01 \x01(\t\x12\x0f\n\x07message\x18\x02 \x01(\t\")\n\x14GetToolSchemaRequest\x12\x11\n\ttool_name\x18\x01 \x01(\t\"\x88\x01\n\nToolSchema\x12\x11\n\ttool_name\x18\x01 \x01(\t\x12\x13\n\x0b\x64\x65scription\x18\x02 \x01(\t\x12(\n\x06\x66ields\x18\x03 \x03(\x0b\x32\x18.wabee.tools.FieldSchema\x12\x13\n\x0bjson_schema\x18\x04 \x01(\t\x12\x13\n\x0b\x66ingerprint\x18\x05 \x01(\t\"P\n\x0b\x46ieldSchema\x12\x0c\n\x04name\x18\x01 \x01(\t\x12\x0c\n\x04type\x18\x02 \x01(\t\x12\x10\n\x08required\x18\x03 \x01(\x08\x12\x13\n\x0b\x64\x65scription\x18\x04 \x01(\t\"g\n\x0eSessionRequest\x12\x0b\n\x03tag\x18\x01 \x01(\x04\x12.\n\x07\x65xecute\x18\x02 \x01(\x0b\x32\x1b.wabee.tools.ExecuteRequestH\x00\x12\x10\n\x06\x63\x61ncel\x18\x03 \x01(\x08H\x00\x42\x06\n\x04kind\"\x80\x01\n\x0fSessionResponse\x12\x0b\n\x03tag\x18\x01 \x01(\x04\x12.\n\x08response\x18\x02 \x01(\x0b\x32\x1c.wabee.tools.ExecuteResponse\x12\x0c\n\x04\x63ode\x18\x03 \x01(\x05\x12\x0f\n\x07\x64\x65tails\x18\x04 \x01(\t\x12\x11\n\tcancelled\x18\x05 \x01(\x08\"\x1c\n\nJobRequest\x12\x0e\n\x06job_id\x18\x01 \x01(\t\"\xc5\x01\n\x03Job\x12\x0e\n\x06job_id\x18\x01 \x01(\t\x12\x11\n\ttool_name\x18\x02 \x01(\t\x12\r\n\x05state\x18\x03 \x01(\t\x12.\n\x08response\x18\x04 \x01(\x0b\x32\x1c.wabee.tools.ExecuteResponse\x12\x0c\n\x04\x63ode\x18\x05 \x01(\x05\x12\x0f\n\x07\x64\x65tails\x18\x06 \x01(\t\x12\x14\n\x0csubmitted_at\x18\x07 \x01(\x01\x12\x12\n\nstarted_at\x18\x08 \x01(\x01\x12\x13\n\x0b\x66inished_at\x18\t \x01(\x01\"<\n\x0c\x46ieldMapping\x12\x0c\n\x04step\x18\x01 \x01(\t\x12\x0e\n\x06source\x18\x02 \x01(\t\x12\x0e\n\x06target\x18\x03 \x01(\t\"|\n\x0cPipelineStep\x12\x0c\n\x04name\x18\x01 \x01(\t\x12\x11\n\ttool_name\x18\x02 \x01(\t\x12\x11\n\tjson_data\x18\x03 \x01(\t\x12)\n\x06inputs\x18\x04 \x03(\x0b\x32\x19.wabee.tools.FieldMapping\x12\r\n\x05\x61\x66ter\x18\x05 \x03(\t\"L\n\x0fPipelineRequest\x12(\n\x05steps\x18\x01 \x03(\x0b\x32\x19.wabee.tools.PipelineStep\x12\x0f\n\x07outputs\x18\x02 \x03(\t\"\x84\x01\n\nStepResult\x12\x0c\n\x04name\x18\x01 \x01(\t\x12.\n\x08response\x18\x02 \x01(\x0b\x32\x1c.wabee.tools.ExecuteResponse\x12\x0f\n\x07skipped\x18\x03 \x01(\x08\x12\x12\n\nstarted_ms\x18\x04 \x01(\x01\x12\x13\n\x0b\x64uration_ms\x18\x05 \x01(\x01\"O\n\x10PipelineResponse\x12&\n\x05steps\x18\x01 \x03(\x0b\x32\x17.wabee.tools.StepResult\x12\x13\n\x0b\x64uration_ms\x18\x02 \x01(\x01\"s\n\x0cResultHandle\x12\x11\n\thandle_id\x18\x01 \x01(\t\x12\x13\n\x0btotal_bytes\x18\x02 \x01(\x04\x12\x13\n\x0btotal_lines\x18\x03 \x01(\x04\x12\x12\n\npage_bytes\x18\x04 \x01(\x04\x12\x12\n\nexpires_at\x18\x05 \x01(\x01\"T\n\x11ReadResultRequest\x12\x11\n\thandle_id\x18\x01 \x01(\t\x12\x0e\n\x06offset\x18\x02 \x01(\x04\x12\r\n\x05limit\x18\x03 \x01(\x04\x12\r\n\x05lines\x18\x04 \x01(\x08\"M\n\x0bResultChunk\x12\x0c\n\x04\x64\x61ta\x18\x01 \x01(\x0c\x12\x0e\n\x06offset\x18\x02 \x01(\x04\x12\x13\n\x0bnext_offset\x18\x03 \x01(\x04\x12\x0b\n\x03\x65of\x18\x04 \x01(\x08\x32\xe4\x04\n\x0bToolService\x12\x44\n\x07\x45xecute\x12\x1b.wabee.tools.ExecuteRequest\x1a\x1c.wabee.tools.ExecuteResponse\x12K\n\rGetToolSchema\x12!.wabee.tools.GetToolSchemaRequest\x1a\x17.wabee.tools.ToolSchema\x12H\n\x07Session\x12\x1b.wabee.tools.SessionRequest\x1a\x1c.wabee.tools.SessionResponse(\x01\x30\x01\x12:\n\tSubmitJob\x12\x1b.wabee.tools.ExecuteRequest\x1a\x10.wabee.tools.Job\x12\x33\n\x06GetJob\x12\x17.wabee.tools.JobRequest\x1a\x10.wabee.tools.Job\x12\x37\n\x08WatchJob\x12\x17.wabee.tools.JobRequest\x1a\x10.wabee.tools.Job0\x01\x12\x36\n\tCancelJob\x12\x17.wabee.tools.JobRequest\x1a\x10.wabee.tools.Job\x12N\n\x0f\x45xecutePipeline\x12\x1c.wabee.tools.PipelineRequest\x1a\x1d.wabee.tools.PipelineResponse\x12\x46\n\nReadResult\x12\x1e.wabee.tools.ReadResultRequest\x1a\x18.wabee.tools.ResultChunkb\x06proto3')
 
 _globals = globals()
 _builder.BuildMessageAndEnumDescriptors(DESCRIPTOR, _globals)
@@ -39,24 +39,48 @@ if not _descriptor._USE_C_DESCRIPTORS:
   _globals['_STRINGVALUE']._serialized_end=109
   _globals['_FLOATVALUE']._serialized_start=111
   _globals['_FLOATVALUE']._serialized_end=138
-  _globals['_EXECUTEREQUEST']._serialized_start=140
-  _globals['_EXECUTEREQUEST']._serialized_end=227
-  _globals['_IMAGETOOLRESPONSE']._serialized_start=229
-  _globals['_IMAGETOOLRESPONSE']._serialized_end=281
-  _globals['_STRUCTUREDTOOLRESPONSE']._serialized_start=284
-  _globals['_STRUCTUREDTOOLRESPONSE']._serialized_end=636
-  _globals['_STRUCTUREDTOOLRESPONSE_METADATAENTRY']._serialized_start=543
-  _globals['_STRUCTUREDTOOLRESPONSE_METADATAENTRY']._serialized_end=590
-  _globals['_EXECUTERESPONSE']._serialized_start=639
-  _globals['_EXECUTERESPONSE']._serialized_end=818
-  _globals['_TOOLERROR']._serialized_start=820
-  _globals['_TOOLERROR']._serialized_end=862
-  _globals['_GETTOOLSCHEMAREQUEST']._serialized_start=864
-  _globals['_GETTOOLSCHEMAREQUEST']._serialized_end=905
-  _globals['_TOOLSCHEMA']._serialized_start=907
-  _globals['_TOOLSCHEMA']._serialized_end=1001
-  _globals['_FIELDSCHEMA']._serialized_start=1003
-  _globals['_FIELDSCHEMA']._serialized_end=1083
-  _globals['_TOOLSERVICE']._serialized_start=1086
-  _globals['_TOOLSERVICE']._serialized_end=1246
+  _globals['_EXECUTEREQUEST']._serialized_start=141
+  _globals['_EXECUTEREQUEST']._serialized_end=299
+  _globals['_IMAGETOOLRESPONSE']._serialized_start=301
+  _globals['_IMAGETOOLRESPONSE']._serialized_end=353
+  _globals['_STRUCTUREDTOOLRESPONSE']._serialized_start=356
+  _globals['_STRUCTUREDTOOLRESPONSE']._serialized_end=758
+  _globals['_STRUCTUREDTOOLRESPONSE_METADATAENTRY']._serialized_start=645
+  _globals['_STRUCTUREDTOOLRESPONSE_METADATAENTRY']._serialized_end=692
+  _globals['_EXECUTERESPONSE']._serialized_start=761
+  _globals['_EXECUTERESPONSE']._serialized_end=1018
+  _globals['_TOOLERROR']._serialized_start=1020
+  _globals['_TOOLERROR']._serialized_end=1062
+  _globals['_GETTOOLSCHEMAREQUEST']._serialized_start=1064
+  _globals['_GETTOOLSCHEMAREQUEST']._serialized_end=1105
+  _globals['_TOOLSCHEMA']._serialized_start=1108
+  _globals['_TOOLSCHEMA']._serialized_end=1244
+  _globals['_FIELDSCHEMA']._serialized_start=1246
+  _globals['_FIELDSCHEMA']._serialized_end=1326
+  _globals['_SESSIONREQUEST']._serialized_start=1328
+  _globals['_SESSIONREQUEST']._serialized_end=1431
+  _globals['_SESSIONRESPONSE']._serialized_start=1434
+  _globals['_SESSIONRESPONSE']._serialized_end=1562
+  _globals['_JOBREQUEST']._serialized_start=1564
+  _globals['_JOBREQUEST']._serialized_end=1592
+  _globals['_JOB']._serialized_start=1595
+  _globals['_JOB']._serialized_end=1792
+  _globals['_FIELDMAPPING']._serialized_start=1794
+  _globals['_FIELDMAPPING']._serialized_end=1854
+  _globals['_PIPELINESTEP']._serialized_start=1856
+  _globals['_PIPELINESTEP']._serialized_end=1980
+  _globals['_PIPELINEREQUEST']._serialized_start=1982
+  _globals['_PIPELINEREQUEST']._serialized_end=2058
+  _globals['_STEPRESULT']._serialized_start=2061
+  _globals['_STEPRESULT']._serialized_end=2193
+  _globals['_PIPELINERESPONSE']._serialized_start=2195
+  _globals['_PIPELINERESPONSE']._serialized_end=2274
+  _globals['_RESULTHANDLE']._serialized_start=2276
+  _globals['_RESULTHANDLE']._serialized_end=2391
+  _globals['_READRESULTREQUEST']._serialized_start=2393
+  _globals['_READRESULTREQUEST']._serialized_end=2477
+  _globals['_RESULTCHUNK']._serialized_start=2479
+  _globals['_RESULTCHUNK']._serialized_end=2556
+  _globals['_TOOLSERVICE']._serialized_start=2559
+  _globals['_TOOLSERVICE']._serialized_end=3171
 # @@protoc_insertion_point(module_scope)
@@ -24,14 +24,20 @@ class FloatValue(_message.Message):
     def __init__(self, value: _Optional[float] = ...) -> None: ...
 
 class ExecuteRequest(_message.Message):
-    __slots__ = ("tool_name", "json_data", "proto_data")
+    __slots__ = ("tool_name", "json_data", "proto_data", "idempotency_key", "paginate", "schema_fingerprint")
     TOOL_NAME_FIELD_NUMBER: _ClassVar[int]
     JSON_DATA_FIELD_NUMBER: _ClassVar[int]
     PROTO_DATA_FIELD_NUMBER: _ClassVar[int]
+    IDEMPOTENCY_KEY_FIELD_NUMBER: _ClassVar[int]
+    PAGINATE_FIELD_NUMBER: _ClassVar[int]
+    SCHEMA_FINGERPRINT_FIELD_NUMBER: _ClassVar[int]
     tool_name: str
     json_data: str
     proto_data: bytes
-    def __init__(self, tool_name: _Optional[str] = ..., json_data: _Optional[str] = ..., proto_data: _Optional[bytes] = ...) -> None: ...
+    idempotency_key: str
+    paginate: bool
+    schema_fingerprint: str
+    def __init__(self, tool_name: _Optional[str] = ..., json_data: _Optional[str] = ..., proto_data: _Optional[bytes] = ..., idempotency_key: _Optional[str] = ..., paginate: bool = ..., schema_fingerprint: _Optional[str] = ...) -> None: ...
 
 class ImageToolResponse(_message.Message):
     __slots__ = ("mime_type", "data")
@@ -42,7 +48,7 @@ class ImageToolResponse(_message.Message):
     def __init__(self, mime_type: _Optional[str] = ..., data: _Optional[str] = ...) -> None: ...
 
 class StructuredToolResponse(_message.Message):
-    __slots__ = ("variable_name", "content", "local_file_path", "metadata", "memory_push", "images", "error")
+    __slots__ = ("variable_name", "content", "local_file_path", "metadata", "memory_push", "images", "error", "is_final_answer")
     class MetadataEntry(_message.Message):
         __slots__ = ("key", "value")
         KEY_FIELD_NUMBER: _ClassVar[int]
@@ -57,6 +63,7 @@ class StructuredToolResponse(_message.Message):
     MEMORY_PUSH_FIELD_NUMBER: _ClassVar[int]
     IMAGES_FIELD_NUMBER: _ClassVar[int]
     ERROR_FIELD_NUMBER: _ClassVar[int]
+    IS_FINAL_ANSWER_FIELD_NUMBER: _ClassVar[int]
     variable_name: str
     content: str
     local_file_path: str
@@ -64,19 +71,24 @@ class StructuredToolResponse(_message.Message):
     memory_push: bool
     images: _containers.RepeatedCompositeFieldContainer[ImageToolResponse]
     error: str
-    def __init__(self, variable_name: _Optional[str] = ..., content: _Optional[str] = ..., local_file_path: _Optional[str] = ..., metadata: _Optional[_Mapping[str, str]] = ..., memory_push: bool = ..., images: _Optional[_Iterable[_Union[ImageToolResponse, _Mapping]]] = ..., error: _Optional[str] = ...) -> None: ...
+    is_final_answer: bool
+    def __init__(self, variable_name: _Optional[str] = ..., content: _Optional[str] = ..., local_file_path: _Optional[str] = ..., metadata: _Optional[_Mapping[str, str]] = ..., memory_push: bool = ..., images: _Optional[_Iterable[_Union[ImageToolResponse, _Mapping]]] = ..., error: _Optional[str] = ..., is_final_answer: bool = ...) -> None: ...
 
 class ExecuteResponse(_message.Message):
-    __slots__ = ("json_result", "proto_result", "structured_result", "error")
+    __slots__ = ("json_result", "proto_result", "structured_result", "error", "schema_fingerprint", "result_handle")
     JSON_RESULT_FIELD_NUMBER: _ClassVar[int]
     PROTO_RESULT_FIELD_NUMBER: _ClassVar[int]
     STRUCTURED_RESULT_FIELD_NUMBER: _ClassVar[int]
     ERROR_FIELD_NUMBER: _ClassVar[int]
+    SCHEMA_FINGERPRINT_FIELD_NUMBER: _ClassVar[int]
+    RESULT_HANDLE_FIELD_NUMBER: _ClassVar[int]
     json_result: str
     proto_result: bytes
     structured_result: StructuredToolResponse
     error: ToolError
-    def __init__(self, json_result: _Optional[str] = ..., proto_result: _Optional[bytes] = ..., structured_result: _Optional[_Union[StructuredToolResponse, _Mapping]] = ..., error: _Optional[_Union[ToolError, _Mapping]] = ...) -> None: ...
+    schema_fingerprint: str
+    result_handle: ResultHandle
+    def __init__(self, json_result: _Optional[str] = ..., proto_result: _Optional[bytes] = ..., structured_result: _Optional[_Union[StructuredToolResponse, _Mapping]] = ..., error: _Optional[_Union[ToolError, _Mapping]] = ..., schema_fingerprint: _Optional[str] = ..., result_handle: _Optional[_Union[ResultHandle, _Mapping]] = ...) -> None: ...
 
 class ToolError(_message.Message):
     __slots__ = ("type", "message")
@@ -93,14 +105,18 @@ class GetToolSchemaRequest(_message.Message):
     def __init__(self, tool_name: _Optional[str] = ...) -> None: ...
 
 class ToolSchema(_message.Message):
-    __slots__ = ("tool_name", "description", "fields")
+    __slots__ = ("tool_name", "description", "fields", "json_schema", "fingerprint")
     TOOL_NAME_FIELD_NUMBER: _ClassVar[int]
     DESCRIPTION_FIELD_NUMBER: _ClassVar[int]
     FIELDS_FIELD_NUMBER: _ClassVar[int]
+    JSON_SCHEMA_FIELD_NUMBER: _ClassVar[int]
+    FINGERPRINT_FIELD_NUMBER: _ClassVar[int]
     tool_name: str
     description: str
     fields: _containers.RepeatedCompositeFieldContainer[FieldSchema]
-    def __init__(self, tool_name: _Optional[str] = ..., description: _Optional[str] = ..., fields: _Optional[_Iterable[_Union[FieldSchema, _Mapping]]] = ...) -> None: ...
+    json_schema: str
+    fingerprint: str
+    def __init__(self, tool_name: _Optional[str] = ..., description: _Optional[str] = ..., fields: _Optional[_Iterable[_Union[FieldSchema, _Mapping]]] = ..., json_schema: _Optional[str] = ..., fingerprint: _Optional[str] = ...) -> None: ...
 
 class FieldSchema(_message.Message):
     __slots__ = ("name", "type", "required", "description")
@@ -113,3 +129,147 @@ class FieldSchema(_message.Message):
     required: bool
     description: str
     def __init__(self, name: _Optional[str] = ..., type: _Optional[str] = ..., required: bool = ..., description: _Optional[str] = ...) -> None: ...
+
+class SessionRequest(_message.Message):
+    __slots__ = ("tag", "execute", "cancel")
+    TAG_FIELD_NUMBER: _ClassVar[int]
+    EXECUTE_FIELD_NUMBER: _ClassVar[int]
+    CANCEL_FIELD_NUMBER: _ClassVar[int]
+    tag: int
+    execute: ExecuteRequest
+    cancel: bool
+    def __init__(self, tag: _Optional[int] = ..., execute: _Optional[_Union[ExecuteRequest, _Mapping]] = ..., cancel: bool = ...) -> None: ...
+
+class SessionResponse(_message.Message):
+    __slots__ = ("tag", "response", "code", "details", "cancelled")
+    TAG_FIELD_NUMBER: _ClassVar[int]
+    RESPONSE_FIELD_NUMBER: _ClassVar[int]
+    CODE_FIELD_NUMBER: _ClassVar[int]
+    DETAILS_FIELD_NUMBER: _ClassVar[int]
+    CANCELLED_FIELD_NUMBER: _ClassVar[int]
+    tag: int
+    response: ExecuteResponse
+    code: int
+    details: str
+    cancelled: bool
+    def __init__(self, tag: _Optional[int] = ..., response: _Optional[_Union[ExecuteResponse, _Mapping]] = ..., code: _Optional[int] = ..., details: _Optional[str] = ..., cancelled: bool = ...) -> None: ...
+
+class JobRequest(_message.Message):
+    __slots__ = ("job_id",)
+    JOB_ID_FIELD_NUMBER: _ClassVar[int]
+    job_id: str
+    def __init__(self, job_id: _Optional[str] = ...) -> None: ...
+
+class Job(_message.Message):
+    __slots__ = ("job_id", "tool_name", "state", "response", "code", "details", "submitted_at", "started_at", "finished_at")
+    JOB_ID_FIELD_NUMBER: _ClassVar[int]
+    TOOL_NAME_FIELD_NUMBER: _ClassVar[int]
+    STATE_FIELD_NUMBER: _ClassVar[int]
+    RESPONSE_FIELD_NUMBER: _ClassVar[int]
+    CODE_FIELD_NUMBER: _ClassVar[int]
+    DETAILS_FIELD_NUMBER: _ClassVar[int]
+    SUBMITTED_AT_FIELD_NUMBER: _ClassVar[int]
+    STARTED_AT_FIELD_NUMBER: _ClassVar[int]
+    FINISHED_AT_FIELD_NUMBER: _ClassVar[int]
+    job_id: str
+    tool_name: str
+    state: str
+    response: ExecuteResponse
+    code: int
+    details: str
+    submitted_at: float
+    started_at: float
+    finished_at: float
+    def __init__(self, job_id: _Optional[str] = ..., tool_name: _Optional[str] = ..., state: _Optional[str] = ..., response: _Optional[_Union[ExecuteResponse, _Mapping]] = ..., code: _Optional[int] = ..., details: _Optional[str] = ..., submitted_at: _Optional[float] = ..., started_at: _Optional[float] = ..., finished_at: _Optional[float] = ...) -> None: ...
+
+class FieldMapping(_message.Message):
+    __slots__ = ("step", "source", "target")
+    STEP_FIELD_NUMBER: _ClassVar[int]
+    SOURCE_FIELD_NUMBER: _ClassVar[int]
+    TARGET_FIELD_NUMBER: _ClassVar[int]
+    step: str
+    source: str
+    target: str
+    def __init__(self, step: _Optional[str] = ..., source: _Optional[str] = ..., target: _Optional[str] = ...) -> None: ...
+
+class PipelineStep(_message.Message):
+    __slots__ = ("name", "tool_name", "json_data", "inputs", "after")
+    NAME_FIELD_NUMBER: _ClassVar[int]
+    TOOL_NAME_FIELD_NUMBER: _ClassVar[int]
+    JSON_DATA_FIELD_NUMBER: _ClassVar[int]
+    INPUTS_FIELD_NUMBER: _ClassVar[int]
+    AFTER_FIELD_NUMBER: _ClassVar[int]
+    name: str
+    tool_name: str
+    json_data: str
+    inputs: _containers.RepeatedCompositeFieldContainer[FieldMapping]
+    after: _containers.RepeatedScalarFieldContainer[str]
+    def __init__(self, name: _Optional[str] = ..., tool_name: _Optional[str] = ..., json_data: _Optional[str] = ..., inputs: _Optional[_Iterable[_Union[FieldMapping, _Mapping]]] = ..., after: _Optional[_Iterable[str]] = ...) -> None: ...
+
+class PipelineRequest(_message.Message):
+    __slots__ = ("steps", "outputs")
+    STEPS_FIELD_NUMBER: _ClassVar[int]
+    OUTPUTS_FIELD_NUMBER: _ClassVar[int]
+    steps: _containers.RepeatedCompositeFieldContainer[PipelineStep]
+    outputs: _containers.RepeatedScalarFieldContainer[str]
+    def __init__(self, steps: _Optional[_Iterable[_Union[PipelineStep, _Mapping]]] = ..., outputs: _Optional[_Iterable[str]] = ...) -> None: ...
+
+class StepResult(_message.Message):
+    __slots__ = ("name", "response", "skipped", "started_ms", "duration_ms")
+    NAME_FIELD_NUMBER: _ClassVar[int]
+    RESPONSE_FIELD_NUMBER: _ClassVar[int]
+    SKIPPED_FIELD_NUMBER: _ClassVar[int]
+    STARTED_MS_FIELD_NUMBER: _ClassVar[int]
+    DURATION_MS_FIELD_NUMBER: _ClassVar[int]
+    name: str
+    response: ExecuteResponse
+    skipped: bool
+    started_ms: float
+    duration_ms: float
+    def __init__(self, name: _Optional[str] = ..., response: _Optional[_Union[ExecuteResponse, _Mapping]] = ..., skipped: bool = ..., started_ms: _Optional[float] = ..., duration_ms: _Optional[float] = ...) -> None: ...
+
+class PipelineResponse(_message.Message):
+    __slots__ = ("steps", "duration_ms")
+    STEPS_FIELD_NUMBER: _ClassVar[int]
+    DURATION_MS_FIELD_NUMBER: _ClassVar[int]
+    steps: _containers.RepeatedCompositeFieldContainer[StepResult]
+    duration_ms: float
+    def __init__(self, steps: _Optional[_Iterable[_Union[StepResult, _Mapping]]] = ..., duration_ms: _Optional[float] = ...) -> None: ...
+
+class ResultHandle(_message.Message):
+    __slots__ = ("handle_id", "total_bytes", "total_lines", "page_bytes", "expires_at")
+    HANDLE_ID_FIELD_NUMBER: _ClassVar[int]
+    TOTAL_BYTES_FIELD_NUMBER: _ClassVar[int]
+    TOTAL_LINES_FIELD_NUMBER: _ClassVar[int]
+    PAGE_BYTES_FIELD_NUMBER: _ClassVar[int]
+    EXPIRES_AT_FIELD_NUMBER: _ClassVar[int]
+    handle_id: str
+    total_bytes: int
+    total_lines: int
+    page_bytes: int
+    expires_at: float
+    def __init__(self, handle_id: _Optional[str] = ..., total_bytes: _Optional[int] = ..., total_lines: _Optional[int] = ..., page_bytes: _Optional[int] = ..., expires_at: _Optional[float] = ...) -> None: ...
+
+class ReadResultRequest(_message.Message):
+    __slots__ = ("handle_id", "offset", "limit", "lines")
+    HANDLE_ID_FIELD_NUMBER: _ClassVar[int]
+    OFFSET_FIELD_NUMBER: _ClassVar[int]
+    LIMIT_FIELD_NUMBER: _ClassVar[int]
+    LINES_FIELD_NUMBER: _ClassVar[int]
+    handle_id: str
+    offset: int
+    limit: int
+    lines: bool
+    def __init__(self, handle_id: _Optional[str] = ..., offset: _Optional[int] = ..., limit: _Optional[int] = ..., lines: bool = ...) -> None: ...
+
+class ResultChunk(_message.Message):
+    __slots__ = ("data", "offset", "next_offset", "eof")
+    DATA_FIELD_NUMBER: _ClassVar[int]
+    OFFSET_FIELD_NUMBER: _ClassVar[int]
+    NEXT_OFFSET_FIELD_NUMBER: _ClassVar[int]
+    EOF_FIELD_NUMBER: _ClassVar[int]
+    data: bytes
+    offset: int
+    next_offset: int
+    eof: bool
+    def __init__(self, data: _Optional[bytes] = ..., offset: _Optional[int] = ..., next_offset: _Optional[int] = ..., eof: bool = ...) -> None: ...
@@ -43,6 +43,41 @@ class ToolServiceStub(object):
                 request_serializer=wabee_dot_rpc_dot_protos_dot_tool__service__pb2.GetToolSchemaRequest.SerializeToString,
                 response_deserializer=wabee_dot_rpc_dot_protos_dot_tool__service__pb2.ToolSchema.FromString,
                 _registered_method=True)
+        self.Session = channel.stream_stream(
+                '/wabee.tools.ToolService/Session',
+                request_serializer=wabee_dot_rpc_dot_protos_dot_tool__service__pb2.SessionRequest.SerializeToString,
+                response_deserializer=wabee_dot_rpc_dot_protos_dot_tool__service__pb2.SessionResponse.FromString,
+                _registered_method=True)
+        self.SubmitJob = channel.unary_unary(
+                '/wabee.tools.ToolService/SubmitJob',
+                request_serializer=wabee_dot_rpc_dot_protos_dot_tool__service__pb2.ExecuteRequest.SerializeToString,
+                response_deserializer=wabee_dot_rpc_dot_protos_dot_tool__service__pb2.Job.FromString,
+                _registered_method=True)
+        self.GetJob = channel.unary_unary(
+                '/wabee.tools.ToolService/GetJob',
+                request_serializer=wabee_dot_rpc_dot_protos_dot_tool__service__pb2.JobRequest.SerializeToString,
+                response_deserializer=wabee_dot_rpc_dot_protos_dot_tool__service__pb2.Job.FromString,
+                _registered_method=True)
+        self.WatchJob = channel.unary_stream(
+                '/wabee.tools.ToolService/WatchJob',
+                request_serializer=wabee_dot_rpc_dot_protos_dot_tool__service__pb2.JobRequest.SerializeToString,
+                response_deserializer=wabee_dot_rpc_dot_protos_dot_tool__service__pb2.Job.FromString,
+                _registered_method=True)
+        self.CancelJob = channel.unary_unary(
+                '/wabee.tools.ToolService/CancelJob',
+                request_serializer=wabee_dot_rpc_dot_protos_dot_tool__service__pb2.JobRequest.SerializeToString,
+                response_deserializer=wabee_dot_rpc_dot_protos_dot_tool__service__pb2.Job.FromString,
+                _registered_method=True)
+        self.ExecutePipeline = channel.unary_unary(
+                '/wabee.tools.ToolService/ExecutePipeline',
+                request_serializer=wabee_dot_rpc_dot_protos_dot_tool__service__pb2.PipelineRequest.SerializeToString,
+                response_deserializer=wabee_dot_rpc_dot_protos_dot_tool__service__pb2.PipelineResponse.FromString,
+                _registered_method=True)
+        self.ReadResult = channel.unary_unary(
+                '/wabee.tools.ToolService/ReadResult',
+                request_serializer=wabee_dot_rpc_dot_protos_dot_tool__service__pb2.ReadResultRequest.SerializeToString,
+                response_deserializer=wabee_dot_rpc_dot_protos_dot_tool__service__pb2.ResultChunk.FromString,
+                _registered_method=True)
 
 
 class ToolServiceServicer(object):
@@ -60,6 +95,52 @@ class ToolServiceServicer(object):
         context.set_details('Method not implemented!')
         raise NotImplementedError('Method not implemented!')
 
+    def Session(self, request_iterator, context):
+        """Many Execute calls multiplexed over one stream, answered out of order
+        """
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def SubmitJob(self, request, context):
+        """Long-running calls as jobs: queued on the server, polled or watched by the client
+        """
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def GetJob(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def WatchJob(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def CancelJob(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def ExecutePipeline(self, request, context):
+        """A DAG of tool calls run on the server, feeding results of steps into others
+        """
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def ReadResult(self, request, context):
+        """Ranges of a large result kept on the server, see ExecuteRequest.paginate
+        """
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
 
 def add_ToolServiceServicer_to_server(servicer, server):
     rpc_method_handlers = {
@@ -73,6 +154,41 @@ def add_ToolServiceServicer_to_server(servicer, server):
                     request_deserializer=wabee_dot_rpc_dot_protos_dot_tool__service__pb2.GetToolSchemaRequest.FromString,
                     response_serializer=wabee_dot_rpc_dot_protos_dot_tool__service__pb2.ToolSchema.SerializeToString,
             ),
+            'Session': grpc.stream_stream_rpc_method_handler(
+                    servicer.Session,
+                    request_deserializer=wabee_dot_rpc_dot_protos_dot_tool__service__pb2.SessionRequest.FromString,
+                    response_serializer=wabee_dot_rpc_dot_protos_dot_tool__service__pb2.SessionResponse.SerializeToString,
+            ),
+            'SubmitJob': grpc.unary_unary_rpc_method_handler(
+                    servicer.SubmitJob,
+                    request_deserializer=wabee_dot_rpc_dot_protos_dot_tool__service__pb2.ExecuteRequest.FromString,
+                    response_serializer=wabee_dot_rpc_dot_protos_dot_tool__service__pb2.Job.SerializeToString,
+            ),
+            'GetJob': grpc.unary_unary_rpc_method_handler(
+                    servicer.GetJob,
+                    request_deserializer=wabee_dot_rpc_dot_protos_dot_tool__service__pb2.JobRequest.FromString,
+                    response_serializer=wabee_dot_rpc_dot_protos_dot_tool__service__pb2.Job.SerializeToString,
+            ),
+            'WatchJob': grpc.unary_stream_rpc_method_handler(
+                    servicer.WatchJob,
+                    request_deserializer=wabee_dot_rpc_dot_protos_dot_tool__service__pb2.JobRequest.FromString,
+                    response_serializer=wabee_dot_rpc_dot_protos_dot_tool__service__pb2.Job.SerializeToString,
+            ),
+            'CancelJob': grpc.unary_unary_rpc_method_handler(
+                    servicer.CancelJob,
+                    request_deserializer=wabee_dot_rpc_dot_protos_dot_tool__service__pb2.JobRequest.FromString,
+                    response_serializer=wabee_dot_rpc_dot_protos_dot_tool__service__pb2.Job.SerializeToString,
+            ),
+            'ExecutePipeline': grpc.unary_unary_rpc_method_handler(
+                    servicer.ExecutePipeline,
+                    request_deserializer=wabee_dot_rpc_dot_protos_dot_tool__service__pb2.PipelineRequest.FromString,
+                    response_serializer=wabee_dot_rpc_dot_protos_dot_tool__service__pb2.PipelineResponse.SerializeToString,
+            ),
+            'ReadResult': grpc.unary_unary_rpc_method_handler(
+                    servicer.ReadResult,
+                    request_deserializer=wabee_dot_rpc_dot_protos_dot_tool__service__pb2.ReadResultRequest.FromString,
+                    response_serializer=wabee_dot_rpc_dot_protos_dot_tool__service__pb2.ResultChunk.SerializeToString,
+            ),
     }
     generic_handler = grpc.method_handlers_generic_handler(
             'wabee.tools.ToolService', rpc_method_handlers)
@@ -137,3 +253,192 @@ class ToolService(object):
             timeout,
             metadata,
             _registered_method=True)
+
+    @staticmethod
+    def Session(request_iterator,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.stream_stream(
+            request_iterator,
+            target,
+            '/wabee.tools.ToolService/Session',
+            wabee_dot_rpc_dot_protos_dot_tool__service__pb2.SessionRequest.SerializeToString,
+            wabee_dot_rpc_dot_protos_dot_tool__service__pb2.SessionResponse.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+    @staticmethod
+    def SubmitJob(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/wabee.tools.ToolService/SubmitJob',
+            wabee_dot_rpc_dot_protos_dot_tool__service__pb2.ExecuteRequest.SerializeToString,
+            wabee_dot_rpc_dot_protos_dot_tool__service__pb2.Job.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+    @staticmethod
+    def GetJob(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/wabee.tools.ToolService/GetJob',
+            wabee_dot_rpc_dot_protos_dot_tool__service__pb2.JobRequest.SerializeToString,
+            wabee_dot_rpc_dot_protos_dot_tool__service__pb2.Job.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+    @staticmethod
+    def WatchJob(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_stream(
+            request,
+            target,
+            '/wabee.tools.ToolService/WatchJob',
+            wabee_dot_rpc_dot_protos_dot_tool__service__pb2.JobRequest.SerializeToString,
+            wabee_dot_rpc_dot_protos_dot_tool__service__pb2.Job.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+    @staticmethod
+    def CancelJob(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/wabee.tools.ToolService/CancelJob',
+            wabee_dot_rpc_dot_protos_dot_tool__service__pb2.JobRequest.SerializeToString,
+            wabee_dot_rpc_dot_protos_dot_tool__service__pb2.Job.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+    @staticmethod
+    def ExecutePipeline(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/wabee.tools.ToolService/ExecutePipeline',
+            wabee_dot_rpc_dot_protos_dot_tool__service__pb2.PipelineRequest.SerializeToString,
+            wabee_dot_rpc_dot_protos_dot_tool__service__pb2.PipelineResponse.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+    @staticmethod
+    def ReadResult(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/wabee.tools.ToolService/ReadResult',
+            wabee_dot_rpc_dot_protos_dot_tool__service__pb2.ReadResultRequest.SerializeToString,
+            wabee_dot_rpc_dot_protos_dot_tool__service__pb2.ResultChunk.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
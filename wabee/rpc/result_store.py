@@ -0,0 +1,203 @@
+import os
+import time
+import uuid
+import logging
+import threading
+from array import array
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Optional
+
+from wabee.rpc.protos import tool_service_pb2
+
+logger = logging.getLogger(__name__)
+
+# Content larger than this many bytes is paged for clients that ask for it
+DEFAULT_PAGE_THRESHOLD = int(os.environ.get("WABEE_RESULT_PAGE_THRESHOLD", str(1024 * 1024)))
+# Bytes of content sent as the first page
+DEFAULT_PAGE_SIZE = int(os.environ.get("WABEE_RESULT_PAGE_SIZE", str(64 * 1024)))
+# Seconds a stored result is kept after it was stored or last read
+DEFAULT_RESULT_TTL = float(os.environ.get("WABEE_RESULT_TTL", "300"))
+# Most bytes of content kept at once; the least recently read results are evicted beyond it
+DEFAULT_RESULT_STORE_MAX_BYTES = int(os.environ.get("WABEE_RESULT_STORE_MAX_BYTES", str(256 * 1024 * 1024)))
+# Most bytes one ReadResult call returns, well below gRPC's default 4MB message cap
+DEFAULT_READ_MAX_BYTES = int(os.environ.get("WABEE_RESULT_READ_MAX_BYTES", str(1024 * 1024)))
+
+class ResultNotFoundError(Exception):
+    """Raised for a handle that expired, was evicted or never existed"""
+    pass
+
+class ResultRangeError(Exception):
+    """Raised for a range that can't be returned as asked, e.g. a line longer than one read"""
+    pass
+
+@dataclass
+class StoredResult:
+    handle_id: str
+    data: bytes
+    total_lines: int
+    expires_at: float
+    # Offsets where each line starts, computed on the first read by lines
+    line_starts: Optional["array[int]"] = None
+
+    def lines(self) -> "array[int]":
+        if self.line_starts is None:
+            starts = array('Q', [0])
+            data = self.data
+            position = data.find(b'\n')
+            while position != -1 and position + 1 < len(data):
+                starts.append(position + 1)
+                position = data.find(b'\n', position + 1)
+            self.line_starts = starts
+        return self.line_starts
+
+def _first_page(data: bytes, size: int) -> str:
+    # Drop a character cut in half at the end of the page
+    return data[:size].decode('utf-8', errors='ignore')
+
+class ResultStore:
+    """
+    Large tool results kept in memory for a while, so clients can read them in
+    ranges instead of in one message.
+
+    Each read extends a result's expiry by ttl. Results are dropped once
+    expired, and the least recently read ones are evicted when the total size
+    would exceed max_bytes.
+    """
+
+    def __init__(
+        self,
+        threshold: int = DEFAULT_PAGE_THRESHOLD,
+        page_size: int = DEFAULT_PAGE_SIZE,
+        ttl: float = DEFAULT_RESULT_TTL,
+        max_bytes: int = DEFAULT_RESULT_STORE_MAX_BYTES,
+        read_max_bytes: int = DEFAULT_READ_MAX_BYTES
+    ) -> None:
+        self.threshold = threshold
+        self.page_size = min(page_size, threshold)
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.read_max_bytes = read_max_bytes
+        self._results: "OrderedDict[str, StoredResult]" = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+
+    @property
+    def size(self) -> int:
+        """Bytes of content stored"""
+        return self._size
+
+    def __len__(self) -> int:
+        return len(self._results)
+
+    def _drop(self, handle_id: str) -> None:
+        stored = self._results.pop(handle_id)
+        self._size -= len(stored.data)
+
+    def _expire(self, now: float) -> None:
+        for handle_id in [h for h, stored in self._results.items() if stored.expires_at <= now]:
+            self._drop(handle_id)
+
+    def put(self, data: bytes) -> Optional[StoredResult]:
+        """Store content; None if it's larger than the store can hold"""
+        if len(data) > self.max_bytes:
+            return None
+        now = time.time()
+        with self._lock:
+            self._expire(now)
+            while self._results and self._size + len(data) > self.max_bytes:
+                evicted = next(iter(self._results))
+                logger.info(f"Evicting stored result {evicted} to stay under {self.max_bytes} bytes")
+                self._drop(evicted)
+            total_lines = data.count(b'\n') + (0 if not data or data.endswith(b'\n') else 1)
+            stored = StoredResult(uuid.uuid4().hex, data, total_lines, now + self.ttl)
+            self._results[stored.handle_id] = stored
+            self._size += len(data)
+        return stored
+
+    def get(self, handle_id: str) -> StoredResult:
+        """A stored result, its expiry extended; raises ResultNotFoundError"""
+        now = time.time()
+        with self._lock:
+            stored = self._results.get(handle_id)
+            if stored is None or stored.expires_at <= now:
+                if stored is not None:
+                    self._drop(handle_id)
+                raise ResultNotFoundError(f"Result '{handle_id}' expired or doesn't exist")
+            stored.expires_at = now + self.ttl
+            self._results.move_to_end(handle_id)
+        return stored
+
+    def page(self, response: tool_service_pb2.ExecuteResponse) -> tool_service_pb2.ExecuteResponse:
+        """
+        The response with its content cut to the first page and a ResultHandle to
+        read the rest, when the content is over the threshold; otherwise (or if the
+        content can't be stored) the response unchanged. The response passed in
+        isn't modified, as it may be shared, e.g. by idempotent duplicates.
+        """
+        if response.WhichOneof('result') != 'structured_result':
+            return response
+        content = response.structured_result.content
+        # A string never takes fewer bytes than characters, nor more than four per character
+        if len(content) * 4 <= self.threshold:
+            return response
+        data = content.encode()
+        if len(data) <= self.threshold:
+            return response
+        stored = self.put(data)
+        if stored is None:
+            logger.warning(f"Result of {len(data)} bytes is larger than the result store, sending it whole")
+            return response
+
+        first_page = _first_page(data, self.page_size)
+        paged = tool_service_pb2.ExecuteResponse()
+        # Copy everything but the content, which is the bulk of the message
+        response.structured_result.content = ''
+        try:
+            paged.CopyFrom(response)
+        finally:
+            response.structured_result.content = content
+        paged.structured_result.content = first_page
+        paged.result_handle.handle_id = stored.handle_id
+        paged.result_handle.total_bytes = len(data)
+        paged.result_handle.total_lines = stored.total_lines
+        paged.result_handle.page_bytes = len(first_page.encode())
+        paged.result_handle.expires_at = stored.expires_at
+        return paged
+
+    def read(self, request: tool_service_pb2.ReadResultRequest) -> tool_service_pb2.ResultChunk:
+        """
+        A byte or line range of a stored result; raises ResultNotFoundError, or
+        ResultRangeError when the first line asked for is over read_max_bytes
+        """
+        stored = self.get(request.handle_id)
+        data = stored.data
+        if not request.lines:
+            start = min(request.offset, len(data))
+            length = min(request.limit or self.read_max_bytes, self.read_max_bytes)
+            end = min(start + length, len(data))
+            return tool_service_pb2.ResultChunk(
+                data=data[start:end], offset=start, next_offset=end, eof=end >= len(data)
+            )
+
+        starts = stored.lines()
+        first = min(request.offset, stored.total_lines)
+        last = stored.total_lines if not request.limit else min(first + request.limit, stored.total_lines)
+        begin = starts[first] if first < len(starts) else len(data)
+        # Whole lines only, as many as fit in one read
+        end = begin
+        line = first
+        while line < last:
+            line_end = starts[line + 1] if line + 1 < len(starts) else len(data)
+            if line_end - begin > self.read_max_bytes:
+                if line == first:
+                    raise ResultRangeError(
+                        f"Line {first} is {line_end - begin} bytes, more than the {self.read_max_bytes} "
+                        f"bytes of one read; read it by bytes from offset {begin}"
+                    )
+                break
+            end = line_end
+            line += 1
+        return tool_service_pb2.ResultChunk(
+            data=data[begin:end], offset=first, next_offset=line, eof=line >= stored.total_lines
+        )
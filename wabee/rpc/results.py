@@ -0,0 +1,119 @@
+import json
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional
+
+import grpc
+from pydantic import TypeAdapter
+
+from wabee.tools.base_model import ImageToolResponse, StructuredToolResponse
+from wabee.rpc.protos import tool_service_pb2
+
+# Status codes carried as numbers in messages (SessionResponse.code, Job.code) back to StatusCode
+STATUS_CODES = {code.value[0]: code for code in grpc.StatusCode}
+
+@dataclass
+class ResultRange:
+    """A range of a large result read from the server; offsets are in bytes or lines, as asked"""
+    data: bytes
+    offset: int
+    next_offset: int
+    eof: bool
+
+# Validating images in pydantic-core is faster than constructing each model in Python
+_images: TypeAdapter[List[ImageToolResponse]] = TypeAdapter(List[ImageToolResponse])
+
+def _result_dict(result: Any) -> Dict[str, Any]:
+    if isinstance(result, StructuredToolResponse):
+        return result.model_dump()
+    if isinstance(result, dict):
+        return result
+    if result is None:
+        return {}
+    # Plain values become the content of the response
+    return {'content': result if isinstance(result, str) else json.dumps(result, default=str)}
+
+def encode_structured_result(result: Any, message: tool_service_pb2.StructuredToolResponse) -> None:
+    """
+    Fill a StructuredToolResponse message from a tool result: a StructuredToolResponse,
+    a dict with its fields, or any other value, which is sent as the content.
+
+    Metadata values that aren't strings are sent JSON encoded.
+    """
+    result_dict = _result_dict(result)
+    message.variable_name = result_dict.get('variable_name') or ''
+    message.content = result_dict.get('content') or ''
+    if result_dict.get('local_file_path') is not None:
+        message.local_file_path = result_dict['local_file_path']
+    message.metadata.update({
+        key: value if isinstance(value, str) else json.dumps(value)
+        for key, value in (result_dict.get('metadata') or {}).items()
+    })
+    message.memory_push = bool(result_dict.get('memory_push', False))
+    for image in result_dict.get('images') or []:
+        message.images.add(
+            mime_type=image.get('mime_type', ''),
+            data=image.get('data', '')
+        )
+    if result_dict.get('error') is not None:
+        message.error = result_dict['error']
+    message.is_final_answer = bool(result_dict.get('is_final_answer', False))
+
+def as_structured_response(result: Any) -> StructuredToolResponse:
+    """
+    The StructuredToolResponse a client receives for a tool result, built
+    without going through the proto. Unlike over the wire, metadata values keep
+    their types.
+    """
+    if isinstance(result, StructuredToolResponse):
+        return result
+    result_dict = _result_dict(result)
+    return StructuredToolResponse.model_validate({
+        **result_dict,
+        'variable_name': result_dict.get('variable_name') or '',
+        'content': result_dict.get('content') or '',
+    })
+
+def decode_structured_result(
+    message: tool_service_pb2.StructuredToolResponse,
+    trusted: bool = False
+) -> StructuredToolResponse:
+    """
+    Build a StructuredToolResponse straight from the proto message, without going
+    through JSON.
+
+    With `trusted` the response model is constructed without validation, which
+    is safe when the server is one of ours: the proto types already match the
+    model's. Images are still validated, as that is the faster way to build them.
+    Metadata values arrive as strings, the way the server encoded them.
+    """
+    local_file_path: Optional[str] = message.local_file_path if message.HasField('local_file_path') else None
+    error: Optional[str] = message.error if message.HasField('error') else None
+    metadata = dict(message.metadata) or None
+
+    images = [
+        {'mime_type': image.mime_type, 'data': image.data}
+        for image in message.images
+    ] or None
+
+    if trusted:
+        return StructuredToolResponse.model_construct(
+            variable_name=message.variable_name,
+            content=message.content,
+            local_file_path=local_file_path,
+            metadata=metadata,
+            memory_push=message.memory_push,
+            images=_images.validate_python(images) if images else None,
+            error=error,
+            is_final_answer=message.is_final_answer
+        )
+
+    return StructuredToolResponse.model_validate({
+        'variable_name': message.variable_name,
+        'content': message.content,
+        'local_file_path': local_file_path,
+        'metadata': metadata,
+        'memory_push': message.memory_push,
+        'images': images,
+        'error': error,
+        'is_final_answer': message.is_final_answer,
+    })
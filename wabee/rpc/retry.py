@@ -0,0 +1,132 @@
+import time
+import random
+import threading
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Deque, Dict, FrozenSet, Optional
+
+import grpc
+
+from wabee.tools.tool_error import ToolErrorType
+
+# Failures where the request never reached a tool, or the server asked us to back off
+DEFAULT_RETRYABLE_STATUS_CODES: FrozenSet[grpc.StatusCode] = frozenset({
+    grpc.StatusCode.UNAVAILABLE,
+    grpc.StatusCode.RESOURCE_EXHAUSTED,
+})
+
+# How the server reports ToolErrorType.RETRYABLE in ExecuteResponse.error.type
+RETRYABLE_TOOL_ERROR = str(ToolErrorType.RETRYABLE)
+
+class RetryBudget:
+    """
+    Caps retries at a fraction of recent traffic so retries can't multiply load
+    on a struggling service. Every request deposits `ratio` tokens, every retry
+    spends one; the balance starts at, and never exceeds, `max_tokens`.
+    """
+
+    def __init__(self, ratio: float = 0.2, max_tokens: float = 10.0) -> None:
+        self.ratio = ratio
+        self.max_tokens = max_tokens
+        self._tokens = max_tokens
+        self._lock = threading.Lock()
+
+    def deposit(self) -> None:
+        with self._lock:
+            self._tokens = min(self.max_tokens, self._tokens + self.ratio)
+
+    def try_spend(self) -> bool:
+        with self._lock:
+            if self._tokens >= 1:
+                self._tokens -= 1
+                return True
+            return False
+
+    @property
+    def tokens(self) -> float:
+        return self._tokens
+
+@dataclass
+class RetryPolicy:
+    """
+    When and how ToolServiceClient retries a call.
+
+    Only RPC failures with a status in retryable_status_codes and, if
+    retry_tool_errors is set, RETRYABLE tool errors are retried. Backoff grows
+    exponentially from initial_backoff up to max_backoff, randomized by ±jitter.
+    Retries go to another replica when the client balances over several.
+    """
+    max_attempts: int = 3
+    initial_backoff: float = 0.05
+    max_backoff: float = 2.0
+    multiplier: float = 2.0
+    jitter: float = 0.2
+    retryable_status_codes: FrozenSet[grpc.StatusCode] = DEFAULT_RETRYABLE_STATUS_CODES
+    retry_tool_errors: bool = True
+    budget: Optional[RetryBudget] = field(default_factory=RetryBudget)
+
+    def backoff(self, attempt: int) -> float:
+        """Seconds to wait before retry number `attempt` (starting at 1)"""
+        delay = min(self.max_backoff, self.initial_backoff * (self.multiplier ** (attempt - 1)))
+        return delay * random.uniform(1 - self.jitter, 1 + self.jitter)
+
+    def is_retryable_rpc_error(self, error: grpc.RpcError) -> bool:
+        return error.code() in self.retryable_status_codes
+
+    def is_retryable_tool_error(self, error_type: str) -> bool:
+        return self.retry_tool_errors and error_type == RETRYABLE_TOOL_ERROR
+
+class LatencyTracker:
+    """Sliding window of recent call latencies per tool"""
+
+    def __init__(self, window: int = 200) -> None:
+        self.window = window
+        self._samples: Dict[str, Deque[float]] = {}
+        self._lock = threading.Lock()
+
+    def record(self, tool_name: str, seconds: float) -> None:
+        with self._lock:
+            samples = self._samples.get(tool_name)
+            if samples is None:
+                samples = self._samples[tool_name] = deque(maxlen=self.window)
+            samples.append(seconds)
+
+    def percentile(self, tool_name: str, q: float, min_samples: int = 1) -> Optional[float]:
+        with self._lock:
+            samples = sorted(self._samples.get(tool_name, ()))
+        if len(samples) < max(1, min_samples):
+            return None
+        return samples[min(len(samples) - 1, int(q * len(samples)))]
+
+@dataclass
+class HedgingPolicy:
+    """
+    Opt-in hedged requests for idempotent tools.
+
+    If a call hasn't answered after the tool's recent `percentile` latency (or a
+    fixed `delay`), another copy is sent to a different replica, up to max_hedges
+    extra copies; the first answer wins and the others are cancelled. Until
+    min_samples latencies are known, initial_delay is used.
+
+    Only tools listed in `tools` are hedged, unless a call asks for it explicitly.
+    """
+    tools: FrozenSet[str] = frozenset()
+    delay: Optional[float] = None
+    percentile: float = 0.95
+    initial_delay: float = 0.1
+    min_delay: float = 0.005
+    min_samples: int = 20
+    max_hedges: int = 1
+    latencies: LatencyTracker = field(default_factory=LatencyTracker)
+
+    def applies_to(self, tool_name: str) -> bool:
+        return tool_name in self.tools
+
+    def delay_for(self, tool_name: str) -> float:
+        if self.delay is not None:
+            return self.delay
+        observed = self.latencies.percentile(tool_name, self.percentile, self.min_samples)
+        return max(self.min_delay, observed if observed is not None else self.initial_delay)
+
+    def record(self, tool_name: str, started: float) -> None:
+        self.latencies.record(tool_name, time.monotonic() - started)
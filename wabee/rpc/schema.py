@@ -18,7 +18,7 @@ class ProtoMessage:
     package: str = "wabee.tools"
     
 class ProtoSchemaGenerator:
-    TYPE_MAPPING = {
+    TYPE_MAPPING: Dict[Any, str] = {
         int: "int64",
         str: "string",
         float: "double",
@@ -35,7 +35,7 @@ class ProtoSchemaGenerator:
     ) -> ProtoMessage:
         fields = []
         for i, (name, field) in enumerate(model.model_fields.items(), start=1):
-            proto_type = cls.TYPE_MAPPING.get(field.annotation.__class__, "bytes")
+            proto_type = cls.TYPE_MAPPING.get(field.annotation, "bytes")
             fields.append(ProtoField(
                 name=name,
                 type=proto_type,
@@ -1,31 +1,119 @@
+import os
 import json
+import stat
 import asyncio
+import functools
 import logging
 import signal
 import grpc
-from typing import Dict, Any, Optional, Callable, Union
+from typing import TYPE_CHECKING, AsyncIterator, Dict, Any, List, Optional, Callable, Tuple, Union
 from concurrent import futures
+from pydantic import BaseModel, ValidationError
 
 from wabee.tools.base_tool import BaseTool
 from wabee.tools.tool_error import ToolError, ToolErrorType
-from wabee.tools.base_model import StructuredToolResponse
-from wabee.rpc.schema import ProtoSchemaGenerator
+from wabee.tools.resources import ResourceRegistry, registry as default_registry
 
+from wabee.rpc.manifest import fingerprint
+from wabee.rpc.results import encode_structured_result
 from wabee.rpc.protos import tool_service_pb2
 from wabee.rpc.protos import tool_service_pb2_grpc
 
+if TYPE_CHECKING:
+    from wabee.rpc.idempotency import IdempotencyCache
+    from wabee.rpc.jobs import JobManager
+    from wabee.rpc.result_store import ResultStore
+    from wabee.rpc.schema import ProtoSchemaGenerator
+
 logger = logging.getLogger(__name__)
 
-# Configure default logging format
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-)
+class MalformedInputError(Exception):
+    """Raised when the raw request input can't be decoded"""
+    pass
+
+class CallStatusError(Exception):
+    """Raised when an Execute call ends with a gRPC status other than OK"""
+
+    def __init__(self, code: grpc.StatusCode, details: str) -> None:
+        super().__init__(details)
+        self.code = code
+        self.details = details
+
+# Most calls of one Session stream running at once
+DEFAULT_SESSION_MAX_IN_FLIGHT = int(os.environ.get("WABEE_SESSION_MAX_IN_FLIGHT", "64"))
 
 class ToolServicer(tool_service_pb2_grpc.ToolServiceServicer):
-    def __init__(self, tools: Dict[str, Union[BaseTool, Any]]):
+    def __init__(
+        self,
+        tools: Dict[str, Union[BaseTool, Any]],
+        session_max_in_flight: int = DEFAULT_SESSION_MAX_IN_FLIGHT,
+        idempotency: Optional["IdempotencyCache"] = None,
+        result_store: Optional["ResultStore"] = None
+    ):
+        """
+        Args:
+            tools: Tools to serve, by name
+            session_max_in_flight: Most calls of one Session stream running at once
+            idempotency: IdempotencyCache deduplicating calls that carry an
+                idempotency key; by default one is created on the first such call
+            result_store: ResultStore keeping large results for calls that ask for
+                paginated content; by default one is created on the first such call
+        """
         self.tools = tools
-        self.schema_generator = ProtoSchemaGenerator()
+        self.session_max_in_flight = session_max_in_flight
+        self._idempotency = idempotency
+        self._result_store = result_store
+        self._schema_generator: Optional["ProtoSchemaGenerator"] = None
+        self._schemas: Dict[str, Tuple[Dict[str, Any], str]] = {}
+        self._jobs: Optional["JobManager"] = None
+
+    @property
+    def schema_generator(self) -> "ProtoSchemaGenerator":
+        # Schema generation is only needed by GetToolSchema, so keep it off
+        # the import path of the server to speed up cold starts.
+        if self._schema_generator is None:
+            from wabee.rpc.schema import ProtoSchemaGenerator
+            self._schema_generator = ProtoSchemaGenerator()
+        return self._schema_generator
+
+    @property
+    def idempotency(self) -> "IdempotencyCache":
+        if self._idempotency is None:
+            from wabee.rpc.idempotency import IdempotencyCache
+            self._idempotency = IdempotencyCache()
+        return self._idempotency
+
+    @property
+    def result_store(self) -> "ResultStore":
+        if self._result_store is None:
+            from wabee.rpc.result_store import ResultStore
+            self._result_store = ResultStore()
+        return self._result_store
+
+    @property
+    def jobs(self) -> "JobManager":
+        # Like the schema generator, only loaded once jobs are used; the store
+        # and workers only start on the first job call
+        if self._jobs is None:
+            from wabee.rpc.jobs import JobManager
+            self._jobs = JobManager(self)
+        return self._jobs
+
+    def _tool_schema(self, tool_name: str) -> Tuple[Dict[str, Any], str]:
+        """The JSON schema of a tool's input and its fingerprint, computed once per tool"""
+        cached = self._schemas.get(tool_name)
+        if cached is None:
+            tool = self.tools[tool_name]
+            compiled = self._compiled_tool(tool)
+            # Tools loaded from a build-time manifest carry their schema already
+            schema = getattr(tool, 'precompiled_schema', None)
+            if schema is None:
+                if compiled is not None and compiled.args_schema is None:
+                    schema = {"type": "object", "properties": {}}
+                else:
+                    schema = self.schema_generator.get_tool_schema(tool)
+            cached = self._schemas[tool_name] = (schema, fingerprint(schema))
+        return cached
 
     async def GetToolSchema(
         self,
@@ -38,12 +126,18 @@ class ToolServicer(tool_service_pb2_grpc.ToolServiceServicer):
             context.set_details(f"Tool '{tool_name}' not found")
             return tool_service_pb2.ToolSchema()
 
+        return self.schema_message(tool_name)
+
+    def schema_message(self, tool_name: str) -> tool_service_pb2.ToolSchema:
+        """The ToolSchema describing a registered tool"""
         tool = self.tools[tool_name]
-        schema = self.schema_generator.get_tool_schema(tool)
+        schema, schema_fingerprint = self._tool_schema(tool_name)
         
         response = tool_service_pb2.ToolSchema(
             tool_name=tool_name,
-            description=tool.description if hasattr(tool, 'description') else ""
+            description=tool.description if hasattr(tool, 'description') else "",
+            json_schema=json.dumps(schema, sort_keys=True, default=str),
+            fingerprint=schema_fingerprint
         )
         
         for name, details in schema.get("properties", {}).items():
@@ -55,17 +149,33 @@ class ToolServicer(tool_service_pb2_grpc.ToolServiceServicer):
             
         return response
 
+    @staticmethod
+    def _compiled_tool(tool: Union[BaseTool, Any]) -> Optional[BaseTool]:
+        """The BaseTool behind a tool: the tool itself or the one compiled by @simple_tool"""
+        if isinstance(tool, BaseTool):
+            return tool
+        compiled = getattr(tool, 'tool', None)
+        return compiled if isinstance(compiled, BaseTool) else None
+
     async def _execute_tool(
         self,
         tool: Union[BaseTool, Any],
-        input_data: Dict[str, Any]
+        input_data: Union[Dict[str, Any], BaseModel]
     ) -> tuple[Any, Optional[ToolError]]:
         try:
             # Check if tool is a function instance and not an object
             if callable(tool) and not isinstance(tool, BaseTool):
+                if isinstance(input_data, BaseModel):
+                    compiled = self._compiled_tool(tool)
+                    if compiled is not None:
+                        return await compiled(input_data)
+                    input_data = dict(input_data)
                 return await tool(**input_data)
             else:  # For BaseTool instances
-                tool_input = tool.args_schema.model_validate(input_data)
+                if tool.args_schema is None or isinstance(input_data, tool.args_schema):
+                    tool_input = input_data
+                else:
+                    tool_input = tool.args_schema.model_validate(input_data)
                 return await tool(tool_input)
         except Exception as e:
             return None, ToolError(
@@ -73,65 +183,368 @@ class ToolServicer(tool_service_pb2_grpc.ToolServiceServicer):
                 message=f"Execution failed: {str(e)}"
             )
 
-    async def Execute(
+    async def _execute_raw(
         self,
-        request: tool_service_pb2.ExecuteRequest,
-        context: grpc.aio.ServicerContext
+        tool: Union[BaseTool, Any],
+        raw_input: Union[str, bytes]
+    ) -> tuple[Any, Optional[ToolError]]:
+        """Execute a tool with its raw JSON input.
+
+        When the tool has an input schema, the decoded JSON is validated into the
+        model in a single pass and the validated model is passed through the tool
+        layers, which don't validate it again. Decoding with json.loads and then
+        validating the dict measured slightly faster than model_validate_json for
+        large nested inputs.
+        """
+        try:
+            input_data = json.loads(raw_input)
+        except ValueError as e:
+            raise MalformedInputError(str(e))
+        return await self.execute_decoded(tool, input_data)
+
+    async def execute_decoded(
+        self,
+        tool: Union[BaseTool, Any],
+        input_data: Any
+    ) -> tuple[Any, Optional[ToolError]]:
+        """Validate already decoded input against the tool's schema and execute it"""
+        compiled = self._compiled_tool(tool)
+        args_schema = compiled.args_schema if compiled is not None else None
+        if compiled is None or args_schema is None or args_schema is BaseModel:
+            return await self._execute_tool(tool, input_data)
+
+        try:
+            tool_input = args_schema.model_validate(input_data)
+        except ValidationError as e:
+            return None, ToolError(
+                type=ToolErrorType.INVALID_INPUT,
+                message=str(e),
+                original_error=e
+            )
+        return await self._execute_tool(compiled, tool_input)
+
+    async def execute_request(
+        self,
+        request: tool_service_pb2.ExecuteRequest
+    ) -> tool_service_pb2.ExecuteResponse:
+        """Run one ExecuteRequest; raises CallStatusError for calls that fail with a gRPC status"""
+        if request.idempotency_key:
+            # Keys are scoped to the tool they were sent to
+            key = f"{request.tool_name}\0{request.idempotency_key}"
+            response = await self.idempotency.run(key, lambda: self._run_request(request))
+        else:
+            response = await self._run_request(request)
+        if request.paginate:
+            return self.result_store.page(response)
+        return response
+
+    async def _run_request(
+        self,
+        request: tool_service_pb2.ExecuteRequest
     ) -> tool_service_pb2.ExecuteResponse:
         tool_name = request.tool_name
         
         if tool_name not in self.tools:
-            context.set_code(grpc.StatusCode.NOT_FOUND)
-            context.set_details(f"Tool '{tool_name}' not found")
-            return tool_service_pb2.ExecuteResponse()
+            raise CallStatusError(grpc.StatusCode.NOT_FOUND, f"Tool '{tool_name}' not found")
 
-        # Handle both JSON and proto inputs
+        # Handle both JSON and proto inputs; both carry JSON that's decoded
+        # and validated in one pass by _execute_raw
+        tool = self.tools[tool_name]
         input_case = request.WhichOneof('input')
-        if input_case == 'json_data':
-            try:
-                input_data = json.loads(request.json_data)
-            except json.JSONDecodeError:
-                context.set_code(grpc.StatusCode.INVALID_ARGUMENT)
-                context.set_details("Invalid JSON input")
-                return tool_service_pb2.ExecuteResponse()
-        else:  # proto_data
-            try:
-                # Deserialize the dynamic proto message
-                input_data = json.loads(request.proto_data.decode())
-            except Exception as e:
-                context.set_code(grpc.StatusCode.INVALID_ARGUMENT)
-                context.set_details(f"Invalid proto input: {str(e)}")
-                return tool_service_pb2.ExecuteResponse()
+        try:
+            if input_case == 'json_data':
+                result, error = await self._execute_raw(tool, request.json_data)
+            else:  # proto_data
+                result, error = await self._execute_raw(tool, request.proto_data)
+        except MalformedInputError as e:
+            if input_case == 'json_data':
+                details = "Invalid JSON input"
+            else:
+                details = f"Invalid proto input: {str(e)}"
+            raise CallStatusError(grpc.StatusCode.INVALID_ARGUMENT, details)
 
-        tool = self.tools[tool_name]
-        result, error = await self._execute_tool(tool, input_data)
-        
+        return self.response_message(tool_name, result, error, bool(request.schema_fingerprint))
+
+    def response_message(
+        self,
+        tool_name: str,
+        result: Any,
+        error: Optional[ToolError],
+        with_fingerprint: bool = False
+    ) -> tool_service_pb2.ExecuteResponse:
+        """The ExecuteResponse for a tool's result or error"""
         response = tool_service_pb2.ExecuteResponse()
+        # Lets clients caching the schema notice when it changes. Only done for
+        # clients that sent theirs, as it builds the schema, which is slow on a cold start
+        if with_fingerprint:
+            try:
+                response.schema_fingerprint = self._tool_schema(tool_name)[1]
+            except Exception as e:
+                logger.debug(f"No schema fingerprint for '{tool_name}': {e}")
         
         if error:
             response.error.type = str(error.type)
             response.error.message = error.message
         else:
-            # Convert result to dict if it's a StructuredToolResponse                                                                                                                                                                                 
-            if isinstance(result, StructuredToolResponse):                                                                                                                                                                                            
-                result_dict = result.model_dump()                                                                                                                                                                                                     
-            else:                                                                                                                                                                                                                                     
-                result_dict = result
-  
-            response.structured_result.variable_name = result_dict.get('variable_name', '')
-            response.structured_result.content = result_dict.get('content', '')
-            response.structured_result.local_file_path = result_dict.get('local_file_path', '')
-            response.structured_result.metadata.update(result_dict.get('metadata', {}))
-            response.structured_result.memory_push = result_dict.get('memory_push', False)
-            response.structured_result.images.extend(result_dict.get('images', []))
-            response.structured_result.error = result_dict.get('error', '')
-                
+            encode_structured_result(result, response.structured_result)
+
         return response
 
+    async def Execute(
+        self,
+        request: tool_service_pb2.ExecuteRequest,
+        context: grpc.aio.ServicerContext
+    ) -> tool_service_pb2.ExecuteResponse:
+        try:
+            return await self.execute_request(request)
+        except CallStatusError as e:
+            context.set_code(e.code)
+            context.set_details(e.details)
+            return tool_service_pb2.ExecuteResponse()
+
+    async def Session(
+        self,
+        request_iterator: AsyncIterator[tool_service_pb2.SessionRequest],
+        context: grpc.aio.ServicerContext
+    ) -> AsyncIterator[tool_service_pb2.SessionResponse]:
+        """
+        Run the Execute calls sent on a stream concurrently, answering each with
+        its tag as soon as it finishes.
+
+        At most session_max_in_flight calls of a session run at once. Beyond
+        that the stream isn't read until a call finishes, so gRPC flow control
+        holds the client back.
+        """
+        limit = asyncio.Semaphore(self.session_max_in_flight)
+        outbox: "asyncio.Queue[Optional[tool_service_pb2.SessionResponse]]" = asyncio.Queue()
+        calls: Dict[int, "asyncio.Task[tool_service_pb2.SessionResponse]"] = {}
+
+        async def run(tag: int, request: tool_service_pb2.ExecuteRequest) -> tool_service_pb2.SessionResponse:
+            answer = tool_service_pb2.SessionResponse(tag=tag)
+            try:
+                answer.response.CopyFrom(await self.execute_request(request))
+            except CallStatusError as e:
+                answer.code = e.code.value[0]
+                answer.details = e.details
+            except asyncio.CancelledError:
+                answer.cancelled = True
+            except Exception as e:
+                logger.error(f"Session call {tag} failed: {e}")
+                answer.code = grpc.StatusCode.UNKNOWN.value[0]
+                answer.details = f"Unexpected error: {e}"
+            return answer
+
+        def finished(tag: int, task: "asyncio.Task[tool_service_pb2.SessionResponse]") -> None:
+            # A call cancelled before it started never ran its coroutine, so the
+            # slot and the answer are handled here rather than in run()
+            calls.pop(tag, None)
+            limit.release()
+            if task.cancelled():
+                outbox.put_nowait(tool_service_pb2.SessionResponse(tag=tag, cancelled=True))
+            else:
+                outbox.put_nowait(task.result())
+
+        async def read() -> None:
+            try:
+                async for message in request_iterator:
+                    kind = message.WhichOneof('kind')
+                    if kind == 'cancel':
+                        call = calls.get(message.tag)
+                        if call is not None:
+                            call.cancel()
+                    elif kind == 'execute':
+                        await limit.acquire()
+                        if message.tag in calls:
+                            limit.release()
+                            outbox.put_nowait(tool_service_pb2.SessionResponse(
+                                tag=message.tag,
+                                code=grpc.StatusCode.INVALID_ARGUMENT.value[0],
+                                details=f"Tag {message.tag} is already in flight"
+                            ))
+                            continue
+                        task = asyncio.ensure_future(run(message.tag, message.execute))
+                        task.add_done_callback(functools.partial(finished, message.tag))
+                        calls[message.tag] = task
+                # The client is done sending; answer what is still running
+                if calls:
+                    await asyncio.gather(*list(calls.values()), return_exceptions=True)
+            finally:
+                outbox.put_nowait(None)
+
+        reader = asyncio.ensure_future(read())
+        try:
+            while True:
+                answer = await outbox.get()
+                if answer is None:
+                    break
+                yield answer
+            # Surface errors reading the stream
+            await reader
+        finally:
+            reader.cancel()
+            for call in list(calls.values()):
+                call.cancel()
+
+    async def ExecutePipeline(
+        self,
+        request: tool_service_pb2.PipelineRequest,
+        context: grpc.aio.ServicerContext
+    ) -> tool_service_pb2.PipelineResponse:
+        from wabee.rpc.pipeline import InvalidPipelineError, run_pipeline
+        try:
+            return await run_pipeline(self, request)
+        except InvalidPipelineError as e:
+            context.set_code(grpc.StatusCode.INVALID_ARGUMENT)
+            context.set_details(str(e))
+            return tool_service_pb2.PipelineResponse()
+
+    async def ReadResult(
+        self,
+        request: tool_service_pb2.ReadResultRequest,
+        context: grpc.aio.ServicerContext
+    ) -> tool_service_pb2.ResultChunk:
+        from wabee.rpc.result_store import ResultNotFoundError, ResultRangeError
+        try:
+            return self.result_store.read(request)
+        except ResultNotFoundError as e:
+            context.set_code(grpc.StatusCode.NOT_FOUND)
+            context.set_details(str(e))
+            return tool_service_pb2.ResultChunk()
+        except ResultRangeError as e:
+            context.set_code(grpc.StatusCode.OUT_OF_RANGE)
+            context.set_details(str(e))
+            return tool_service_pb2.ResultChunk()
+
+    async def _job_call(
+        self,
+        call: Callable[[str], Any],
+        job_id: str,
+        context: grpc.aio.ServicerContext
+    ) -> tool_service_pb2.Job:
+        from wabee.rpc.jobs import JobNotFoundError
+        try:
+            return await call(job_id)
+        except JobNotFoundError as e:
+            context.set_code(grpc.StatusCode.NOT_FOUND)
+            context.set_details(str(e))
+            return tool_service_pb2.Job()
+
+    async def SubmitJob(
+        self,
+        request: tool_service_pb2.ExecuteRequest,
+        context: grpc.aio.ServicerContext
+    ) -> tool_service_pb2.Job:
+        """Queue an Execute call to run in the background"""
+        from wabee.rpc.jobs import JobQueueFullError
+        if request.tool_name not in self.tools:
+            context.set_code(grpc.StatusCode.NOT_FOUND)
+            context.set_details(f"Tool '{request.tool_name}' not found")
+            return tool_service_pb2.Job()
+        try:
+            return await self.jobs.submit(request)
+        except JobQueueFullError as e:
+            context.set_code(grpc.StatusCode.RESOURCE_EXHAUSTED)
+            context.set_details(str(e))
+            return tool_service_pb2.Job()
+
+    async def GetJob(
+        self,
+        request: tool_service_pb2.JobRequest,
+        context: grpc.aio.ServicerContext
+    ) -> tool_service_pb2.Job:
+        return await self._job_call(self.jobs.get, request.job_id, context)
+
+    async def CancelJob(
+        self,
+        request: tool_service_pb2.JobRequest,
+        context: grpc.aio.ServicerContext
+    ) -> tool_service_pb2.Job:
+        return await self._job_call(self.jobs.cancel, request.job_id, context)
+
+    async def WatchJob(
+        self,
+        request: tool_service_pb2.JobRequest,
+        context: grpc.aio.ServicerContext
+    ) -> AsyncIterator[tool_service_pb2.Job]:
+        """Stream the job on every change of state until it has finished"""
+        from wabee.rpc.jobs import JobNotFoundError
+        try:
+            async for job in self.jobs.watch(request.job_id):
+                yield job
+        except JobNotFoundError as e:
+            await context.abort(grpc.StatusCode.NOT_FOUND, str(e))
+
+def _lifecycle_tools(tools: Dict[str, Union[BaseTool, Any]]) -> List[BaseTool]:
+    """The distinct BaseTool instances behind the served tools, in registration order"""
+    seen: Dict[int, BaseTool] = {}
+    for tool in tools.values():
+        compiled = ToolServicer._compiled_tool(tool)
+        if compiled is not None:
+            seen.setdefault(id(compiled), compiled)
+    return list(seen.values())
+
+async def start_tools(
+    tools: Dict[str, Union[BaseTool, Any]],
+    resources: Optional[ResourceRegistry] = None
+) -> None:
+    """Bind shared resources and run each tool's on_startup hook.
+
+    If any tool fails to start, the tools already started are shut down again
+    and the error is re-raised, so a server never runs half-initialized.
+    """
+    resources = resources if resources is not None else default_registry
+    started: Dict[str, Union[BaseTool, Any]] = {}
+    try:
+        for tool in _lifecycle_tools(tools):
+            await tool.bind_resources(resources)
+            await tool.on_startup()
+            started[tool.tool_name] = tool
+    except Exception as e:
+        logger.error(f"Tool startup failed: {e}")
+        await stop_tools(started, resources)
+        raise
+
+async def stop_tools(
+    tools: Dict[str, Union[BaseTool, Any]],
+    resources: Optional[ResourceRegistry] = None
+) -> None:
+    """Run each tool's on_shutdown hook in reverse order, then close shared resources.
+
+    Errors are logged and don't prevent the remaining tools from shutting down.
+    """
+    resources = resources if resources is not None else default_registry
+    for tool in reversed(_lifecycle_tools(tools)):
+        try:
+            await tool.on_shutdown()
+        except Exception as e:
+            logger.error(f"Tool '{tool.tool_name}' shutdown failed: {e}")
+        tool.sync_runner.shutdown(wait=False)
+    await resources.close()
+
+def _unix_socket_path(unix_socket: str) -> str:
+    """Filesystem path of a Unix socket given as a path or a unix: target"""
+    if unix_socket.startswith('unix://'):
+        return unix_socket[len('unix://'):]
+    if unix_socket.startswith('unix:'):
+        return unix_socket[len('unix:'):]
+    return unix_socket
+
+def _remove_stale_socket(path: str) -> None:
+    """Remove a socket file left behind by a previous server, refusing to delete anything else"""
+    try:
+        mode = os.stat(path).st_mode
+    except FileNotFoundError:
+        return
+    if not stat.S_ISSOCK(mode):
+        raise FileExistsError(f"{path} exists and is not a socket")
+    os.unlink(path)
+
 async def serve(
     tools: Dict[str, Union[BaseTool, Any]],
-    port: int = 50051,
-    max_workers: int = 10
+    port: Optional[int] = 50051,
+    max_workers: int = 10,
+    resources: Optional[ResourceRegistry] = None,
+    unix_socket: Optional[str] = None
 ) -> None:
     """Start a gRPC server for the given tools.
 
@@ -140,8 +553,21 @@ async def serve(
 
     Args:
         tools: Dictionary mapping tool names to tool instances
-        port: Port number to listen on
+        port: Port number to listen on, or None to listen on unix_socket only
         max_workers: Maximum number of worker threads
+        resources: Registry of shared resources injected into tools; defaults to
+            `wabee.tools.resources.registry`
+        unix_socket: Optional path of a Unix domain socket to listen on as well,
+            for clients on the same host (e.g. sidecars) to connect to with a
+            `unix:` target. A stale socket file at the path is replaced, and the
+            file is removed on shutdown.
+
+    Tool on_startup hooks run before the server accepts requests, and on_shutdown
+    hooks run once it has drained, followed by closing the shared resources.
+
+    Jobs submitted with SubmitJob run on a pool of WABEE_JOB_WORKERS workers. They
+    are kept in the sqlite file WABEE_JOB_STORE (default .wabee/jobs.sqlite3 in the
+    working directory), so queued jobs survive a restart.
 
     Example:
         # In a tool's server.py:
@@ -152,13 +578,33 @@ async def serve(
         tool = loader.load_from_env()
         asyncio.run(serve({tool.name: tool}))
     """
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+    )
+
     server = grpc.aio.server(
         futures.ThreadPoolExecutor(max_workers=max_workers)
     )
-    tool_service_pb2_grpc.add_ToolServiceServicer_to_server(
-        ToolServicer(tools), server
-    )
-    server.add_insecure_port(f'0.0.0.0:{port}')
+    servicer = ToolServicer(tools)
+    tool_service_pb2_grpc.add_ToolServiceServicer_to_server(servicer, server)
+    if port is None and unix_socket is None:
+        raise ValueError("serve() needs a port, a Unix socket or both")
+    addresses = []
+    if port is not None:
+        server.add_insecure_port(f'0.0.0.0:{port}')
+        addresses.append(f"port {port}")
+    socket_path = _unix_socket_path(unix_socket) if unix_socket is not None else None
+    if socket_path is not None:
+        _remove_stale_socket(socket_path)
+        server.add_insecure_port(f'unix:{socket_path}')
+        addresses.append(f"unix:{socket_path}")
+
+    await start_tools(tools, resources)
+    # Resume the jobs left from a previous run; otherwise the job queue starts
+    # on the first job call, keeping sqlite and its workers off the cold start
+    if servicer.jobs.has_store:
+        await servicer.jobs.start()
     
     shutdown_event = asyncio.Event()
     
@@ -178,7 +624,7 @@ async def serve(
         loop.add_signal_handler(sig, create_handler(sig))
     
     try:
-        logging.info(f"Starting gRPC server on port {port}")
+        logging.info(f"Starting gRPC server on {' and '.join(addresses)}")
         await server.start()
         await shutdown_event.wait()
         logging.info("Server shutdown complete")
@@ -189,3 +635,7 @@ async def serve(
         # Cleanup
         if hasattr(server, 'wait_for_termination'):
             await server.wait_for_termination()
+        await servicer.jobs.stop()
+        await stop_tools(tools, resources)
+        if socket_path is not None and os.path.exists(socket_path):
+            os.unlink(socket_path)
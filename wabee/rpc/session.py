@@ -0,0 +1,160 @@
+import asyncio
+import itertools
+import logging
+from typing import TYPE_CHECKING, Any, Dict, Optional
+
+import grpc
+
+from wabee.tools.base_model import StructuredToolResponse
+from wabee.rpc.results import STATUS_CODES
+from wabee.rpc.protos import tool_service_pb2
+
+if TYPE_CHECKING:
+    from wabee.rpc.client import ToolServiceClient
+
+logger = logging.getLogger(__name__)
+
+# Most calls a session has outstanding at once
+DEFAULT_MAX_IN_FLIGHT = 64
+
+class SessionClosedError(Exception):
+    """Raised for calls on a session whose stream has ended"""
+
+    def __init__(self, error: Dict[str, str]) -> None:
+        super().__init__(error['message'])
+        self.error = error
+
+class ToolSession:
+    """
+    Many tool calls multiplexed over one Session stream.
+
+    Each execute() sends a tagged request and waits for the response with its
+    tag; responses come back in whatever order the calls finish, without the
+    per-call cost of setting up a unary RPC. At most max_in_flight calls are
+    outstanding: further calls wait for a slot, and the server applies its own
+    limit by not reading the stream. Cancelling the task awaiting execute()
+    cancels the call on the server by its tag.
+
+    A session is pinned to one server (the balancer's pick when the client has
+    several) and isn't retried or hedged. Use it as an async context manager:
+
+        async with client.session() as session:
+            result, error = await session.execute("search", {"query": "..."})
+    """
+
+    def __init__(self, client: "ToolServiceClient", max_in_flight: int = DEFAULT_MAX_IN_FLIGHT) -> None:
+        self.client = client
+        self.max_in_flight = max_in_flight
+        self.target: Optional[str] = None
+        self._call: Optional[Any] = None
+        self._reader: Optional["asyncio.Task[None]"] = None
+        self._slots = asyncio.Semaphore(max_in_flight)
+        self._write_lock = asyncio.Lock()
+        self._tags = itertools.count(1)
+        self._pending: Dict[int, "asyncio.Future[tool_service_pb2.SessionResponse]"] = {}
+        self._closed: Optional[Dict[str, str]] = None
+
+    async def __aenter__(self) -> "ToolSession":
+        await self.open()
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb) -> None:
+        await self.close()
+
+    async def open(self) -> None:
+        client = self.client
+        target = client.target
+        if client.balancer is not None:
+            target = (await client.balancer.choose()).target
+        self.target = target
+        self._call = client._leased(target).next_stub().Session()
+        self._reader = asyncio.ensure_future(self._read())
+
+    async def _read(self) -> None:
+        assert self._call is not None
+        error = {'type': 'RPC_ERROR', 'message': 'Session closed'}
+        try:
+            async for answer in self._call:
+                future = self._pending.pop(answer.tag, None)
+                if future is not None and not future.done():
+                    future.set_result(answer)
+        except grpc.RpcError as e:
+            error = {'type': 'RPC_ERROR', 'message': str(e)}
+            logger.warning(f"Tool session to {self.target} failed: {e}")
+        finally:
+            self._closed = error
+            for future in self._pending.values():
+                if not future.done():
+                    future.set_exception(SessionClosedError(error))
+            self._pending.clear()
+
+    async def _send(self, request: tool_service_pb2.SessionRequest) -> None:
+        async with self._write_lock:
+            if self._call is None or self._closed is not None:
+                raise SessionClosedError(self._closed or {'type': 'RPC_ERROR', 'message': 'Session is not open'})
+            try:
+                await self._call.write(request)
+            except (grpc.RpcError, asyncio.InvalidStateError) as e:
+                raise SessionClosedError({'type': 'RPC_ERROR', 'message': f"Session stream ended: {e}"})
+
+    async def execute(
+        self,
+        tool_name: str,
+        input_data: Dict[str, Any],
+        hedge: Optional[bool] = None,
+        idempotency_key: Optional[str] = None
+    ) -> tuple[Optional[StructuredToolResponse], Optional[Dict]]:
+        """
+        Execute a tool over the session; same arguments, results and errors as
+        ToolServiceClient.execute. `hedge` is accepted for compatibility and
+        ignored, since the session talks to a single server.
+        """
+        client = self.client
+        if client.validate_inputs:
+            invalid = await client._validation_error(tool_name, input_data)
+            if invalid is not None:
+                return None, invalid
+        request = client.execute_request(tool_name, input_data, idempotency_key)
+
+        async with self._slots:
+            tag = next(self._tags)
+            future: "asyncio.Future[tool_service_pb2.SessionResponse]" = asyncio.get_running_loop().create_future()
+            self._pending[tag] = future
+            try:
+                await self._send(tool_service_pb2.SessionRequest(tag=tag, execute=request))
+                answer = await future
+            except SessionClosedError as e:
+                self._pending.pop(tag, None)
+                return None, e.error
+            except asyncio.CancelledError:
+                if self._pending.pop(tag, None) is not None:
+                    await self.cancel(tag)
+                raise
+
+        if answer.cancelled:
+            return None, {'type': 'CANCELLED', 'message': f"Call {tag} was cancelled"}
+        if answer.code:
+            code = STATUS_CODES.get(answer.code, grpc.StatusCode.UNKNOWN)
+            return None, {'type': 'RPC_ERROR', 'message': f"{code}: {answer.details}"}
+        return client.decode_response(tool_name, answer.response)
+
+    async def cancel(self, tag: int) -> None:
+        """Ask the server to cancel the call with this tag; unknown tags are ignored"""
+        try:
+            await self._send(tool_service_pb2.SessionRequest(tag=tag, cancel=True))
+        except SessionClosedError:
+            pass
+
+    async def close(self) -> None:
+        """Stop sending and wait for the calls in flight to be answered"""
+        if self._call is None:
+            return
+        if self._closed is None:
+            async with self._write_lock:
+                try:
+                    await self._call.done_writing()
+                except (grpc.RpcError, asyncio.InvalidStateError):
+                    pass
+        if self._reader is not None:
+            await self._reader
+        self._call = None
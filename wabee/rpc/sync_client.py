@@ -0,0 +1,202 @@
+import os
+import asyncio
+import logging
+import threading
+import concurrent.futures
+from typing import Any, AsyncIterator, Coroutine, Dict, Iterator, Mapping, Optional, Tuple, TypeVar, Union
+
+from wabee.tools.base_model import StructuredToolResponse
+from wabee.rpc.client import ToolServiceClient
+from wabee.rpc.fanout import DEFAULT_MAX_CONCURRENCY, CallResult, Calls
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+class BackgroundLoop:
+    """
+    An event loop running forever in a daemon thread, for synchronous code to
+    run coroutines on.
+
+    The thread starts on first use. A forked child process starts its own
+    thread on first use, since threads don't survive a fork.
+    """
+
+    def __init__(self, name: str = "wabee-rpc-loop") -> None:
+        self.name = name
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._pid = os.getpid()
+        self._lock = threading.Lock()
+
+    @property
+    def loop(self) -> asyncio.AbstractEventLoop:
+        with self._lock:
+            if self._pid != os.getpid():
+                # The parent's loop thread doesn't exist in a forked child
+                self._loop = self._thread = None
+                self._pid = os.getpid()
+            if self._loop is None:
+                loop = asyncio.new_event_loop()
+                ready = threading.Event()
+                thread = threading.Thread(target=self._run, args=(loop, ready), name=self.name, daemon=True)
+                thread.start()
+                ready.wait()
+                self._loop, self._thread = loop, thread
+                logger.debug(f"Started background event loop thread {self.name}")
+            return self._loop
+
+    @staticmethod
+    def _run(loop: asyncio.AbstractEventLoop, ready: threading.Event) -> None:
+        asyncio.set_event_loop(loop)
+        loop.call_soon(ready.set)
+        loop.run_forever()
+
+    def in_loop_thread(self) -> bool:
+        return self._thread is threading.current_thread() and self._pid == os.getpid()
+
+    def submit(self, coro: Coroutine[Any, Any, T]) -> "concurrent.futures.Future[T]":
+        """Schedule a coroutine on the loop and return a concurrent.futures.Future for it"""
+        return asyncio.run_coroutine_threadsafe(coro, self.loop)
+
+    def run(self, coro: Coroutine[Any, Any, T], timeout: Optional[float] = None) -> T:
+        """Run a coroutine on the loop and block until it finishes"""
+        if self.in_loop_thread():
+            coro.close()
+            raise RuntimeError("Blocking on the background loop from its own thread would deadlock")
+        future = self.submit(coro)
+        try:
+            return future.result(timeout)
+        except concurrent.futures.TimeoutError:
+            future.cancel()
+            raise
+
+    def stop(self) -> None:
+        """Stop the loop and wait for its thread; it starts again on next use"""
+        with self._lock:
+            loop, thread = self._loop, self._thread
+            self._loop = self._thread = None
+        if loop is None or thread is None or self._pid != os.getpid():
+            return
+        loop.call_soon_threadsafe(loop.stop)
+        thread.join()
+        loop.close()
+
+# Loop shared by every SyncToolServiceClient that isn't given its own
+background_loop = BackgroundLoop()
+
+class SyncToolServiceClient:
+    """
+    Blocking ToolServiceClient for synchronous code such as Celery workers or
+    Flask handlers.
+
+    Calls run on one background event loop per process, so every client and
+    thread shares the same pooled channels instead of creating a loop and a
+    connection per call. Methods ending in _future return a
+    concurrent.futures.Future instead of blocking. Safe to use from any number
+    of threads.
+    """
+
+    def __init__(
+        self,
+        *args: Any,
+        background: Optional[BackgroundLoop] = None,
+        timeout: Optional[float] = None,
+        **kwargs: Any
+    ) -> None:
+        """
+        Args:
+            *args, **kwargs: ToolServiceClient arguments
+            background: BackgroundLoop to run calls on (defaults to the process-wide one)
+            timeout: Default seconds to wait for a blocking call; None waits indefinitely
+        """
+        self.background = background if background is not None else background_loop
+        self.timeout = timeout
+        self.client = ToolServiceClient(*args, **kwargs)
+
+    def __enter__(self) -> "SyncToolServiceClient":
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.close()
+
+    def execute_future(
+        self,
+        tool_name: str,
+        input_data: Dict[str, Any],
+        hedge: Optional[bool] = None,
+        idempotency_key: Optional[str] = None
+    ) -> "concurrent.futures.Future[Tuple[Optional[StructuredToolResponse], Optional[Dict]]]":
+        return self.background.submit(self.client.execute(tool_name, input_data, hedge, idempotency_key))
+
+    def execute(
+        self,
+        tool_name: str,
+        input_data: Dict[str, Any],
+        hedge: Optional[bool] = None,
+        timeout: Optional[float] = None,
+        idempotency_key: Optional[str] = None
+    ) -> Tuple[Optional[StructuredToolResponse], Optional[Dict]]:
+        """Execute a tool and wait for the result; see ToolServiceClient.execute"""
+        return self.background.run(
+            self.client.execute(tool_name, input_data, hedge, idempotency_key),
+            timeout if timeout is not None else self.timeout
+        )
+
+    def get_tool_schema_future(self, tool_name: str) -> "concurrent.futures.Future[Dict[str, Any]]":
+        return self.background.submit(self.client.get_tool_schema(tool_name))
+
+    def get_tool_schema(self, tool_name: str, timeout: Optional[float] = None) -> Dict[str, Any]:
+        return self.background.run(
+            self.client.get_tool_schema(tool_name),
+            timeout if timeout is not None else self.timeout
+        )
+
+    def _iterate(self, results: AsyncIterator[CallResult]) -> Iterator[CallResult]:
+        async def next_result() -> Optional[CallResult]:
+            try:
+                return await results.__anext__()
+            except StopAsyncIteration:
+                return None
+
+        async def close() -> None:
+            aclose = getattr(results, "aclose", None)
+            if aclose is not None:
+                await aclose()
+
+        try:
+            while True:
+                result = self.background.run(next_result())
+                if result is None:
+                    return
+                yield result
+        finally:
+            self.background.run(close())
+
+    def as_completed(
+        self,
+        calls: Calls,
+        max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+        tool_concurrency: Union[int, Mapping[str, int], None] = None,
+        window: Optional[int] = None
+    ) -> Iterator[CallResult]:
+        """
+        Execute many calls concurrently on the background loop, yielding results as
+        they finish; see ToolServiceClient.as_completed. Calls keep running between
+        iterations. Closing the iterator cancels the calls still running.
+        """
+        return self._iterate(self.client.as_completed(calls, max_concurrency, tool_concurrency, window))
+
+    def execute_many(
+        self,
+        calls: Calls,
+        max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+        tool_concurrency: Union[int, Mapping[str, int], None] = None,
+        window: Optional[int] = None
+    ) -> Iterator[CallResult]:
+        """Like as_completed(), in input order; see ToolServiceClient.execute_many"""
+        return self._iterate(self.client.execute_many(calls, max_concurrency, tool_concurrency, window))
+
+    def close(self) -> None:
+        """Give the client's channels back to the pool"""
+        self.background.run(self.client.close())
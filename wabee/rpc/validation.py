@@ -0,0 +1,350 @@
+import re
+import json
+import time
+import threading
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
+
+from wabee.tools.tool_error import ToolErrorType
+
+# Matches the type the server reports for pydantic validation failures
+INVALID_INPUT = str(ToolErrorType.INVALID_INPUT)
+
+Location = Tuple[Union[str, int], ...]
+
+@dataclass
+class Issue:
+    """One validation failure, shaped like a pydantic error"""
+    loc: Location
+    type: str
+    msg: str
+    input: Any
+
+Check = Callable[[Any, Location, List[Issue]], None]
+
+_TRUE_STRINGS = frozenset({"1", "on", "t", "true", "y", "yes"})
+_FALSE_STRINGS = frozenset({"0", "off", "f", "false", "n", "no"})
+
+def _as_number(value: Any) -> Optional[float]:
+    if isinstance(value, (int, float)):
+        return float(value)
+    if isinstance(value, str):
+        try:
+            return float(value.strip())
+        except ValueError:
+            return None
+    return None
+
+def _expected(values: List[Any]) -> str:
+    rendered = [repr(value) for value in values]
+    if len(rendered) <= 1:
+        return "".join(rendered)
+    return f"{', '.join(rendered[:-1])} or {rendered[-1]}"
+
+def _input_type(value: Any) -> str:
+    return type(value).__name__
+
+class LocalValidator:
+    """
+    Validates tool input against the JSON schema published by the server, on the
+    client, before any RPC.
+
+    The checks mirror pydantic's lax mode ("2" is a valid integer, "yes" a valid
+    boolean, "1" a member of an int enum) and only reject what the server would
+    reject too: keywords, types and string formats (dates, durations, ...) it
+    doesn't understand are accepted and left to the server.
+    """
+
+    def __init__(self, schema: Dict[str, Any]) -> None:
+        self.schema = schema
+        self.title = schema.get("title", "Input")
+        self._defs: Dict[str, Any] = {**schema.get("definitions", {}), **schema.get("$defs", {})}
+        self._refs: Dict[str, Check] = {}
+        self._check = self._compile(schema)
+
+    def validate(self, data: Any) -> List[Issue]:
+        issues: List[Issue] = []
+        self._check(data, (), issues)
+        return issues
+
+    def format(self, issues: List[Issue]) -> str:
+        """Render issues the way str(pydantic.ValidationError) does"""
+        count = len(issues)
+        lines = [f"{count} validation error{'s' if count != 1 else ''} for {self.title}"]
+        for issue in issues:
+            input_value = repr(issue.input)
+            if len(input_value) > 100:
+                input_value = f"{input_value[:48]}...{input_value[-48:]}"
+            if issue.loc:
+                lines.append(".".join(str(part) for part in issue.loc))
+            lines.append(f"  {issue.msg} [type={issue.type}, input_value={input_value}, input_type={_input_type(issue.input)}]")
+        return "\n".join(lines)
+
+    def _compile(self, schema: Any) -> Check:
+        if not isinstance(schema, dict):
+            return _accept
+
+        checks: List[Check] = []
+        if "$ref" in schema:
+            checks.append(self._ref(schema["$ref"]))
+        for key in ("anyOf", "oneOf"):
+            if key in schema:
+                checks.append(self._any_of([self._compile(branch) for branch in schema[key]]))
+        for branch in schema.get("allOf", []):
+            checks.append(self._compile(branch))
+        if "const" in schema:
+            checks.append(self._enum([schema["const"]], "literal_error"))
+        elif "enum" in schema:
+            # Members of int and float enums are also matched from numeric strings
+            numeric = schema.get("type") in ("integer", "number")
+            checks.append(self._enum(list(schema["enum"]), "enum", numeric))
+
+        types = schema.get("type")
+        if isinstance(types, list):
+            checks.append(self._any_of([self._type(t, schema) for t in types]))
+        elif isinstance(types, str):
+            checks.append(self._type(types, schema))
+        elif "properties" in schema:
+            checks.append(self._type("object", schema))
+
+        if not checks:
+            return _accept
+        if len(checks) == 1:
+            return checks[0]
+
+        def check_all(value: Any, loc: Location, issues: List[Issue]) -> None:
+            for check in checks:
+                found: List[Issue] = []
+                check(value, loc, found)
+                if found:
+                    issues.extend(found)
+                    return
+        return check_all
+
+    def _ref(self, ref: str) -> Check:
+        name = ref.rsplit("/", 1)[-1]
+
+        def check_ref(value: Any, loc: Location, issues: List[Issue]) -> None:
+            # Resolved on first use so recursive models compile
+            check = self._refs.get(name)
+            if check is None:
+                check = self._refs[name] = self._compile(self._defs.get(name))
+            check(value, loc, issues)
+        return check_ref
+
+    @staticmethod
+    def _any_of(branches: List[Check]) -> Check:
+        def check_any(value: Any, loc: Location, issues: List[Issue]) -> None:
+            best: Optional[List[Issue]] = None
+            for branch in branches:
+                found: List[Issue] = []
+                branch(value, loc, found)
+                if not found:
+                    return
+                if best is None or len(found) < len(best):
+                    best = found
+            issues.extend(best or [])
+        return check_any
+
+    @staticmethod
+    def _enum(values: List[Any], error_type: str, numeric: bool = False) -> Check:
+        allowed = list(values)
+
+        def check_enum(value: Any, loc: Location, issues: List[Issue]) -> None:
+            if value in allowed:
+                return
+            if numeric and isinstance(value, str) and _as_number(value) in allowed:
+                return
+            issues.append(Issue(loc, error_type, f"Input should be {_expected(allowed)}", value))
+        return check_enum
+
+    def _type(self, name: str, schema: Dict[str, Any]) -> Check:
+        if name == "object":
+            return self._object(schema)
+        if name == "array":
+            return self._array(schema)
+        if name == "string":
+            return _string(schema)
+        if name in ("integer", "number"):
+            return _number(schema, integer=name == "integer")
+        if name == "boolean":
+            return _boolean
+        if name == "null":
+            return _null
+        return _accept
+
+    def _object(self, schema: Dict[str, Any]) -> Check:
+        properties = {name: self._compile(sub) for name, sub in schema.get("properties", {}).items()}
+        required = [name for name in schema.get("required", []) if isinstance(name, str)]
+        extra = schema.get("additionalProperties", True)
+        extra_check = self._compile(extra) if isinstance(extra, dict) else None
+        title = schema.get("title") if "properties" in schema else None
+
+        def check_object(value: Any, loc: Location, issues: List[Issue]) -> None:
+            if not isinstance(value, dict):
+                if title:
+                    issues.append(Issue(loc, "model_type", f"Input should be a valid dictionary or instance of {title}", value))
+                else:
+                    issues.append(Issue(loc, "dict_type", "Input should be a valid dictionary", value))
+                return
+            for name in required:
+                if name not in value:
+                    issues.append(Issue(loc + (name,), "missing", "Field required", value))
+            for key, item in value.items():
+                check = properties.get(key)
+                if check is not None:
+                    check(item, loc + (key,), issues)
+                elif extra is False:
+                    issues.append(Issue(loc + (key,), "extra_forbidden", "Extra inputs are not permitted", item))
+                elif extra_check is not None:
+                    extra_check(item, loc + (key,), issues)
+        return check_object
+
+    def _array(self, schema: Dict[str, Any]) -> Check:
+        items = self._compile(schema["items"]) if isinstance(schema.get("items"), dict) else None
+        min_items = schema.get("minItems")
+        max_items = schema.get("maxItems")
+
+        def check_array(value: Any, loc: Location, issues: List[Issue]) -> None:
+            if not isinstance(value, (list, tuple, set, frozenset)):
+                issues.append(Issue(loc, "list_type", "Input should be a valid list", value))
+                return
+            if min_items is not None and len(value) < min_items:
+                issues.append(Issue(loc, "too_short", f"List should have at least {min_items} item{'s' if min_items != 1 else ''} after validation, not {len(value)}", value))
+            if max_items is not None and len(value) > max_items:
+                issues.append(Issue(loc, "too_long", f"List should have at most {max_items} item{'s' if max_items != 1 else ''} after validation, not {len(value)}", value))
+            if items is not None:
+                for index, item in enumerate(value):
+                    items(item, loc + (index,), issues)
+        return check_array
+
+def _accept(value: Any, loc: Location, issues: List[Issue]) -> None:
+    return None
+
+def _null(value: Any, loc: Location, issues: List[Issue]) -> None:
+    if value is not None:
+        issues.append(Issue(loc, "none_required", "Input should be None", value))
+
+def _boolean(value: Any, loc: Location, issues: List[Issue]) -> None:
+    if isinstance(value, bool):
+        return
+    if isinstance(value, (int, float)):
+        if value not in (0, 1):
+            issues.append(Issue(loc, "bool_parsing", "Input should be a valid boolean, unable to interpret input", value))
+    elif isinstance(value, str):
+        if value.strip().lower() not in _TRUE_STRINGS | _FALSE_STRINGS:
+            issues.append(Issue(loc, "bool_parsing", "Input should be a valid boolean, unable to interpret input", value))
+    else:
+        issues.append(Issue(loc, "bool_type", "Input should be a valid boolean", value))
+
+def _string(schema: Dict[str, Any]) -> Check:
+    if "format" in schema:
+        # Formatted strings are dates, durations, UUIDs and the like, which
+        # pydantic also parses from other types (e.g. timestamps); leave them to the server
+        return _accept
+    min_length = schema.get("minLength")
+    max_length = schema.get("maxLength")
+    pattern = schema.get("pattern")
+    try:
+        regex = re.compile(pattern) if pattern else None
+    except re.error:
+        regex = None
+
+    def check_string(value: Any, loc: Location, issues: List[Issue]) -> None:
+        if not isinstance(value, str):
+            issues.append(Issue(loc, "string_type", "Input should be a valid string", value))
+            return
+        if min_length is not None and len(value) < min_length:
+            issues.append(Issue(loc, "string_too_short", f"String should have at least {min_length} character{'s' if min_length != 1 else ''}", value))
+        if max_length is not None and len(value) > max_length:
+            issues.append(Issue(loc, "string_too_long", f"String should have at most {max_length} character{'s' if max_length != 1 else ''}", value))
+        if regex is not None and not regex.search(value):
+            issues.append(Issue(loc, "string_pattern_mismatch", f"String should match pattern '{pattern}'", value))
+    return check_string
+
+def _number(schema: Dict[str, Any], integer: bool) -> Check:
+    bounds = [
+        (schema.get("minimum"), lambda v, b: v >= b, "greater_than_equal", "greater than or equal to"),
+        (schema.get("exclusiveMinimum"), lambda v, b: v > b, "greater_than", "greater than"),
+        (schema.get("maximum"), lambda v, b: v <= b, "less_than_equal", "less than or equal to"),
+        (schema.get("exclusiveMaximum"), lambda v, b: v < b, "less_than", "less than"),
+    ]
+    bounds = [bound for bound in bounds if isinstance(bound[0], (int, float))]
+    kind = "integer" if integer else "number"
+    prefix = "int" if integer else "float"
+
+    def check_number(value: Any, loc: Location, issues: List[Issue]) -> None:
+        number = _as_number(value)
+        if number is None:
+            if isinstance(value, str):
+                issues.append(Issue(loc, f"{prefix}_parsing", f"Input should be a valid {kind}, unable to parse string as {'an integer' if integer else 'a number'}", value))
+            else:
+                issues.append(Issue(loc, f"{prefix}_type", f"Input should be a valid {kind}", value))
+            return
+        if integer and not number.is_integer():
+            if isinstance(value, str):
+                issues.append(Issue(loc, "int_parsing", "Input should be a valid integer, unable to parse string as an integer", value))
+            else:
+                issues.append(Issue(loc, "int_from_float", "Input should be a valid integer, got a number with a fractional part", value))
+            return
+        for bound, ok, error_type, words in bounds:
+            if not ok(number, bound):
+                issues.append(Issue(loc, error_type, f"Input should be {words} {bound}", value))
+    return check_number
+
+@dataclass
+class CachedSchema:
+    target: str
+    tool_name: str
+    fingerprint: str
+    schema: Optional[Dict[str, Any]]
+    validator: Optional[LocalValidator]
+    fetched_at: float
+
+class SchemaCache:
+    """
+    Tool schemas fetched from servers, with their compiled validators, by
+    (target, tool name): clients sharing a cache may talk to different servers
+    whose tools have the same names.
+
+    Entries are replaced when a response carries a different schema fingerprint,
+    and optionally expire after ttl seconds.
+    """
+
+    def __init__(self, ttl: Optional[float] = None) -> None:
+        self.ttl = ttl
+        self._entries: Dict[Tuple[str, str], CachedSchema] = {}
+        self._lock = threading.Lock()
+
+    def get(self, target: str, tool_name: str) -> Optional[CachedSchema]:
+        entry = self._entries.get((target, tool_name))
+        if entry is not None and self.ttl is not None and time.monotonic() - entry.fetched_at > self.ttl:
+            self.invalidate(target, tool_name)
+            return None
+        return entry
+
+    def put(self, target: str, tool_name: str, json_schema: str, fingerprint: str) -> CachedSchema:
+        """Cache a schema as published by GetToolSchema; servers without one get no validator"""
+        schema: Optional[Dict[str, Any]] = None
+        validator = None
+        if json_schema:
+            try:
+                schema = json.loads(json_schema)
+            except ValueError:
+                schema = None
+            if isinstance(schema, dict):
+                validator = LocalValidator(schema)
+        entry = CachedSchema(target, tool_name, fingerprint, schema, validator, time.monotonic())
+        with self._lock:
+            self._entries[(target, tool_name)] = entry
+        return entry
+
+    def observe(self, target: str, tool_name: str, fingerprint: str) -> None:
+        """Drop a cached schema when the server reports a different fingerprint"""
+        entry = self._entries.get((target, tool_name))
+        if fingerprint and entry is not None and entry.fingerprint != fingerprint:
+            self.invalidate(target, tool_name)
+
+    def invalidate(self, target: str, tool_name: str) -> None:
+        with self._lock:
+            self._entries.pop((target, tool_name), None)
@@ -1,3 +1,5 @@
 from wabee.tools.base_tool import BaseTool  # noqa: F401
 from wabee.tools.tool_error import ToolError, ToolErrorType  # noqa: F401
-from wabee.tools.simple_tool import simple_tool  # noqa: F401
\ No newline at end of file
+from wabee.tools.simple_tool import simple_tool  # noqa: F401
+from wabee.tools.resources import ResourceRegistry  # noqa: F401
+from wabee.tools.memoize import memoize  # noqa: F401
@@ -5,6 +5,13 @@ class ImageToolResponse(BaseModel):
     mime_type: str = Field(description="The MIME type of the image.")
     data: str = Field(description="The base64 encoded image data.")
 
+class ResultHandle(BaseModel):
+    handle_id: str = Field(description="Id of the full content kept on the tool server.")
+    total_bytes: int = Field(description="Size of the full content, UTF-8 encoded.")
+    total_lines: int = Field(description="Number of lines of the full content.")
+    page_bytes: int = Field(description="Size of the first page received as the content.")
+    expires_at: float = Field(description="Unix time the full content is kept until, unless read again.")
+
 class StructuredToolResponse(BaseModel):
     variable_name: str = Field(description="An intuitive name for a variable that can be used to easily infer what's stored in it. Use specific names that take the variable content into consideration.")
     content: str = Field(description="The content of the tool response.")
@@ -14,3 +21,4 @@ class StructuredToolResponse(BaseModel):
     images: Optional[List[ImageToolResponse]] = Field(None, description="Optional list of images that are part of the response.")
     error: Optional[str] = Field(None, description="Use this field to include an error message if an error occurred during the tool execution.")
     is_final_answer: bool = Field(False, description="Indicates whether this tool response is the final answer to the user.")
+    result_handle: Optional[ResultHandle] = Field(None, exclude=True, description="Set by the client when the content is only the first page of a larger result kept on the server.")
@@ -1,14 +1,30 @@
+import inspect
 from abc import ABC, abstractmethod
 from wabee.tools.tool_error import ToolError, ToolErrorType
 from wabee.tools.base_model import StructuredToolResponse
-from typing import TypeVar, Generic, Optional, Dict, Type, Any
+from wabee.tools.sync_runner import DEFAULT_MAX_SYNC_WORKERS, SyncRunner
+from wabee.tools.limits import QUEUE, ToolLimiter, ToolLimitExceeded
+from typing import TYPE_CHECKING, TypeVar, Generic, Optional, Dict, Type, Any, Callable, Tuple, cast
 from pydantic import BaseModel, ValidationError
 
+if TYPE_CHECKING:
+    from wabee.tools.resources import ResourceRegistry
+
 InputType = TypeVar('InputType', Dict, BaseModel)
 OutputType = TypeVar('OutputType', bound=StructuredToolResponse)
 
 class BaseTool(ABC, Generic[InputType, OutputType]):
     args_schema: Optional[Type[BaseModel]] = None
+    # Size of the thread pool used to run a synchronous execute()
+    max_sync_workers: int = DEFAULT_MAX_SYNC_WORKERS
+    # Names of shared resources (see ResourceRegistry) injected as attributes on startup
+    resources: Tuple[str, ...] = ()
+    # Call limits enforced for every call (see ToolLimiter); None means unlimited
+    max_concurrency: Optional[int] = None
+    rate_limit: Optional[float] = None  # calls per second
+    rate_limit_burst: Optional[int] = None
+    on_limit: str = QUEUE  # "queue" excess calls or "reject" them as retryable errors
+    queue_timeout: Optional[float] = None
     
     def __init__(
         self,
@@ -35,12 +51,78 @@ class BaseTool(ABC, Generic[InputType, OutputType]):
     def tool_name(self) -> str:
         """Return the tool's name."""
         return self.name
+
+    @property
+    def sync_runner(self) -> SyncRunner:
+        """The tool's own thread pool for blocking code, created on first use."""
+        runner = self.__dict__.get('_sync_runner')
+        if runner is None:
+            runner = SyncRunner(self.max_sync_workers, name=type(self).__name__)
+            self.__dict__['_sync_runner'] = runner
+        return runner
+
+    @property
+    def limiter(self) -> Optional[ToolLimiter]:
+        """The limiter enforcing max_concurrency/rate_limit, or None if the tool has no limits."""
+        if self.max_concurrency is None and self.rate_limit is None:
+            return None
+        limiter = self.__dict__.get('_limiter')
+        if limiter is None:
+            limiter = ToolLimiter(
+                self.tool_name or type(self).__name__,
+                max_concurrency=self.max_concurrency,
+                rate_limit=self.rate_limit,
+                burst=self.rate_limit_burst,
+                on_limit=self.on_limit,
+                queue_timeout=self.queue_timeout
+            )
+            self.__dict__['_limiter'] = limiter
+        return limiter
+
+    async def run_limited(self, func: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+        """
+        Run func under the tool's limits, on the tool's thread pool if it is synchronous.
+        Raises ToolLimitExceeded when the call is rejected.
+        """
+        limiter = self.limiter
+        if limiter is not None:
+            await limiter.acquire()
+        try:
+            if inspect.iscoroutinefunction(func):
+                return await func(*args, **kwargs)
+            # Synchronous code must not block the event loop
+            return await self.sync_runner.run(func, *args, **kwargs)
+        finally:
+            if limiter is not None:
+                limiter.release()
+
+    async def bind_resources(self, registry: "ResourceRegistry") -> None:
+        """Set each resource listed in `resources` as an attribute of the tool."""
+        for name in self.resources:
+            setattr(self, name, await registry.get(name))
+
+    async def on_startup(self) -> None:
+        """
+        Called once by the server before it accepts requests, after shared
+        resources have been bound. Override to open connections or load models.
+        """
+        pass
+
+    async def on_shutdown(self) -> None:
+        """
+        Called once by the server after it has drained in-flight requests.
+        Override to release what on_startup acquired.
+        """
+        pass
             
     @abstractmethod
     async def execute(self, input_data: InputType) -> tuple[Optional[OutputType], Optional[ToolError]]:
         """
         Main execution method for the tool.
         Returns either (result, None) or (None, error)
+
+        May also be defined as a plain synchronous method, in which case it runs
+        on the tool's bounded thread pool instead of blocking the event loop.
         """
         pass
 
@@ -72,4 +154,13 @@ class BaseTool(ABC, Generic[InputType, OutputType]):
                 type=ToolErrorType.INVALID_INPUT,
                 message=error_msg or "Invalid input"
             )
-        return await self.execute(input_data)
+        return await self._dispatch(input_data)
+
+    async def _dispatch(self, input_data: InputType) -> tuple[Optional[OutputType], Optional[ToolError]]:
+        try:
+            return cast(
+                tuple[Optional[OutputType], Optional[ToolError]],
+                await self.run_limited(self.execute, input_data)
+            )
+        except ToolLimitExceeded as e:
+            return None, ToolError(type=ToolErrorType.RETRYABLE, message=str(e), original_error=e)
@@ -0,0 +1,286 @@
+import time
+import asyncio
+import logging
+import threading
+from collections import deque
+from contextlib import asynccontextmanager
+from dataclasses import asdict, dataclass
+from typing import Any, AsyncIterator, Deque, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+QUEUE = "queue"
+REJECT = "reject"
+
+class ToolLimitExceeded(Exception):
+    """Raised when a call is rejected by a tool's concurrency or rate limit"""
+    pass
+
+class TokenBucket:
+    """Token bucket allowing `rate` calls per second with bursts of up to `burst` calls"""
+
+    def __init__(self, rate: float, burst: Optional[int] = None) -> None:
+        if rate <= 0:
+            raise ValueError("rate_limit must be positive")
+        self.rate = rate
+        self.capacity = float(burst if burst is not None else max(1, int(rate)))
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def try_take(self) -> bool:
+        """Take a token if one is available right now"""
+        with self._lock:
+            self._refill()
+            if self._tokens >= 1:
+                self._tokens -= 1
+                return True
+            return False
+
+    def reserve(self, max_wait: Optional[float] = None) -> Optional[float]:
+        """
+        Reserve the next token and return how long to wait before using it, or None
+        if that would take longer than max_wait. Reservations keep callers in order.
+        """
+        with self._lock:
+            self._refill()
+            wait = max(0.0, (1 - self._tokens) / self.rate)
+            if max_wait is not None and wait > max_wait:
+                return None
+            self._tokens -= 1
+            return wait
+
+    def refund(self) -> None:
+        """Give back a token taken by a call that didn't run"""
+        with self._lock:
+            self._refill()
+            self._tokens = min(self.capacity, self._tokens + 1)
+
+    @property
+    def available(self) -> float:
+        with self._lock:
+            self._refill()
+            return max(0.0, self._tokens)
+
+class ConcurrencyLimit:
+    """
+    Counting semaphore that hands slots to waiters in FIFO order.
+
+    Unlike asyncio.Semaphore it isn't bound to one event loop, so a tool can be
+    shared between the server's loop and callers running their own loops.
+    """
+
+    def __init__(self, limit: int) -> None:
+        if limit < 1:
+            raise ValueError("max_concurrency must be at least 1")
+        self.limit = limit
+        self.in_flight = 0
+        self._waiters: Deque[asyncio.Future] = deque()
+        self._lock = threading.Lock()
+
+    @property
+    def waiting(self) -> int:
+        return len(self._waiters)
+
+    def try_acquire(self) -> bool:
+        with self._lock:
+            if self.in_flight < self.limit and not self._waiters:
+                self.in_flight += 1
+                return True
+            return False
+
+    async def acquire(self, timeout: Optional[float] = None) -> bool:
+        """Wait for a slot; returns False if none became free within timeout"""
+        if self.try_acquire():
+            return True
+        fut = asyncio.get_running_loop().create_future()
+        with self._lock:
+            # A slot may have been released between try_acquire and taking the lock
+            if self.in_flight < self.limit and not self._waiters:
+                self.in_flight += 1
+                return True
+            self._waiters.append(fut)
+        try:
+            if timeout is None:
+                await fut
+            else:
+                await asyncio.wait_for(fut, timeout)
+            return True
+        except (asyncio.TimeoutError, asyncio.CancelledError) as e:
+            with self._lock:
+                queued = fut in self._waiters
+                if queued:
+                    self._waiters.remove(fut)
+            if not queued:
+                if fut.done() and not fut.cancelled():
+                    # The slot was handed over just as we gave up; pass it on
+                    self.release()
+                else:
+                    # A hand-over is in flight and will find the future cancelled
+                    fut.cancel()
+            if isinstance(e, asyncio.CancelledError):
+                raise
+            return False
+
+    def release(self) -> None:
+        with self._lock:
+            while self._waiters:
+                fut = self._waiters.popleft()
+                if not fut.done():
+                    # The slot goes straight to the waiter, in_flight is unchanged
+                    fut.get_loop().call_soon_threadsafe(self._grant, fut)
+                    return
+            self.in_flight -= 1
+
+    def _grant(self, fut: asyncio.Future) -> None:
+        if fut.done():
+            self.release()
+        else:
+            fut.set_result(True)
+
+@dataclass
+class LimiterSnapshot:
+    """Point-in-time utilization of a tool's limits"""
+    tool_name: str
+    max_concurrency: Optional[int]
+    rate_limit: Optional[float]
+    in_flight: int
+    queued: int
+    accepted: int
+    rejected: int
+    tokens_available: Optional[float]
+    total_wait_seconds: float
+    max_wait_seconds: float
+
+    @property
+    def utilization(self) -> float:
+        """Fraction of concurrency slots in use (0.0 when concurrency isn't limited)"""
+        if not self.max_concurrency:
+            return 0.0
+        return self.in_flight / self.max_concurrency
+
+    def as_dict(self) -> Dict[str, Any]:
+        data = asdict(self)
+        data["utilization"] = self.utilization
+        return data
+
+class ToolLimiter:
+    """
+    Enforces a tool's max_concurrency and rate_limit.
+
+    Calls over the limit are either queued (optionally for at most queue_timeout
+    seconds) or rejected straight away with ToolLimitExceeded, depending on on_limit.
+    Queued and rejected calls are logged with the current snapshot under
+    `extra={"tool_utilization": ...}`.
+    """
+
+    def __init__(
+        self,
+        tool_name: str,
+        max_concurrency: Optional[int] = None,
+        rate_limit: Optional[float] = None,
+        burst: Optional[int] = None,
+        on_limit: str = QUEUE,
+        queue_timeout: Optional[float] = None
+    ) -> None:
+        if on_limit not in (QUEUE, REJECT):
+            raise ValueError(f"on_limit must be '{QUEUE}' or '{REJECT}', got '{on_limit}'")
+        self.tool_name = tool_name
+        self.on_limit = on_limit
+        self.queue_timeout = queue_timeout
+        self.concurrency = ConcurrencyLimit(max_concurrency) if max_concurrency else None
+        self.bucket = TokenBucket(rate_limit, burst) if rate_limit else None
+        self._in_flight = 0
+        self._accepted = 0
+        self._rejected = 0
+        self._total_wait = 0.0
+        self._max_wait = 0.0
+
+    def _reject(self, reason: str) -> ToolLimitExceeded:
+        self._rejected += 1
+        logger.warning(
+            f"Tool '{self.tool_name}' rejected a call: {reason}",
+            extra={"tool_utilization": self.snapshot().as_dict()}
+        )
+        return ToolLimitExceeded(f"Tool '{self.tool_name}' is over its {reason}, retry later")
+
+    async def acquire(self) -> None:
+        """Wait for permission to run one call, or raise ToolLimitExceeded"""
+        start = time.monotonic()
+        queued = False
+        wait = 0.0
+
+        if self.bucket is not None:
+            if self.on_limit == REJECT:
+                if not self.bucket.try_take():
+                    raise self._reject("rate limit")
+            else:
+                reserved = self.bucket.reserve(self.queue_timeout)
+                if reserved is None:
+                    raise self._reject("rate limit")
+                wait = reserved
+        try:
+            if wait > 0:
+                queued = True
+                await asyncio.sleep(wait)
+
+            if self.concurrency is not None:
+                if self.on_limit == REJECT:
+                    if not self.concurrency.try_acquire():
+                        raise self._reject("concurrency limit")
+                elif not self.concurrency.try_acquire():
+                    queued = True
+                    timeout = None
+                    if self.queue_timeout is not None:
+                        timeout = max(0.0, self.queue_timeout - (time.monotonic() - start))
+                    if not await self.concurrency.acquire(timeout):
+                        raise self._reject("concurrency limit")
+        except BaseException:
+            # The call won't run: don't let it use up the rate budget
+            if self.bucket is not None:
+                self.bucket.refund()
+            raise
+
+        waited = time.monotonic() - start
+        self._in_flight += 1
+        self._accepted += 1
+        self._total_wait += waited
+        self._max_wait = max(self._max_wait, waited)
+        if queued:
+            logger.debug(
+                f"Tool '{self.tool_name}' call waited {waited * 1000:.1f}ms for its limits",
+                extra={"tool_utilization": self.snapshot().as_dict()}
+            )
+
+    def release(self) -> None:
+        self._in_flight -= 1
+        if self.concurrency is not None:
+            self.concurrency.release()
+
+    @asynccontextmanager
+    async def limit(self) -> AsyncIterator[None]:
+        """Hold one call's worth of the tool's limits for the duration of the block"""
+        await self.acquire()
+        try:
+            yield
+        finally:
+            self.release()
+
+    def snapshot(self) -> LimiterSnapshot:
+        return LimiterSnapshot(
+            tool_name=self.tool_name,
+            max_concurrency=self.concurrency.limit if self.concurrency else None,
+            rate_limit=self.bucket.rate if self.bucket else None,
+            in_flight=self._in_flight,
+            queued=self.concurrency.waiting if self.concurrency else 0,
+            accepted=self._accepted,
+            rejected=self._rejected,
+            tokens_available=self.bucket.available if self.bucket else None,
+            total_wait_seconds=self._total_wait,
+            max_wait_seconds=self._max_wait
+        )
@@ -0,0 +1,302 @@
+import json
+import pickle
+import asyncio
+import hashlib
+import inspect
+import logging
+import threading
+from collections import OrderedDict
+from functools import wraps
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Optional, Tuple, Type, TypeVar, Union, cast
+
+from pydantic import BaseModel
+
+from wabee.tools.base_tool import BaseTool
+
+logger = logging.getLogger(__name__)
+
+F = TypeVar('F', bound=Callable[..., Any])
+
+_MISSING = object()
+
+class MemoryStore:
+    """Thread-safe in-memory LRU store"""
+
+    def __init__(self, maxsize: int = 1024) -> None:
+        self.maxsize = maxsize
+        self._entries: "OrderedDict[str, Any]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Any:
+        with self._lock:
+            value = self._entries.get(key, _MISSING)
+            if value is not _MISSING:
+                self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: Any) -> None:
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+class SqliteStore:
+    """
+    Persistent store in a sqlite file, shared by every tool memoized into it.
+
+    Values are pickled. Entries written by other versions of a tool are pruned
+    the first time the tool uses the store, so the file doesn't grow with stale results.
+    """
+
+    def __init__(self, path: Union[str, Path]) -> None:
+        # Imported here so importing wabee.tools doesn't load sqlite
+        import sqlite3
+
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS memo ("
+            "key TEXT PRIMARY KEY, namespace TEXT NOT NULL, version TEXT NOT NULL, value BLOB NOT NULL)"
+        )
+
+    def get(self, key: str) -> Any:
+        with self._lock:
+            row = self._conn.execute("SELECT value FROM memo WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            return _MISSING
+        try:
+            return pickle.loads(row[0])
+        except Exception as e:
+            logger.warning(f"Discarding unreadable memoized entry: {e}")
+            return _MISSING
+
+    def set(self, key: str, value: Any, namespace: str, version: str) -> None:
+        try:
+            blob = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        except Exception as e:
+            logger.warning(f"Result of '{namespace}' can't be persisted: {e}")
+            return
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO memo (key, namespace, version, value) VALUES (?, ?, ?, ?)",
+                (key, namespace, version, blob)
+            )
+
+    def prune(self, namespace: str, version: str) -> int:
+        """Delete the entries of a namespace that were written by other versions"""
+        with self._lock:
+            cursor = self._conn.execute(
+                "DELETE FROM memo WHERE namespace = ? AND version != ?", (namespace, version)
+            )
+        return cursor.rowcount
+
+    def clear(self, namespace: Optional[str] = None) -> None:
+        with self._lock:
+            if namespace is None:
+                self._conn.execute("DELETE FROM memo")
+            else:
+                self._conn.execute("DELETE FROM memo WHERE namespace = ?", (namespace,))
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+def code_version(obj: Any, schema: Optional[Type[BaseModel]] = None) -> str:
+    """Hash of an object's source code (and input schema), used to version memoized results"""
+    digest = hashlib.sha256()
+    try:
+        digest.update(inspect.getsource(obj).encode())
+    except (OSError, TypeError):
+        code = getattr(inspect.unwrap(obj), '__code__', None)
+        digest.update(code.co_code if code is not None else repr(obj).encode())
+    if schema is not None:
+        try:
+            digest.update(json.dumps(schema.model_json_schema(), sort_keys=True).encode())
+        except Exception:
+            # Schemas with arbitrary types have no JSON schema; their source is hashed above
+            pass
+    return digest.hexdigest()[:16]
+
+class Memoizer:
+    """Cache of tool results keyed on (namespace, version, validated input)"""
+
+    def __init__(
+        self,
+        namespace: str,
+        version: str,
+        maxsize: int = 1024,
+        path: Optional[Union[str, Path]] = None,
+        cache_errors: bool = False
+    ) -> None:
+        self.namespace = namespace
+        self.version = version
+        self.cache_errors = cache_errors
+        self.memory = MemoryStore(maxsize)
+        self.disk = SqliteStore(path) if path is not None else None
+        if self.disk is not None:
+            pruned = self.disk.prune(namespace, version)
+            if pruned:
+                logger.info(f"Pruned {pruned} memoized results of older versions of '{namespace}'")
+        self.hits = 0
+        self.misses = 0
+
+    def key(self, payload: str) -> str:
+        return hashlib.sha256(f"{self.namespace}\0{self.version}\0{payload}".encode()).hexdigest()
+
+    async def call(
+        self,
+        payload: str,
+        compute: Callable[[], Awaitable[Tuple[Any, Any]]]
+    ) -> Tuple[Any, Any]:
+        """Return the cached (result, error) for payload, or compute and store it"""
+        key = self.key(payload)
+        cached = self.memory.get(key)
+        if cached is _MISSING and self.disk is not None:
+            # sqlite blocks, keep it off the event loop
+            cached = await asyncio.to_thread(self.disk.get, key)
+            if cached is not _MISSING:
+                self.memory.set(key, cached)
+        if cached is not _MISSING:
+            self.hits += 1
+            return cached
+
+        self.misses += 1
+        outcome = await compute()
+        failed = isinstance(outcome, tuple) and len(outcome) == 2 and outcome[1] is not None
+        if not failed or self.cache_errors:
+            self.memory.set(key, outcome)
+            if self.disk is not None:
+                await asyncio.to_thread(self.disk.set, key, outcome, self.namespace, self.version)
+        return outcome
+
+    def clear(self) -> None:
+        self.memory.clear()
+        if self.disk is not None:
+            self.disk.clear(self.namespace)
+
+    def stats(self) -> dict:
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / total if total else 0.0,
+            "memory_entries": len(self.memory),
+        }
+
+def _namespace(obj: Any) -> str:
+    """Where an object is defined, so same-named tools of different modules don't share results"""
+    return f"{obj.__module__}.{obj.__qualname__}"
+
+def _input_payload(schema: Optional[Type[BaseModel]], args: tuple, kwargs: dict) -> Tuple[str, Optional[BaseModel]]:
+    """Canonical JSON of the validated input, and the validated model when there is a schema"""
+    if schema is not None and schema is not BaseModel:
+        if args and isinstance(args[0], schema):
+            model = args[0]
+        elif args and isinstance(args[0], dict):
+            model = schema.model_validate(args[0])
+        else:
+            model = schema.model_validate(kwargs)
+        return model.model_dump_json(), model
+    raw = args[0] if args and not kwargs else kwargs or list(args)
+    if isinstance(raw, BaseModel):
+        return raw.model_dump_json(), None
+    return json.dumps(raw, sort_keys=True, default=repr), None
+
+def memoize(
+    maxsize: int = 1024,
+    path: Optional[Union[str, Path]] = None,
+    version: Optional[str] = None,
+    cache_errors: bool = False
+) -> Callable[[F], F]:
+    """
+    Memoize a tool's results for repeated in-process calls.
+
+    Stacks on top of `@simple_tool` functions and decorates `BaseTool` subclasses.
+    Results are keyed on the validated pydantic input, so equivalent inputs
+    (e.g. "2" and 2 for an int field) share an entry. Keys include a version that
+    defaults to a hash of the tool's source and schema, so editing the tool
+    invalidates what it cached before.
+
+    Only successful results are cached unless cache_errors is set. Cached results
+    are returned as-is, so callers shouldn't mutate them.
+
+    Args:
+        maxsize: Maximum number of results kept in the in-memory LRU
+        path: Optional sqlite file persisting results across restarts
+        version: Explicit version string, replacing the source hash
+        cache_errors: Also cache (None, ToolError) outcomes
+
+    Example:
+        @memoize(maxsize=10_000, path=".cache/geocode.sqlite")
+        @simple_tool()
+        async def geocode(address: str) -> str:
+            ...
+    """
+    def decorator(target: F) -> F:
+        if isinstance(target, type) and issubclass(target, BaseTool):
+            return cast(F, _memoize_class(target, maxsize, path, version, cache_errors))
+        return _memoize_function(cast(F, target), maxsize, path, version, cache_errors)
+    return decorator
+
+def _memoize_function(
+    func: F,
+    maxsize: int,
+    path: Optional[Union[str, Path]],
+    version: Optional[str],
+    cache_errors: bool
+) -> F:
+    schema = getattr(func, 'args_schema', None)
+    memoizer = Memoizer(_namespace(func), version or code_version(func, schema), maxsize, path, cache_errors)
+
+    @wraps(func)
+    async def memoized(*args: Any, **kwargs: Any) -> Any:
+        try:
+            payload, model = _input_payload(schema, args, kwargs)
+        except Exception:
+            # Let the tool report invalid input the way it normally does
+            return await func(*args, **kwargs)
+        if model is not None:
+            return await memoizer.call(payload, lambda: func(model))
+        return await memoizer.call(payload, lambda: func(*args, **kwargs))
+
+    # wraps() copies the compiled tool @simple_tool attaches; the server would run
+    # that directly and skip the cache, so the wrapper only keeps its schema
+    memoized.__dict__.pop('tool', None)
+    setattr(memoized, 'cache', memoizer)
+    return memoized  # type: ignore[return-value]
+
+def _memoize_class(
+    cls: Type[BaseTool],
+    maxsize: int,
+    path: Optional[Union[str, Path]],
+    version: Optional[str],
+    cache_errors: bool
+) -> Type[BaseTool]:
+    memoizer = Memoizer(_namespace(cls), version or code_version(cls, cls.args_schema), maxsize, path, cache_errors)
+    original_call: Callable[..., Awaitable[Any]] = cls.__call__
+
+    @wraps(original_call)
+    async def __call__(self: BaseTool, input_data: Any) -> Any:
+        try:
+            payload, model = _input_payload(self.args_schema, (input_data,), {})
+        except Exception:
+            return await original_call(self, input_data)
+        # Instances of one class can be configured differently, so the name is part of the key
+        payload = f"{self.tool_name}\0{payload}"
+        return await memoizer.call(payload, lambda: original_call(self, model if model is not None else input_data))
+
+    setattr(cls, '__call__', __call__)
+    setattr(cls, 'cache', memoizer)
+    return cls
@@ -0,0 +1,128 @@
+import asyncio
+import inspect
+import logging
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# A factory returns the resource, or an awaitable resolving to it
+ResourceFactory = Callable[[], Any]
+# A closer receives the resource and may return an awaitable
+ResourceCloser = Callable[[Any], Any]
+
+class ResourceError(Exception):
+    """Raised when a shared resource is unknown or can't be created"""
+    pass
+
+@dataclass
+class _Resource:
+    factory: ResourceFactory
+    close: Optional[ResourceCloser]
+    value: Any = None
+    created: bool = False
+    lock: asyncio.Lock = field(default_factory=asyncio.Lock)
+
+async def _maybe_await(value: Any) -> Any:
+    if inspect.isawaitable(value):
+        return await value
+    return value
+
+async def close_resource(resource: Any) -> None:
+    """Close a resource using whichever of aclose()/close() it provides"""
+    for method in ("aclose", "close"):
+        closer = getattr(resource, method, None)
+        if callable(closer):
+            await _maybe_await(closer())
+            return
+
+class ResourceRegistry:
+    """
+    Shared, lazily created resources (HTTP sessions, connection pools, model handles)
+    that tools borrow instead of opening their own on every call.
+
+    Each resource is created once, the first time a tool asks for it, and closed when
+    the registry is closed, in the reverse order of creation. Tools list the resources
+    they need in `BaseTool.resources`; `serve()` injects them before `on_startup` runs
+    and closes the registry once the server has drained.
+
+    Example:
+        registry = ResourceRegistry()
+        registry.register("http", lambda: httpx.AsyncClient(timeout=10))
+
+        class SearchTool(BaseTool):
+            resources = ("http",)
+
+            async def execute(self, input_data):
+                response = await self.http.get(...)
+    """
+
+    def __init__(self) -> None:
+        self._resources: Dict[str, _Resource] = {}
+        self._created: List[str] = []
+
+    def register(
+        self,
+        name: str,
+        factory: Optional[ResourceFactory] = None,
+        *,
+        close: Optional[ResourceCloser] = None
+    ) -> Any:
+        """
+        Register a resource factory. Can also be used as a decorator.
+
+        Args:
+            name: Name tools use to refer to the resource
+            factory: Sync or async callable creating the resource
+            close: Optional callable releasing the resource; defaults to its aclose()/close()
+        """
+        if factory is None:
+            def decorator(func: ResourceFactory) -> ResourceFactory:
+                self.register(name, func, close=close)
+                return func
+            return decorator
+
+        if name in self._resources:
+            raise ResourceError(f"Resource '{name}' is already registered")
+        self._resources[name] = _Resource(factory=factory, close=close)
+        return factory
+
+    def __contains__(self, name: object) -> bool:
+        return name in self._resources
+
+    async def get(self, name: str) -> Any:
+        """Return the shared instance of a resource, creating it on first use"""
+        resource = self._resources.get(name)
+        if resource is None:
+            raise ResourceError(f"Resource '{name}' is not registered")
+        if resource.created:
+            return resource.value
+
+        async with resource.lock:
+            if not resource.created:
+                try:
+                    resource.value = await _maybe_await(resource.factory())
+                except Exception as e:
+                    raise ResourceError(f"Failed to create resource '{name}': {e}") from e
+                resource.created = True
+                self._created.append(name)
+                logger.info(f"Created shared resource '{name}'")
+        return resource.value
+
+    async def close(self) -> None:
+        """Close every created resource, newest first. Errors are logged, not raised."""
+        while self._created:
+            name = self._created.pop()
+            resource = self._resources[name]
+            value, resource.value, resource.created = resource.value, None, False
+            try:
+                if resource.close is not None:
+                    await _maybe_await(resource.close(value))
+                else:
+                    await close_resource(value)
+                logger.info(f"Closed shared resource '{name}'")
+            except Exception as e:
+                logger.error(f"Failed to close resource '{name}': {e}")
+
+# Registry used by serve() when none is passed explicitly
+registry = ResourceRegistry()
@@ -6,6 +6,8 @@ from pydantic import BaseModel, create_model, ConfigDict, ValidationError
 from wabee.tools.base_tool import BaseTool
 from wabee.tools.tool_error import ToolError, ToolErrorType
 from wabee.tools.base_model import StructuredToolResponse
+from wabee.tools.sync_runner import DEFAULT_MAX_SYNC_WORKERS
+from wabee.tools.limits import QUEUE, ToolLimitExceeded
 
 T = TypeVar('T')
 P = ParamSpec('P')
@@ -14,34 +16,56 @@ def simple_tool(
     name: Optional[str] = None,
     description: Optional[str] = None,
     schema: Optional[Type[BaseModel]] = None,
+    max_sync_workers: int = DEFAULT_MAX_SYNC_WORKERS,
+    max_concurrency: Optional[int] = None,
+    rate_limit: Optional[float] = None,
+    on_limit: str = QUEUE,
     **schema_fields: Any
-) -> Callable[[Callable[P, Awaitable[T]]], Callable[P, Awaitable[tuple[Optional[Union[StructuredToolResponse, T]], Optional[ToolError]]]]]:
+) -> Callable[[Union[Callable[P, Awaitable[T]], Callable[P, T]]], Callable[P, Awaitable[tuple[Optional[Union[StructuredToolResponse, T]], Optional[ToolError]]]]]:
     """
-    A decorator that transforms a simple async function into a BaseTool-compatible interface.
-    
+    A decorator that transforms a simple function into a BaseTool-compatible interface.
+
     Can be used in these ways:
     1. With inline schema fields: @simple_tool(name="Add", description="Adds numbers", x=int, y=int)
     2. With a predefined schema: @simple_tool(name="Add", description="Adds numbers", schema=MySchema)
     3. Without any schema: @simple_tool(name="Add", description="Adds numbers")
     4. With automatic name/description: @simple_tool()
-    
+
+    The tool class, its instance and any schema derived from the function's type hints
+    are built once, when the decorator is applied, and reused for every call. The
+    compiled BaseTool instance is available as the `tool` attribute of the decorated function.
+
+    Both `async def` and plain `def` functions are supported. Synchronous functions run on
+    a bounded thread pool owned by the tool, so blocking libraries don't stall the event
+    loop; the decorated function is awaitable either way.
+
     Args:
         name: Optional name for the tool (defaults to function name)
         description: Optional description (defaults to function docstring)
         schema: Optional predefined Pydantic model for input validation
+        max_sync_workers: Maximum number of threads running a synchronous function at once
+        max_concurrency: Optional maximum number of calls running at once
+        rate_limit: Optional maximum number of calls started per second
+        on_limit: "queue" calls over the limits, or "reject" them with a RETRYABLE error
         **schema_fields: Field definitions to create an ad-hoc Pydantic model
-        
+
     Returns:
         A decorator that wraps the function in a BaseTool-compatible interface
-        
+
     Example:
         @simple_tool(x=int, y=int)
         async def add_numbers(input_data):
             return input_data.x + input_data.y
-            
+
         result, error = await add_numbers(x=5, y=3)
     """
-    def decorator(func: Callable[P, Awaitable[T]]) -> Callable[P, Awaitable[tuple[Optional[Union[StructuredToolResponse, T]], Optional[ToolError]]]]:
+    def decorator(func: Union[Callable[P, Awaitable[T]], Callable[P, T]]) -> Callable[P, Awaitable[tuple[Optional[Union[StructuredToolResponse, T]], Optional[ToolError]]]]:
+        # Get tool name and description
+        tool_name = name or func.__name__
+        tool_description = description or func.__doc__ or ""
+        sync_workers = max_sync_workers
+        concurrency_limit, calls_per_second, limit_mode = max_concurrency, rate_limit, on_limit
+
         # Create a schema on the fly if fields are provided but no schema
         if schema is None and schema_fields:
             # Convert field definitions to proper Pydantic field annotations
@@ -51,7 +75,7 @@ def simple_tool(
             }
             model_name = f"{func.__name__.title()}Input"
             dynamic_schema = create_model(
-                model_name, 
+                model_name,
                 __config__=ConfigDict(arbitrary_types_allowed=True),
                 __doc__=None,
                 __base__=None,
@@ -63,112 +87,141 @@ def simple_tool(
         else:
             dynamic_schema = schema
 
-        @wraps(func)
-        async def wrapped_tool(*args: P.args, **kwargs: P.kwargs) -> tuple[Optional[Union[StructuredToolResponse, T]], Optional[ToolError]]:
-            # Get tool name and description
-            tool_name = name or func.__name__
-            tool_description = description or func.__doc__ or ""
-            
-            # Create an anonymous class inheriting from BaseTool
-            class FunctionalTool(BaseTool):
-                args_schema = cast(Type[BaseModel], dynamic_schema if dynamic_schema is not None else BaseModel)
-
-                def __init__(self):
-                    self.name = tool_name
-                    self.description = tool_description
-
-                async def execute(self, input_data: Any) -> tuple[Union[T, None], Optional[ToolError]]:
-                    try:
+        # For functions without schema, validate against type hints
+        runtime_schema: Optional[Type[BaseModel]] = None
+        if dynamic_schema is None:
+            fields = {
+                field_name: (field_type, ...)
+                for field_name, field_type in func.__annotations__.items()
+                if field_name != 'return'
+            }
+            if fields:
+                runtime_schema = create_model(
+                    f"{func.__name__}RuntimeSchema",
+                    __config__=ConfigDict(arbitrary_types_allowed=True),
+                    __doc__=None,
+                    __base__=None,
+                    __module__=func.__module__,
+                    __validators__=None,
+                    __cls_kwargs__=None,
+                    **fields
+                )
+        runtime_fields = frozenset(runtime_schema.model_fields) if runtime_schema is not None else frozenset()
+
+        class FunctionalTool(BaseTool):
+            args_schema = cast(Type[BaseModel], dynamic_schema or runtime_schema or BaseModel)
+            max_sync_workers = sync_workers
+            max_concurrency = concurrency_limit
+            rate_limit = calls_per_second
+            on_limit = limit_mode
+
+            def __init__(self):
+                self.name = tool_name
+                self.description = tool_description
+
+            async def execute(self, input_data: Any) -> tuple[Union[T, None], Optional[ToolError]]:
+                if isinstance(input_data, dict):
+                    return await self.invoke((), input_data)
+                return await self.invoke((input_data,), {})
+
+            async def _dispatch(self, input_data: Any) -> tuple[Union[T, None], Optional[ToolError]]:
+                # Limits are applied around the function call itself, see call()
+                return await self.execute(input_data)
+
+            async def call(self, *args: Any, **kwargs: Any) -> Any:
+                """Call the wrapped function under the tool's limits, off the event loop if it is synchronous"""
+                return await self.run_limited(func, *args, **kwargs)
+
+            async def invoke(self, args: tuple, kwargs: dict) -> tuple[Union[T, None], Optional[ToolError]]:
+                """Call the wrapped function with the arguments the decorated function received"""
+                try:
+                    if dynamic_schema is not None:
                         # Validate and convert input to Pydantic model if schema exists
-                        if dynamic_schema:
-                            if isinstance(input_data, dict):
-                                validated_input = dynamic_schema(**input_data)
-                            elif isinstance(input_data, dynamic_schema):
-                                validated_input = input_data
-                            else:
-                                raise ValueError(f"Input must be dict or {dynamic_schema.__name__}")
-                            result = await func(validated_input)
+                        input_data = args[0] if args else kwargs
+                        if isinstance(input_data, dict):
+                            validated_input = dynamic_schema.model_validate(input_data)
+                        elif isinstance(input_data, dynamic_schema):
+                            validated_input = input_data
                         else:
-                            # For functions without schema, validate against type hints
-                            try:
-                                # Create a dynamic model from function annotations
-                                hints = func.__annotations__
-                                if hints:
-                                    fields = {
-                                        name: (typ, ...) for name, typ in hints.items()
-                                        if name != 'return'
-                                    }
-                                    model_name = f"{func.__name__}RuntimeSchema"
-                                    runtime_schema = create_model(
-                                        model_name,
-                                        __config__=ConfigDict(arbitrary_types_allowed=True),
-                                        __doc__=None,
-                                        __base__=None,
-                                        __module__=func.__module__,
-                                        __validators__=None,
-                                        __cls_kwargs__=None,
-                                        **fields
-                                    )
-                                    # Validate kwargs against the runtime schema
-                                    # Create model instance with validated kwargs
-                                    input_kwargs = {k: v for k, v in kwargs.items() if k in fields}
-                                    model_instance = runtime_schema(**input_kwargs)
-                                    validated_kwargs = model_instance.model_dump()
-                                    result = await func(**validated_kwargs)
+                            raise ValueError(f"Input must be dict or {dynamic_schema.__name__}")
+                        result = await self.call(validated_input)
+                    else:
+                        try:
+                            if runtime_schema is not None:
+                                # Validate kwargs against the runtime schema built from the type hints,
+                                # unless the caller already passes a validated instance of it
+                                if args and isinstance(args[0], runtime_schema):
+                                    model_instance = args[0]
                                 else:
-                                    # When no schema and no type hints, pass args/kwargs directly 
-                                    if args:
-                                        if len(args) > 0:
-                                            result = await func(*args)
-                                        else:
-                                            result = await func()
-                                    else:
-                                        result = await func(**kwargs)
-                            except (ValueError, TypeError) as e:
-                                return None, ToolError(
-                                    type=ToolErrorType.INVALID_INPUT,
-                                    message=str(e),
-                                    original_error=e
-                                )
-                        # Return the result
-                        return result, None
-                    except ValidationError as e:
-                        # Pydantic validation errors
-                        return None, ToolError(
-                            type=ToolErrorType.INVALID_INPUT,
-                            message=str(e),
-                            original_error=e
-                        )
-                    except ValueError as e:
-                        # Business logic errors raised by the function
-                        return None, ToolError(
-                            type=ToolErrorType.EXECUTION_ERROR,
-                            message=str(e),
-                            original_error=e
-                        )
-                    except AttributeError as e:
-                        # Schema validation/access errors
-                        return None, ToolError(
-                            type=ToolErrorType.INVALID_INPUT,
-                            message=str(e),
-                            original_error=e
-                        )
-                    except Exception as e:
-                        # Unexpected errors
-                        return None, ToolError(
-                            type=ToolErrorType.INTERNAL_ERROR,
-                            message=str(e),
-                            original_error=e
-                        )
-
-            # Create and call the tool instance
-            tool = FunctionalTool()
-            if dynamic_schema is not None:
-                return await tool.execute(kwargs)
-            elif args and len(args) > 0:
-                return await tool.execute(args[0])
-            else:
-                return await tool.execute(kwargs or {})
+                                    model_instance = runtime_schema.model_validate(
+                                        {k: v for k, v in kwargs.items() if k in runtime_fields}
+                                    )
+                                # Pass the validated field values as they are, without re-serializing them
+                                result = await self.call(**{k: getattr(model_instance, k) for k in runtime_fields})
+                            elif args:
+                                # When no schema and no type hints, pass args/kwargs directly
+                                result = await self.call(*args)
+                            else:
+                                result = await self.call(**kwargs)
+                        except (ValueError, TypeError) as e:
+                            return None, ToolError(
+                                type=ToolErrorType.INVALID_INPUT,
+                                message=str(e),
+                                original_error=e
+                            )
+                    # Return the result
+                    return result, None
+                except ToolLimitExceeded as e:
+                    # Over the tool's concurrency or rate limit
+                    return None, ToolError(
+                        type=ToolErrorType.RETRYABLE,
+                        message=str(e),
+                        original_error=e
+                    )
+                except ValidationError as e:
+                    # Pydantic validation errors
+                    return None, ToolError(
+                        type=ToolErrorType.INVALID_INPUT,
+                        message=str(e),
+                        original_error=e
+                    )
+                except ValueError as e:
+                    # Business logic errors raised by the function
+                    return None, ToolError(
+                        type=ToolErrorType.EXECUTION_ERROR,
+                        message=str(e),
+                        original_error=e
+                    )
+                except AttributeError as e:
+                    # Schema validation/access errors
+                    return None, ToolError(
+                        type=ToolErrorType.INVALID_INPUT,
+                        message=str(e),
+                        original_error=e
+                    )
+                except Exception as e:
+                    # Unexpected errors
+                    return None, ToolError(
+                        type=ToolErrorType.INTERNAL_ERROR,
+                        message=str(e),
+                        original_error=e
+                    )
+
+        FunctionalTool.__name__ = FunctionalTool.__qualname__ = f"{func.__name__}FunctionalTool"
+        tool = FunctionalTool()
+
+        @wraps(func)
+        async def wrapped_tool(*args: P.args, **kwargs: P.kwargs) -> tuple[Optional[Union[StructuredToolResponse, T]], Optional[ToolError]]:
+            if dynamic_schema is not None and not (args and isinstance(args[0], dynamic_schema)):
+                return await tool.invoke((), kwargs)
+            return await tool.invoke(args, kwargs)
+
+        # Expose the compiled tool so servers and other decorators can reuse it
+        setattr(wrapped_tool, 'tool', tool)
+        setattr(wrapped_tool, 'name', tool_name)
+        setattr(wrapped_tool, 'description', tool_description)
+        if dynamic_schema is not None or runtime_schema is not None:
+            setattr(wrapped_tool, 'args_schema', tool.args_schema)
 
         return wrapped_tool
 
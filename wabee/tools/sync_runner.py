@@ -0,0 +1,55 @@
+import asyncio
+import functools
+import threading
+import contextvars
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Optional, TypeVar
+
+T = TypeVar('T')
+
+DEFAULT_MAX_SYNC_WORKERS = 4
+
+class SyncRunner:
+    """
+    Runs blocking callables for a tool on a bounded thread pool of its own.
+
+    Synchronous tool code (database drivers, PDF parsers, SDKs) is executed off the
+    event loop so it can't stall other requests. The caller's contextvars are carried
+    over to the worker thread. Cancelling the awaiting task cancels calls that are still
+    queued; a call that is already running in a thread can't be interrupted and is left
+    to finish in the background.
+    """
+
+    def __init__(self, max_workers: int = DEFAULT_MAX_SYNC_WORKERS, name: str = "tool") -> None:
+        if max_workers < 1:
+            raise ValueError("max_workers must be at least 1")
+        self.max_workers = max_workers
+        self.name = name
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._lock = threading.Lock()
+
+    @property
+    def executor(self) -> ThreadPoolExecutor:
+        # Created on first use so tools that never run sync code don't start threads
+        if self._executor is None:
+            with self._lock:
+                if self._executor is None:
+                    self._executor = ThreadPoolExecutor(
+                        max_workers=self.max_workers,
+                        thread_name_prefix=f"wabee-{self.name}"
+                    )
+        return self._executor
+
+    async def run(self, func: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+        """Run func(*args, **kwargs) on the pool and wait for the result"""
+        loop = asyncio.get_running_loop()
+        context = contextvars.copy_context()
+        call = functools.partial(context.run, func, *args, **kwargs)
+        return await loop.run_in_executor(self.executor, call)
+
+    def shutdown(self, wait: bool = True) -> None:
+        """Stop the worker threads; the pool is recreated if the runner is used again"""
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=wait, cancel_futures=True)